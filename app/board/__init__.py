@@ -0,0 +1,74 @@
+"""
+FORD-CAD Board State Module
+In-memory model of the live board (units, crews, coverage, assignments and
+the incident panels), rebuilt per section only when its tables change, the
+versioned (ETag) panel fragments rendered from it, and the background
+reconciler that repairs it.
+"""
+from .fragments import (
+    PanelFragments,
+    cached_panel,
+    etag_matches,
+    get_panel_fragments,
+    panel_cache_stats,
+    panel_etag,
+    panel_not_modified,
+    register_panel,
+    store_panel,
+)
+from .reconciler import (
+    BoardReconciler,
+    get_board_reconciler,
+    reconciler_stats,
+    register_board_repair,
+    request_board_reconcile,
+    run_board_reconcile,
+    start_board_reconciler,
+    stop_board_reconciler,
+)
+from .state import (
+    BOARD_TABLES,
+    BoardState,
+    board_section,
+    board_sections,
+    board_state_stats,
+    board_versions,
+    get_board_state,
+    install_board_versions,
+    install_dailylog_version,
+    invalidate_board_state,
+    load_board_state,
+    register_board_section,
+)
+
+__all__ = [
+    "PanelFragments",
+    "cached_panel",
+    "etag_matches",
+    "get_panel_fragments",
+    "panel_cache_stats",
+    "panel_etag",
+    "panel_not_modified",
+    "register_panel",
+    "store_panel",
+    "BoardReconciler",
+    "get_board_reconciler",
+    "reconciler_stats",
+    "register_board_repair",
+    "request_board_reconcile",
+    "run_board_reconcile",
+    "start_board_reconciler",
+    "stop_board_reconciler",
+    "BOARD_TABLES",
+    "BoardState",
+    "board_section",
+    "board_sections",
+    "board_state_stats",
+    "board_versions",
+    "get_board_state",
+    "install_board_versions",
+    "install_dailylog_version",
+    "invalidate_board_state",
+    "load_board_state",
+    "register_board_section",
+]
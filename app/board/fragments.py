@@ -0,0 +1,174 @@
+# ============================================================================
+# FORD CAD — Versioned Panel Fragments (ETag / 304)
+# ============================================================================
+# The console polls /panel/units, /panel/active, /panel/open, /panel/held
+# and /panel/dailylog_rows, and most polls land on a board that has not
+# changed since the last one. Each panel is registered here with the board
+# tables it renders (their write counts are kept in board_versions, see
+# state.py) and its response carries an ETag built from
+#
+#   panel name + view key (session shift letter / roster mode, filters)
+#              + versions of the panel's tables
+#
+# A poll presenting that ETag in If-None-Match is answered 304 after one
+# primary-key read of board_versions: no board query, no template. A poll
+# that misses is served from a small LRU of rendered fragments keyed on the
+# same ETag (another console on the same view and version already paid for
+# the render), and only then rendered.
+#
+# Versions live in cad.db, so every uvicorn worker computes the same ETag
+# for the same board. Panels whose HTML ages between writes (held call ages
+# are not refreshed client-side) add a time bucket of age_bucket_s seconds
+# to the key. Without board_versions (CAD_BOARD_CACHE=0, migration not
+# run) or with CAD_PANEL_ETAG=0 panels are rendered on every poll as before.
+# ============================================================================
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Sequence, Tuple
+
+from .state import BOARD_TABLES, board_versions
+
+logger = logging.getLogger("board.fragments")
+
+ENABLED = os.getenv("CAD_PANEL_ETAG", "1").strip().lower() not in ("0", "false", "no", "off")
+CACHE_SIZE = int(os.getenv("CAD_PANEL_CACHE_SIZE", "64"))
+
+
+class Panel(NamedTuple):
+    tables: Tuple[str, ...]
+    age_bucket_s: Optional[float]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    want = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if (tag[2:] if tag.startswith("W/") else tag) == want:
+            return True
+    return False
+
+
+class PanelFragments:
+    """ETags for the registered panels and an LRU of their rendered HTML."""
+
+    def __init__(self, capacity: int = CACHE_SIZE):
+        self.capacity = max(0, int(capacity))
+        self._panels: Dict[str, Panel] = {}
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def register(self, panel: str, tables: Sequence[str], age_bucket_s: Optional[float] = None):
+        unknown = [t for t in tables if t not in BOARD_TABLES]
+        if unknown:
+            raise ValueError(f"Panel '{panel}' reads untracked tables: {unknown}")
+        with self._lock:
+            self._panels[panel] = Panel(tuple(tables), age_bucket_s)
+            self._stats[panel] = {"not_modified": 0, "cached": 0, "rendered": 0, "untracked": 0}
+
+    # ------------------------------------------------------------------
+    # ETags
+    # ------------------------------------------------------------------
+
+    def etag(self, panel: str, view: Hashable = (),
+             versions: Optional[Dict[str, int]] = None) -> Optional[str]:
+        """ETag of `panel` for this view of the current board (None: not
+        tracked, render as usual). Reads board_versions unless given."""
+        spec = self._panels[panel]
+        if ENABLED:
+            versions = board_versions() if versions is None else versions
+        if not ENABLED or versions is None:
+            with self._lock:
+                self._stats[panel]["untracked"] += 1
+            return None
+        key: Tuple[Any, ...] = (panel, view, tuple(versions.get(t, 0) for t in spec.tables))
+        if spec.age_bucket_s:
+            key += (int(time.time() // spec.age_bucket_s),)
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:20]
+        return f'W/"{panel}-{digest}"'
+
+    def not_modified(self, panel: str):
+        with self._lock:
+            self._stats[panel]["not_modified"] += 1
+
+    # ------------------------------------------------------------------
+    # Rendered fragments
+    # ------------------------------------------------------------------
+
+    def get(self, panel: str, etag: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._cache.get(etag)
+            if body is not None:
+                self._cache.move_to_end(etag)
+                self._stats[panel]["cached"] += 1
+            return body
+
+    def put(self, panel: str, etag: str, body: bytes):
+        with self._lock:
+            self._stats[panel]["rendered"] += 1
+            if not self.capacity:
+                return
+            self._cache[etag] = body
+            self._cache.move_to_end(etag)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": ENABLED,
+                "capacity": self.capacity,
+                "cached": len(self._cache),
+                "cached_bytes": sum(len(b) for b in self._cache.values()),
+                "panels": {name: dict(s) for name, s in self._stats.items()},
+            }
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_fragments = PanelFragments()
+
+
+def get_panel_fragments() -> PanelFragments:
+    return _fragments
+
+
+def register_panel(panel: str, tables: Sequence[str], age_bucket_s: Optional[float] = None):
+    _fragments.register(panel, tables, age_bucket_s)
+
+
+def panel_etag(panel: str, view: Hashable = ()) -> Optional[str]:
+    """Blocking (one board_versions read): call via run_db."""
+    return _fragments.etag(panel, view)
+
+
+def panel_not_modified(panel: str):
+    _fragments.not_modified(panel)
+
+
+def cached_panel(panel: str, etag: str) -> Optional[bytes]:
+    return _fragments.get(panel, etag)
+
+
+def store_panel(panel: str, etag: str, body: bytes):
+    _fragments.put(panel, etag, body)
+
+
+def panel_cache_stats() -> Dict[str, Any]:
+    return _fragments.stats()
@@ -0,0 +1,214 @@
+# ============================================================================
+# FORD CAD — Board Reconciler (background board repairs)
+# ============================================================================
+# GET /panel/units used to repair the board before every render: clear
+# assignments left open on CLOSED incidents, reset units left DISPATCHED /
+# ENROUTE with nothing assigned, expire shift overrides from past shifts.
+# Every console poll took the write lock and queued behind dispatch.
+#
+# Those repairs are registered here (by main.py) and run on one background
+# thread instead:
+#
+#   every INTERVAL_S     in the worker holding the "board_reconciler"
+#                        lease (app/db/lease.py)
+#   after Incidents      any commit that touched Incidents (closes, holds,
+#   commits              dispositions; units of work included) wakes the
+#                        thread in the worker that made it; runs are at
+#                        least MIN_SPACING_S apart
+#
+# A repair looks for work with a read first and only writes when it found
+# some, so a clean board never takes the write lock. Each repair returns
+# what it fixed; the fixes are logged and kept in reconciler_stats().
+# ============================================================================
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional
+
+from app.db import add_commit_listener, get_db_path, is_leader, remove_commit_listener
+
+logger = logging.getLogger("board.reconciler")
+
+ENABLED = os.getenv("CAD_BOARD_RECONCILE", "1").strip().lower() not in ("0", "false", "no", "off")
+INTERVAL_S = float(os.getenv("CAD_BOARD_RECONCILE_INTERVAL_S", "30"))
+MIN_SPACING_S = 1.0
+# Recent fixes kept for stats
+RECENT = 50
+
+# repair() -> descriptions of what it fixed ([] when the board was clean)
+Repair = Callable[[], List[str]]
+
+
+class BoardReconciler:
+    """Runs the registered board repairs on a background thread."""
+
+    def __init__(self, db_path=None, interval_s: float = INTERVAL_S,
+                 min_spacing_s: float = MIN_SPACING_S):
+        self.db_path = db_path
+        self.interval_s = max(1.0, float(interval_s))
+        self.min_spacing_s = max(0.0, float(min_spacing_s))
+        self._repairs: Dict[str, Repair] = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._requested = False
+        self._path: Optional[str] = None
+        self._last_run = 0.0
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT)
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._runs = {"runs": 0, "requested": 0, "skipped_standby": 0}
+
+    def register(self, name: str, repair: Repair):
+        with self._lock:
+            self._repairs[name] = repair
+            self._stats[name] = {"runs": 0, "fixed": 0, "failed": 0, "last_error": None}
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+
+    def run(self) -> Dict[str, List[str]]:
+        """Run every repair now on the calling thread; returns the fixes."""
+        with self._run_lock:
+            with self._lock:
+                repairs = list(self._repairs.items())
+                self._runs["runs"] += 1
+            fixes: Dict[str, List[str]] = {}
+            for name, repair in repairs:
+                stats = self._stats[name]
+                try:
+                    fixed = list(repair() or [])
+                except Exception as e:
+                    with self._lock:
+                        stats["failed"] += 1
+                        stats["last_error"] = str(e)
+                    logger.warning(f"[Reconciler] {name} failed: {e}")
+                    continue
+                with self._lock:
+                    stats["runs"] += 1
+                    stats["fixed"] += len(fixed)
+                    if fixed:
+                        self._recent.append({
+                            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                            "repair": name,
+                            "fixed": fixed,
+                        })
+                if fixed:
+                    fixes[name] = fixed
+                    logger.info(f"[Reconciler] {name}: fixed {len(fixed)}: {', '.join(fixed[:10])}")
+            self._last_run = time.monotonic()
+            return fixes
+
+    def request(self):
+        """Run soon on the reconciler thread (no-op until start())."""
+        with self._lock:
+            self._requested = True
+            self._runs["requested"] += 1
+        self._wake.set()
+
+    def _on_commit(self, db_path: str, tables: FrozenSet[str]):
+        if db_path == self._path and "Incidents" in tables:
+            self.request()
+
+    # ------------------------------------------------------------------
+    # Thread
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if not ENABLED or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._path = os.path.abspath(str(self.db_path if self.db_path is not None else get_db_path()))
+        add_commit_listener(self._on_commit)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="cad-board-reconciler", daemon=True)
+        self._thread.start()
+        # Repair whatever the last run of the server left behind
+        self.request()
+
+    def stop(self, timeout: float = 5.0):
+        remove_commit_listener(self._on_commit)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        next_timed = time.monotonic() + self.interval_s
+        while not self._stop.is_set():
+            self._wake.wait(max(0.0, next_timed - time.monotonic()))
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            # Space runs out: a burst of closes becomes one run
+            spacing = self.min_spacing_s - (time.monotonic() - self._last_run)
+            if spacing > 0 and self._stop.wait(spacing):
+                break
+            with self._lock:
+                requested, self._requested = self._requested, False
+            timed = time.monotonic() >= next_timed
+            if timed:
+                next_timed = time.monotonic() + self.interval_s
+            if not requested:
+                if not timed:
+                    continue
+                if not is_leader("board_reconciler"):
+                    with self._lock:
+                        self._runs["skipped_standby"] += 1
+                    continue
+            try:
+                self.run()
+            except Exception as e:
+                logger.warning(f"[Reconciler] {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._runs)
+            out["repairs"] = {name: dict(s) for name, s in self._stats.items()}
+            out["recent"] = list(self._recent)[-10:]
+        out["enabled"] = ENABLED
+        out["running"] = self._thread is not None and self._thread.is_alive()
+        out["interval_s"] = self.interval_s
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_reconciler = BoardReconciler()
+
+
+def get_board_reconciler() -> BoardReconciler:
+    return _reconciler
+
+
+def register_board_repair(name: str, repair: Repair):
+    _reconciler.register(name, repair)
+
+
+def start_board_reconciler():
+    """Startup hook (after migrations). CAD_BOARD_RECONCILE=0 disables the
+    thread; run_board_reconcile() still works on demand."""
+    _reconciler.start()
+
+
+def stop_board_reconciler():
+    _reconciler.stop()
+
+
+def request_board_reconcile():
+    _reconciler.request()
+
+
+def run_board_reconcile() -> Dict[str, List[str]]:
+    return _reconciler.run()
+
+
+def reconciler_stats() -> Dict[str, Any]:
+    return _reconciler.stats()
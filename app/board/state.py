@@ -0,0 +1,269 @@
+# ============================================================================
+# FORD CAD — Live Board State (in-memory units / incidents model)
+# ============================================================================
+# Every /panel/units, /panel/active, /panel/open refresh and every dispatch
+# picker used to rebuild the board from SQL: unit rows, crews, coverage
+# overrides, roster, uncleared assignments and the incident lists, 5-10
+# queries per console per refresh.
+#
+# The board is now held in memory as named sections, each built by a
+# loader from a few board tables:
+#
+#   units        ordered Units rows with metadata     Units
+#   assignments  uncleared assignments + inc. status  UnitAssignments, Incidents
+#   overrides    active shift coverage overrides      ShiftOverrides
+#   roster       personnel roster by shift letter     UnitRoster
+#   crews        apparatus crews by shift             PersonnelAssignments
+#   active / open / held   incident panel lists       Incidents, UnitAssignments, Units
+#
+# (loaders are registered by main.py). A section is rebuilt only when one of
+# its tables changed. Changes are counted in cad.db itself: triggers on each
+# board table bump its row in board_versions inside the writing transaction
+# (migration 16), so every mutation path, raw sqlite3 writers and other
+# uvicorn workers included, is seen without any of them calling in here. A
+# board read costs one primary-key read of board_versions; sections whose
+# versions are unchanged are served from memory.
+#
+# Sections are shared between readers: callers copy rows before changing
+# them. Without board_versions (migration not run, CAD_BOARD_CACHE=0) every
+# read goes to the loader as before, and so does a read inside a unit of
+# work: there get_conn() is the unit's uncommitted transaction, whose rows
+# (and version bumps) may yet roll back and must never be cached.
+# ============================================================================
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.db import current_uow, get_conn
+
+logger = logging.getLogger("board.state")
+
+ENABLED = os.getenv("CAD_BOARD_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Tables whose writes are counted in board_versions (DailyLog: only the
+# daily log panel's ETag, fragments.py)
+BOARD_TABLES = (
+    "Incidents",
+    "UnitAssignments",
+    "Units",
+    "ShiftOverrides",
+    "PersonnelAssignments",
+    "UnitRoster",
+    "DailyLog",
+)
+
+_VERSIONS_SQL = "SELECT name, version FROM board_versions"
+
+
+def install_board_versions(conn: sqlite3.Connection) -> List[str]:
+    """Create board_versions and the bump triggers of the board sections'
+    tables (migration 16). Idempotent; tables that do not exist yet are
+    skipped."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS board_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    return _install_version_triggers(conn, [t for t in BOARD_TABLES if t != "DailyLog"])
+
+
+def install_dailylog_version(conn: sqlite3.Connection) -> List[str]:
+    """Add DailyLog's board_versions row and bump triggers (migration 17,
+    for the daily log panel's ETag)."""
+    return _install_version_triggers(conn, ["DailyLog"])
+
+
+def _install_version_triggers(conn: sqlite3.Connection, tables: Sequence[str]) -> List[str]:
+    installed: List[str] = []
+    for table in tables:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if not exists:
+            continue
+        conn.execute("INSERT OR IGNORE INTO board_versions (name, version) VALUES (?, 0)", (table,))
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS board_version_{table.lower()}_{op.lower()} "
+                f'AFTER {op} ON "{table}" BEGIN '
+                f"UPDATE board_versions SET version = version + 1 WHERE name = '{table}'; END"
+            )
+        installed.append(table)
+    return installed
+
+
+class Section(NamedTuple):
+    loader: Callable[[], Any]
+    tables: Tuple[str, ...]
+
+
+class BoardState:
+    """Named board sections, rebuilt when their tables' versions move."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path
+        self._sections: Dict[str, Section] = {}
+        # name -> (versions key, value)
+        self._values: Dict[str, Tuple[Tuple[int, ...], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._uncached = 0
+
+    def register(self, name: str, loader: Callable[[], Any], tables: Sequence[str]):
+        unknown = [t for t in tables if t not in BOARD_TABLES]
+        if unknown:
+            raise ValueError(f"Board section '{name}' reads untracked tables: {unknown}")
+        with self._lock:
+            self._sections[name] = Section(loader, tuple(tables))
+            self._locks[name] = threading.Lock()
+            self._stats[name] = {"hits": 0, "loads": 0, "last_load_ms": 0.0}
+            self._values.pop(name, None)
+
+    @property
+    def sections(self) -> List[str]:
+        return list(self._sections)
+
+    # ------------------------------------------------------------------
+    # Versions
+    # ------------------------------------------------------------------
+
+    def versions(self) -> Optional[Dict[str, int]]:
+        """Current committed write count of every board table (None: not
+        tracked, or a unit of work is active and only its own uncommitted
+        view is visible)."""
+        if not ENABLED:
+            return None
+        if current_uow(self.db_path) is not None:
+            return None
+        conn = get_conn(self.db_path)
+        try:
+            rows = conn.execute(_VERSIONS_SQL).fetchall()
+        except sqlite3.OperationalError:
+            return None
+        finally:
+            conn.close()
+        return {r[0]: int(r[1]) for r in rows}
+
+    def version_key(self, tables: Sequence[str], versions: Optional[Dict[str, int]] = None) -> Optional[Tuple[int, ...]]:
+        """Versions of `tables` as a tuple (None when not tracked)."""
+        versions = self.versions() if versions is None else versions
+        if versions is None:
+            return None
+        return tuple(versions.get(t, 0) for t in tables)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, name: str) -> Any:
+        return self.read(name)[0]
+
+    def read(self, *names: str) -> Tuple[Any, ...]:
+        """Values of `names`, checked against one read of board_versions."""
+        versions = self.versions()
+        return tuple(self._value(name, versions) for name in names)
+
+    def _value(self, name: str, versions: Optional[Dict[str, int]]) -> Any:
+        section = self._sections[name]
+        if versions is None:
+            self._uncached += 1
+            return section.loader()
+        key = tuple(versions.get(t, 0) for t in section.tables)
+        cached = self._values.get(name)
+        if cached is not None and cached[0] == key:
+            self._stats[name]["hits"] += 1
+            return cached[1]
+        with self._locks[name]:
+            # Another reader may have loaded it while we waited
+            cached = self._values.get(name)
+            if cached is not None and cached[0] == key:
+                self._stats[name]["hits"] += 1
+                return cached[1]
+            # Versions were read before the load: a write landing during it
+            # leaves the stored key behind and the next read reloads
+            started = time.perf_counter()
+            value = section.loader()
+            ms = (time.perf_counter() - started) * 1000.0
+            self._values[name] = (key, value)
+            stats = self._stats[name]
+            stats["loads"] += 1
+            stats["last_load_ms"] = round(ms, 2)
+        return value
+
+    def invalidate(self, *names: str):
+        """Drop cached sections (default: all); the next read reloads."""
+        for name in names or list(self._values):
+            self._values.pop(name, None)
+
+    def load(self):
+        """Build every section now (startup)."""
+        versions = self.versions()
+        for name in list(self._sections):
+            try:
+                self._value(name, versions)
+            except Exception as e:
+                logger.warning(f"[Board] Loading {name} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        versions = self.versions()
+        sections = {}
+        for name, section in self._sections.items():
+            cached = self._values.get(name)
+            fresh = (versions is not None and cached is not None
+                     and cached[0] == tuple(versions.get(t, 0) for t in section.tables))
+            sections[name] = {**self._stats[name], "fresh": fresh}
+        return {
+            "enabled": ENABLED,
+            "tracking": versions is not None,
+            "versions": versions or {},
+            "uncached_reads": self._uncached,
+            "sections": sections,
+        }
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_board = BoardState()
+
+
+def get_board_state() -> BoardState:
+    return _board
+
+
+def register_board_section(name: str, loader: Callable[[], Any], tables: Sequence[str]):
+    _board.register(name, loader, tables)
+
+
+def board_section(name: str) -> Any:
+    """One section (shared: copy rows before changing them)."""
+    return _board.get(name)
+
+
+def board_sections(*names: str) -> Tuple[Any, ...]:
+    """Several sections checked against the same versions read."""
+    return _board.read(*names)
+
+
+def board_versions() -> Optional[Dict[str, int]]:
+    return _board.versions()
+
+
+def load_board_state():
+    """Startup hook (after migrations): build every section."""
+    _board.load()
+
+
+def invalidate_board_state(*names: str):
+    _board.invalidate(*names)
+
+
+def board_state_stats() -> Dict[str, Any]:
+    return _board.stats()
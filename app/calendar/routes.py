@@ -5,7 +5,8 @@ import logging
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 
-from .models import ensure_calendar_schema
+from app.db import run_db
+
 from .google_auth import get_auth_url, handle_callback, get_google_service, save_credentials_to_db
 from .sync import sync_from_google, push_to_google, delete_from_google
 
@@ -15,12 +16,8 @@ router = APIRouter()
 
 
 def _get_conn():
-    import sqlite3
-    from pathlib import Path
-    db = Path(__file__).resolve().parent.parent.parent / "cad.db"
-    conn = sqlite3.connect(str(db))
-    conn.row_factory = sqlite3.Row
-    return conn
+    from app.db import get_conn
+    return get_conn()
 
 
 @router.get("/api/calendar/auth")
@@ -34,7 +31,7 @@ async def calendar_auth(request: Request):
 
 
 @router.get("/api/calendar/callback")
-async def calendar_callback(request: Request, code: str = ""):
+def calendar_callback(request: Request, code: str = ""):
     """OAuth2 callback — exchange code for tokens."""
     if not code:
         return HTMLResponse("<h3>Authorization failed — no code received</h3>", status_code=400)
@@ -46,7 +43,6 @@ async def calendar_callback(request: Request, code: str = ""):
 
     conn = _get_conn()
     try:
-        ensure_calendar_schema(conn)
         save_credentials_to_db(
             conn,
             result["email"],
@@ -67,11 +63,10 @@ async def calendar_callback(request: Request, code: str = ""):
 
 
 @router.get("/api/calendar/status")
-async def calendar_status():
+def calendar_status():
     """Check Google Calendar auth and sync status."""
     conn = _get_conn()
     try:
-        ensure_calendar_schema(conn)
         from .google_auth import get_credentials_from_db
         creds = get_credentials_from_db(conn)
         connected = bool(creds and creds.get("refresh_token"))
@@ -96,7 +91,7 @@ async def calendar_status():
 
 
 @router.get("/api/calendar/events")
-async def calendar_events(month: int = 0, year: int = 0):
+def calendar_events(month: int = 0, year: int = 0):
     """Get calendar events for a given month."""
     now = datetime.date.today()
     y = year or now.year
@@ -104,7 +99,6 @@ async def calendar_events(month: int = 0, year: int = 0):
 
     conn = _get_conn()
     try:
-        ensure_calendar_schema(conn)
         time_min = f"{y}-{m:02d}-01"
         if m == 12:
             time_max = f"{y + 1}-01-01"
@@ -129,6 +123,10 @@ async def calendar_events(month: int = 0, year: int = 0):
 async def create_event(request: Request):
     """Create a new calendar event, optionally syncing to Google."""
     body = await request.json()
+    return await run_db(_create_event, body)
+
+
+def _create_event(body: dict):
     summary = body.get("summary", "").strip()
     if not summary:
         return JSONResponse({"error": "Summary is required"}, status_code=400)
@@ -147,7 +145,6 @@ async def create_event(request: Request):
     ts = datetime.datetime.now().isoformat()
     conn = _get_conn()
     try:
-        ensure_calendar_schema(conn)
         c = conn.execute("""
             INSERT INTO CalendarEvents
             (summary, description, start_time, end_time, all_day, location, source, sync_status, created, updated)
@@ -174,9 +171,12 @@ async def create_event(request: Request):
 async def update_event(event_id: int, request: Request):
     """Update an existing calendar event."""
     body = await request.json()
+    return await run_db(_update_event, event_id, body)
+
+
+def _update_event(event_id: int, body: dict):
     conn = _get_conn()
     try:
-        ensure_calendar_schema(conn)
         row = conn.execute("SELECT * FROM CalendarEvents WHERE id=?", (event_id,)).fetchone()
         if not row:
             return JSONResponse({"error": "Event not found"}, status_code=404)
@@ -211,11 +211,10 @@ async def update_event(event_id: int, request: Request):
 
 
 @router.delete("/api/calendar/events/{event_id}")
-async def delete_event(event_id: int):
+def delete_event(event_id: int):
     """Delete a calendar event (and from Google if synced)."""
     conn = _get_conn()
     try:
-        ensure_calendar_schema(conn)
         row = conn.execute("SELECT * FROM CalendarEvents WHERE id=?", (event_id,)).fetchone()
         if not row:
             return JSONResponse({"error": "Event not found"}, status_code=404)
@@ -236,11 +235,10 @@ async def delete_event(event_id: int):
 
 
 @router.post("/api/calendar/sync")
-async def force_sync():
+def force_sync():
     """Force a sync from Google Calendar."""
     conn = _get_conn()
     try:
-        ensure_calendar_schema(conn)
         service = get_google_service(conn)
         if not service:
             return JSONResponse({"error": "Google Calendar not connected"}, status_code=400)
@@ -0,0 +1,231 @@
+"""
+FORD-CAD Database Layer
+Shared connection management, schema metadata, the async DB executor,
+the audit writer, units of work, hot-path indexes, epoch
+timestamp helpers, the reporting snapshot, the cold-storage archive,
+the maintenance scheduler, write-lock telemetry and leader leases for
+main.py and every app/* module.
+"""
+from .pool import (
+    ConnectionPool,
+    PooledConnection,
+    add_commit_listener,
+    close_all,
+    configure,
+    get_conn,
+    get_db_path,
+    get_pool,
+    pool_stats,
+    remove_commit_listener,
+)
+from .archive import (
+    ARCHIVED_TABLES,
+    archive_closed_incidents,
+    archive_conn,
+    archive_files,
+    archive_path,
+    archive_stats,
+    attach_archives,
+)
+from .audit import (
+    AuditWriter,
+    audit_insert,
+    audit_stats,
+    audit_submit,
+    flush_audit,
+    get_audit_writer,
+    start_audit_writer,
+    stop_audit_writer,
+)
+from .executor import (
+    DBExecutor,
+    db_execute,
+    db_fetchall,
+    db_fetchone,
+    executor_stats,
+    get_executor,
+    run_db,
+    shutdown_executor,
+)
+from .indexes import (
+    HOT_PATH_INDEXES,
+    IndexSpec,
+    capture_statements,
+    explain_query_plan,
+    full_table_scans,
+    install_hot_path_indexes,
+)
+from .lease import (
+    LeaseManager,
+    get_lease_manager,
+    install_lease_table,
+    is_leader,
+    leader_only,
+    lease_stats,
+    start_leases,
+    stop_leases,
+)
+from .locks import (
+    LockTelemetry,
+    call_site,
+    get_lock_telemetry,
+    lock_stats,
+    note_busy_retry,
+    note_lock_timeout,
+    reset_lock_endpoint,
+    reset_lock_stats,
+    set_lock_endpoint,
+)
+from .maintenance import (
+    MaintenanceDeferred,
+    MaintenanceJob,
+    MaintenanceScheduler,
+    get_maintenance_scheduler,
+    list_backups,
+    maintenance_stats,
+    request_maintenance,
+    run_maintenance,
+    start_maintenance,
+    stop_maintenance,
+)
+from .migrations import (
+    MigrationError,
+    MigrationSkipped,
+    latest_version,
+    migration_status,
+    register_migration,
+    run_migrations,
+)
+from .schema import (
+    SchemaRegistry,
+    get_schema,
+    has_column,
+    has_table,
+    invalidate_schema,
+    refresh_schema,
+    table_columns,
+)
+from .snapshot import (
+    ReportingSnapshot,
+    get_reporting_snapshot,
+    reporting_conn,
+    reporting_snapshot,
+    snapshot_stats,
+)
+from .timestamps import (
+    EPOCH_COLUMNS,
+    date_range_sql,
+    day_bounds,
+    epoch_column_for,
+    install_epoch_columns,
+    time_range_sql,
+    to_datetime,
+    to_epoch,
+)
+from .uow import (
+    SharedConnection,
+    UnitOfWork,
+    after_commit,
+    current_uow,
+    unit_of_work,
+)
+
+__all__ = [
+    "ConnectionPool",
+    "PooledConnection",
+    "add_commit_listener",
+    "close_all",
+    "configure",
+    "get_conn",
+    "get_db_path",
+    "get_pool",
+    "pool_stats",
+    "remove_commit_listener",
+    "ARCHIVED_TABLES",
+    "archive_closed_incidents",
+    "archive_conn",
+    "archive_files",
+    "archive_path",
+    "archive_stats",
+    "attach_archives",
+    "AuditWriter",
+    "audit_insert",
+    "audit_stats",
+    "audit_submit",
+    "flush_audit",
+    "get_audit_writer",
+    "start_audit_writer",
+    "stop_audit_writer",
+    "DBExecutor",
+    "db_execute",
+    "db_fetchall",
+    "db_fetchone",
+    "executor_stats",
+    "get_executor",
+    "run_db",
+    "shutdown_executor",
+    "HOT_PATH_INDEXES",
+    "IndexSpec",
+    "capture_statements",
+    "explain_query_plan",
+    "full_table_scans",
+    "install_hot_path_indexes",
+    "LeaseManager",
+    "get_lease_manager",
+    "install_lease_table",
+    "is_leader",
+    "leader_only",
+    "lease_stats",
+    "start_leases",
+    "stop_leases",
+    "LockTelemetry",
+    "call_site",
+    "get_lock_telemetry",
+    "lock_stats",
+    "note_busy_retry",
+    "note_lock_timeout",
+    "reset_lock_endpoint",
+    "reset_lock_stats",
+    "set_lock_endpoint",
+    "MaintenanceDeferred",
+    "MaintenanceJob",
+    "MaintenanceScheduler",
+    "get_maintenance_scheduler",
+    "list_backups",
+    "maintenance_stats",
+    "request_maintenance",
+    "run_maintenance",
+    "start_maintenance",
+    "stop_maintenance",
+    "MigrationError",
+    "MigrationSkipped",
+    "latest_version",
+    "migration_status",
+    "register_migration",
+    "run_migrations",
+    "SchemaRegistry",
+    "get_schema",
+    "has_column",
+    "has_table",
+    "invalidate_schema",
+    "refresh_schema",
+    "table_columns",
+    "ReportingSnapshot",
+    "get_reporting_snapshot",
+    "reporting_conn",
+    "reporting_snapshot",
+    "snapshot_stats",
+    "EPOCH_COLUMNS",
+    "date_range_sql",
+    "day_bounds",
+    "epoch_column_for",
+    "install_epoch_columns",
+    "time_range_sql",
+    "to_datetime",
+    "to_epoch",
+    "SharedConnection",
+    "UnitOfWork",
+    "after_commit",
+    "current_uow",
+    "unit_of_work",
+]
@@ -0,0 +1,361 @@
+# ============================================================================
+# FORD CAD — Cold-Storage Archive (closed incidents, one file per year)
+# ============================================================================
+# Incidents and their child rows (UnitAssignments, Narrative,
+# IncidentHistory, MasterLog, event_stream) are never deleted, so every
+# board query walks past years of closed calls. The archiver moves closed
+# incidents older than ARCHIVE_AFTER_DAYS out of cad.db into
+# cad_archive_YYYY.db (year the call was created) next to it:
+#
+#     1. copy the batch into the ATTACHed archive, commit
+#     2. delete it from the live DB in one transaction on cad.db only
+#
+# Step 2 only removes rows that step 1 copied, and a crash between the
+# two leaves a duplicate, never a loss (the next run finishes the move).
+#
+# Readers see one store. archive_conn() / reporting_conn() attach every
+# archive read-only and create TEMP views named after the archived tables,
+# which SQLite resolves before main.*, so unchanged queries like
+# "SELECT ... FROM Incidents i" UNION ALL the live and archived rows. An
+# archived row whose incident is still live is hidden, which covers both
+# the crash window and a snapshot taken before the move.
+#
+# Runs as the "archive" maintenance job (maintenance.py) every
+# INTERVAL_S. Off by default: CAD_ARCHIVE_AFTER_DAYS=0.
+# ============================================================================
+
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from .pool import BUSY_TIMEOUT_MS, get_conn, get_db_path
+
+logger = logging.getLogger("db.archive")
+
+# Closed incidents older than this many days are archived (0 = never)
+ARCHIVE_AFTER_DAYS = int(os.getenv("CAD_ARCHIVE_AFTER_DAYS", "0"))
+ARCHIVE_DIR = os.getenv("CAD_ARCHIVE_DIR", "")
+BATCH_SIZE = int(os.getenv("CAD_ARCHIVE_BATCH", "200"))
+INTERVAL_S = float(os.getenv("CAD_ARCHIVE_INTERVAL_S", "3600"))
+# Pause between batches so dispatch writers get the lock
+BATCH_PAUSE_S = 0.05
+
+# Incidents first: children are matched by incident_id
+ARCHIVED_TABLES = (
+    "Incidents",
+    "UnitAssignments",
+    "Narrative",
+    "IncidentHistory",
+    "MasterLog",
+    "event_stream",
+)
+
+_CREATE_TABLE = re.compile(r'^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"?\w+"?', re.IGNORECASE)
+_CREATE_INDEX = re.compile(
+    r'^\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?("?\w+"?)', re.IGNORECASE
+)
+
+
+# ============================================================================
+# Archive files
+# ============================================================================
+
+def _live_path(db_path=None) -> str:
+    return os.path.abspath(str(db_path if db_path is not None else get_db_path()))
+
+
+def archive_dir(db_path=None) -> Path:
+    return Path(ARCHIVE_DIR) if ARCHIVE_DIR else Path(_live_path(db_path)).parent
+
+
+def archive_path(year: int, db_path=None) -> str:
+    """cad_archive_<year>.db for cad.db (cad_test_archive_<year>.db for cad_test.db)."""
+    stem = Path(_live_path(db_path)).stem
+    return str(archive_dir(db_path) / f"{stem}_archive_{int(year):04d}.db")
+
+
+def archive_files(db_path=None) -> List[Tuple[int, str]]:
+    """[(year, path)] of the existing archives, newest year first."""
+    stem = Path(_live_path(db_path)).stem
+    pattern = re.compile(rf"^{re.escape(stem)}_archive_(\d{{4}})\.db$")
+    folder = archive_dir(db_path)
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    found = []
+    for name in names:
+        m = pattern.match(name)
+        if m:
+            found.append((int(m.group(1)), str(folder / name)))
+    return sorted(found, reverse=True)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> List[Tuple[str, str, bool]]:
+    """[(name, declared type, generated)] for schema.table ([] if missing)."""
+    return [
+        (r[1], r[2] or "", bool(r[6]))
+        for r in conn.execute(f"PRAGMA {schema}.table_xinfo({_quote(table)})").fetchall()
+    ]
+
+
+# ============================================================================
+# Readers
+# ============================================================================
+
+_warned_limit = False
+
+
+def attach_archives(conn: sqlite3.Connection, db_path=None) -> List[str]:
+    """
+    Attach every archive of `db_path` to `conn` read-only and shadow the
+    archived tables with live+archive UNION ALL views. Only for private,
+    read-only connections: the views hide main.* from unqualified writes.
+    Returns the attached schema names.
+    """
+    global _warned_limit
+    files = archive_files(db_path)
+    if not files:
+        return []
+    attached = {r[1] for r in conn.execute("PRAGMA database_list").fetchall()}
+    room = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - (len(attached) - 2)
+    if len(files) > room and not _warned_limit:
+        _warned_limit = True
+        logger.warning("[DB] %d archive files but only %d can be attached; oldest years are skipped",
+                       len(files), room)
+
+    schemas: List[str] = []
+    for year, path in files:
+        schema = f"archive_{year}"
+        if schema not in attached:
+            if len(schemas) >= room:
+                continue
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (f"file:{quote(path)}?mode=ro",))
+        schemas.append(schema)
+
+    for table in ARCHIVED_TABLES:
+        live = [name for name, _, _ in _columns(conn, "main", table)]
+        if not live:
+            continue
+        arms = ["SELECT " + ", ".join(_quote(c) for c in live) + f" FROM main.{_quote(table)}"]
+        for schema in schemas:
+            have = {name for name, _, _ in _columns(conn, schema, table)}
+            if not have:
+                continue
+            cols = ", ".join(_quote(c) if c in have else f"NULL AS {_quote(c)}" for c in live)
+            arms.append(
+                f"SELECT {cols} FROM {schema}.{_quote(table)} "
+                "WHERE incident_id NOT IN (SELECT incident_id FROM main.Incidents)"
+            )
+        conn.execute(f"DROP VIEW IF EXISTS temp.{_quote(table)}")
+        conn.execute(f"CREATE TEMP VIEW {_quote(table)} AS " + " UNION ALL ".join(arms))
+    return schemas
+
+
+def archive_conn(db_path=None, row_factory: Any = sqlite3.Row) -> sqlite3.Connection:
+    """
+    Read-only connection that sees live and archived incidents as one
+    store. Without archive files this is just a pooled get_conn().
+    Call close() when done either way.
+    """
+    if not archive_files(db_path):
+        return get_conn(db_path, row_factory)
+    conn = sqlite3.connect(
+        f"file:{quote(_live_path(db_path))}?mode=ro",
+        uri=True,
+        timeout=BUSY_TIMEOUT_MS / 1000.0,
+        check_same_thread=False,
+    )
+    conn.row_factory = row_factory
+    try:
+        attach_archives(conn, db_path)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+# ============================================================================
+# Archiver
+# ============================================================================
+
+def _year(ts: Optional[str]) -> Optional[int]:
+    head = (ts or "")[:4]
+    return int(head) if head.isdigit() and head != "0000" else None
+
+
+def _ensure_archive_schema(conn: sqlite3.Connection, schema: str):
+    """Create (or widen) the archived tables and their indexes in `schema`
+    from the live definitions."""
+    for table in ARCHIVED_TABLES:
+        row = conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        if row is None:
+            continue
+        have = {name for name, _, _ in _columns(conn, schema, table)}
+        if not have:
+            conn.execute(_CREATE_TABLE.sub(f"CREATE TABLE {schema}.{_quote(table)}", row[0], count=1))
+        else:
+            # Columns added to the live table since this archive was created
+            for name, decl, generated in _columns(conn, "main", table):
+                if name not in have and not generated:
+                    conn.execute(f"ALTER TABLE {schema}.{_quote(table)} ADD COLUMN {_quote(name)} {decl}")
+        for (sql,) in conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table,),
+        ).fetchall():
+            conn.execute(_CREATE_INDEX.sub(
+                lambda m: f"CREATE {m.group(1) or ''}INDEX IF NOT EXISTS {schema}.{m.group(2)}", sql, count=1
+            ))
+
+
+def _move_batch(conn: sqlite3.Connection, schema: str, ids: Sequence[int]) -> Dict[str, int]:
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (incident_id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.archive_batch")
+    conn.executemany("INSERT INTO temp.archive_batch VALUES (?)", [(i,) for i in ids])
+    batch = "SELECT incident_id FROM temp.archive_batch"
+
+    tables = []
+    for table in ARCHIVED_TABLES:
+        cols = [name for name, _, generated in _columns(conn, "main", table) if not generated]
+        if cols:
+            tables.append((table, ", ".join(_quote(c) for c in cols)))
+
+    # 1. Copy. INSERT OR REPLACE makes a re-run after a crash harmless.
+    conn.execute("BEGIN")
+    try:
+        for table, cols in tables:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {schema}.{_quote(table)} ({cols}) "
+                f"SELECT {cols} FROM main.{_quote(table)} WHERE incident_id IN ({batch})"
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    # 2. Delete what was copied, writing cad.db only. An incident touched
+    #    since step 1 (reopened, edited) stays live; its stale archive copy
+    #    is hidden by the reader views and replaced on the next run.
+    moved: Dict[str, int] = {}
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            f"DELETE FROM temp.archive_batch WHERE incident_id NOT IN ("
+            f"SELECT m.incident_id FROM main.Incidents m "
+            f"JOIN {schema}.Incidents a ON a.incident_id = m.incident_id "
+            f"WHERE m.status = 'CLOSED' AND a.updated IS m.updated AND a.status IS m.status)"
+        )
+        for table, _ in reversed(tables):
+            if table == "Incidents":
+                cur = conn.execute(f"DELETE FROM main.Incidents WHERE incident_id IN ({batch})")
+            else:
+                cur = conn.execute(
+                    f"DELETE FROM main.{_quote(table)} WHERE incident_id IN ({batch}) "
+                    f"AND id IN (SELECT id FROM {schema}.{_quote(table)} WHERE incident_id IN ({batch}))"
+                )
+            moved[table] = cur.rowcount
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return moved
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Any] = {"runs": 0, "failed": 0, "last_run": None, "last_ms": 0.0, "moved": {}}
+
+
+def archive_closed_incidents(after_days: Optional[int] = None, batch_size: Optional[int] = None,
+                             db_path=None, now: Optional[datetime.datetime] = None) -> Dict[str, int]:
+    """
+    Move closed incidents whose close time (closed_at, else updated) is
+    more than `after_days` old into the per-year archives. Returns rows
+    moved per table.
+    """
+    days = ARCHIVE_AFTER_DAYS if after_days is None else int(after_days)
+    if days <= 0:
+        return {}
+    size = max(1, int(batch_size or BATCH_SIZE))
+    cutoff = (now or datetime.datetime.now()) - datetime.timedelta(days=days)
+    cutoff_text = cutoff.strftime("%Y-%m-%d %H:%M:%S")
+    live = _live_path(db_path)
+    started = time.perf_counter()
+
+    totals: Dict[str, int] = {}
+    conn = sqlite3.connect(live, timeout=BUSY_TIMEOUT_MS / 1000.0, isolation_level=None)
+    try:
+        conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_MS)}")
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                "SELECT incident_id, created, COALESCE(NULLIF(closed_at, ''), updated) "
+                "FROM Incidents "
+                "WHERE status = 'CLOSED' AND incident_id > ? "
+                "AND COALESCE(NULLIF(closed_at, ''), updated) < ? "
+                "ORDER BY incident_id LIMIT ?",
+                (last_id, cutoff_text, size),
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            by_year: Dict[int, List[int]] = {}
+            for incident_id, created, done in rows:
+                year = _year(created) or _year(done) or cutoff.year
+                by_year.setdefault(year, []).append(incident_id)
+
+            for year, ids in sorted(by_year.items()):
+                path = archive_path(year, live)
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                conn.execute("ATTACH DATABASE ? AS archive_w", (path,))
+                try:
+                    _ensure_archive_schema(conn, "archive_w")
+                    for table, n in _move_batch(conn, "archive_w", ids).items():
+                        totals[table] = totals.get(table, 0) + n
+                finally:
+                    conn.execute("DETACH DATABASE archive_w")
+            time.sleep(BATCH_PAUSE_S)
+    except Exception:
+        with _stats_lock:
+            _stats["failed"] += 1
+        raise
+    finally:
+        conn.close()
+
+    ms = (time.perf_counter() - started) * 1000.0
+    with _stats_lock:
+        _stats["runs"] += 1
+        _stats["last_run"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        _stats["last_ms"] = round(ms, 2)
+        for table, n in totals.items():
+            _stats["moved"][table] = _stats["moved"].get(table, 0) + n
+    if totals.get("Incidents"):
+        logger.info("[DB] Archived %d closed incidents older than %d days in %.0f ms",
+                    totals["Incidents"], days, ms)
+    return totals
+
+
+def archive_stats(db_path=None) -> Dict[str, Any]:
+    with _stats_lock:
+        out: Dict[str, Any] = dict(_stats)
+        out["moved"] = dict(_stats["moved"])
+    out["after_days"] = ARCHIVE_AFTER_DAYS
+    out["files"] = [
+        {"year": year, "path": path, "size_kb": round(os.path.getsize(path) / 1024, 1)}
+        for year, path in archive_files(db_path)
+        if os.path.exists(path)
+    ]
+    return out
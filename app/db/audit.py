@@ -0,0 +1,391 @@
+# ============================================================================
+# FORD CAD — Single-Writer Audit Pipeline
+# ============================================================================
+# MasterLog, IncidentHistory, DailyLog, event_stream and playbook execution
+# rows are append-only. Instead of one connect/insert/commit (and one fsync)
+# per row, callers enqueue them here and a dedicated writer thread
+# group-commits everything that arrives within BATCH_MS in one transaction.
+#
+# One dispatch of an engine with crew used to cost ~10 commits; it now
+# costs one, and audit writes no longer fight the dispatch transaction for
+# the write lock row by row.
+#
+# Guarantees:
+#   - Rows are committed in enqueue order; each op runs in its own
+#     SAVEPOINT so one bad row does not drop the rest of the batch.
+#   - flush() blocks until everything enqueued so far is committed (tests,
+#     shutdown, read-after-write checks). barrier() is the non-blocking
+#     form for async code.
+#   - If the writer is not running or the queue stays full for
+#     ENQUEUE_TIMEOUT_S, the op is written synchronously — audit rows are
+#     never dropped.
+#   - Inside a unit of work (uow.py) ops are written in the unit's own
+#     transaction instead, and on_commit waits for the unit to commit.
+# ============================================================================
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from .pool import ACTIVE_UOW, get_conn
+
+logger = logging.getLogger("db.audit")
+
+MAX_QUEUE = int(os.getenv("CAD_AUDIT_MAX_QUEUE", "10000"))
+BATCH_MS = float(os.getenv("CAD_AUDIT_BATCH_MS", "5"))
+MAX_BATCH = int(os.getenv("CAD_AUDIT_MAX_BATCH", "500"))
+ENQUEUE_TIMEOUT_S = float(os.getenv("CAD_AUDIT_ENQUEUE_TIMEOUT_S", "2"))
+ENABLED = os.getenv("CAD_AUDIT_WRITER", "1").strip().lower() not in ("0", "false", "no", "off")
+
+OpFn = Callable[[sqlite3.Cursor], Any]
+CommitFn = Callable[[Any], None]
+
+
+class _Op:
+    __slots__ = ("fn", "on_commit", "name")
+
+    def __init__(self, fn: OpFn, on_commit: Optional[CommitFn], name: str):
+        self.fn = fn
+        self.on_commit = on_commit
+        self.name = name
+
+
+class _Barrier:
+    __slots__ = ("future",)
+
+    def __init__(self):
+        self.future: Future = Future()
+
+
+_STOP = object()
+
+
+class AuditWriter:
+    """Dedicated thread that group-commits append-only audit rows."""
+
+    def __init__(self, db_path=None, max_queue: int = MAX_QUEUE,
+                 batch_ms: float = BATCH_MS, max_batch: int = MAX_BATCH):
+        self.db_path = db_path
+        self.batch_s = max(0.0, float(batch_ms)) / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "sync_writes": 0,
+            "in_unit": 0,
+            "max_queue_depth": 0,
+            "last_commit_ms": 0.0,
+            "max_commit_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        t = self._thread
+        return t is not None and t.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="cad-audit-writer", daemon=True
+            )
+            self._thread.start()
+        logger.info("[DB] Audit writer started (batch=%.0fms)", self.batch_s * 1000)
+
+    def stop(self, timeout: float = 10.0):
+        """Commit everything still queued, then stop the thread."""
+        t = self._thread
+        if t is None or not t.is_alive():
+            return
+        self._queue.put(_STOP)
+        t.join(timeout)
+        with self._lock:
+            self._thread = None
+        # Anything that raced in behind the stop marker is written inline
+        barriers: list = []
+        for op in self._drain(barriers):
+            self._write_sync(op)
+        for b in barriers:
+            b.future.set_result(True)
+
+    def _on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, fn: OpFn, on_commit: Optional[CommitFn] = None, name: str = "") -> None:
+        """
+        Queue `fn(cursor)` for the next group commit. `on_commit(result)`
+        runs on the writer thread after the batch commits.
+        """
+        op = _Op(fn, on_commit, name or getattr(fn, "__name__", "op"))
+        uow = ACTIVE_UOW.get()
+        if uow is not None and uow.covers(self.db_path):
+            self._write_in_unit(uow, op)
+            return
+        if self.running and not self._on_writer_thread():
+            try:
+                self._queue.put(op, timeout=ENQUEUE_TIMEOUT_S)
+            except queue.Full:
+                logger.warning("[DB] Audit queue full; writing %s synchronously", op.name)
+            else:
+                with self._lock:
+                    self._enqueued += 1
+                    self._stats["enqueued"] += 1
+                    depth = self._queue.qsize()
+                    if depth > self._stats["max_queue_depth"]:
+                        self._stats["max_queue_depth"] = depth
+                return
+        self._write_sync(op)
+
+    def insert(self, sql: str, params: Sequence = (), on_commit: Optional[CommitFn] = None,
+               name: str = "") -> None:
+        """Queue a single INSERT; on_commit receives the new rowid."""
+        params = tuple(params)
+
+        def _insert(cur: sqlite3.Cursor):
+            cur.execute(sql, params)
+            return cur.lastrowid
+
+        self.submit(_insert, on_commit, name or "insert")
+
+    @property
+    def enqueued(self) -> int:
+        return self._enqueued
+
+    def barrier(self) -> Future:
+        """Future resolved once everything enqueued before it is committed."""
+        b = _Barrier()
+        if ACTIVE_UOW.get() is not None:
+            # The writer would wait on this unit's write lock; don't deadlock
+            b.future.set_result(False)
+            return b.future
+        if not self.running or self._on_writer_thread():
+            b.future.set_result(True)
+            return b.future
+        try:
+            self._queue.put(b, timeout=ENQUEUE_TIMEOUT_S)
+        except queue.Full:
+            b.future.set_result(False)
+        return b.future
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until every op enqueued so far is committed."""
+        try:
+            return bool(self.barrier().result(timeout))
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, barriers, stopping = [], [], False
+            deadline = time.monotonic() + self.batch_s
+            while True:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, _Barrier):
+                    barriers.append(item)
+                else:
+                    batch.append(item)
+                if stopping:
+                    batch.extend(self._drain(barriers))
+                    break
+                # A waiting barrier (or a full batch) commits immediately
+                if barriers or len(batch) >= self.max_batch:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit(batch)
+            for b in barriers:
+                if not b.future.done():
+                    b.future.set_result(True)
+            if stopping:
+                return
+
+    def _drain(self, barriers: list) -> list:
+        ops = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return ops
+            if isinstance(item, _Barrier):
+                barriers.append(item)
+            elif item is not _STOP:
+                ops.append(item)
+
+    def _commit(self, batch: list):
+        started = time.perf_counter()
+        results = []
+        failed = False
+        conn = get_conn(self.db_path, row_factory=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cur = conn.cursor()
+            for op in batch:
+                cur.execute("SAVEPOINT audit_op")
+                try:
+                    results.append((op, op.fn(cur), True))
+                    cur.execute("RELEASE audit_op")
+                except Exception as e:
+                    cur.execute("ROLLBACK TO audit_op")
+                    cur.execute("RELEASE audit_op")
+                    results.append((op, None, False))
+                    logger.error("[DB] Audit op %s failed: %s", op.name, e)
+            conn.commit()
+        except Exception as e:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            logger.error("[DB] Audit batch of %d failed (%s); retrying row by row", len(batch), e)
+            failed = True
+        finally:
+            conn.close()
+
+        if failed:
+            for op in batch:
+                self._write_sync(op)
+            return
+
+        ms = (time.perf_counter() - started) * 1000.0
+        ok = sum(1 for _, _, good in results if good)
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["written"] += ok
+            self._stats["failed"] += len(results) - ok
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            self._stats["last_commit_ms"] = round(ms, 2)
+            self._stats["max_commit_ms"] = round(max(self._stats["max_commit_ms"], ms), 2)
+        for op, result, good in results:
+            if good:
+                self._after_commit(op, result)
+
+    def _write_sync(self, op: _Op):
+        """Fallback: write one op in its own transaction on the caller's thread."""
+        conn = get_conn(self.db_path, row_factory=None)
+        try:
+            result = op.fn(conn.cursor())
+            conn.commit()
+        except Exception as e:
+            logger.error("[DB] Audit op %s failed: %s", op.name, e)
+            with self._lock:
+                self._stats["failed"] += 1
+            return
+        finally:
+            conn.close()
+        with self._lock:
+            self._stats["sync_writes"] += 1
+            self._stats["written"] += 1
+        self._after_commit(op, result)
+
+    def _write_in_unit(self, uow, op: _Op):
+        """Write `op` inside the caller's unit of work (atomic with it)."""
+        cur = uow.cursor(row_factory=None)
+        cur.execute("SAVEPOINT audit_op")
+        try:
+            result = op.fn(cur)
+            cur.execute("RELEASE audit_op")
+        except Exception as e:
+            cur.execute("ROLLBACK TO audit_op")
+            cur.execute("RELEASE audit_op")
+            logger.error("[DB] Audit op %s failed: %s", op.name, e)
+            with self._lock:
+                self._stats["failed"] += 1
+            return
+        with self._lock:
+            self._stats["in_unit"] += 1
+            self._stats["written"] += 1
+        if op.on_commit is not None:
+            uow.after_commit(self._after_commit, op, result)
+
+    @staticmethod
+    def _after_commit(op: _Op, result: Any):
+        if op.on_commit is None:
+            return
+        try:
+            op.on_commit(result)
+        except Exception as e:
+            logger.debug("[DB] Audit on_commit for %s failed: %s", op.name, e)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+        out["running"] = self.running
+        out["queue_depth"] = self._queue.qsize()
+        out["rows_per_commit"] = round(out["written"] / out["batches"], 2) if out["batches"] else 0.0
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_writer = AuditWriter()
+
+
+def get_audit_writer() -> AuditWriter:
+    return _writer
+
+
+def start_audit_writer():
+    """Startup hook (after migrations). CAD_AUDIT_WRITER=0 keeps writes synchronous."""
+    if ENABLED:
+        _writer.start()
+
+
+def stop_audit_writer(timeout: float = 10.0):
+    """Shutdown hook: commit everything queued and stop the writer."""
+    _writer.stop(timeout)
+
+
+def audit_insert(sql: str, params: Sequence = (), on_commit: Optional[CommitFn] = None,
+                 name: str = "") -> None:
+    _writer.insert(sql, params, on_commit, name)
+
+
+def audit_submit(fn: OpFn, on_commit: Optional[CommitFn] = None, name: str = "") -> None:
+    _writer.submit(fn, on_commit, name)
+
+
+def flush_audit(timeout: Optional[float] = 10.0) -> bool:
+    return _writer.flush(timeout)
+
+
+def audit_stats() -> Dict[str, Any]:
+    return _writer.stats()
@@ -0,0 +1,237 @@
+# ============================================================================
+# FORD CAD — DB Executor (blocking SQLite work off the event loop)
+# ============================================================================
+# async handlers must not run sqlite queries inline: one slow analytics or
+# report query would stall every WebSocket and panel refresh in the process.
+#
+# All such work goes through a dedicated, bounded thread pool:
+#
+#     rows = await db_fetchall("SELECT ... WHERE x = ?", (x,))
+#     data = await run_db(fetch_unified_events, filters=f, page=1)
+#
+# Worker threads check connections out of the shared pool (app.db.pool), so
+# each worker keeps its own warm connection. At most MAX_PENDING calls may
+# be queued or running; further callers wait (asynchronously) for a slot.
+# Queue depth, wait and run times are exposed via executor_stats().
+# ============================================================================
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .locks import LOCK_ENDPOINT
+from .pool import get_conn
+
+logger = logging.getLogger("db.executor")
+
+WORKERS = int(os.getenv("CAD_DB_EXECUTOR_WORKERS", "4"))
+MAX_PENDING = int(os.getenv("CAD_DB_EXECUTOR_MAX_PENDING", "64"))
+
+# Calls waiting longer than this for a worker are logged
+SLOW_WAIT_MS = float(os.getenv("CAD_DB_EXECUTOR_SLOW_WAIT_MS", "250"))
+
+
+class DBExecutor:
+    """Bounded thread pool for blocking database calls from async code."""
+
+    def __init__(self, workers: int = WORKERS, max_pending: int = MAX_PENDING):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(self.workers, int(max_pending))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Admission slots (max_pending), one asyncio.Semaphore per event loop
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self._queued = 0        # admitted, waiting for a worker thread
+        self._running = 0       # executing on a worker thread
+        self._waiting = 0       # blocked on a free slot (beyond max_pending)
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "max_queue_depth": 0,
+            "max_waiting": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "total_run_ms": 0.0,
+            "max_run_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _executor(self) -> ThreadPoolExecutor:
+        pool = self._pool
+        if pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="cad-db"
+                    )
+                pool = self._pool
+        return pool
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._slots.get(loop)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_pending)
+            self._slots[loop] = sem
+        return sem
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._slots.clear()
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` on a DB worker thread and await it."""
+        sem = self._slot()
+        if sem.locked():
+            with self._lock:
+                self._waiting += 1
+                self._stats["max_waiting"] = max(self._stats["max_waiting"], self._waiting)
+            try:
+                await sem.acquire()
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        else:
+            await sem.acquire()
+
+        enqueued = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(
+                self._stats["max_queue_depth"], self._queued + self._running
+            )
+
+        # Lock telemetry attributes the worker's writes to the caller's endpoint
+        endpoint = LOCK_ENDPOINT.get()
+
+        def _call():
+            token = LOCK_ENDPOINT.set(endpoint)
+            started = time.perf_counter()
+            wait_ms = (started - enqueued) * 1000.0
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._stats["total_wait_ms"] += wait_ms
+                self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+            if wait_ms >= SLOW_WAIT_MS:
+                logger.warning(
+                    "[DB] %s waited %.0f ms for a DB worker",
+                    getattr(fn, "__name__", "call"), wait_ms,
+                )
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                run_ms = (time.perf_counter() - started) * 1000.0
+                with self._lock:
+                    self._running -= 1
+                    self._stats["completed" if ok else "failed"] += 1
+                    self._stats["total_run_ms"] += run_ms
+                    self._stats["max_run_ms"] = max(self._stats["max_run_ms"], run_ms)
+                LOCK_ENDPOINT.reset(token)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), _call)
+        finally:
+            sem.release()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["queued"] = self._queued
+            out["running"] = self._running
+            out["waiting"] = self._waiting
+        done = out["completed"] + out["failed"]
+        out["workers"] = self.workers
+        out["max_pending"] = self.max_pending
+        out["queue_depth"] = out["queued"] + out["running"]
+        out["avg_wait_ms"] = round(out["total_wait_ms"] / done, 2) if done else 0.0
+        out["avg_run_ms"] = round(out["total_run_ms"] / done, 2) if done else 0.0
+        for key in ("total_wait_ms", "max_wait_ms", "total_run_ms", "max_run_ms"):
+            out[key] = round(out[key], 2)
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_executor = DBExecutor()
+
+
+def get_executor() -> DBExecutor:
+    return _executor
+
+
+async def run_db(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await a blocking DB function on the DB executor."""
+    return await _executor.run(fn, *args, **kwargs)
+
+
+def _fetch(sql: str, params: Sequence, db_path, one: bool):
+    conn = get_conn(db_path)
+    try:
+        cur = conn.execute(sql, tuple(params))
+        return cur.fetchone() if one else cur.fetchall()
+    finally:
+        conn.close()
+
+
+def _write(sql: str, params: Sequence, db_path) -> Dict[str, int]:
+    conn = get_conn(db_path)
+    try:
+        cur = conn.execute(sql, tuple(params))
+        conn.commit()
+        return {"lastrowid": cur.lastrowid, "rowcount": cur.rowcount}
+    finally:
+        conn.close()
+
+
+async def db_fetchall(sql: str, params: Sequence = (), db_path=None) -> List[Any]:
+    """SELECT on a DB worker; returns sqlite3.Row objects."""
+    return await _executor.run(_fetch, sql, params, db_path, False)
+
+
+async def db_fetchone(sql: str, params: Sequence = (), db_path=None) -> Optional[Any]:
+    return await _executor.run(_fetch, sql, params, db_path, True)
+
+
+async def db_execute(sql: str, params: Sequence = (), db_path=None) -> Dict[str, int]:
+    """Single committed write on a DB worker; returns lastrowid/rowcount."""
+    return await _executor.run(_write, sql, params, db_path)
+
+
+def executor_stats() -> Dict[str, Any]:
+    return _executor.stats()
+
+
+def shutdown_executor(wait: bool = True):
+    """Shutdown hook: stop DB worker threads."""
+    _executor.shutdown(wait=wait)
@@ -0,0 +1,169 @@
+# ============================================================================
+# FORD CAD — Hot-Path Indexes
+# ============================================================================
+# The board refreshes (units / active panels), dispatch and the Daily Log
+# viewer run on every poll from every console. Their queries filter on:
+#
+#   UnitAssignments   (incident_id, cleared) / (unit_id, cleared)
+#   Incidents         (status, is_draft) ORDER BY updated
+#   Narrative         incident_id ORDER BY timestamp
+#   IncidentHistory   incident_id ORDER BY timestamp
+#   DailyLog          timestamp / unit_id / incident_id
+#   ShiftOverrides    end_ts IS NULL (+ to_shift_letter)
+#
+# Active rows (cleared IS NULL, end_ts IS NULL) are a tiny fraction of the
+# table, so they get partial indexes. The set is installed by migration 13
+# and guarded by the EXPLAIN QUERY PLAN tests (tests/test_query_plans.py);
+# explain_query_plan() / full_table_scans() are the helpers they use.
+# ============================================================================
+
+import logging
+import re
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Sequence, Set
+
+from .pool import get_pool
+
+logger = logging.getLogger("db.indexes")
+
+
+class IndexSpec(NamedTuple):
+    name: str
+    table: str
+    sql: str
+
+
+HOT_PATH_INDEXES = (
+    # panel_active: EXISTS / IN lookups with "(cleared IS NULL OR cleared = '')"
+    IndexSpec("idx_ua_incident_cleared", "UnitAssignments",
+              "CREATE INDEX IF NOT EXISTS idx_ua_incident_cleared "
+              "ON UnitAssignments(incident_id, cleared)"),
+    # Active assignments only: dispatch conflict check, units panel,
+    # ghost-assignment cleanup
+    IndexSpec("idx_ua_active_unit", "UnitAssignments",
+              "CREATE INDEX IF NOT EXISTS idx_ua_active_unit "
+              "ON UnitAssignments(unit_id, incident_id) WHERE cleared IS NULL"),
+    IndexSpec("idx_ua_active_incident", "UnitAssignments",
+              "CREATE INDEX IF NOT EXISTS idx_ua_active_incident "
+              "ON UnitAssignments(incident_id, unit_id) WHERE cleared IS NULL"),
+    # Active / open / held panels: status + draft filter, newest first
+    IndexSpec("idx_incidents_board", "Incidents",
+              "CREATE INDEX IF NOT EXISTS idx_incidents_board "
+              "ON Incidents(status, is_draft, updated)"),
+    # Incident detail / IAW timelines, already in display order
+    IndexSpec("idx_narrative_incident_ts", "Narrative",
+              "CREATE INDEX IF NOT EXISTS idx_narrative_incident_ts "
+              "ON Narrative(incident_id, timestamp)"),
+    IndexSpec("idx_incident_history_incident_ts", "IncidentHistory",
+              "CREATE INDEX IF NOT EXISTS idx_incident_history_incident_ts "
+              "ON IncidentHistory(incident_id, timestamp)"),
+    # Daily Log viewer filters (timestamp is already indexed)
+    IndexSpec("idx_dailylog_unit", "DailyLog",
+              "CREATE INDEX IF NOT EXISTS idx_dailylog_unit ON DailyLog(unit_id)"),
+    IndexSpec("idx_dailylog_incident", "DailyLog",
+              "CREATE INDEX IF NOT EXISTS idx_dailylog_incident ON DailyLog(incident_id)"),
+    # Shift coverage on the units panel
+    IndexSpec("idx_shift_overrides_active", "ShiftOverrides",
+              "CREATE INDEX IF NOT EXISTS idx_shift_overrides_active "
+              "ON ShiftOverrides(to_shift_letter, unit_id) WHERE end_ts IS NULL"),
+)
+
+# Superseded by the set above. A low-selectivity index on `cleared` is worse
+# than none: without ANALYZE stats the planner prefers it to the partial ones.
+REDUNDANT_INDEXES = (
+    "idx_unit_assignments_cleared",
+    "idx_narrative_incident",
+    "idx_incident_history_incident",
+)
+
+
+def install_hot_path_indexes(conn: sqlite3.Connection) -> List[str]:
+    """Create the hot-path index set (tables that do not exist are skipped)
+    and drop the indexes it replaces. Returns the names created."""
+    tables = {
+        r[0].lower()
+        for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    created: List[str] = []
+    for spec in HOT_PATH_INDEXES:
+        if spec.table.lower() not in tables:
+            logger.info("[DB] Skipping index %s: no table %s", spec.name, spec.table)
+            continue
+        conn.execute(spec.sql)
+        created.append(spec.name)
+    for name in REDUNDANT_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    return created
+
+
+# ============================================================================
+# Query plan checks
+# ============================================================================
+
+_TABLE_REF = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO)\s+([A-Za-z_]\w*)(?:\s+(?:AS\s+)?([A-Za-z_]\w*))?",
+    re.IGNORECASE,
+)
+_NOT_ALIAS = {
+    "WHERE", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "JOIN", "ON", "USING",
+    "SET", "ORDER", "GROUP", "HAVING", "LIMIT", "UNION", "VALUES", "SELECT",
+    "INDEXED", "NOT", "DEFAULT",
+}
+_SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?")
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for `sql`."""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, tuple(params)).fetchall()
+    return [r[3] for r in rows]
+
+
+def _partial_indexes(conn: sqlite3.Connection) -> Set[str]:
+    return {
+        r[0]
+        for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql LIKE '% WHERE %'"
+        )
+    }
+
+
+def full_table_scans(conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> List[str]:
+    """
+    Tables the plan for `sql` reads in full: a plain SCAN, or a SCAN through
+    a full (non-partial) index. Scanning a partial index (active rows only)
+    is not a full scan.
+    """
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table.lower()] = table
+        if alias and alias.upper() not in _NOT_ALIAS:
+            aliases[alias.lower()] = table
+    partial = _partial_indexes(conn)
+
+    scanned: List[str] = []
+    for detail in explain_query_plan(conn, sql, params):
+        m = _SCAN.match(detail)
+        if not m:
+            continue
+        name, index = m.group(1), m.group(2)
+        if index and index in partial:
+            continue
+        table = aliases.get(name.lower())
+        if table is not None and table not in scanned:
+            scanned.append(table)
+    return scanned
+
+
+@contextmanager
+def capture_statements(db_path=None) -> Iterator[List[str]]:
+    """Collect every statement run on connections checked out of the pool
+    while the block is active (parameters expanded), for plan checks."""
+    pool = get_pool(db_path)
+    statements: List[str] = []
+    previous = pool._trace
+    pool.trace(statements.append)
+    try:
+        yield statements
+    finally:
+        pool.trace(previous)
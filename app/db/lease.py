@@ -0,0 +1,285 @@
+# ============================================================================
+# FORD CAD — Leader Leases (one scheduler per family across workers)
+# ============================================================================
+# Every uvicorn worker imports main.py and starts the same background
+# schedulers. With N workers that meant N on-scene reminders, N shift
+# reports and N nightly backups. Each scheduler family now runs its jobs
+# only in the worker holding that family's lease:
+#
+#   reminders            app/reminders/scheduler_jobs.py (APScheduler)
+#   reporting            ReportScheduler scheduled report runs
+#   reports              reports.run_scheduler (legacy shift reports)
+#   scheduled_incidents  main._scheduled_check_loop
+#   maintenance          MaintenanceScheduler timed jobs
+#
+# A lease is one row in leader_leases (cad.db). It is taken and renewed
+# with a single UPSERT that only succeeds while the row is ours or has
+# expired, so two workers can never both win. Leases last TTL_S seconds;
+# the holder renews every HEARTBEAT_S on the lease thread, and any other
+# worker takes over at its next heartbeat once the row expires (at most
+# TTL_S + HEARTBEAT_S after the leader died). A clean shutdown deletes
+# our rows so the takeover happens at the next heartbeat.
+#
+# The scheduler threads still run in every worker; their jobs ask
+# is_leader(family) (or are wrapped in leader_only) and skip the run
+# otherwise. A single worker takes every lease on its first check, so
+# nothing changes for one-process deployments. Lease times are wall-clock
+# (time.time()): all workers share the host clock.
+# ============================================================================
+
+import functools
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from .pool import get_conn, get_db_path
+
+logger = logging.getLogger("db.lease")
+
+ENABLED = os.getenv("CAD_LEADER_ELECTION", "1").strip().lower() not in ("0", "false", "no", "off")
+TTL_S = float(os.getenv("CAD_LEASE_TTL_S", "15"))
+HEARTBEAT_S = float(os.getenv("CAD_LEASE_HEARTBEAT_S", "5"))
+
+LEASE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS leader_leases (
+        name TEXT PRIMARY KEY,
+        holder TEXT NOT NULL,
+        acquired_at REAL NOT NULL,
+        heartbeat_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+"""
+
+# Take the row when it is free, ours, or expired; rowcount 0 means another
+# holder has it
+_ACQUIRE_SQL = """
+    INSERT INTO leader_leases (name, holder, acquired_at, heartbeat_at, expires_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        acquired_at = CASE WHEN leader_leases.holder = excluded.holder
+                           THEN leader_leases.acquired_at ELSE excluded.acquired_at END,
+        holder = excluded.holder,
+        heartbeat_at = excluded.heartbeat_at,
+        expires_at = excluded.expires_at
+    WHERE leader_leases.holder = excluded.holder
+       OR leader_leases.expires_at < excluded.heartbeat_at
+"""
+
+
+def install_lease_table(conn: sqlite3.Connection) -> str:
+    """Create leader_leases (migration step)."""
+    conn.execute(LEASE_SCHEMA)
+    return "leader_leases"
+
+
+class LeaseManager:
+    """Takes, renews and releases the leases of this process."""
+
+    def __init__(self, db_path=None, ttl_s: float = TTL_S, heartbeat_s: float = HEARTBEAT_S,
+                 holder: Optional[str] = None):
+        self.db_path = db_path
+        self.ttl_s = max(1.0, float(ttl_s))
+        self.heartbeat_s = max(0.1, min(float(heartbeat_s), self.ttl_s / 2))
+        # Stop trusting a lease this long before it expires
+        self.margin_s = min(2.0, self.ttl_s / 4)
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # family -> expires_at of the lease we hold (absent: not held)
+        self._held: Dict[str, float] = {}
+        # family -> time of the last failed attempt
+        self._tried: Dict[str, float] = {}
+        self._ready = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {"acquired": 0, "lost": 0, "renewals": 0, "skipped": 0, "failed": 0}
+
+    def _path(self) -> str:
+        return os.path.abspath(str(self.db_path if self.db_path is not None else get_db_path()))
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+
+    def is_leader(self, name: str) -> bool:
+        """True while this process holds the `name` lease. Registers the
+        family for heartbeats; the first call (and a call after the lease
+        lapsed) tries to take it at once."""
+        if not ENABLED:
+            return True
+        now = time.time()
+        with self._lock:
+            expires = self._held.get(name)
+            if expires is not None and expires - now > self.margin_s:
+                return True
+            tried = self._tried.get(name)
+            if tried is not None and now - tried < self.heartbeat_s:
+                return False
+        return self.acquire(name)
+
+    def acquire(self, name: str) -> bool:
+        """Take or renew one lease now."""
+        return self._acquire([name]).get(name, False)
+
+    def _acquire(self, names) -> Dict[str, bool]:
+        now = time.time()
+        expires = now + self.ttl_s
+        won: Dict[str, bool] = {}
+        try:
+            conn = get_conn(self._path())
+            try:
+                if not self._ready:
+                    install_lease_table(conn)
+                    self._ready = True
+                for name in names:
+                    cur = conn.execute(_ACQUIRE_SQL, (name, self.holder, now, now, expires))
+                    won[name] = cur.rowcount == 1
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Keep what we hold until it lapses; try again next heartbeat
+            with self._lock:
+                self._stats["failed"] += 1
+                for name in names:
+                    self._tried[name] = now
+                held = {name: self._held.get(name, 0.0) - now > self.margin_s for name in names}
+            logger.warning(f"[Lease] Heartbeat failed: {e}")
+            return held
+
+        with self._lock:
+            for name, ok in won.items():
+                was_held = name in self._held
+                if ok:
+                    self._held[name] = expires
+                    self._tried.pop(name, None)
+                    if was_held:
+                        self._stats["renewals"] += 1
+                    else:
+                        self._stats["acquired"] += 1
+                        logger.info(f"[Lease] {self.holder} is now leader for {name}")
+                else:
+                    self._tried[name] = now
+                    if was_held:
+                        del self._held[name]
+                        self._stats["lost"] += 1
+                        logger.warning(f"[Lease] {self.holder} lost the {name} lease")
+        return won
+
+    def heartbeat(self):
+        """Renew every lease we hold and try for every family we run."""
+        with self._lock:
+            names = sorted(set(self._held) | set(self._tried))
+        if names:
+            self._acquire(names)
+
+    def release(self, name: Optional[str] = None):
+        """Give up one lease (default: all) so another worker takes over."""
+        with self._lock:
+            names = [name] if name is not None else list(self._held)
+            for n in names:
+                self._held.pop(n, None)
+        if not names:
+            return
+        try:
+            conn = get_conn(self._path())
+            try:
+                conn.executemany(
+                    "DELETE FROM leader_leases WHERE name = ? AND holder = ?",
+                    [(n, self.holder) for n in names],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"[Lease] Release failed: {e}")
+
+    def note_skipped(self):
+        with self._lock:
+            self._stats["skipped"] += 1
+
+    # ------------------------------------------------------------------
+    # Heartbeat thread
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if not ENABLED or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="cad-leader-lease", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.release()
+        with self._lock:
+            self._tried.clear()
+
+    def _loop(self):
+        while not self._stop.wait(self.heartbeat_s):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.warning(f"[Lease] {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["leader_for"] = {name: round(exp - now, 1) for name, exp in sorted(self._held.items())}
+            out["standby_for"] = sorted(n for n in self._tried if n not in self._held)
+        out["enabled"] = ENABLED
+        out["holder"] = self.holder
+        out["ttl_s"] = self.ttl_s
+        out["heartbeat_s"] = self.heartbeat_s
+        out["running"] = self._thread is not None and self._thread.is_alive()
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_manager = LeaseManager()
+
+
+def get_lease_manager() -> LeaseManager:
+    return _manager
+
+
+def start_leases():
+    """Startup hook (after migrations): heartbeat the leases we run."""
+    _manager.start()
+
+
+def stop_leases():
+    """Shutdown hook: stop heartbeats and release our leases."""
+    _manager.stop()
+
+
+def is_leader(name: str) -> bool:
+    return _manager.is_leader(name)
+
+
+def leader_only(name: str) -> Callable:
+    """Decorator for scheduler jobs: run only in the `name` leader."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def job(*args, **kwargs):
+            if not _manager.is_leader(name):
+                _manager.note_skipped()
+                return None
+            return fn(*args, **kwargs)
+        return job
+    return wrap
+
+
+def lease_stats() -> Dict[str, Any]:
+    return _manager.stats()
@@ -0,0 +1,230 @@
+# ============================================================================
+# FORD CAD — Write-Lock Telemetry
+# ============================================================================
+# SQLite has one write lock per database. A slow dispatch is either waiting
+# for that lock (another request or the audit writer holds it) or running
+# slow statements while holding it. This module tells the two apart.
+#
+# Pooled connections (pool.PooledConnection) report every write
+# transaction:
+#
+#   wait   time to get the lock: a timed BEGIN IMMEDIATE, issued by the
+#          pool in place of the implicit deferred BEGIN before the first
+#          INSERT/UPDATE/DELETE (same lock, taken at the same moment)
+#   hold   from getting the lock to commit / rollback
+#   retry  sleeps in main._sqlite_exec_retry after "database is locked"
+#   timeout  lock not obtained within busy_timeout
+#
+# Each is attributed to the HTTP endpoint (set by middleware in main.py,
+# carried into run_db workers) and to the code call site that opened the
+# transaction. lock_stats() adds a rolling per-minute histogram of wait
+# and hold times over the last WINDOW_MIN minutes.
+# ============================================================================
+
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+WINDOW_MIN = int(os.getenv("CAD_LOCK_WINDOW_MIN", "15"))
+# Per-endpoint / per-site tables are capped; extra keys are folded into "other"
+MAX_KEYS = 200
+# Waits at or above this are logged as contention by callers that care
+SLOW_WAIT_MS = float(os.getenv("CAD_LOCK_SLOW_WAIT_MS", "100"))
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+_BUCKET_LABELS = [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+
+# Endpoint of the current request ("METHOD /path/{id}"); "-" outside requests
+LOCK_ENDPOINT: ContextVar[str] = ContextVar("cad_lock_endpoint", default="-")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_DB_DIR = os.path.dirname(os.path.abspath(__file__))
+# Frames in these files are plumbing, not the call site
+_SKIP_FILES = {os.path.join(_DB_DIR, f) for f in ("pool.py", "locks.py", "uow.py")}
+
+
+def _bucket(ms: float) -> int:
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+def call_site(depth: int = 2) -> str:
+    """'file.py:function:line' of the first frame outside the DB plumbing."""
+    try:
+        frame = sys._getframe(depth)
+    except ValueError:
+        return "?"
+    while frame is not None and frame.f_code.co_filename in _SKIP_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    path = frame.f_code.co_filename
+    if path.startswith(_ROOT):
+        path = os.path.relpath(path, _ROOT)
+    return f"{path}:{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+def _new_row() -> Dict[str, float]:
+    return {
+        "waits": 0, "wait_ms": 0.0, "max_wait_ms": 0.0,
+        "holds": 0, "hold_ms": 0.0, "max_hold_ms": 0.0,
+        "retries": 0, "retry_ms": 0.0, "timeouts": 0,
+    }
+
+
+class LockTelemetry:
+    """Thread-safe counters for write-lock waits, holds and retries."""
+
+    def __init__(self, window_min: int = WINDOW_MIN):
+        self.window_min = max(1, int(window_min))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._totals = _new_row()
+            self._endpoints: Dict[str, Dict[str, float]] = {}
+            self._sites: Dict[str, Dict[str, float]] = {}
+            # minute -> {"wait": [counts], "hold": [counts]}
+            self._minutes: Dict[int, Dict[str, List[int]]] = {}
+
+    def _rows(self, endpoint: str, site: str):
+        rows = [self._totals]
+        for table, key in ((self._endpoints, endpoint), (self._sites, site)):
+            row = table.get(key)
+            if row is None:
+                if len(table) >= MAX_KEYS:
+                    key = "other"
+                    row = table.get(key)
+                if row is None:
+                    row = table[key] = _new_row()
+            rows.append(row)
+        return rows
+
+    def _slot(self, kind: str) -> List[int]:
+        minute = int(time.time() // 60)
+        slot = self._minutes.get(minute)
+        if slot is None:
+            slot = self._minutes[minute] = {
+                "wait": [0] * len(_BUCKET_LABELS), "hold": [0] * len(_BUCKET_LABELS)
+            }
+            oldest = minute - self.window_min
+            for m in [m for m in self._minutes if m <= oldest]:
+                del self._minutes[m]
+        return slot[kind]
+
+    def record_wait(self, ms: float, site: str, endpoint: Optional[str] = None):
+        endpoint = endpoint or LOCK_ENDPOINT.get()
+        with self._lock:
+            for row in self._rows(endpoint, site):
+                row["waits"] += 1
+                row["wait_ms"] += ms
+                row["max_wait_ms"] = max(row["max_wait_ms"], ms)
+            self._slot("wait")[_bucket(ms)] += 1
+
+    def record_hold(self, ms: float, site: str, endpoint: Optional[str] = None):
+        endpoint = endpoint or LOCK_ENDPOINT.get()
+        with self._lock:
+            for row in self._rows(endpoint, site):
+                row["holds"] += 1
+                row["hold_ms"] += ms
+                row["max_hold_ms"] = max(row["max_hold_ms"], ms)
+            self._slot("hold")[_bucket(ms)] += 1
+
+    def record_retry(self, sleep_ms: float, site: str, endpoint: Optional[str] = None):
+        endpoint = endpoint or LOCK_ENDPOINT.get()
+        with self._lock:
+            for row in self._rows(endpoint, site):
+                row["retries"] += 1
+                row["retry_ms"] += sleep_ms
+
+    def record_timeout(self, site: str, endpoint: Optional[str] = None):
+        endpoint = endpoint or LOCK_ENDPOINT.get()
+        with self._lock:
+            for row in self._rows(endpoint, site):
+                row["timeouts"] += 1
+
+    def stats(self, top: int = 10, detail: bool = True) -> Dict[str, Any]:
+        """Totals, rolling histogram and the top waiting / holding call
+        sites; detail adds the per-endpoint table and per-minute slots."""
+        now_min = int(time.time() // 60)
+        with self._lock:
+            totals = dict(self._totals)
+            endpoints = {k: dict(v) for k, v in self._endpoints.items()}
+            sites = {k: dict(v) for k, v in self._sites.items()}
+            minutes = {m: {k: list(v) for k, v in s.items()} for m, s in self._minutes.items()
+                       if m > now_min - self.window_min}
+
+        hist = {"wait": [0] * len(_BUCKET_LABELS), "hold": [0] * len(_BUCKET_LABELS)}
+        for slot in minutes.values():
+            for kind in hist:
+                hist[kind] = [a + b for a, b in zip(hist[kind], slot[kind])]
+
+        def _round(row):
+            for key in ("wait_ms", "max_wait_ms", "hold_ms", "max_hold_ms", "retry_ms"):
+                row[key] = round(row[key], 2)
+            row["avg_wait_ms"] = round(row["wait_ms"] / row["waits"], 2) if row["waits"] else 0.0
+            row["avg_hold_ms"] = round(row["hold_ms"] / row["holds"], 2) if row["holds"] else 0.0
+            return row
+
+        def _top(table, key):
+            ranked = sorted(table.items(), key=lambda kv: kv[1][key], reverse=True)[:top]
+            return [{"name": name, **_round(row)} for name, row in ranked if row[key] > 0]
+
+        out: Dict[str, Any] = {
+            **_round(totals),
+            "window_min": self.window_min,
+            "histogram": {"buckets_ms": _BUCKET_LABELS, "wait": hist["wait"], "hold": hist["hold"]},
+            "top_waiters": _top(sites, "wait_ms"),
+            "top_holders": _top(sites, "hold_ms"),
+        }
+        if detail:
+            out["histogram"]["per_minute"] = [
+                {"minute": time.strftime("%H:%M", time.localtime(m * 60)), **minutes[m]}
+                for m in sorted(minutes)
+            ]
+            out["endpoints"] = {name: _round(row) for name, row in endpoints.items()}
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_telemetry = LockTelemetry()
+
+
+def get_lock_telemetry() -> LockTelemetry:
+    return _telemetry
+
+
+def set_lock_endpoint(endpoint: str):
+    """Tag DB work in this context with `endpoint`; returns the reset token."""
+    return LOCK_ENDPOINT.set(endpoint)
+
+
+def reset_lock_endpoint(token):
+    LOCK_ENDPOINT.reset(token)
+
+
+def note_busy_retry(sleep_s: float, site: Optional[str] = None):
+    """Record one sleep-and-retry after 'database is locked'."""
+    _telemetry.record_retry(sleep_s * 1000.0, site or call_site())
+
+
+def note_lock_timeout(site: Optional[str] = None):
+    _telemetry.record_timeout(site or call_site())
+
+
+def lock_stats(top: int = 10, detail: bool = True) -> Dict[str, Any]:
+    return _telemetry.stats(top, detail)
+
+
+def reset_lock_stats():
+    _telemetry.reset()
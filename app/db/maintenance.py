@@ -0,0 +1,423 @@
+# ============================================================================
+# FORD CAD — Database Maintenance Scheduler
+# ============================================================================
+# One background thread runs the housekeeping cad.db needs on a 24/7 floor,
+# one job at a time, without taking the database offline:
+#
+#   wal_checkpoint    PRAGMA wal_checkpoint(TRUNCATE): fold the WAL back
+#                     into cad.db and truncate it (PASSIVE if readers
+#                     are in the way)
+#   incremental_vacuum  return free pages to the filesystem, a few hundred
+#                     pages per transaction
+#   optimize          ANALYZE (first run) / PRAGMA optimize with
+#                     analysis_limit, so planner statistics stay current
+#   archive           cold-storage move of old closed incidents (archive.py)
+#   backup            nightly online backup through the SQLite backup API
+#   quick_check       nightly PRAGMA quick_check
+#
+# Jobs yield to dispatch: they use their own connection with a short busy
+# timeout (MAINT_BUSY_MS), so they back off when a writer holds the lock
+# instead of queueing in front of it, work in small steps with PAUSE_MS
+# between them, and a job that cannot get the lock is deferred to the next
+# tick. Readers never block writers in WAL mode, so the backup and
+# quick_check reads do not stall dispatch.
+#
+# incremental_vacuum needs auto_vacuum=INCREMENTAL. New databases get it
+# from the pool; existing ones are converted once with the "vacuum" job
+# (a full VACUUM, admin-triggered only).
+#
+# With several workers only the holder of the "maintenance" lease
+# (lease.py) runs the timed jobs; requested jobs run where they were asked.
+# ============================================================================
+
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from .archive import ARCHIVE_AFTER_DAYS, archive_closed_incidents
+from .archive import INTERVAL_S as ARCHIVE_INTERVAL_S
+from .lease import is_leader
+from .pool import get_db_path
+
+logger = logging.getLogger("db.maintenance")
+
+ENABLED = os.getenv("CAD_MAINTENANCE", "1").strip().lower() not in ("0", "false", "no", "off")
+BACKUP_DIR = os.getenv("CAD_BACKUP_DIR", "")
+BACKUP_KEEP = int(os.getenv("CAD_BACKUP_KEEP", "7"))
+# Local hour the nightly jobs (backup, quick_check) run in
+NIGHTLY_HOUR = int(os.getenv("CAD_MAINT_NIGHTLY_HOUR", "3"))
+# Lock wait before a maintenance step gives way to dispatch
+MAINT_BUSY_MS = int(os.getenv("CAD_MAINT_BUSY_MS", "200"))
+PAUSE_MS = float(os.getenv("CAD_MAINT_PAUSE_MS", "50"))
+VACUUM_STEP_PAGES = 256
+ANALYSIS_LIMIT = 400
+TICK_S = 60.0
+# Attempts per step before a locked job is deferred
+LOCK_RETRIES = 5
+
+
+class MaintenanceDeferred(Exception):
+    """The job kept finding the database locked; it runs again next tick."""
+
+
+class MaintenanceJob(NamedTuple):
+    name: str
+    run: Callable[[str], Dict[str, Any]]
+    interval_s: float       # 0 = nightly at NIGHTLY_HOUR, < 0 = on request only
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=MAINT_BUSY_MS / 1000.0, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout={int(MAINT_BUSY_MS)}")
+    return conn
+
+
+def _pause():
+    time.sleep(PAUSE_MS / 1000.0)
+
+
+def _is_locked(e: sqlite3.OperationalError) -> bool:
+    msg = str(e).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def _yielding(step: Callable[[], Any]) -> Any:
+    """Run one short step, backing off while a writer holds the lock."""
+    for attempt in range(LOCK_RETRIES):
+        try:
+            return step()
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e):
+                raise
+            time.sleep(PAUSE_MS * (attempt + 1) * 4 / 1000.0)
+    raise MaintenanceDeferred("database stayed locked")
+
+
+def backup_dir(db_path=None) -> Path:
+    src = Path(str(db_path if db_path is not None else get_db_path()))
+    return Path(BACKUP_DIR) if BACKUP_DIR else src.parent / f"{src.stem}.backups"
+
+
+def list_backups(db_path=None) -> List[str]:
+    """Completed backup files, newest first."""
+    stem = Path(str(db_path if db_path is not None else get_db_path())).stem
+    folder = backup_dir(db_path)
+    if not folder.is_dir():
+        return []
+    return sorted((str(p) for p in folder.glob(f"{stem}-*.db")), reverse=True)
+
+
+# ============================================================================
+# Jobs
+# ============================================================================
+
+def wal_checkpoint(db_path: str) -> Dict[str, Any]:
+    conn = _connect(db_path)
+    try:
+        busy, log_pages, done = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        mode = "TRUNCATE"
+        if busy:
+            # A reader is still on an older snapshot: copy what we can
+            busy, log_pages, done = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            mode = "PASSIVE"
+        return {"mode": mode, "busy": bool(busy), "wal_pages": log_pages, "checkpointed": done}
+    finally:
+        conn.close()
+
+
+def incremental_vacuum(db_path: str) -> Dict[str, Any]:
+    conn = _connect(db_path)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return {"skipped": "auto_vacuum is not INCREMENTAL (run the vacuum job once)"}
+        freed = 0
+        while True:
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if free == 0:
+                break
+            step = min(free, VACUUM_STEP_PAGES)
+            # executescript steps the pragma to completion (execute frees one page)
+            _yielding(lambda: conn.executescript(f"PRAGMA incremental_vacuum({step})"))
+            freed += step
+            _pause()
+        return {"freed_pages": freed}
+    finally:
+        conn.close()
+
+
+def optimize(db_path: str) -> Dict[str, Any]:
+    conn = _connect(db_path)
+    try:
+        conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).fetchone()
+        if has_stats:
+            # 0x10002: consider every table, not only ones this connection queried
+            _yielding(lambda: conn.execute("PRAGMA optimize=0x10002").fetchall())
+            return {"mode": "optimize"}
+        _yielding(lambda: conn.execute("ANALYZE"))
+        return {"mode": "analyze"}
+    finally:
+        conn.close()
+
+
+def archive(db_path: str) -> Dict[str, Any]:
+    return {"moved": archive_closed_incidents(db_path=db_path)}
+
+
+def backup(db_path: str) -> Dict[str, Any]:
+    """
+    Online backup to <db>.backups/<stem>-YYYYmmdd-HHMMSS.db, checked with
+    quick_check before it replaces anything. Copied in one step: in WAL
+    mode that is a single read transaction, invisible to writers, where a
+    paced multi-step backup restarts from scratch after every commit.
+    """
+    folder = backup_dir(db_path)
+    folder.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    target = folder / f"{Path(db_path).stem}-{stamp}.db"
+    partial = target.with_suffix(".db.partial")
+
+    src = sqlite3.connect(db_path, timeout=MAINT_BUSY_MS / 1000.0)
+    try:
+        dest = sqlite3.connect(str(partial))
+        try:
+            src.backup(dest)
+            dest.execute("PRAGMA journal_mode=DELETE")
+            check = [r[0] for r in dest.execute("PRAGMA quick_check").fetchall()]
+        finally:
+            dest.close()
+    except Exception:
+        _discard(partial)
+        raise
+    finally:
+        src.close()
+    if check != ["ok"]:
+        _discard(partial)
+        raise RuntimeError(f"backup copy failed quick_check: {check[:5]}")
+    os.replace(partial, target)
+
+    pruned = 0
+    for old in list_backups(db_path)[max(1, BACKUP_KEEP):]:
+        _discard(old)
+        pruned += 1
+    return {"path": str(target), "size_kb": round(target.stat().st_size / 1024, 1), "pruned": pruned}
+
+
+def quick_check(db_path: str) -> Dict[str, Any]:
+    conn = _connect(db_path)
+    try:
+        problems = [r[0] for r in conn.execute("PRAGMA quick_check").fetchall()]
+    finally:
+        conn.close()
+    ok = problems == ["ok"]
+    if not ok:
+        logger.error("[DB] quick_check found problems in %s: %s", db_path, problems[:20])
+    return {"ok": ok, "problems": [] if ok else problems[:20]}
+
+
+def vacuum(db_path: str) -> Dict[str, Any]:
+    """Full VACUUM, switching the file to auto_vacuum=INCREMENTAL. Blocks
+    writers for its whole run: admin-triggered only."""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        before = os.path.getsize(db_path)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        after = os.path.getsize(db_path)
+        return {"before_kb": round(before / 1024, 1), "after_kb": round(after / 1024, 1)}
+    finally:
+        conn.close()
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug("[DB] Could not remove %s: %s", path, e)
+
+
+JOBS = (
+    MaintenanceJob("wal_checkpoint", wal_checkpoint, 900),
+    MaintenanceJob("incremental_vacuum", incremental_vacuum, 3600),
+    MaintenanceJob("optimize", optimize, 6 * 3600),
+    MaintenanceJob("archive", archive, ARCHIVE_INTERVAL_S if ARCHIVE_AFTER_DAYS > 0 else -1),
+    MaintenanceJob("backup", backup, 0),
+    MaintenanceJob("quick_check", quick_check, 0),
+    MaintenanceJob("vacuum", vacuum, -1),
+)
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+class MaintenanceScheduler:
+    """Runs JOBS one at a time on a background thread."""
+
+    def __init__(self, db_path=None, jobs=JOBS):
+        self.db_path = db_path
+        self.jobs = {job.name: job for job in jobs}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._run_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._requested: List[str] = []
+        self._started = time.monotonic()
+        self._stats: Dict[str, Dict[str, Any]] = {
+            name: {"runs": 0, "failed": 0, "deferred": 0, "last_run": None,
+                   "last_ms": 0.0, "last_result": None, "last_error": None}
+            for name in self.jobs
+        }
+        self._last_mono: Dict[str, float] = {}
+        self._last_day: Dict[str, datetime.date] = {}
+
+    def _path(self) -> str:
+        return os.path.abspath(str(self.db_path if self.db_path is not None else get_db_path()))
+
+    def run_job(self, name: str) -> Dict[str, Any]:
+        """Run one job now on the calling thread (admin endpoint, tests)."""
+        job = self.jobs.get(name)
+        if job is None:
+            raise KeyError(f"Unknown maintenance job '{name}'")
+        with self._run_lock:
+            started = time.perf_counter()
+            stats = self._stats[name]
+            try:
+                result = job.run(self._path())
+            except MaintenanceDeferred as e:
+                with self._lock:
+                    stats["deferred"] += 1
+                logger.info("[DB] Maintenance %s deferred: %s", name, e)
+                return {"ok": False, "deferred": True, "error": str(e)}
+            except Exception as e:
+                with self._lock:
+                    stats["failed"] += 1
+                    stats["last_error"] = str(e)
+                logger.error("[DB] Maintenance %s failed: %s", name, e)
+                return {"ok": False, "error": str(e)}
+            finally:
+                self._last_mono[name] = time.monotonic()
+                self._last_day[name] = datetime.date.today()
+            ms = (time.perf_counter() - started) * 1000.0
+            with self._lock:
+                stats["runs"] += 1
+                stats["last_run"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                stats["last_ms"] = round(ms, 2)
+                stats["last_result"] = result
+            logger.info("[DB] Maintenance %s done in %.0f ms: %s", name, ms, result)
+            return {"ok": True, **result}
+
+    def request(self, name: str):
+        """Queue `name` to run on the maintenance thread soon (e.g. after
+        an admin reset deleted rows)."""
+        if name not in self.jobs:
+            raise KeyError(f"Unknown maintenance job '{name}'")
+        with self._lock:
+            if name not in self._requested:
+                self._requested.append(name)
+        self._wake.set()
+
+    def due(self, now: Optional[datetime.datetime] = None) -> List[str]:
+        now = now or datetime.datetime.now()
+        mono = time.monotonic()
+        out = []
+        for job in self.jobs.values():
+            if job.interval_s > 0:
+                last = self._last_mono.get(job.name, self._started)
+                if mono - last >= job.interval_s:
+                    out.append(job.name)
+            elif job.interval_s == 0:
+                if now.hour == NIGHTLY_HOUR and self._last_day.get(job.name) != now.date():
+                    out.append(job.name)
+        return out
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._loop, name="cad-db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(TICK_S)
+            self._wake.clear()
+            with self._lock:
+                names, self._requested = self._requested, []
+            # Timed jobs run in one worker (lease.py); requested ones wherever asked
+            due = self.due()
+            if due and is_leader("maintenance"):
+                names.extend(name for name in due if name not in names)
+            for name in names:
+                if self._stop.is_set():
+                    break
+                self.run_job(name)
+                _pause()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = {name: dict(s) for name, s in self._stats.items()}
+            pending = list(self._requested)
+        return {
+            "enabled": ENABLED,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "nightly_hour": NIGHTLY_HOUR,
+            "pending": pending,
+            "jobs": jobs,
+        }
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_scheduler = MaintenanceScheduler()
+
+
+def get_maintenance_scheduler() -> MaintenanceScheduler:
+    return _scheduler
+
+
+def start_maintenance():
+    """Startup hook (after migrations). CAD_MAINTENANCE=0 disables the thread;
+    jobs can still be run on demand."""
+    if ENABLED:
+        _scheduler.start()
+
+
+def stop_maintenance(timeout: float = 10.0):
+    _scheduler.stop(timeout)
+
+
+def run_maintenance(name: str) -> Dict[str, Any]:
+    return _scheduler.run_job(name)
+
+
+def request_maintenance(name: str):
+    _scheduler.request(name)
+
+
+def maintenance_stats() -> Dict[str, Any]:
+    return _scheduler.stats()
@@ -0,0 +1,124 @@
+# ============================================================================
+# FORD CAD — Versioned Schema Migrations
+# ============================================================================
+# One ordered list of schema steps for the whole application (core tables
+# in main.py plus every app/* module), tracked with PRAGMA user_version.
+#
+# Steps run once, at startup, before the first request is served. A
+# database already at the latest version costs a single PRAGMA read.
+# Each step must be idempotent (CREATE ... IF NOT EXISTS, guarded ALTERs):
+# a step interrupted half-way is simply re-run on the next start.
+#
+# Adding schema: register a NEW version. Never edit a step that has
+# shipped — databases already past it will not run it again.
+# ============================================================================
+
+import logging
+import sqlite3
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .pool import get_conn
+from .schema import refresh_schema
+
+logger = logging.getLogger("db.migrations")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+class MigrationError(RuntimeError):
+    """A schema step failed; later steps were not attempted."""
+
+
+class MigrationSkipped(Exception):
+    """Raised by a step whose module is unavailable (missing dependency).
+
+    Later steps still run, but user_version stops advancing at the skipped
+    step so it is retried on the next start.
+    """
+
+
+_MIGRATIONS: Dict[int, Migration] = {}
+_run_lock = threading.Lock()
+
+
+def register_migration(version: int, name: str, apply: Callable[[sqlite3.Connection], None]):
+    """Register schema step `version`. `apply(conn)` runs with a pooled
+    connection; the runner commits after it returns."""
+    version = int(version)
+    if version < 1:
+        raise ValueError("Migration versions start at 1")
+    existing = _MIGRATIONS.get(version)
+    if existing is not None and existing.name != name:
+        raise ValueError(
+            f"Migration version {version} already registered as '{existing.name}'"
+        )
+    _MIGRATIONS[version] = Migration(version, name, apply)
+
+
+def registered_migrations() -> List[Migration]:
+    return [_MIGRATIONS[v] for v in sorted(_MIGRATIONS)]
+
+
+def latest_version() -> int:
+    return max(_MIGRATIONS) if _MIGRATIONS else 0
+
+
+def get_user_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def _set_user_version(conn: sqlite3.Connection, version: int):
+    # PRAGMA does not take bound parameters; version is always an int here
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+    conn.commit()
+
+
+def run_migrations(db_path=None) -> List[str]:
+    """
+    Apply every registered step above the database's user_version, in
+    order, then reload the schema registry. Returns the applied step names.
+    """
+    with _run_lock:
+        conn = get_conn(db_path)
+        try:
+            current = get_user_version(conn)
+            pending = [m for m in registered_migrations() if m.version > current]
+            applied: List[str] = []
+            blocked = False
+
+            for m in pending:
+                try:
+                    m.apply(conn)
+                    conn.commit()
+                except MigrationSkipped as e:
+                    conn.rollback()
+                    blocked = True
+                    logger.warning("[DB] Migration %d (%s) skipped: %s", m.version, m.name, e)
+                    continue
+                except Exception as e:
+                    conn.rollback()
+                    logger.error("[DB] Migration %d (%s) failed: %s", m.version, m.name, e)
+                    raise MigrationError(f"Migration {m.version} ({m.name}) failed: {e}") from e
+                if not blocked:
+                    _set_user_version(conn, m.version)
+                applied.append(m.name)
+                logger.info("[DB] Applied migration %d (%s)", m.version, m.name)
+
+            refresh_schema(db_path, conn)
+            return applied
+        finally:
+            conn.close()
+
+
+def migration_status(db_path=None) -> Dict[str, Optional[int]]:
+    conn = get_conn(db_path)
+    try:
+        current = get_user_version(conn)
+    finally:
+        conn.close()
+    return {"current_version": current, "latest_version": latest_version()}
@@ -0,0 +1,441 @@
+# ============================================================================
+# FORD CAD — Pooled SQLite Connection Manager
+# ============================================================================
+# Single place that opens cad.db. main.get_conn() and every module-local
+# _get_conn() check connections out of a bounded per-thread pool; calling
+# close() on a pooled connection hands it back instead of tearing it down.
+#
+# Every connection is opened in WAL mode with tuned pragmas so readers
+# never block behind the dispatch writer, and reports its write-lock waits
+# and holds to the lock telemetry (locks.py).
+#
+# Commit listeners (add_commit_listener) hear which tables each commit
+# actually changed; the panel push (app.messaging.panel_push) uses this to
+# tell consoles what to refetch.
+# ============================================================================
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+from .locks import LOCK_ENDPOINT, call_site, get_lock_telemetry, note_lock_timeout
+from .locks import SLOW_WAIT_MS as LOCK_SLOW_WAIT_MS
+
+logger = logging.getLogger("db.pool")
+
+DB_PATH = Path(__file__).resolve().parent.parent.parent / os.getenv("CAD_DB_PATH", "cad.db")
+
+# Idle connections kept per thread (connections beyond this are closed on release)
+POOL_SIZE = int(os.getenv("CAD_DB_POOL_SIZE", "4"))
+BUSY_TIMEOUT_MS = int(os.getenv("CAD_DB_BUSY_TIMEOUT_MS", "30000"))
+CACHE_SIZE_KB = int(os.getenv("CAD_DB_CACHE_KB", "16384"))
+MMAP_SIZE_MB = int(os.getenv("CAD_DB_MMAP_MB", "256"))
+
+# Active unit of work for the current thread / asyncio task (see uow.py)
+ACTIVE_UOW: ContextVar[Optional[Any]] = ContextVar("cad_db_uow", default=None)
+
+
+# ============================================================================
+# Connection class
+# ============================================================================
+
+_WRITE_HEADS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+# DDL is never wrapped in an implicit BEGIN; it takes the lock by itself
+_DDL_HEADS = ("CREATE", "DROP", "ALTER")
+_LOCKING_BEGIN = ("BEGIN IMMEDIATE", "BEGIN EXCLUSIVE")
+_DEFERRED_BEGIN = ("BEGIN", "SAVEPOINT")
+
+# _lock_action() results
+_NO_LOCK, _TAKES_LOCK, _BEGIN_FIRST = 0, 1, 2
+
+_WRITE_TARGET = re.compile(
+    r"\s*(?:(?:INSERT|REPLACE)(?:\s+OR\s+\w+)?\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+(?:main\.)?[\"\[`]?(\w+)",
+    re.IGNORECASE,
+)
+_write_targets: Dict[str, Optional[str]] = {}
+
+# fn(db_path, tables) after each commit that changed rows (see add_commit_listener)
+_commit_listeners: List[Callable[[str, FrozenSet[str]], None]] = []
+
+
+def _write_target(sql: str) -> Optional[str]:
+    """Table an INSERT / UPDATE / DELETE writes to (statements are cached)."""
+    try:
+        return _write_targets[sql]
+    except KeyError:
+        pass
+    m = _WRITE_TARGET.match(sql)
+    table = m.group(1) if m else None
+    if len(_write_targets) < 2048:
+        _write_targets[sql] = table
+    return table
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Default cursor of pooled connections: reports write-lock waits."""
+
+    def execute(self, sql, parameters=()):
+        return self.connection._locked_call(sql, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.connection._locked_call(sql, super().executemany, sql, seq_of_parameters)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to its pool.
+
+    Write transactions are timed for lock telemetry (locks.py): the first
+    write outside a transaction is preceded by a timed BEGIN IMMEDIATE —
+    the lock the implicit deferred BEGIN + write would take anyway — and
+    commit / rollback closes the hold.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool: Optional["ConnectionPool"] = None
+        self._generation = 0
+        self._checked_out = False
+        self._cad_uow = None
+        self._lock_t0: Optional[float] = None
+        self._lock_site = ""
+        self._lock_deferred = False
+        # Tables changed by the open transaction (for commit listeners)
+        self._changed: set = set()
+
+    # ------------------------------------------------------------------
+    # Write-lock telemetry
+    # ------------------------------------------------------------------
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or _TimedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self._locked_call(sql, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._locked_call(sql, super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, script):
+        try:
+            return super().executescript(script)
+        finally:
+            self._lock_settle()
+
+    def commit(self):
+        try:
+            super().commit()
+        finally:
+            self._lock_settle()
+
+    def rollback(self):
+        self._changed.clear()
+        try:
+            super().rollback()
+        finally:
+            self._lock_settle()
+
+    def _note_changes(self, sql, result):
+        if isinstance(result, sqlite3.Cursor) and result.rowcount > 0:
+            table = _write_target(sql)
+            if table:
+                self._changed.add(table)
+
+    def _lock_action(self, sql: str) -> int:
+        if self._lock_t0 is not None:
+            return _NO_LOCK
+        if self.in_transaction:
+            if self._lock_deferred and sql.lstrip()[:7].upper().startswith(_WRITE_HEADS + _DDL_HEADS):
+                return _TAKES_LOCK
+            return _NO_LOCK
+        head = sql.lstrip()[:15].upper()
+        if head.startswith(_LOCKING_BEGIN):
+            return _TAKES_LOCK
+        if head.startswith(_DEFERRED_BEGIN):
+            self._lock_deferred = True
+            return _NO_LOCK
+        if head.startswith(_WRITE_HEADS):
+            # Autocommit connections have no transaction to open first
+            return _BEGIN_FIRST if self.isolation_level is not None else _TAKES_LOCK
+        if head.startswith(_DDL_HEADS):
+            return _TAKES_LOCK
+        return _NO_LOCK
+
+    def _locked_call(self, sql, fn, *args):
+        action = self._lock_action(sql) if isinstance(sql, str) else _NO_LOCK
+        if action == _NO_LOCK:
+            try:
+                result = fn(*args)
+                self._note_changes(sql, result)
+                return result
+            finally:
+                if self._lock_t0 is not None or self._lock_deferred:
+                    self._lock_settle()
+
+        site = call_site()
+        started = time.perf_counter()
+        try:
+            if action == _BEGIN_FIRST:
+                super().execute("BEGIN IMMEDIATE")
+                result = None
+            else:
+                result = fn(*args)
+        except sqlite3.OperationalError as e:
+            msg = str(e).lower()
+            if "locked" in msg or "busy" in msg:
+                note_lock_timeout(site)
+            raise
+        acquired = time.perf_counter()
+        wait_ms = (acquired - started) * 1000.0
+        get_lock_telemetry().record_wait(wait_ms, site)
+        if wait_ms >= LOCK_SLOW_WAIT_MS:
+            logger.warning("[DB] Waited %.0f ms for the write lock at %s (%s)",
+                           wait_ms, site, LOCK_ENDPOINT.get())
+        self._lock_t0 = acquired
+        self._lock_site = site
+        self._lock_deferred = False
+        if action == _BEGIN_FIRST:
+            result = fn(*args)
+        self._note_changes(sql, result)
+        self._lock_settle()
+        return result
+
+    def _lock_settle(self):
+        """Close the hold once the transaction has ended, and tell commit
+        listeners what it changed."""
+        if self.in_transaction:
+            return
+        self._lock_deferred = False
+        if self._lock_t0 is not None:
+            hold_ms = (time.perf_counter() - self._lock_t0) * 1000.0
+            self._lock_t0 = None
+            get_lock_telemetry().record_hold(hold_ms, self._lock_site)
+        if self._changed:
+            tables = frozenset(self._changed)
+            self._changed.clear()
+            db_path = self._pool.db_path if self._pool is not None else ""
+            for listener in list(_commit_listeners):
+                try:
+                    listener(db_path, tables)
+                except Exception as e:
+                    logger.debug("[DB] Commit listener failed: %s", e)
+
+    def close(self):
+        pool = self._pool
+        if pool is None:
+            super().close()
+            return
+        pool.release(self)
+
+    def dispose(self):
+        """Really close the underlying SQLite handle."""
+        self._pool = None
+        self._checked_out = False
+        try:
+            super().close()
+        except sqlite3.Error:
+            pass
+
+
+def _apply_pragmas(conn: sqlite3.Connection):
+    """WAL journal + tuned pragmas. journal_mode is persistent in the file;
+    the rest are per-connection."""
+    # Only takes effect on a new, empty file (and must precede the WAL
+    # switch); existing files are converted by the maintenance vacuum job
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError as e:
+        # Another connection holds a lock during first switch; next open retries
+        logger.warning("[DB] Could not enable WAL: %s", e)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_MS)}")
+    conn.execute(f"PRAGMA cache_size=-{int(CACHE_SIZE_KB)}")
+    conn.execute(f"PRAGMA mmap_size={int(MMAP_SIZE_MB) * 1024 * 1024}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+
+# ============================================================================
+# Pool
+# ============================================================================
+
+class ConnectionPool:
+    """
+    Bounded per-thread pool of connections to one database file.
+
+    Each thread keeps up to `size` idle connections. A checkout pops an idle
+    connection (or opens a new one); close() rolls back anything the caller
+    left uncommitted and pushes the connection back onto the idle list of
+    whichever thread released it.
+    """
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE):
+        self.db_path = str(db_path)
+        self.size = max(0, int(size))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: "weakref.WeakSet[PooledConnection]" = weakref.WeakSet()
+        self._generation = 0
+        # Statement trace callback applied to every checkout (see trace())
+        self._trace: Optional[Callable[[str], None]] = None
+        self._stats = {"opened": 0, "reused": 0, "released": 0, "discarded": 0}
+
+    def _idle(self) -> list:
+        state = getattr(self._local, "state", None)
+        if state is None or state[0] != self._generation:
+            state = (self._generation, [])
+            self._local.state = state
+        return state[1]
+
+    def _open(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_MS / 1000.0,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        _apply_pragmas(conn)
+        conn._generation = self._generation
+        with self._lock:
+            self._all.add(conn)
+            self._stats["opened"] += 1
+        return conn
+
+    def acquire(self, row_factory: Any = sqlite3.Row) -> PooledConnection:
+        idle = self._idle()
+        if idle:
+            conn = idle.pop()
+            with self._lock:
+                self._stats["reused"] += 1
+        else:
+            conn = self._open()
+        conn.row_factory = row_factory
+        conn.set_trace_callback(self._trace)
+        conn._pool = self
+        conn._checked_out = True
+        return conn
+
+    def trace(self, callback: Optional[Callable[[str], None]]):
+        """Install (or clear, with None) a statement trace on later checkouts.
+        The callback receives each statement with its parameters expanded."""
+        self._trace = callback
+
+    def release(self, conn: PooledConnection):
+        if not conn._checked_out:
+            return  # double close() is a no-op, like sqlite3
+        conn._checked_out = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        idle = self._idle()
+        if conn._generation != self._generation or len(idle) >= self.size:
+            self._discard(conn)
+            return
+        idle.append(conn)
+        with self._lock:
+            self._stats["released"] += 1
+
+    def _discard(self, conn: PooledConnection):
+        conn.dispose()
+        with self._lock:
+            self._stats["discarded"] += 1
+
+    def close_all(self):
+        """Close every idle connection; checked-out ones close on release."""
+        with self._lock:
+            self._generation += 1
+            conns = list(self._all)
+        for conn in conns:
+            if not conn._checked_out:
+                conn.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            live = list(self._all)
+            out = dict(self._stats)
+        out["db_path"] = self.db_path
+        out["pool_size"] = self.size
+        out["open"] = len(live)
+        out["checked_out"] = sum(1 for c in live if c._checked_out)
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def configure(db_path=None):
+    """Set the default database file used by get_conn() with no path."""
+    global DB_PATH
+    if db_path is not None:
+        DB_PATH = Path(db_path)
+
+
+def get_db_path() -> Path:
+    return Path(DB_PATH)
+
+
+def get_pool(db_path=None) -> ConnectionPool:
+    key = os.path.abspath(str(db_path if db_path is not None else DB_PATH))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(key)
+                _pools[key] = pool
+    return pool
+
+
+def get_conn(db_path=None, row_factory: Any = sqlite3.Row) -> sqlite3.Connection:
+    """
+    Check a connection out of the pool for `db_path` (default: configured DB).
+    Call close() when done — it returns the connection to the pool.
+
+    Inside a unit of work on the same database this returns the unit's
+    shared connection instead (see uow.py).
+    """
+    uow = ACTIVE_UOW.get()
+    if uow is not None and uow.covers(db_path):
+        return uow.connection(row_factory)
+    return get_pool(db_path).acquire(row_factory=row_factory)
+
+
+def add_commit_listener(fn: Callable[[str, FrozenSet[str]], None]):
+    """Call fn(db_path, tables) after every pooled commit that changed rows.
+    Runs on the committing thread: keep it short and never block."""
+    if fn not in _commit_listeners:
+        _commit_listeners.append(fn)
+
+
+def remove_commit_listener(fn: Callable[[str, FrozenSet[str]], None]):
+    if fn in _commit_listeners:
+        _commit_listeners.remove(fn)
+
+
+def close_all():
+    """Shutdown hook: close idle connections in every pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+def pool_stats() -> Dict[str, Any]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {p.db_path: p.stats() for p in pools}
@@ -0,0 +1,150 @@
+# ============================================================================
+# FORD CAD — Schema Metadata Registry
+# ============================================================================
+# Column sets and table-existence flags for the live database, loaded once
+# after migrations instead of running PRAGMA table_info / sqlite_master scans
+# on every audit write and panel poll.
+#
+# The registry is refreshed explicitly by whatever changes the schema
+# (ensure_phase3_schema, module schema init, admin resets). Lookups are
+# case-insensitive, matching SQLite's identifier rules.
+# ============================================================================
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, FrozenSet, Optional
+
+from .pool import get_conn, get_db_path
+
+logger = logging.getLogger("db.schema")
+
+
+class SchemaRegistry:
+    """Cached table/column metadata for one database file."""
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._columns: Optional[Dict[str, FrozenSet[str]]] = None
+        self._columns_lower: Dict[str, FrozenSet[str]] = {}
+        self.schema_version: Optional[int] = None
+        self.loads = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, conn: Optional[sqlite3.Connection] = None):
+        """(Re)read every table's columns. Uses `conn` if given (e.g. the
+        migration connection) so the registry sees uncommitted DDL too."""
+        own = conn is None
+        if own:
+            conn = get_conn(self.db_path, row_factory=None)
+        try:
+            names = [
+                r[0] for r in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'"
+                ).fetchall()
+            ]
+            columns: Dict[str, FrozenSet[str]] = {}
+            for name in names:
+                quoted = name.replace('"', '""')
+                # table_xinfo also lists generated columns (epoch shadows)
+                cols = conn.execute(f'PRAGMA table_xinfo("{quoted}")').fetchall()
+                if not cols:
+                    cols = conn.execute(f'PRAGMA table_info("{quoted}")').fetchall()
+                columns[name.lower()] = frozenset(r[1] for r in cols)
+            version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        finally:
+            if own:
+                conn.close()
+
+        with self._lock:
+            self._columns = columns
+            self._columns_lower = {
+                t: frozenset(c.lower() for c in cols) for t, cols in columns.items()
+            }
+            self.schema_version = version
+            self.loads += 1
+        logger.debug("[DB] Schema registry loaded: %d tables", len(columns))
+
+    def invalidate(self):
+        """Drop cached metadata; the next lookup reloads it."""
+        with self._lock:
+            self._columns = None
+            self._columns_lower = {}
+
+    def _ensure_loaded(self):
+        if self._columns is None:
+            self.load()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def has_table(self, table: str) -> bool:
+        self._ensure_loaded()
+        return str(table).lower() in (self._columns or {})
+
+    def columns(self, table: str) -> FrozenSet[str]:
+        """Declared column names of `table` (empty if the table is missing)."""
+        self._ensure_loaded()
+        return (self._columns or {}).get(str(table).lower(), frozenset())
+
+    def has_column(self, table: str, column: str) -> bool:
+        self._ensure_loaded()
+        return str(column).lower() in self._columns_lower.get(str(table).lower(), frozenset())
+
+    def tables(self) -> FrozenSet[str]:
+        self._ensure_loaded()
+        return frozenset((self._columns or {}).keys())
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_registries: Dict[str, SchemaRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_schema(db_path=None) -> SchemaRegistry:
+    key = os.path.abspath(str(db_path if db_path is not None else get_db_path()))
+    reg = _registries.get(key)
+    if reg is None:
+        with _registries_lock:
+            reg = _registries.get(key)
+            if reg is None:
+                reg = SchemaRegistry(key)
+                _registries[key] = reg
+    return reg
+
+
+def refresh_schema(db_path=None, conn: Optional[sqlite3.Connection] = None):
+    """Reload metadata now — call after migrations or any DDL."""
+    get_schema(db_path).load(conn)
+
+
+def invalidate_schema(db_path=None):
+    """Mark metadata stale (all databases when db_path is None)."""
+    if db_path is None:
+        with _registries_lock:
+            regs = list(_registries.values())
+        for reg in regs:
+            reg.invalidate()
+        return
+    get_schema(db_path).invalidate()
+
+
+def table_columns(table: str, db_path=None) -> FrozenSet[str]:
+    return get_schema(db_path).columns(table)
+
+
+def has_table(table: str, db_path=None) -> bool:
+    return get_schema(db_path).has_table(table)
+
+
+def has_column(table: str, column: str, db_path=None) -> bool:
+    return get_schema(db_path).has_column(table, column)
@@ -0,0 +1,269 @@
+# ============================================================================
+# FORD CAD — Reporting Snapshot (read-only copy for reports and exports)
+# ============================================================================
+# Report extractors, history exports and the NFIRS CSV run long read
+# queries. Against the live cad.db they compete with dispatch for the page
+# cache and DB workers, and keep the WAL from being checkpointed.
+#
+# Instead they read a copy of the database made with the SQLite online
+# backup API:
+#
+#     conn = reporting_conn()          # snapshot no older than MAX_AGE_S
+#     with reporting_snapshot():       # one consistent snapshot for a run
+#         ...
+#
+# A report whose range reaches the present passes not_before=time.time()
+# (or the range's end): the snapshot must have been taken after it, so
+# rows written just before the report are never missing from it.
+#
+# The backup runs in a single read transaction on its own connection. In
+# WAL mode that never blocks a writer. Each refresh writes a new generation
+# file (cad.snapshot.<n>.db in SNAPSHOT_DIR). Files are never modified
+# after creation, so readers open them immutable (no locks at all).
+# Generations still pinned by a running report are kept until it finishes.
+#
+# Closed incidents moved to cold storage (archive.py) are attached to every
+# reporting connection, so reports cover live and archived rows alike.
+#
+# CAD_REPORT_SNAPSHOT=0 sends all of this back to the live database.
+# ============================================================================
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import quote
+
+from .archive import archive_conn, attach_archives
+from .pool import get_db_path
+
+logger = logging.getLogger("db.snapshot")
+
+ENABLED = os.getenv("CAD_REPORT_SNAPSHOT", "1").strip().lower() not in ("0", "false", "no", "off")
+# Freshness bound: a snapshot older than this is refreshed before use
+MAX_AGE_S = float(os.getenv("CAD_REPORT_SNAPSHOT_MAX_AGE_S", "300"))
+SNAPSHOT_DIR = os.getenv("CAD_REPORT_SNAPSHOT_DIR", "")
+
+# Snapshot generation pinned by the current report run (see reporting_snapshot)
+_PINNED: ContextVar[Optional[str]] = ContextVar("cad_report_snapshot", default=None)
+
+
+class ReportingSnapshot:
+    """Periodically refreshed, read-only copy of one database file."""
+
+    def __init__(self, db_path=None, directory=None, max_age_s: float = MAX_AGE_S):
+        self.db_path = os.path.abspath(str(db_path if db_path is not None else get_db_path()))
+        src = Path(self.db_path)
+        self.directory = Path(directory or SNAPSHOT_DIR or src.parent / f"{src.stem}.snapshots")
+        self.max_age_s = max(0.0, float(max_age_s))
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._previous: Optional[str] = None
+        self._taken = 0.0           # monotonic
+        self._taken_wall = 0.0
+        self._generation = 0
+        self._pins: Dict[str, int] = {}
+        self._stats = {"refreshes": 0, "failed": 0, "last_refresh_ms": 0.0, "max_refresh_ms": 0.0}
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def age(self) -> Optional[float]:
+        return None if self._path is None else time.monotonic() - self._taken
+
+    def is_fresh(self, max_age_s: Optional[float] = None,
+                 not_before: Optional[float] = None) -> bool:
+        """Within the age bound and, given `not_before` (epoch seconds),
+        taken at or after it."""
+        age = self.age()
+        bound = self.max_age_s if max_age_s is None else max_age_s
+        if age is None or age > bound or not os.path.exists(self._path):
+            return False
+        return not_before is None or self._taken_wall >= not_before
+
+    def ensure_fresh(self, max_age_s: Optional[float] = None,
+                     not_before: Optional[float] = None) -> str:
+        """Path of a snapshot within the freshness bound, refreshing if needed."""
+        if self.is_fresh(max_age_s, not_before):
+            return self._path
+        with self._lock:
+            # Another caller may have refreshed while we waited
+            if self.is_fresh(max_age_s, not_before):
+                return self._path
+            return self._refresh_locked()
+
+    def refresh(self) -> str:
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> str:
+        started = time.perf_counter()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        generation = self._generation + 1
+        target = self.directory / f"{Path(self.db_path).stem}.snapshot.{generation}.db"
+        partial = target.with_suffix(".db.partial")
+        _remove(partial)
+
+        taken_wall = time.time()
+        src = sqlite3.connect(f"file:{quote(self.db_path)}?mode=ro", uri=True)
+        try:
+            dest = sqlite3.connect(str(partial))
+            try:
+                src.backup(dest)
+                dest.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                dest.close()
+        except Exception:
+            self._stats["failed"] += 1
+            _remove(partial)
+            raise
+        finally:
+            src.close()
+
+        os.replace(partial, target)
+        self._previous = self._path
+        self._generation = generation
+        self._path = str(target)
+        self._taken = time.monotonic()
+        self._taken_wall = taken_wall
+        ms = (time.perf_counter() - started) * 1000.0
+        self._stats["refreshes"] += 1
+        self._stats["last_refresh_ms"] = round(ms, 2)
+        self._stats["max_refresh_ms"] = round(max(self._stats["max_refresh_ms"], ms), 2)
+        logger.info("[DB] Reporting snapshot %d taken in %.0f ms", generation, ms)
+        self._cleanup_locked()
+        return self._path
+
+    def _cleanup_locked(self):
+        """Delete generations nobody is reading. The previous one is kept
+        for callers that looked up the path just before this refresh.
+        Best effort: Windows keeps open files locked; they go next time."""
+        keep = {self._path, self._previous} | {p for p, n in self._pins.items() if n > 0}
+        for f in self.directory.glob(f"{Path(self.db_path).stem}.snapshot.*.db"):
+            if str(f) not in keep:
+                _remove(f)
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def connect(path: str, row_factory: Any = sqlite3.Row) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{quote(path)}?mode=ro&immutable=1", uri=True, check_same_thread=False
+        )
+        conn.row_factory = row_factory
+        return conn
+
+    def pin(self, max_age_s: Optional[float] = None, not_before: Optional[float] = None) -> str:
+        with self._lock:
+            if not self.is_fresh(max_age_s, not_before):
+                self._refresh_locked()
+            path = self._path
+            self._pins[path] = self._pins.get(path, 0) + 1
+            return path
+
+    def unpin(self, path: str):
+        with self._lock:
+            n = self._pins.get(path, 0) - 1
+            if n > 0:
+                self._pins[path] = n
+            else:
+                self._pins.pop(path, None)
+                if path not in (self._path, self._previous):
+                    _remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["generation"] = self._generation
+            out["path"] = self._path
+            out["pinned"] = sum(self._pins.values())
+        age = self.age()
+        out["age_s"] = round(age, 1) if age is not None else None
+        out["taken_at"] = (
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self._taken_wall)) if self._taken_wall else None
+        )
+        out["max_age_s"] = self.max_age_s
+        out["enabled"] = ENABLED
+        return out
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug("[DB] Could not remove old snapshot %s: %s", path, e)
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_snapshots: Dict[str, ReportingSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_reporting_snapshot(db_path=None) -> ReportingSnapshot:
+    key = os.path.abspath(str(db_path if db_path is not None else get_db_path()))
+    snap = _snapshots.get(key)
+    if snap is None:
+        with _snapshots_lock:
+            snap = _snapshots.get(key)
+            if snap is None:
+                snap = ReportingSnapshot(key)
+                _snapshots[key] = snap
+    return snap
+
+
+def reporting_conn(max_age_s: Optional[float] = None, db_path=None,
+                   not_before: Optional[float] = None) -> sqlite3.Connection:
+    """
+    Read-only connection for reports / exports: the snapshot pinned by the
+    enclosing reporting_snapshot() block, else one no older than the
+    freshness bound. Falls back to the live database when disabled.
+    Archived incidents are attached either way.
+    """
+    if not ENABLED:
+        return archive_conn(db_path)
+    path = _PINNED.get()
+    if path is None:
+        path = get_reporting_snapshot(db_path).ensure_fresh(max_age_s, not_before)
+    conn = ReportingSnapshot.connect(path)
+    try:
+        attach_archives(conn, db_path)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+@contextmanager
+def reporting_snapshot(max_age_s: Optional[float] = None, db_path=None,
+                       not_before: Optional[float] = None) -> Iterator[Optional[str]]:
+    """Pin one snapshot generation for every reporting_conn() in the block,
+    so a multi-query report reads a single consistent state. `not_before`
+    (epoch seconds) requires a snapshot taken at or after that time."""
+    if not ENABLED or _PINNED.get() is not None:
+        yield _PINNED.get()
+        return
+    snap = get_reporting_snapshot(db_path)
+    path = snap.pin(max_age_s, not_before)
+    token = _PINNED.set(path)
+    try:
+        yield path
+    finally:
+        _PINNED.reset(token)
+        snap.unpin(path)
+
+
+def snapshot_stats(db_path=None) -> Dict[str, Any]:
+    return get_reporting_snapshot(db_path).stats()
@@ -0,0 +1,183 @@
+# ============================================================================
+# FORD CAD — Sargable Timestamps (integer epoch shadow columns)
+# ============================================================================
+# Timestamps are stored as 'YYYY-MM-DD HH:MM:SS' local-time text. Filters
+# like substr(ts, 1, 10) = ? or DATE(created) >= DATE(?) wrap the column in
+# a function, so SQLite cannot use an index and reads the whole table.
+#
+# Each hot timestamp gets an indexed INTEGER shadow column:
+#
+#     Incidents.created      -> created_epoch
+#     Incidents.closed_at    -> closed_epoch
+#     UnitAssignments.assigned / .cleared -> assigned_epoch / cleared_epoch
+#     DailyLog / Narrative / IncidentHistory / event_stream
+#           .timestamp       -> ts_epoch
+#
+# The shadows are VIRTUAL generated columns (strftime('%s', col)), so every
+# writer keeps them in sync for free and PRAGMA table_info / INSERTs without
+# a column list are unaffected. Values are wall-clock seconds: the local
+# text read as if it were UTC, exactly what strftime('%s') yields. Use
+# to_epoch() for bounds, never time.time().
+#
+# Queries build their range filters with time_range_sql() / date_range_sql(),
+# which fall back to a plain text range on databases without the shadows.
+# ============================================================================
+
+import calendar
+import datetime
+import logging
+import sqlite3
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from .migrations import MigrationSkipped
+from .schema import has_column
+
+logger = logging.getLogger("db.timestamps")
+
+# Generated columns need SQLite 3.31+
+MIN_SQLITE = (3, 31, 0)
+
+_TEXT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class EpochColumn(NamedTuple):
+    table: str
+    column: str
+    epoch_column: str
+
+
+EPOCH_COLUMNS = (
+    EpochColumn("Incidents", "created", "created_epoch"),
+    EpochColumn("Incidents", "closed_at", "closed_epoch"),
+    EpochColumn("UnitAssignments", "assigned", "assigned_epoch"),
+    EpochColumn("UnitAssignments", "cleared", "cleared_epoch"),
+    EpochColumn("DailyLog", "timestamp", "ts_epoch"),
+    EpochColumn("Narrative", "timestamp", "ts_epoch"),
+    EpochColumn("IncidentHistory", "timestamp", "ts_epoch"),
+    EpochColumn("event_stream", "timestamp", "ts_epoch"),
+)
+
+# Status-scoped date ranges (NFIRS export, closed-call reports): without
+# this the planner prefers the status index and sorts every CLOSED row
+EPOCH_INDEXES = (
+    ("idx_incidents_status_created_epoch", "Incidents", "status", "created_epoch"),
+)
+
+_BY_SOURCE = {(e.table.lower(), e.column.lower()): e for e in EPOCH_COLUMNS}
+
+
+def epoch_column_for(table: str, column: str) -> Optional[str]:
+    """Name of the epoch shadow of `table.column`, if one is defined."""
+    spec = _BY_SOURCE.get((table.lower(), column.lower()))
+    return spec.epoch_column if spec else None
+
+
+def install_epoch_columns(conn: sqlite3.Connection) -> List[str]:
+    """Add and index every epoch shadow column (migration step)."""
+    if sqlite3.sqlite_version_info < MIN_SQLITE:
+        raise MigrationSkipped(
+            f"SQLite {sqlite3.sqlite_version} has no generated columns; "
+            "range queries keep using text timestamps"
+        )
+    added: List[str] = []
+    present = set()
+    for spec in EPOCH_COLUMNS:
+        quoted = spec.table.replace('"', '""')
+        cols = {r[1] for r in conn.execute(f'PRAGMA table_xinfo("{quoted}")').fetchall()}
+        if not cols or spec.column not in cols:
+            continue
+        if spec.epoch_column not in cols:
+            conn.execute(
+                f'ALTER TABLE "{quoted}" ADD COLUMN {spec.epoch_column} INTEGER '
+                f"GENERATED ALWAYS AS (CAST(strftime('%s', {spec.column}) AS INTEGER)) VIRTUAL"
+            )
+            added.append(f"{spec.table}.{spec.epoch_column}")
+        present.add((spec.table, spec.epoch_column))
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{spec.table.lower()}_{spec.epoch_column} "
+            f'ON "{quoted}"({spec.epoch_column})'
+        )
+    for name, table, lead, epoch_col in EPOCH_INDEXES:
+        if (table, epoch_col) in present:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({lead}, {epoch_col})")
+    return added
+
+
+# ============================================================================
+# Conversions
+# ============================================================================
+
+def to_datetime(value: Any) -> datetime.datetime:
+    """Naive local datetime from a datetime, date or timestamp string
+    ('YYYY-MM-DD', 'YYYY-MM-DD HH:MM:SS', ISO 'T' / offset forms)."""
+    if isinstance(value, datetime.datetime):
+        dt = value
+    elif isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day)
+    else:
+        text = str(value or "").strip()
+        if not text:
+            raise ValueError("empty timestamp")
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        dt = datetime.datetime.fromisoformat(text)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def to_epoch(value: Any) -> int:
+    """Epoch bound matching the shadow columns (wall-clock seconds)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    return calendar.timegm(to_datetime(value).timetuple())
+
+
+def day_bounds(start_date: Any = None, end_date: Any = None) -> Tuple[Optional[datetime.datetime],
+                                                                      Optional[datetime.datetime]]:
+    """[start, end) covering whole calendar days; end_date is inclusive."""
+    start = end = None
+    if start_date:
+        d = to_datetime(start_date)
+        start = datetime.datetime(d.year, d.month, d.day)
+    if end_date:
+        d = to_datetime(end_date)
+        end = datetime.datetime(d.year, d.month, d.day) + datetime.timedelta(days=1)
+    return start, end
+
+
+# ============================================================================
+# Range filters
+# ============================================================================
+
+def time_range_sql(table: str, column: str, start: Any = None, end: Any = None,
+                   alias: Optional[str] = None, db_path=None) -> Tuple[str, List[Any]]:
+    """
+    WHERE fragment + params selecting start <= table.column < end. Uses the
+    indexed epoch shadow when the database has it, else a text range on
+    the raw column (still sargable for 'YYYY-MM-DD HH:MM:SS' values).
+    Returns ("1=1", []) when neither bound is given.
+    """
+    prefix = f"{alias}." if alias else ""
+    epoch_col = epoch_column_for(table, column)
+    use_epoch = epoch_col is not None and has_column(table, epoch_col, db_path)
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    for bound, op in ((start, ">="), (end, "<")):
+        if bound is None or bound == "":
+            continue
+        if use_epoch:
+            clauses.append(f"{prefix}{epoch_col} {op} ?")
+            params.append(to_epoch(bound))
+        else:
+            clauses.append(f"{prefix}{column} {op} ?")
+            params.append(to_datetime(bound).strftime(_TEXT_FORMAT))
+    return (" AND ".join(clauses) or "1=1"), params
+
+
+def date_range_sql(table: str, column: str, start_date: Any = None, end_date: Any = None,
+                   alias: Optional[str] = None, db_path=None) -> Tuple[str, List[Any]]:
+    """time_range_sql() over whole days, both dates inclusive."""
+    start, end = day_bounds(start_date, end_date)
+    return time_range_sql(table, column, start, end, alias=alias, db_path=db_path)
@@ -0,0 +1,210 @@
+# ============================================================================
+# FORD CAD — Unit of Work
+# ============================================================================
+# One connection, one transaction, one commit for a whole dispatch / status
+# change / clear — including the audit rows it produces.
+#
+#     with unit_of_work():
+#         ...                      # any get_conn() in this context shares
+#                                  # the unit's connection; commit()/close()
+#                                  # on it are deferred to the end of the block
+#         after_commit(fn, ...)    # runs only if the block commits
+#
+# While a unit is active (per thread / asyncio task, via a ContextVar):
+#   - app.db.get_conn() for the same database returns a shared handle;
+#     BEGIN/COMMIT statements and commit()/close() calls become no-ops and
+#     rollback() marks the unit rollback-only.
+#   - Audit rows (masterlog, incident_history, emit_event, ...) are written
+#     in the unit's transaction instead of the audit writer's queue, so the
+#     audit trail is atomic with the state change.
+#   - Post-commit hooks (broadcasts, chat cards, playbooks) are deferred
+#     until the commit succeeds and dropped on rollback.
+#   - Tables the unit changed reach the pool's commit listeners (panel
+#     push, held counter, board reconciler) once, at COMMIT.
+#
+# The transaction starts with BEGIN IMMEDIATE on the first checkout. Do not
+# await inside a unit: the write lock is held until the block exits.
+# ============================================================================
+
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from .pool import ACTIVE_UOW, PooledConnection, get_pool
+
+logger = logging.getLogger("db.uow")
+
+_TX_STATEMENTS = ("BEGIN", "COMMIT", "END", "ROLLBACK")
+
+
+class _UnitCursor(sqlite3.Cursor):
+    """Cursor on the unit's connection: transaction statements are no-ops.
+    Changed tables are noted on the connection, so the unit's COMMIT tells
+    the pool's commit listeners about them."""
+
+    def execute(self, sql, parameters=()):
+        head = sql.lstrip()[:8].upper()
+        if head.startswith(_TX_STATEMENTS) and not head.startswith("ROLLBACK TO"):
+            if head.startswith("ROLLBACK"):
+                self.connection._cad_uow.set_rollback_only()
+            return self
+        result = super().execute(sql, parameters)
+        self.connection._note_changes(sql, result)
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        result = super().executemany(sql, seq_of_parameters)
+        self.connection._note_changes(sql, result)
+        return result
+
+
+class SharedConnection:
+    """Connection handle given out by get_conn() inside a unit of work."""
+
+    def __init__(self, uow: "UnitOfWork", row_factory: Any):
+        self._uow = uow
+        self.row_factory = row_factory
+
+    def cursor(self, factory=None) -> sqlite3.Cursor:
+        cur = self._uow._raw().cursor(_UnitCursor)
+        cur.row_factory = self.row_factory
+        return cur
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script):
+        raise sqlite3.ProgrammingError("executescript() commits implicitly; not allowed in a unit of work")
+
+    def commit(self):
+        # Committed once, when the unit of work exits
+        pass
+
+    def rollback(self):
+        self._uow.set_rollback_only()
+
+    def close(self):
+        pass
+
+    @property
+    def in_transaction(self) -> bool:
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._uow.set_rollback_only()
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._uow._raw(), name)
+
+
+class UnitOfWork:
+    """A single write transaction shared by everything in its context."""
+
+    def __init__(self, db_path=None):
+        self.pool = get_pool(db_path)
+        self.db_path = self.pool.db_path
+        self._conn: Optional[PooledConnection] = None
+        self._hooks: List[Tuple[Callable[..., Any], tuple, dict]] = []
+        self.rollback_only = False
+
+    def covers(self, db_path) -> bool:
+        if db_path is None:
+            from .pool import get_db_path
+            db_path = get_db_path()
+        return os.path.abspath(str(db_path)) == self.db_path
+
+    def _raw(self) -> PooledConnection:
+        if self._conn is None:
+            conn = self.pool.acquire(row_factory=None)
+            conn._cad_uow = self
+            conn.execute("BEGIN IMMEDIATE")
+            self._conn = conn
+        return self._conn
+
+    def connection(self, row_factory: Any = sqlite3.Row) -> SharedConnection:
+        return SharedConnection(self, row_factory)
+
+    def cursor(self, row_factory: Any = sqlite3.Row) -> sqlite3.Cursor:
+        return self.connection(row_factory).cursor()
+
+    def after_commit(self, fn: Callable[..., Any], *args, **kwargs):
+        self._hooks.append((fn, args, kwargs))
+
+    def set_rollback_only(self):
+        self.rollback_only = True
+
+    def _finish(self, failed: bool):
+        conn, self._conn = self._conn, None
+        hooks, self._hooks = self._hooks, []
+        committed = False
+        if conn is not None:
+            try:
+                if failed or self.rollback_only:
+                    conn.rollback()
+                else:
+                    conn.commit()
+                    committed = True
+            finally:
+                conn._cad_uow = None
+                conn.close()
+        else:
+            committed = not (failed or self.rollback_only)
+
+        if not committed:
+            return
+        for fn, args, kwargs in hooks:
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                logger.warning("[DB] after_commit hook %s failed: %s",
+                               getattr(fn, "__name__", fn), e)
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+def current_uow(db_path=None) -> Optional[UnitOfWork]:
+    """The active unit of work for this context (and database), if any."""
+    uow = ACTIVE_UOW.get()
+    if uow is not None and uow.covers(db_path):
+        return uow
+    return None
+
+
+@contextmanager
+def unit_of_work(db_path=None) -> Iterator[UnitOfWork]:
+    """Run the block as one transaction. Nested units join the outer one."""
+    outer = current_uow(db_path)
+    if outer is not None:
+        yield outer
+        return
+
+    uow = UnitOfWork(db_path)
+    token = ACTIVE_UOW.set(uow)
+    failed = True
+    try:
+        yield uow
+        failed = False
+    finally:
+        ACTIVE_UOW.reset(token)
+        uow._finish(failed)
+
+
+def after_commit(fn: Callable[..., Any], *args, **kwargs):
+    """Run fn after the active unit of work commits (immediately if none)."""
+    uow = ACTIVE_UOW.get()
+    if uow is None:
+        fn(*args, **kwargs)
+        return
+    uow.after_commit(fn, *args, **kwargs)
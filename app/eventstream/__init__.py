@@ -3,11 +3,18 @@ FORD-CAD Event Stream Module
 Single operational memory that records every CAD action in real-time.
 """
 from .routes import register_eventstream_routes
-from .emitter import emit_event
+from .emitter import emit_event, flush_playbooks, stop_playbook_worker
 from .models import init_eventstream_schema
+from .replay import EventReplay, events_since, get_event_replay, replay_stats
 
 __all__ = [
     "register_eventstream_routes",
     "emit_event",
+    "flush_playbooks",
+    "stop_playbook_worker",
     "init_eventstream_schema",
+    "EventReplay",
+    "events_since",
+    "get_event_replay",
+    "replay_stats",
 ]
@@ -2,29 +2,24 @@
 FORD-CAD Event Stream — Core Emitter
 
 emit_event() is the single entry point for recording operational events.
-It writes to the DB and broadcasts via WebSocket. Wrapped in try/except
-so it NEVER breaks the caller's flow.
+It queues the row on the audit writer; once the row is committed it is
+broadcast via WebSocket and playbooks are evaluated against it. Wrapped in try/except so it NEVER breaks the caller's flow.
+
+Playbooks run on their own worker thread (one, so evaluations stay in
+event order), never inside the audit writer's commit path: their reads,
+actions and narrative writes must not stall the group commit.
 """
 import datetime
 import json
-import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 
-from .models import insert_event, init_eventstream_schema
+from .models import queue_event
 
 logger = logging.getLogger(__name__)
 
-# Track whether schema has been initialized
-_schema_ready = False
-
-
-def _ensure_schema():
-    global _schema_ready
-    if not _schema_ready:
-        init_eventstream_schema()
-        _schema_ready = True
-
 
 def _ts() -> str:
     return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -85,24 +80,39 @@ def emit_event(
     category: Optional[str] = None,
     severity: Optional[str] = None,
     shift: Optional[str] = None,
-) -> Optional[int]:
+) -> bool:
     """
     Record an operational event to the event stream.
 
     This is ADDITIVE — it never replaces masterlog(), incident_history(), or dailylog_event().
     Wrapped in try/except so it never breaks the calling function.
 
-    Returns the event ID on success, None on failure.
+    The row is group-committed by the audit writer; the WebSocket broadcast
+    (which carries the new event ID) and playbook evaluation run after the
+    commit.
+    Returns True if the event was recorded/queued, False on failure.
     """
     try:
-        _ensure_schema()
-
         timestamp = _ts()
         cat = category or _category_for_event(event_type)
         sev = severity or _severity_for_event(event_type)
         sh = shift or _current_shift()
 
-        event_id = insert_event(
+        def _committed(event_id):
+            _broadcast_event(event_id, timestamp, event_type, cat, sev,
+                             incident_id, unit_id, user, summary, sh)
+            if incident_id:
+                # Reloads an open IAW only; board panels are pushed by the
+                # commit listener from the tables the write changed
+                from app.messaging.panel_push import mark_panels_dirty
+                mark_panels_dirty(incident_id=incident_id)
+            _submit_playbooks(event_type, {
+                "event_type": event_type, "incident_id": incident_id,
+                "unit_id": unit_id, "user": user, "summary": summary or "",
+                "category": cat, "severity": sev, "shift": sh,
+            })
+
+        queue_event(
             timestamp=timestamp,
             event_type=event_type,
             category=cat,
@@ -113,38 +123,97 @@ def emit_event(
             summary=summary,
             details=details,
             shift=sh,
+            on_commit=_committed,
         )
 
-        # Broadcast via WebSocket (non-blocking)
-        _broadcast_event(event_id, timestamp, event_type, cat, sev, incident_id, unit_id, user, summary, sh)
+        return True
 
-        # Evaluate playbooks (non-blocking, never breaks caller)
-        try:
-            from app.playbooks.engine import evaluate_playbooks
-            context = {
-                "event_type": event_type, "incident_id": incident_id,
-                "unit_id": unit_id, "user": user, "summary": summary or "",
-                "category": cat, "severity": sev, "shift": sh,
-            }
-            evaluate_playbooks(event_type, context)
-        except Exception:
-            pass
+    except Exception as e:
+        logger.error(f"[EventStream] emit_event failed: {e}")
+        return False
+
+
+# ============================================================================
+# Playbook worker
+# ============================================================================
 
-        return event_id
+_playbook_lock = threading.Lock()
+_playbook_pool: Optional[ThreadPoolExecutor] = None
+_playbooks_stopped = False
 
+
+def _submit_playbooks(event_type: str, context: Dict):
+    """Queue playbook evaluation for an event whose row is committed.
+
+    Called from the audit writer's commit callback (or a unit of work's
+    after-commit hook); the evaluation itself runs on the playbook worker.
+    """
+    global _playbook_pool
+    try:
+        with _playbook_lock:
+            if _playbooks_stopped:
+                raise RuntimeError("playbook worker stopped")
+            if _playbook_pool is None:
+                _playbook_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cad-playbooks")
+            pool = _playbook_pool
+        pool.submit(_evaluate_playbooks, event_type, context)
+    except RuntimeError:
+        # Shutting down: evaluate in place rather than drop the event
+        _evaluate_playbooks(event_type, context)
+
+
+def flush_playbooks(timeout: Optional[float] = None) -> bool:
+    """Wait until every playbook evaluation queued so far has run."""
+    with _playbook_lock:
+        pool = _playbook_pool
+    if pool is None:
+        return True
+    try:
+        pool.submit(lambda: None).result(timeout)
+        return True
+    except Exception:
+        return False
+
+
+def stop_playbook_worker(wait: bool = True):
+    """Shutdown hook: run the queued evaluations, then stop the worker.
+    Later events (the audit writer's final commits) are evaluated in place."""
+    global _playbook_pool, _playbooks_stopped
+    with _playbook_lock:
+        pool, _playbook_pool = _playbook_pool, None
+        _playbooks_stopped = True
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def _evaluate_playbooks(event_type: str, context: Dict):
+    """Run playbooks for an event whose row is committed (never raises).
+
+    Runs on the playbook worker, so playbook actions see the event row and
+    never act on a rolled-back change, and count_fires_for_incident's
+    flush_audit() really waits for earlier executions.
+    """
+    try:
+        from app.playbooks.engine import evaluate_playbooks
+        evaluate_playbooks(event_type, context)
     except Exception as e:
-        logger.error(f"[EventStream] emit_event failed: {e}")
-        return None
+        logger.debug(f"[EventStream] playbook evaluation skipped: {e}")
 
 
 def _broadcast_event(
     event_id, timestamp, event_type, category, severity,
     incident_id, unit_id, user, summary, shift
 ):
-    """Broadcast event via WebSocket to all connected clients."""
+    """Broadcast event via WebSocket to connected clients (those with
+    topic subscriptions only get matching events).
+
+    Called after commit, usually on the audit writer thread; the event
+    bridge hands it to the server loop.
+    """
     try:
-        from app.messaging.websocket import get_broadcaster
-        broadcaster = get_broadcaster()
+        from app.messaging.bridge import publish
+        from app.messaging.websocket import event_topic
+        from .replay import remember_event
 
         payload = {
             "id": event_id,
@@ -159,13 +228,10 @@ def _broadcast_event(
             "shift": shift,
         }
 
-        # Schedule async broadcast from sync context
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.broadcast("event_stream", payload))
-        except RuntimeError:
-            # No running loop — skip broadcast (DB write still succeeded)
-            pass
+        # Before publishing: a client reconnecting now must find it
+        remember_event(payload)
+        publish("event_stream", payload,
+                topic=event_topic(incident_id, unit_id, category, severity))
 
     except Exception as e:
         logger.debug(f"[EventStream] broadcast skipped: {e}")
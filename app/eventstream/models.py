@@ -1,17 +1,20 @@
 """
 FORD-CAD Event Stream — Database Models & Query Helpers
 """
-import sqlite3
 import json
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict
 
-DB_PATH = "cad.db"
+from app.db import audit_insert, get_conn
+
+_INSERT_SQL = """
+    INSERT INTO event_stream
+        (timestamp, event_type, category, severity, incident_id, unit_id, user, summary, details_json, shift)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 def _get_conn():
-    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_conn()
 
 
 def init_eventstream_schema():
@@ -59,11 +62,7 @@ def insert_event(
     """Insert an event and return its ID."""
     conn = _get_conn()
     c = conn.cursor()
-    c.execute("""
-        INSERT INTO event_stream
-            (timestamp, event_type, category, severity, incident_id, unit_id, user, summary, details_json, shift)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    c.execute(_INSERT_SQL, (
         timestamp, event_type, category, severity,
         incident_id, unit_id, user, summary,
         json.dumps(details) if details else None,
@@ -75,6 +74,28 @@ def insert_event(
     return event_id
 
 
+def queue_event(
+    timestamp: str,
+    event_type: str,
+    category: str = "system",
+    severity: str = "info",
+    incident_id: Optional[int] = None,
+    unit_id: Optional[str] = None,
+    user: Optional[str] = None,
+    summary: Optional[str] = None,
+    details: Optional[Dict] = None,
+    shift: Optional[str] = None,
+    on_commit: Optional[Callable[[int], None]] = None,
+) -> None:
+    """Queue an event on the audit writer; on_commit(event_id) runs once it is committed."""
+    audit_insert(_INSERT_SQL, (
+        timestamp, event_type, category, severity,
+        incident_id, unit_id, user, summary,
+        json.dumps(details) if details else None,
+        shift,
+    ), on_commit=on_commit, name="event_stream")
+
+
 def query_events(
     limit: int = 50,
     offset: int = 0,
@@ -0,0 +1,142 @@
+"""
+FORD-CAD Event Stream — Reconnect Replay
+
+A console that reconnects presents the last event_stream id it saw
+(WebSocket ?last_event_id= / "resume" message, SSE Last-Event-ID) and is
+sent the events it missed instead of refetching the whole board.
+
+Recent events are kept in a ring buffer (REPLAY_BUFFER entries), filled by
+the emitter as each event is committed. A gap older than the ring is read
+from the event_stream table. Gaps longer than REPLAY_MAX events, or an id
+this server has never issued (database replaced), come back as incomplete
+and the client does a full refresh as before.
+"""
+import bisect
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.db import get_conn
+
+logger = logging.getLogger(__name__)
+
+REPLAY_BUFFER = int(os.getenv("CAD_EVENT_REPLAY_BUFFER", "1000"))
+REPLAY_MAX = int(os.getenv("CAD_EVENT_REPLAY_MAX", "500"))
+
+# Columns of the broadcast payload (emitter._broadcast_event)
+FIELDS = ("id", "timestamp", "event_type", "category", "severity",
+          "incident_id", "unit_id", "user", "summary", "shift")
+
+
+class EventReplay:
+    """Ring buffer of recently broadcast events with a table fallback."""
+
+    def __init__(self, capacity: int = REPLAY_BUFFER, db_path=None):
+        self.capacity = max(1, int(capacity))
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._ring: Deque[Dict] = deque()
+        # Every event with id > _floor is in the ring (None: nothing yet)
+        self._floor: Optional[int] = None
+        self._stats = {"remembered": 0, "replays": 0, "from_ring": 0,
+                       "from_table": 0, "incomplete": 0}
+
+    def remember(self, payload: Dict):
+        """Add a committed event. Usually called in commit order; events
+        relayed from other workers (messaging/bus.py) can arrive late and
+        are put in id order."""
+        event_id = payload.get("id")
+        if event_id is None:
+            return
+        with self._lock:
+            if self._floor is None:
+                self._floor = event_id - 1
+            elif event_id <= self._floor:
+                return
+            if not self._ring or event_id > self._ring[-1]["id"]:
+                self._ring.append(payload)
+            else:
+                ids = [e["id"] for e in self._ring]
+                pos = bisect.bisect_left(ids, event_id)
+                if pos < len(ids) and ids[pos] == event_id:
+                    return
+                self._ring.insert(pos, payload)
+            if len(self._ring) > self.capacity:
+                self._floor = self._ring.popleft()["id"]
+            self._stats["remembered"] += 1
+
+    def since(self, last_id: int, limit: int = REPLAY_MAX) -> Tuple[List[Dict], bool]:
+        """Events after `last_id`, oldest first, and whether that is the
+        whole gap. Reads the table when the ring does not reach back."""
+        last_id = int(last_id)
+        with self._lock:
+            self._stats["replays"] += 1
+            if self._floor is not None and last_id >= self._floor:
+                newest = self._ring[-1]["id"] if self._ring else self._floor
+                if last_id > newest:
+                    # Never issued here: the client saw a different database
+                    self._stats["incomplete"] += 1
+                    return [], False
+                events = [e for e in self._ring if e["id"] > last_id]
+                self._stats["from_ring"] += 1
+                complete = len(events) <= limit
+                if not complete:
+                    self._stats["incomplete"] += 1
+                return events[:limit], complete
+
+        events, complete = self._from_table(last_id, limit)
+        with self._lock:
+            self._stats["from_table"] += 1
+            if not complete:
+                self._stats["incomplete"] += 1
+        return events, complete
+
+    def _from_table(self, last_id: int, limit: int) -> Tuple[List[Dict], bool]:
+        conn = get_conn(self.db_path)
+        try:
+            newest = conn.execute("SELECT MAX(id) FROM event_stream").fetchone()[0] or 0
+            if last_id > newest:
+                return [], False
+            rows = conn.execute(
+                f"SELECT {', '.join(FIELDS)} FROM event_stream WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, limit + 1),
+            ).fetchall()
+        finally:
+            conn.close()
+        events = [dict(zip(FIELDS, tuple(r))) for r in rows]
+        return events[:limit], len(events) <= limit
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["buffered"] = len(self._ring)
+            out["oldest_id"] = self._ring[0]["id"] if self._ring else None
+            out["newest_id"] = self._ring[-1]["id"] if self._ring else None
+        out["capacity"] = self.capacity
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_replay = EventReplay()
+
+
+def get_event_replay() -> EventReplay:
+    return _replay
+
+
+def remember_event(payload: Dict):
+    _replay.remember(payload)
+
+
+def events_since(last_id: int, limit: int = REPLAY_MAX) -> Tuple[List[Dict], bool]:
+    """Blocking when the gap is read from the table: call via run_db."""
+    return _replay.since(last_id, limit)
+
+
+def replay_stats() -> Dict[str, Any]:
+    return _replay.stats()
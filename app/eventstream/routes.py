@@ -5,16 +5,14 @@ from fastapi import FastAPI, Request, Query
 from fastapi.responses import HTMLResponse, JSONResponse
 from typing import Optional
 
-from .models import query_events, count_events, get_event_stats, init_eventstream_schema
+from .models import query_events, count_events, get_event_stats
 
 
 def register_eventstream_routes(app: FastAPI):
     """Register all event stream endpoints."""
 
-    init_eventstream_schema()
-
     @app.get("/api/event-stream")
-    async def api_event_stream(
+    def api_event_stream(
         request: Request,
         limit: int = Query(50, ge=1, le=500),
         offset: int = Query(0, ge=0),
@@ -47,7 +45,7 @@ def register_eventstream_routes(app: FastAPI):
         }
 
     @app.get("/api/event-stream/stats")
-    async def api_event_stream_stats(
+    def api_event_stream_stats(
         request: Request,
         since: Optional[str] = None,
     ):
@@ -56,7 +54,7 @@ def register_eventstream_routes(app: FastAPI):
         return {"ok": True, "stats": stats}
 
     @app.get("/partials/event-stream/rows", response_class=HTMLResponse)
-    async def partials_event_stream_rows(
+    def partials_event_stream_rows(
         request: Request,
         limit: int = Query(50, ge=1, le=200),
         offset: int = Query(0, ge=0),
@@ -74,7 +72,7 @@ def register_eventstream_routes(app: FastAPI):
         return _render_timeline_rows(events)
 
     @app.get("/modals/event-stream", response_class=HTMLResponse)
-    async def modal_event_stream(request: Request):
+    def modal_event_stream(request: Request):
         """Full timeline modal HTML."""
         events = query_events(limit=100)
         stats = get_event_stats()
@@ -2,23 +2,20 @@
 # FORD CAD — Call History Query Layer
 # ============================================================================
 # Unified event queries: Incidents + DailyLog via UNION ALL,
-# with server-side filtering and pagination.
+# with server-side filtering and pagination. Incident reads go through
+# archive_conn(), so archived (cold-storage) calls show up like live ones.
 # ============================================================================
 
-import sqlite3
 import logging
-from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-logger = logging.getLogger("history.queries")
+from app.db import archive_conn, get_conn, reporting_conn
 
-DB_PATH = Path(__file__).resolve().parent.parent.parent / "cad.db"
+logger = logging.getLogger("history.queries")
 
 
 def _get_conn():
-    conn = sqlite3.connect(str(DB_PATH), timeout=30, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_conn()
 
 
 # ============================================================================
@@ -29,9 +26,13 @@ def fetch_unified_events(
     filters: Optional[Dict[str, Any]] = None,
     page: int = 1,
     per_page: int = 50,
+    snapshot: bool = False,
 ) -> Dict[str, Any]:
     """Return paginated, filtered events from Incidents + DailyLog.
 
+    snapshot=True reads the reporting snapshot instead of the live DB
+    (bulk exports).
+
     Returns {"events": [...], "total": int, "page": int, "per_page": int, "pages": int}
     """
     if filters is None:
@@ -221,7 +222,7 @@ def fetch_unified_events(
         total_sql = " + ".join(f"({cp})" for cp in count_parts)
         total_sql = f"SELECT {total_sql}"
 
-    conn = _get_conn()
+    conn = reporting_conn() if snapshot else archive_conn()
     try:
         c = conn.cursor()
         total = c.execute(total_sql, count_params).fetchone()[0]
@@ -246,7 +247,7 @@ def fetch_unified_events(
 
 def fetch_incident_detail(incident_id: int) -> Optional[Dict[str, Any]]:
     """Return full incident data including narrative, timeline, units."""
-    conn = _get_conn()
+    conn = archive_conn()
     try:
         c = conn.cursor()
 
@@ -297,7 +298,7 @@ def fetch_incident_detail(incident_id: int) -> Optional[Dict[str, Any]]:
 
 def fetch_unit_assignments(incident_id: int) -> List[Dict[str, Any]]:
     """Return unit-level timestamps from UnitAssignments."""
-    conn = _get_conn()
+    conn = archive_conn()
     try:
         rows = conn.execute("""
             SELECT *
@@ -405,7 +406,7 @@ def log_export(incident_id: int, fmt: str, artifact_path: str) -> int:
 
 def get_distinct_values() -> Dict[str, List[str]]:
     """Return distinct event_types, dispositions, units, shifts for filter dropdowns."""
-    conn = _get_conn()
+    conn = archive_conn()
     try:
         c = conn.cursor()
 
@@ -14,6 +14,8 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 
+from app.db import run_db
+
 from .queries import (
     create_saved_view,
     delete_saved_view,
@@ -68,7 +70,7 @@ async def history_modal(request: Request):
 @modal_router.get("/modals/history/incident/{incident_id}", response_class=HTMLResponse)
 async def history_incident_report(request: Request, incident_id: int):
     """Return a printable HTML incident report."""
-    incident = fetch_incident_detail(incident_id)
+    incident = await run_db(fetch_incident_detail, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     html = render_incident_html(incident)
@@ -126,7 +128,7 @@ async def api_history_list(
         filters["sort"] = sort
 
     try:
-        result = fetch_unified_events(filters=filters, page=page, per_page=per_page)
+        result = await run_db(fetch_unified_events, filters=filters, page=page, per_page=per_page)
         return result
     except Exception as e:
         logger.error("api_history_list failed: %s\n%s", e, traceback.format_exc())
@@ -140,13 +142,13 @@ async def api_history_list(
 @api_router.get("/filters")
 async def api_history_filters():
     """Return distinct values for filter dropdowns."""
-    return get_distinct_values()
+    return await run_db(get_distinct_values)
 
 
 @api_router.get("/saved-views")
 async def api_saved_views_list():
     """List saved views."""
-    views = get_saved_views()
+    views = await run_db(get_saved_views)
     return {"views": views}
 
 
@@ -164,12 +166,12 @@ async def api_saved_views_create(request: Request):
         raise HTTPException(status_code=400, detail="name is required")
 
     user = _get_user(request)
-    view_id = create_saved_view(name, json.dumps(filters), user)
+    view_id = await run_db(create_saved_view, name, json.dumps(filters), user)
     return {"ok": True, "id": view_id}
 
 
 @api_router.delete("/saved-views/{view_id}")
-async def api_saved_views_delete(view_id: int):
+def api_saved_views_delete(view_id: int):
     """Delete a saved view."""
     ok = delete_saved_view(view_id)
     if not ok:
@@ -191,6 +193,10 @@ async def api_history_export(request: Request):
     if not incident_id:
         raise HTTPException(status_code=400, detail="incident_id is required")
 
+    return await run_db(_export_incident, incident_id, formats)
+
+
+def _export_incident(incident_id, formats):
     incident = fetch_incident_detail(incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
@@ -233,6 +239,10 @@ async def api_history_send(request: Request):
     if not destination:
         raise HTTPException(status_code=400, detail="destination is required")
 
+    return await run_db(_send_incident, incident_id, channel, destination)
+
+
+def _send_incident(incident_id, channel: str, destination: str):
     incident = fetch_incident_detail(incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
@@ -342,7 +352,7 @@ async def api_export_results(request: Request):
     filters = data.get("filters", {})
     fmt = data.get("format", "csv")
 
-    result = fetch_unified_events(filters, page=1, per_page=10000)
+    result = await run_db(fetch_unified_events, filters, page=1, per_page=10000, snapshot=True)
     events = result.get("events", [])
     ts_slug = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -382,7 +392,7 @@ async def api_send_results(request: Request):
     if not destination:
         raise HTTPException(status_code=400, detail="destination is required")
 
-    result = fetch_unified_events(filters, page=1, per_page=10000)
+    result = await run_db(fetch_unified_events, filters, page=1, per_page=10000, snapshot=True)
     events = result.get("events", [])
     total = result.get("total", 0)
 
@@ -456,7 +466,7 @@ async def api_send_results(request: Request):
 
 
 @api_router.get("/download/{incident_id}/{fmt}")
-async def api_history_download(incident_id: int, fmt: str):
+def api_history_download(incident_id: int, fmt: str):
     """Download an exported incident artifact."""
     artifact_dir = Path("artifacts/history") / str(incident_id)
     if not artifact_dir.exists():
@@ -492,7 +502,7 @@ async def api_history_download(incident_id: int, fmt: str):
 @api_router.get("/{incident_id}")
 async def api_history_detail(incident_id: int):
     """Full incident data (JSON)."""
-    incident = fetch_incident_detail(incident_id)
+    incident = await run_db(fetch_incident_detail, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     return {"ok": True, "incident": incident}
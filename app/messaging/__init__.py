@@ -4,6 +4,9 @@
 # Provides internal and external messaging capabilities including:
 # - Channel-based real-time chat (DM, incident, shift, ops, broadcast)
 # - Presence tracking, structured cards, reactions, ACK-required
+# - Event bridge: thread-safe broadcast from sync code / worker threads
+# - Event bus: broadcasts relayed across uvicorn workers (CAD_EVENT_BUS)
+# - Panel push: "panel dirty" notices so consoles refetch on change
 # - SMS via Twilio
 # - Email via SendGrid
 # - Signal (experimental)
@@ -14,6 +17,32 @@ from .models import init_messaging_schema, init_chat_schema
 from .routes import register_messaging_routes
 from .websocket import MessageBroadcaster
 from .chat_engine import ChatEngine, get_chat_engine
+from .bridge import (
+    EventBridge,
+    event_bridge_stats,
+    get_event_bridge,
+    publish,
+    publish_to_users,
+    start_event_bridge,
+    stop_event_bridge,
+)
+from .bus import (
+    LocalBus,
+    SQLiteBus,
+    event_bus_stats,
+    get_event_bus,
+    start_event_bus,
+    stop_event_bus,
+)
+from .panel_push import (
+    PanelPush,
+    get_panel_push,
+    held_count,
+    mark_panels_dirty,
+    panel_push_stats,
+    start_panel_push,
+    stop_panel_push,
+)
 
 __all__ = [
     "init_messaging_schema",
@@ -22,4 +51,24 @@ __all__ = [
     "MessageBroadcaster",
     "ChatEngine",
     "get_chat_engine",
+    "EventBridge",
+    "event_bridge_stats",
+    "get_event_bridge",
+    "publish",
+    "publish_to_users",
+    "start_event_bridge",
+    "stop_event_bridge",
+    "LocalBus",
+    "SQLiteBus",
+    "event_bus_stats",
+    "get_event_bus",
+    "start_event_bus",
+    "stop_event_bus",
+    "PanelPush",
+    "get_panel_push",
+    "held_count",
+    "mark_panels_dirty",
+    "panel_push_stats",
+    "start_panel_push",
+    "stop_panel_push",
 ]
@@ -0,0 +1,215 @@
+# ============================================================================
+# FORD-CAD Messaging — Event Bridge (any thread -> asyncio broadcaster)
+# ============================================================================
+# MessageBroadcaster lives on the server's event loop. Most publishers do
+# not: sync FastAPI routes run in the threadpool, emit_event() broadcasts
+# from the audit writer thread, and reminders / reports / the scheduled
+# incident check run on their own threads. asyncio.get_running_loop()
+# raises there, and the broadcast used to be dropped silently.
+#
+# The bridge captures the server loop at startup. publish() may be called
+# from any thread:
+#
+#     publish("reminder", payload)                      # everyone
+#     publish_to_users(ids, "channel_message", payload)
+#
+# Items go into a bounded queue (MAX_QUEUE, oldest dropped first) and a
+# consumer task on the loop hands them to the broadcaster in order. Only
+# an idle -> busy transition costs a call_soon_threadsafe. Drops (full
+# queue, no loop yet) and delivery latency are in event_bridge_stats().
+# ============================================================================
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_QUEUE = int(os.getenv("CAD_EVENT_BRIDGE_MAX_QUEUE", "1000"))
+
+# (published_at, event_type, data, user_ids or None, exclude_users, topic)
+_Item = Tuple[float, str, Dict, Optional[List[str]], Optional[List[str]], Optional[Dict]]
+
+
+class EventBridge:
+    """Thread-safe, bounded hand-off from any thread to the broadcaster."""
+
+    def __init__(self, max_queue: int = MAX_QUEUE, broadcaster=None):
+        self.max_queue = max(1, int(max_queue))
+        self._broadcaster = broadcaster
+        self._lock = threading.Lock()
+        self._queue: Deque[_Item] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._idle = True
+        self._stopping = False
+        self._stats = {
+            "published": 0,
+            "delivered": 0,
+            "failed": 0,
+            "dropped_full": 0,
+            "dropped_no_loop": 0,
+            "max_depth": 0,
+            "max_latency_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Deliver on `loop` (default: the running loop). Must be called on
+        that loop, e.g. from the startup hook."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._consume())
+        with self._lock:
+            pending = bool(self._queue)
+            self._idle = not pending
+        if pending:
+            self._wakeup.set()
+
+    async def stop(self, timeout: float = 2.0):
+        """Deliver what is queued (up to `timeout`), then stop."""
+        task, self._task = self._task, None
+        self._loop = None
+        if task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[Bridge] Stopped with {len(self._queue)} events undelivered")
+        except Exception as e:
+            logger.debug(f"[Bridge] Consumer stopped with: {e}")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    # ------------------------------------------------------------------
+    # Publishing (any thread)
+    # ------------------------------------------------------------------
+
+    def publish(self, event_type: str, data: Dict, user_ids: Optional[List[str]] = None,
+                exclude_users: Optional[List[str]] = None, topic: Optional[Dict] = None) -> bool:
+        """Queue a broadcast (or a send to `user_ids`). Never blocks; returns
+        False when the event was dropped. `topic` limits a broadcast to
+        matching topic subscribers (websocket.event_topic)."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            with self._lock:
+                self._stats["dropped_no_loop"] += 1
+            return False
+        item = (time.perf_counter(), event_type, data,
+                list(user_ids) if user_ids is not None else None, exclude_users, topic)
+        with self._lock:
+            self._stats["published"] += 1
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self._stats["dropped_full"] += 1
+            self._queue.append(item)
+            self._stats["max_depth"] = max(self._stats["max_depth"], len(self._queue))
+            wake = self._idle
+            self._idle = False
+        if wake:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop closed between the check and the call (shutdown)
+                pass
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer (event loop)
+    # ------------------------------------------------------------------
+
+    async def _consume(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                with self._lock:
+                    if not self._queue:
+                        self._idle = True
+                        break
+                    item = self._queue.popleft()
+                await self._deliver(item)
+            if self._stopping:
+                return
+
+    async def _deliver(self, item: _Item):
+        published, event_type, data, user_ids, exclude_users, topic = item
+        try:
+            broadcaster = self._get_broadcaster()
+            if user_ids is None:
+                await broadcaster.broadcast(event_type, data, exclude_users=exclude_users, topic=topic)
+            else:
+                await broadcaster.send_to_users(user_ids, event_type, data)
+        except Exception as e:
+            with self._lock:
+                self._stats["failed"] += 1
+            logger.warning(f"[Bridge] {event_type} delivery failed: {e}")
+            return
+        latency_ms = (time.perf_counter() - published) * 1000.0
+        with self._lock:
+            self._stats["delivered"] += 1
+            self._stats["max_latency_ms"] = max(self._stats["max_latency_ms"], latency_ms)
+
+    def _get_broadcaster(self):
+        if self._broadcaster is None:
+            from .websocket import get_broadcaster
+            self._broadcaster = get_broadcaster()
+        return self._broadcaster
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["depth"] = len(self._queue)
+        out["max_latency_ms"] = round(out["max_latency_ms"], 2)
+        out["max_queue"] = self.max_queue
+        out["running"] = self.running
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_bridge = EventBridge()
+
+
+def get_event_bridge() -> EventBridge:
+    return _bridge
+
+
+def start_event_bridge(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """Startup hook: capture the server loop."""
+    _bridge.start(loop)
+
+
+async def stop_event_bridge():
+    await _bridge.stop()
+
+
+def publish(event_type: str, data: Dict, exclude_users: Optional[List[str]] = None,
+            topic: Optional[Dict] = None) -> bool:
+    """Broadcast to every connected console (or, with `topic`, to those
+    subscribed to it), from any thread."""
+    return _bridge.publish(event_type, data, exclude_users=exclude_users, topic=topic)
+
+
+def publish_to_users(user_ids: List[str], event_type: str, data: Dict) -> bool:
+    """Send to the given users' connections, from any thread."""
+    return _bridge.publish(event_type, data, user_ids=user_ids)
+
+
+def event_bridge_stats() -> Dict[str, Any]:
+    return _bridge.stats()
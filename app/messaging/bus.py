@@ -0,0 +1,295 @@
+# ============================================================================
+# FORD-CAD Messaging — Event Bus (fan-out across uvicorn workers)
+# ============================================================================
+# MessageBroadcaster and SSEManager only know the sockets held by their own
+# process. With more than one worker, a broadcast raised in worker A must
+# also reach the consoles connected to worker B. The bus relays every
+# broadcast / send_to_users to the other workers on the host:
+#
+#   CAD_EVENT_BUS=local    single process, nothing relayed (default)
+#   CAD_EVENT_BUS=sqlite   rows in a small side database (cad_bus.db next
+#                          to cad.db, or CAD_EVENT_BUS_PATH) that every
+#                          worker tails every CAD_EVENT_BUS_POLL_MS
+#
+# No broker: one thread per worker batches its outgoing rows into one
+# transaction and reads the rows other workers wrote since its last id.
+# Rows are pruned after RETAIN_S seconds. Remote events are delivered on
+# the worker's loop through MessageBroadcaster.deliver_remote(), which
+# re-broadcasts them locally (never relaying them again) and keeps
+# per-process state (presence, panel notices, replay ring) in step.
+# Chat channel subscriptions and typing state are per process too: typing
+# notices travel as channel-scoped broadcasts that each worker resolves
+# against its own channel subscribers.
+# ============================================================================
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.db import get_conn, get_db_path
+
+logger = logging.getLogger(__name__)
+
+BACKEND = os.getenv("CAD_EVENT_BUS", "local").strip().lower()
+BUS_PATH = os.getenv("CAD_EVENT_BUS_PATH", "")
+POLL_MS = float(os.getenv("CAD_EVENT_BUS_POLL_MS", "50"))
+RETAIN_S = 60.0
+BATCH = 500
+
+# Per-process messages that are never relayed (each worker derives its own)
+LOCAL_ONLY = {"ping", "held_count", "connected", "replay_done"}
+
+# deliver(event_type, data, user_ids, exclude_users, topic)
+Deliver = Callable[[str, Dict, Optional[List[str]], Optional[List[str]], Optional[Dict]], Awaitable[Any]]
+
+
+def default_bus_path() -> str:
+    if BUS_PATH:
+        return BUS_PATH
+    db = Path(get_db_path())
+    return str(db.with_name(f"{db.stem}_bus.db"))
+
+
+class LocalBus:
+    """Single-process backend: nothing to relay."""
+
+    name = "local"
+
+    def __init__(self):
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stats = {"published": 0, "received": 0, "failed": 0}
+
+    def start(self, deliver: Deliver, loop: Optional[asyncio.AbstractEventLoop] = None):
+        pass
+
+    def stop(self):
+        pass
+
+    @property
+    def running(self) -> bool:
+        return False
+
+    def publish(self, event_type: str, data: Dict, user_ids: Optional[List[str]] = None,
+                exclude_users: Optional[List[str]] = None, topic: Optional[Dict] = None):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "origin": self.origin, "running": self.running, **self._stats}
+
+
+class SQLiteBus(LocalBus):
+    """Relays through a table in a side database tailed by every worker."""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: Optional[str] = None, poll_ms: float = POLL_MS):
+        super().__init__()
+        self.db_path = db_path
+        self.poll_s = max(0.005, float(poll_ms) / 1000.0)
+        self._lock = threading.Lock()
+        self._outbox: Deque[Tuple[float, str, str]] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._deliver: Optional[Deliver] = None
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._stats.update({"batches": 0, "pruned": 0, "max_delay_ms": 0.0})
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, deliver: Deliver, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Deliver remote events with `deliver` on `loop` (default: the
+        running loop). Starts tailing from the current end of the table."""
+        if self._thread is not None:
+            return
+        self.db_path = self.db_path or default_bus_path()
+        self._loop = loop or asyncio.get_running_loop()
+        self._deliver = deliver
+        conn = get_conn(self.db_path)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bus_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts REAL NOT NULL,
+                    origin TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    body TEXT NOT NULL
+                )
+            """)
+            conn.commit()
+            self._last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM bus_events").fetchone()[0]
+        finally:
+            conn.close()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cad-event-bus", daemon=True)
+        self._thread.start()
+        logger.info(f"[Bus] Tailing {self.db_path} as {self.origin}")
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout=2.0)
+        self._loop = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    # ------------------------------------------------------------------
+    # Publishing (event loop; never blocks)
+    # ------------------------------------------------------------------
+
+    def publish(self, event_type: str, data: Dict, user_ids: Optional[List[str]] = None,
+                exclude_users: Optional[List[str]] = None, topic: Optional[Dict] = None):
+        if self._thread is None or event_type in LOCAL_ONLY:
+            return
+        body = json.dumps({"data": data, "user_ids": user_ids,
+                           "exclude_users": exclude_users, "topic": topic})
+        with self._lock:
+            self._outbox.append((time.time(), event_type, body))
+            self._stats["published"] += 1
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Bus thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_s)
+            self._wake.clear()
+            try:
+                self._flush()
+                self._tail()
+                now = time.time()
+                if now - self._last_prune >= 10.0:
+                    self._last_prune = now
+                    self._prune(now)
+            except Exception as e:
+                self._stats["failed"] += 1
+                logger.warning(f"[Bus] {e}")
+                self._stop.wait(1.0)
+        try:
+            self._flush()
+        except Exception as e:
+            logger.warning(f"[Bus] Final flush failed: {e}")
+
+    def _flush(self):
+        with self._lock:
+            rows = list(self._outbox)
+            self._outbox.clear()
+        if not rows:
+            return
+        conn = get_conn(self.db_path)
+        try:
+            conn.executemany(
+                "INSERT INTO bus_events (ts, origin, event_type, body) VALUES (?, ?, ?, ?)",
+                [(ts, self.origin, event_type, body) for ts, event_type, body in rows],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self._stats["batches"] += 1
+
+    def _tail(self):
+        conn = get_conn(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT id, ts, origin, event_type, body FROM bus_events WHERE id > ? ORDER BY id LIMIT ?",
+                (self._last_id, BATCH),
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return
+        self._last_id = rows[-1][0]
+        loop = self._loop
+        now = time.time()
+        for _id, ts, origin, event_type, body in rows:
+            if origin == self.origin:
+                continue
+            self._stats["received"] += 1
+            self._stats["max_delay_ms"] = max(self._stats["max_delay_ms"], (now - ts) * 1000.0)
+            if loop is None or loop.is_closed():
+                continue
+            try:
+                loop.call_soon_threadsafe(self._dispatch, event_type, json.loads(body))
+            except RuntimeError:
+                # Loop closed under us (shutdown)
+                return
+        if len(rows) == BATCH:
+            # More waiting: go round again without sleeping
+            self._wake.set()
+
+    def _dispatch(self, event_type: str, body: Dict):
+        self._loop.create_task(self._deliver_one(event_type, body))
+
+    async def _deliver_one(self, event_type: str, body: Dict):
+        try:
+            await self._deliver(event_type, body.get("data") or {}, body.get("user_ids"),
+                                body.get("exclude_users"), body.get("topic"))
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.warning(f"[Bus] Delivering {event_type} failed: {e}")
+
+    def _prune(self, now: float):
+        conn = get_conn(self.db_path)
+        try:
+            cur = conn.execute("DELETE FROM bus_events WHERE ts < ?", (now - RETAIN_S,))
+            conn.commit()
+            self._stats["pruned"] += cur.rowcount or 0
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        out = super().stats()
+        out["max_delay_ms"] = round(out["max_delay_ms"], 2)
+        out["path"] = self.db_path
+        out["last_id"] = self._last_id
+        with self._lock:
+            out["pending"] = len(self._outbox)
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_BACKENDS = {"local": LocalBus, "sqlite": SQLiteBus}
+
+if BACKEND not in _BACKENDS:
+    logger.warning(f"[Bus] Unknown CAD_EVENT_BUS={BACKEND!r}; using local")
+_bus: LocalBus = _BACKENDS.get(BACKEND, LocalBus)()
+
+
+def get_event_bus() -> LocalBus:
+    return _bus
+
+
+def start_event_bus(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """Startup hook: relay to / from other workers (CAD_EVENT_BUS)."""
+    from .websocket import get_broadcaster
+    _bus.start(get_broadcaster().deliver_remote, loop)
+
+
+def stop_event_bus():
+    _bus.stop()
+
+
+def event_bus_stats() -> Dict[str, Any]:
+    return _bus.stats()
@@ -17,6 +17,7 @@ from .models import (
     upsert_receipt, search_chat_messages, add_reaction, remove_reaction,
     get_message_reactions, get_messages_reactions_bulk
 )
+from .bridge import publish_to_users
 
 logger = logging.getLogger(__name__)
 
@@ -174,9 +175,8 @@ class ChatEngine:
         return msg
 
     def _broadcast_message(self, msg: Dict, members: List[Dict], exclude_sender: str = None):
-        """Broadcast a message to channel members via WebSocket."""
-        import asyncio
-        broadcaster = self.get_broadcaster()
+        """Broadcast a message to channel members via WebSocket (from any
+        thread — delivered through the event bridge)."""
         recipient_ids = [m["member_id"] for m in members if m["member_id"] != exclude_sender]
 
         payload = {
@@ -184,12 +184,7 @@ class ChatEngine:
             "message": msg
         }
 
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.send_to_users(recipient_ids, "channel_message", payload))
-        except RuntimeError:
-            # No running loop — skip real-time delivery
-            pass
+        publish_to_users(recipient_ids, "channel_message", payload)
 
     def edit_message(self, message_id: int, new_body: str, editor_id: str) -> Optional[Dict]:
         """Edit a message (only sender). Returns updated message or None."""
@@ -204,16 +199,10 @@ class ChatEngine:
             conn.close()
 
     def _broadcast_edit(self, msg: Dict, members: List[Dict]):
-        import asyncio
-        broadcaster = self.get_broadcaster()
         recipient_ids = [m["member_id"] for m in members]
         payload = {"message_id": msg["id"], "channel_id": msg["channel_id"],
                    "body": msg["body"], "edited_at": msg["edited_at"]}
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.send_to_users(recipient_ids, "message_edited", payload))
-        except RuntimeError:
-            pass
+        publish_to_users(recipient_ids, "message_edited", payload)
 
     def delete_message(self, message_id: int, deleter_id: str) -> bool:
         """Soft-delete a message. Returns True on success."""
@@ -234,15 +223,9 @@ class ChatEngine:
             conn.close()
 
     def _broadcast_delete(self, message_id: int, channel_id: int, members: List[Dict]):
-        import asyncio
-        broadcaster = self.get_broadcaster()
         recipient_ids = [m["member_id"] for m in members]
         payload = {"message_id": message_id, "channel_id": channel_id}
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.send_to_users(recipient_ids, "message_deleted", payload))
-        except RuntimeError:
-            pass
+        publish_to_users(recipient_ids, "message_deleted", payload)
 
     def get_messages(self, channel_id: int, limit: int = 50, before_id: int = None) -> List[Dict]:
         """Get messages for a channel."""
@@ -332,16 +315,10 @@ class ChatEngine:
             conn.close()
 
     def _broadcast_receipt(self, message_id, channel_id, recipient_id, status, members):
-        import asyncio
-        broadcaster = self.get_broadcaster()
         recipient_ids = [m["member_id"] for m in members]
         payload = {"message_id": message_id, "channel_id": channel_id,
                    "recipient_id": recipient_id, "status": status}
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.send_to_users(recipient_ids, "receipt_update", payload))
-        except RuntimeError:
-            pass
+        publish_to_users(recipient_ids, "receipt_update", payload)
 
     # ---- Search ----
 
@@ -11,6 +11,8 @@ from datetime import datetime
 from fastapi import FastAPI, Request, HTTPException, UploadFile, File, Form
 from fastapi.responses import JSONResponse, HTMLResponse
 
+from app.db import run_db
+
 logger = logging.getLogger(__name__)
 
 # Allowed upload extensions and max size
@@ -58,7 +60,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         })
 
     @app.get("/api/chat/channel/{channel_id}/fragment", response_class=HTMLResponse)
-    async def chat_thread_fragment(request: Request, channel_id: int):
+    def chat_thread_fragment(request: Request, channel_id: int):
         """Channel thread view fragment."""
         user_id = _user(request)
         eng = engine()
@@ -91,7 +93,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         })
 
     @app.get("/api/chat/search/fragment", response_class=HTMLResponse)
-    async def chat_search_fragment(request: Request, q: str = ""):
+    def chat_search_fragment(request: Request, q: str = ""):
         """Search results HTML fragment."""
         user_id = _user(request)
         results = engine().search(user_id, q, limit=30) if len(q) >= 2 else []
@@ -111,7 +113,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         })
 
     @app.get("/api/chat/channel/{channel_id}/info", response_class=HTMLResponse)
-    async def chat_channel_info(request: Request, channel_id: int):
+    def chat_channel_info(request: Request, channel_id: int):
         """Channel info panel."""
         eng = engine()
         channel = eng.get_channel(channel_id)
@@ -129,7 +131,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         })
 
     @app.get("/api/chat/broadcast/form", response_class=HTMLResponse)
-    async def chat_broadcast_form(request: Request):
+    def chat_broadcast_form(request: Request):
         """Broadcast compose form (dispatcher only)."""
         if not _is_dispatcher(request):
             raise HTTPException(403, "Dispatcher access required")
@@ -153,7 +155,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
     # ================================================================
 
     @app.get("/api/chat/channels")
-    async def list_channels(request: Request):
+    def list_channels(request: Request):
         """Get user's channels with unread counts."""
         user_id = _user(request)
         channels = engine().get_channels(user_id)
@@ -169,18 +171,21 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         title = data.get("title", "New Group")
         member_ids = data.get("members", [])
 
-        eng = engine()
-        channel = eng.create_ops_channel(title, user_id)
-        # Add creator as admin
-        eng.add_member(channel["id"], "unit", user_id, display_name=user_id, role="admin")
-        # Add other members
-        for mid in member_ids:
-            eng.add_member(channel["id"], "unit", mid, display_name=mid)
-
+        def create():
+            eng = engine()
+            channel = eng.create_ops_channel(title, user_id)
+            # Add creator as admin
+            eng.add_member(channel["id"], "unit", user_id, display_name=user_id, role="admin")
+            # Add other members
+            for mid in member_ids:
+                eng.add_member(channel["id"], "unit", mid, display_name=mid)
+            return channel
+
+        channel = await run_db(create)
         return {"ok": True, "channel": channel}
 
     @app.get("/api/chat/channel/{channel_id}/messages")
-    async def get_messages(request: Request, channel_id: int, limit: int = 50, before: int = None):
+    def get_messages(request: Request, channel_id: int, limit: int = 50, before: int = None):
         """Get paginated messages for a channel."""
         messages = engine().get_messages(channel_id, limit=limit, before_id=before)
         return {"ok": True, "messages": messages}
@@ -194,7 +199,8 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         if not body:
             raise HTTPException(400, "Message body required")
 
-        msg = engine().send_message(
+        msg = await run_db(
+            engine().send_message,
             channel_id=channel_id,
             sender_type="unit",
             sender_id=user_id,
@@ -217,13 +223,13 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         if not new_body:
             raise HTTPException(400, "Body required")
 
-        msg = engine().edit_message(message_id, new_body, user_id)
+        msg = await run_db(engine().edit_message, message_id, new_body, user_id)
         if not msg:
             raise HTTPException(403, "Cannot edit this message")
         return {"ok": True, "message": msg}
 
     @app.delete("/api/chat/messages/{message_id}")
-    async def delete_message(request: Request, message_id: int):
+    def delete_message(request: Request, message_id: int):
         """Soft-delete a message (sender only)."""
         user_id = _user(request)
         ok = engine().delete_message(message_id, user_id)
@@ -238,11 +244,11 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         user_id = _user(request)
         status = data.get("status")
         if status == "delivered":
-            engine().mark_delivered(message_id, user_id)
+            await run_db(engine().mark_delivered, message_id, user_id)
         elif status == "read":
-            engine().mark_read(message_id, user_id)
+            await run_db(engine().mark_read, message_id, user_id)
         elif status == "ack":
-            engine().mark_ack(message_id, user_id)
+            await run_db(engine().mark_ack, message_id, user_id)
         else:
             raise HTTPException(400, "Invalid status")
         return {"ok": True}
@@ -255,12 +261,12 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         reaction = data.get("reaction", "")
         if not reaction:
             raise HTTPException(400, "Reaction required")
-        ok = engine().react(message_id, user_id, reaction)
-        reactions = engine().get_reactions(message_id)
+        ok = await run_db(engine().react, message_id, user_id, reaction)
+        reactions = await run_db(engine().get_reactions, message_id)
         return {"ok": ok, "reactions": reactions}
 
     @app.delete("/api/chat/messages/{message_id}/react/{reaction}")
-    async def remove_reaction_route(request: Request, message_id: int, reaction: str):
+    def remove_reaction_route(request: Request, message_id: int, reaction: str):
         """Remove a reaction."""
         user_id = _user(request)
         ok = engine().unreact(message_id, user_id, reaction)
@@ -325,7 +331,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         }
 
     @app.get("/api/chat/search")
-    async def search_messages(request: Request, q: str = "", type: str = None,
+    def search_messages(request: Request, q: str = "", type: str = None,
                                sender: str = None, limit: int = 50):
         """Search messages across user's channels."""
         user_id = _user(request)
@@ -349,7 +355,8 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         if not targets or not body:
             raise HTTPException(400, "Targets and body required")
 
-        messages = engine().broadcast(
+        messages = await run_db(
+            engine().broadcast,
             targets=targets,
             body=body,
             sender_id=user_id,
@@ -377,7 +384,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         return {"ok": True, "status": status}
 
     @app.post("/api/chat/dm/{unit_id}")
-    async def open_dm(request: Request, unit_id: str):
+    def open_dm(request: Request, unit_id: str):
         """Open/create a DM with a unit."""
         user_id = _user(request)
         if user_id == unit_id:
@@ -387,7 +394,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         return {"ok": True, "channel": channel}
 
     @app.get("/api/chat/units/available")
-    async def list_available_units(request: Request):
+    def list_available_units(request: Request):
         """List units available for messaging."""
         conn = get_conn()
         try:
@@ -404,7 +411,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         return {"ok": True, "units": units}
 
     @app.post("/api/chat/channel/{channel_id}/read")
-    async def mark_channel_read(request: Request, channel_id: int):
+    def mark_channel_read(request: Request, channel_id: int):
         """Mark all messages in channel as read."""
         user_id = _user(request)
         count = engine().mark_read_bulk(channel_id, user_id)
@@ -417,12 +424,12 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         member_id = data.get("member_id")
         if not member_id:
             raise HTTPException(400, "member_id required")
-        member = engine().add_member(channel_id, "unit", member_id,
-                                      display_name=data.get("display_name", member_id))
+        member = await run_db(engine().add_member, channel_id, "unit", member_id,
+                              display_name=data.get("display_name", member_id))
         return {"ok": True, "member": member}
 
     @app.delete("/api/chat/channel/{channel_id}/members/{member_id}")
-    async def remove_member(request: Request, channel_id: int, member_id: str):
+    def remove_member(request: Request, channel_id: int, member_id: str):
         """Remove a member from a channel."""
         ok = engine().remove_member(channel_id, "unit", member_id)
         return {"ok": ok}
@@ -432,7 +439,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
     # ================================================================
 
     @app.get("/api/chat/preferences")
-    async def get_preferences(request: Request):
+    def get_preferences(request: Request):
         """Load all user preferences from chat_preferences table."""
         user_id = _user(request)
         conn = get_conn()
@@ -459,34 +466,39 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         user_id = _user(request)
         data = await request.json()
         prefs = data.get("preferences", {})
-        conn = get_conn()
+
+        def save():
+            conn = get_conn()
+            try:
+                for key, value in prefs.items():
+                    # Keys like "sound_enabled" are global (channel_id=0)
+                    # Keys like "5:muted" are per-channel
+                    if ":" in key and key.split(":")[0].isdigit():
+                        parts = key.split(":", 1)
+                        channel_id = int(parts[0])
+                        pref_key = parts[1]
+                    else:
+                        channel_id = 0
+                        pref_key = key
+                    conn.execute(
+                        """INSERT INTO chat_preferences (user_id, channel_id, pref_key, pref_value)
+                           VALUES (?, ?, ?, ?)
+                           ON CONFLICT(user_id, channel_id, pref_key) DO UPDATE SET pref_value = excluded.pref_value""",
+                        (user_id, channel_id, pref_key, str(value))
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+
         try:
-            for key, value in prefs.items():
-                # Keys like "sound_enabled" are global (channel_id=0)
-                # Keys like "5:muted" are per-channel
-                if ":" in key and key.split(":")[0].isdigit():
-                    parts = key.split(":", 1)
-                    channel_id = int(parts[0])
-                    pref_key = parts[1]
-                else:
-                    channel_id = 0
-                    pref_key = key
-                conn.execute(
-                    """INSERT INTO chat_preferences (user_id, channel_id, pref_key, pref_value)
-                       VALUES (?, ?, ?, ?)
-                       ON CONFLICT(user_id, channel_id, pref_key) DO UPDATE SET pref_value = excluded.pref_value""",
-                    (user_id, channel_id, pref_key, str(value))
-                )
-            conn.commit()
+            await run_db(save)
             return {"ok": True}
         except Exception as e:
             logger.error(f"[CHAT] Failed to save preferences: {e}")
             raise HTTPException(500, "Failed to save preferences")
-        finally:
-            conn.close()
 
     @app.delete("/api/chat/channel/{channel_id}/messages")
-    async def clear_channel_messages(request: Request, channel_id: int):
+    def clear_channel_messages(request: Request, channel_id: int):
         """Soft-delete all messages in a channel for this user."""
         user_id = _user(request)
         conn = get_conn()
@@ -527,7 +539,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
     # ================================================================
 
     @app.post("/api/chat/channel/{channel_id}/archive")
-    async def archive_channel(request: Request, channel_id: int):
+    def archive_channel(request: Request, channel_id: int):
         """Archive a channel (admin/dispatcher only)."""
         if not _is_dispatcher(request):
             raise HTTPException(403, "Dispatcher access required")
@@ -543,7 +555,7 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         return {"ok": True, "channel_id": channel_id, "archived": True}
 
     @app.post("/api/chat/channel/{channel_id}/restore")
-    async def restore_channel(request: Request, channel_id: int):
+    def restore_channel(request: Request, channel_id: int):
         """Restore an archived channel."""
         if not _is_dispatcher(request):
             raise HTTPException(403, "Dispatcher access required")
@@ -563,16 +575,20 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
         """Update channel title (admin/creator only)."""
         data = await request.json()
         title = data.get("title")
-        conn = get_conn()
-        try:
-            if title:
+
+        def rename():
+            conn = get_conn()
+            try:
                 conn.execute(
                     "UPDATE chat_channels SET title = ?, updated_at = ? WHERE id = ?",
                     (title, datetime.now().isoformat(), channel_id)
                 )
                 conn.commit()
-        finally:
-            conn.close()
+            finally:
+                conn.close()
+
+        if title:
+            await run_db(rename)
         return {"ok": True}
 
     # ================================================================
@@ -580,29 +596,30 @@ def register_chat_routes(app: FastAPI, templates, get_conn):
     # ================================================================
 
     from fastapi import WebSocket, WebSocketDisconnect
-    from .websocket import get_broadcaster as _get_bc
+    from .websocket import get_broadcaster as _get_bc, resume_params
 
     @app.websocket("/ws/chat")
     async def chat_websocket(websocket: WebSocket):
         """WebSocket endpoint for chat v2."""
         user_id = websocket.query_params.get("user_id", "UNKNOWN")
         broadcaster = _get_bc()
-        await broadcaster.connect(websocket, user_id)
+        await broadcaster.connect(websocket, user_id, topics=websocket.query_params.get("topics"),
+                                  **resume_params(websocket))
 
         # Persist presence
         try:
-            engine().persist_presence("unit", user_id, "available")
+            await run_db(engine().persist_presence, "unit", user_id, "available")
         except Exception:
             pass
 
         try:
             while True:
                 data = await websocket.receive_json()
-                await broadcaster.handle_client_message(user_id, data)
+                await broadcaster.handle_client_message(user_id, data, websocket)
         except WebSocketDisconnect:
             await broadcaster.disconnect(websocket)
             try:
-                engine().persist_presence("unit", user_id, "offline")
+                await run_db(engine().persist_presence, "unit", user_id, "offline")
             except Exception:
                 pass
         except Exception as e:
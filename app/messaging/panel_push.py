@@ -0,0 +1,316 @@
+# ============================================================================
+# FORD-CAD Messaging — Panel Push (server-side panel invalidation)
+# ============================================================================
+# Consoles used to re-fetch every board panel on a timer. Now every commit
+# that changes a board table publishes a typed "panel_dirty" notice over the
+# MessageBroadcaster; panels.js refetches only the named panels and keeps
+# interval polling as a slow fallback for when the socket is down.
+#
+#   tables changed by a commit  -> panels          (TABLE_PANELS)
+#   incident mutations          -> incident_ids    (an open IAW reloads)
+#
+# Commits are seen through the pool's commit listener, so no mutation route
+# has to remember to publish. Notices are coalesced for DEBOUNCE_MS: a
+# dispatch touching four tables in three commits goes out as one message.
+#
+# The held-incident count (toolbar badge) is kept in memory (HeldCounter):
+# any Incidents commit marks it stale, the flush recounts once and pushes
+# a "held_count" message only when the number changed. New sockets get it
+# in their "connected" payload.
+#
+# The last HISTORY notices are kept so a reconnecting console can present
+# the last seq it saw and get the missed panels as one notice
+# (notices_since) instead of refetching the whole board.
+#
+# Seqs are per worker. Notices relayed from other workers (bus.py) are
+# re-issued here under this worker's seq and not relayed again, and every
+# notice carries this worker's bus origin. A console that reconnects to a
+# different worker presents a foreign origin and is told to refetch
+# everything (complete=False).
+# ============================================================================
+
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from app.db import add_commit_listener, get_conn, get_db_path, remove_commit_listener, run_db
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("CAD_PANEL_PUSH", "1").strip().lower() not in ("0", "false", "no", "off")
+DEBOUNCE_MS = float(os.getenv("CAD_PANEL_PUSH_DEBOUNCE_MS", "100"))
+HISTORY = 256
+
+PANELS = ("units", "active", "open", "held", "dailylog")
+
+# Board tables -> panels that render them
+TABLE_PANELS: Dict[str, tuple] = {
+    "Incidents": ("active", "open", "held"),
+    "UnitAssignments": ("units", "active", "open"),
+    "Units": ("units", "active"),
+    "ShiftOverrides": ("units",),
+    "PersonnelAssignments": ("units",),
+    "UnitRoster": ("units",),
+    "DailyLog": ("dailylog",),
+}
+
+
+HELD_COUNT_SQL = "SELECT COUNT(*) FROM Incidents WHERE status = 'HELD' AND is_draft = 0"
+
+
+class HeldCounter:
+    """Held-incident count kept in memory. While commits are tracked it is
+    only recounted after an Incidents commit; otherwise every read counts."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path
+        self.tracking = False
+        self._lock = threading.Lock()
+        self._value: Optional[int] = None
+        self._stale = True
+        self._stats = {"reads": 0, "recounts": 0}
+
+    @property
+    def value(self) -> Optional[int]:
+        """Last known count (None before the first count)."""
+        return self._value
+
+    def invalidate(self):
+        self._stale = True
+
+    def get(self) -> int:
+        self._stats["reads"] += 1
+        if self.tracking and not self._stale and self._value is not None:
+            return self._value
+        return self.recount()[0]
+
+    def recount(self) -> Tuple[int, bool]:
+        """Count from the database; returns (count, changed)."""
+        # Cleared first: a commit landing during the count marks it again
+        self._stale = False
+        conn = get_conn(self.db_path)
+        try:
+            n = int(conn.execute(HELD_COUNT_SQL).fetchone()[0])
+        finally:
+            conn.close()
+        with self._lock:
+            changed = n != self._value
+            self._value = n
+            self._stats["recounts"] += 1
+        return n, changed
+
+    def stats(self) -> Dict[str, Any]:
+        return {"count": self._value, "stale": self._stale, "tracking": self.tracking, **self._stats}
+
+
+class PanelPush:
+    """Coalesces dirty panels / incidents and broadcasts them as one notice."""
+
+    def __init__(self, debounce_ms: float = DEBOUNCE_MS, broadcaster=None):
+        self.debounce_s = max(0.0, float(debounce_ms) / 1000.0)
+        self._broadcaster = broadcaster
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._db_path: Optional[str] = None
+        self._panels: set = set()
+        self._incidents: set = set()
+        self._scheduled = False
+        # Relay the next notice to other workers (some of it is ours)
+        self._relay = False
+        self._origin: Optional[str] = None
+        self._seq = 0
+        # (seq, panels, incident_ids) of recent notices
+        self._history: deque = deque(maxlen=HISTORY)
+        self._stats = {"notices": 0, "broadcasts": 0, "failed": 0}
+        self.held = HeldCounter()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None, db_path=None):
+        """Publish on `loop` (default: the running loop) for commits to `db_path`."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._db_path = os.path.abspath(str(db_path if db_path is not None else get_db_path()))
+        add_commit_listener(self._on_commit)
+        self.held.db_path = self._db_path
+        self.held.tracking = True
+        try:
+            self.held.recount()
+        except Exception as e:
+            logger.warning(f"[PanelPush] Held count unavailable: {e}")
+
+    def stop(self):
+        remove_commit_listener(self._on_commit)
+        self.held.tracking = False
+        self._loop = None
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def seq(self) -> int:
+        """Seq of the last notice sent."""
+        return self._seq
+
+    @property
+    def origin(self) -> str:
+        """This worker's bus origin: seqs only mean something to it."""
+        if self._origin is None:
+            from .bus import get_event_bus
+            self._origin = get_event_bus().origin
+        return self._origin
+
+    # ------------------------------------------------------------------
+    # Notices
+    # ------------------------------------------------------------------
+
+    def _on_commit(self, db_path: str, tables: FrozenSet[str]):
+        if db_path != self._db_path:
+            return
+        if "Incidents" in tables:
+            self.held.invalidate()
+        panels = set()
+        for table in tables:
+            panels.update(TABLE_PANELS.get(table, ()))
+        if panels:
+            self.mark_dirty(panels)
+
+    def mark_dirty(self, panels: Iterable[str] = (), incident_id: Any = None, relay: bool = True):
+        """Queue panels (and/or one incident) for the next notice. Safe to
+        call from any thread; a no-op until start(). relay=False for
+        notices that came from another worker."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._lock:
+            self._relay = self._relay or relay
+            self._panels.update(p for p in panels if p in PANELS)
+            if incident_id not in (None, ""):
+                try:
+                    self._incidents.add(int(incident_id))
+                except (TypeError, ValueError):
+                    pass
+            self._stats["notices"] += 1
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            loop.call_soon_threadsafe(loop.call_later, self.debounce_s, self._start_flush)
+        except RuntimeError:
+            # Loop closed under us (shutdown)
+            with self._lock:
+                self._scheduled = False
+
+    def _start_flush(self):
+        if self._loop is not None:
+            self._loop.create_task(self.flush())
+
+    async def flush(self):
+        """Broadcast everything queued so far as one "panel_dirty" notice."""
+        with self._lock:
+            panels, incidents = sorted(self._panels), sorted(self._incidents)
+            relay, self._relay = self._relay, False
+            self._panels.clear()
+            self._incidents.clear()
+            self._scheduled = False
+            if not panels and not incidents:
+                return
+            self._seq += 1
+            seq = self._seq
+            self._history.append((seq, panels, incidents))
+        try:
+            broadcaster = self._get_broadcaster()
+            await broadcaster.broadcast("panel_dirty", {
+                "seq": seq,
+                "origin": self.origin,
+                "panels": panels,
+                "incident_ids": incidents,
+            }, relay=relay)
+            self._stats["broadcasts"] += 1
+            if "held" in panels and self.held.tracking:
+                count, changed = await run_db(self.held.recount)
+                if changed:
+                    await broadcaster.broadcast("held_count", {"count": count})
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.warning(f"[PanelPush] Broadcast failed: {e}")
+
+    def notices_since(self, seq: int, origin: Optional[str] = None) -> Dict[str, Any]:
+        """Panels / incidents named by notices after `seq`, merged. complete
+        is False when some of them are no longer kept, `seq` is from before
+        a restart, or `origin` names another worker: the client should
+        refetch everything."""
+        seq = int(seq)
+        with self._lock:
+            current = self._seq
+            history = list(self._history)
+        oldest = history[0][0] if history else current + 1
+        complete = seq <= current and seq >= oldest - 1
+        if origin is not None and origin != self.origin:
+            complete = False
+        panels, incidents = set(), set()
+        for s, p, i in history:
+            if s > seq:
+                panels.update(p)
+                incidents.update(i)
+        return {"seq": current, "origin": self.origin, "panels": sorted(panels),
+                "incident_ids": sorted(incidents), "complete": complete}
+
+    def _get_broadcaster(self):
+        if self._broadcaster is None:
+            from .websocket import get_broadcaster
+            self._broadcaster = get_broadcaster()
+        return self._broadcaster
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["seq"] = self._seq
+            out["pending"] = sorted(self._panels) + [f"incident:{i}" for i in sorted(self._incidents)]
+        out["origin"] = self.origin
+        out["enabled"] = ENABLED
+        out["running"] = self.running
+        out["debounce_ms"] = round(self.debounce_s * 1000.0, 1)
+        out["held"] = self.held.stats()
+        return out
+
+
+# ============================================================================
+# Module-level API
+# ============================================================================
+
+_panel_push = PanelPush()
+
+
+def get_panel_push() -> PanelPush:
+    return _panel_push
+
+
+def start_panel_push(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """Startup hook: publish panel notices on the app's event loop."""
+    if ENABLED:
+        _panel_push.start(loop)
+
+
+def stop_panel_push():
+    _panel_push.stop()
+
+
+def mark_panels_dirty(*panels: str, incident_id: Any = None):
+    """Publish a notice for work the commit listener cannot see (or to
+    name the incident an IAW should reload)."""
+    _panel_push.mark_dirty(panels, incident_id=incident_id)
+
+
+def held_count() -> int:
+    """Held incidents (non-draft), from memory while commits are tracked."""
+    return _panel_push.held.get()
+
+
+def panel_push_stats() -> Dict[str, Any]:
+    return _panel_push.stats()
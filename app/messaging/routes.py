@@ -8,8 +8,9 @@ from typing import Optional, List, Dict, Any
 import json
 import logging
 
+from app.db import run_db
+
 from .models import (
-    init_messaging_schema,
     MessageChannel, MessageStatus, MessageDirection,
     create_contact, get_contact, find_contact_by_address,
     create_conversation, get_conversation, find_or_create_direct_conversation,
@@ -21,7 +22,7 @@ from .providers import (
     InternalProvider, TwilioProvider, SendGridProvider,
     SignalProvider, WebExProvider, ProviderResult, MessagePayload
 )
-from .websocket import get_broadcaster, get_sse_manager, sse_event_generator
+from .websocket import get_broadcaster, get_sse_manager, resume_params, sse_event_generator
 
 logger = logging.getLogger(__name__)
 
@@ -55,14 +56,6 @@ def register_messaging_routes(app, templates, get_conn):
 
     router = APIRouter(prefix="/api/messaging", tags=["messaging"])
 
-    # Initialize schema on startup
-    @app.on_event("startup")
-    async def init_messaging():
-        conn = get_conn()
-        init_messaging_schema(conn)
-        conn.close()
-        logger.info("[Messaging] Schema initialized")
-
     # =========================================================================
     # UNIFIED SEND API
     # =========================================================================
@@ -113,7 +106,7 @@ def register_messaging_routes(app, templates, get_conn):
 
             # Check if "to" is a contact ID
             if str(to).isdigit():
-                contact = get_contact(conn, int(to))
+                contact = await run_db(get_contact, conn, int(to))
                 if contact:
                     recipient_type = "contact"
                     recipient_id = str(contact["contact_id"])
@@ -155,13 +148,13 @@ def register_messaging_routes(app, templates, get_conn):
                     "id": recipient_id or to,
                     "name": recipient_name or to
                 }
-                conversation_id = find_or_create_direct_conversation(
-                    conn, sender_participant, recipient_participant
+                conversation_id = await run_db(
+                    find_or_create_direct_conversation, conn, sender_participant, recipient_participant
                 )
 
             # Create message record
-            message_id = create_message(
-                conn,
+            message_id = await run_db(
+                create_message, conn,
                 direction=MessageDirection.OUTBOUND,
                 channel=channel,
                 sender_type="user",
@@ -181,11 +174,11 @@ def register_messaging_routes(app, templates, get_conn):
             # Get provider and send
             provider = get_provider(channel)
             if not provider:
-                update_message_status(conn, message_id, MessageStatus.FAILED, error_message=f"Unknown channel: {channel}")
+                await run_db(update_message_status, conn, message_id, MessageStatus.FAILED, error_message=f"Unknown channel: {channel}")
                 raise HTTPException(status_code=400, detail=f"Unknown channel: {channel}")
 
             if not provider.is_configured():
-                update_message_status(conn, message_id, MessageStatus.FAILED, error_message=f"{channel} provider not configured")
+                await run_db(update_message_status, conn, message_id, MessageStatus.FAILED, error_message=f"{channel} provider not configured")
                 raise HTTPException(status_code=503, detail=f"{channel} provider not configured")
 
             # Build payload
@@ -207,8 +200,8 @@ def register_messaging_routes(app, templates, get_conn):
 
             # Update message status
             if result.success:
-                update_message_status(
-                    conn, message_id,
+                await run_db(
+                    update_message_status, conn, message_id,
                     MessageStatus.SENT,
                     external_id=result.message_id,
                     external_status=result.external_status,
@@ -239,8 +232,8 @@ def register_messaging_routes(app, templates, get_conn):
                     "status": MessageStatus.SENT,
                 }
             else:
-                update_message_status(
-                    conn, message_id,
+                await run_db(
+                    update_message_status, conn, message_id,
                     MessageStatus.FAILED,
                     error_message=result.error,
                     provider_response=result.raw_response
@@ -259,7 +252,7 @@ def register_messaging_routes(app, templates, get_conn):
     # =========================================================================
 
     @router.get("/conversations")
-    async def list_conversations(request: Request):
+    def list_conversations(request: Request):
         """Get user's conversations."""
         user_id = request.session.get("unit_id") or request.session.get("user", "unknown")
 
@@ -271,7 +264,7 @@ def register_messaging_routes(app, templates, get_conn):
             conn.close()
 
     @router.get("/conversations/{conversation_id}")
-    async def get_conversation_detail(request: Request, conversation_id: int):
+    def get_conversation_detail(request: Request, conversation_id: int):
         """Get conversation details and messages."""
         user_id = request.session.get("unit_id") or request.session.get("user", "unknown")
 
@@ -295,7 +288,7 @@ def register_messaging_routes(app, templates, get_conn):
             conn.close()
 
     @router.get("/conversations/{conversation_id}/messages")
-    async def get_messages(
+    def get_messages(
         request: Request,
         conversation_id: int,
         limit: int = Query(50, le=100),
@@ -310,7 +303,7 @@ def register_messaging_routes(app, templates, get_conn):
             conn.close()
 
     @router.post("/conversations/{conversation_id}/read")
-    async def mark_conversation_read(request: Request, conversation_id: int):
+    def mark_conversation_read(request: Request, conversation_id: int):
         """Mark all messages in conversation as read."""
         user_id = request.session.get("unit_id") or request.session.get("user", "unknown")
 
@@ -326,7 +319,7 @@ def register_messaging_routes(app, templates, get_conn):
     # =========================================================================
 
     @router.get("/contacts")
-    async def list_contacts(request: Request, search: str = None):
+    def list_contacts(request: Request, search: str = None):
         """List messaging contacts."""
         conn = get_conn()
         try:
@@ -367,26 +360,29 @@ def register_messaging_routes(app, templates, get_conn):
         if not name:
             raise HTTPException(status_code=400, detail="Name required")
 
-        conn = get_conn()
-        try:
-            contact_id = create_contact(
-                conn,
-                name=name,
-                phone=data.get("phone"),
-                email=data.get("email"),
-                signal_number=data.get("signal_number"),
-                webex_person_id=data.get("webex_person_id"),
-                preferred_channel=data.get("preferred_channel", "sms"),
-                organization=data.get("organization"),
-                notes=data.get("notes"),
-                tags=data.get("tags", [])
-            )
-            return {"ok": True, "contact_id": contact_id}
-        finally:
-            conn.close()
+        def create():
+            conn = get_conn()
+            try:
+                return create_contact(
+                    conn,
+                    name=name,
+                    phone=data.get("phone"),
+                    email=data.get("email"),
+                    signal_number=data.get("signal_number"),
+                    webex_person_id=data.get("webex_person_id"),
+                    preferred_channel=data.get("preferred_channel", "sms"),
+                    organization=data.get("organization"),
+                    notes=data.get("notes"),
+                    tags=data.get("tags", [])
+                )
+            finally:
+                conn.close()
+
+        contact_id = await run_db(create)
+        return {"ok": True, "contact_id": contact_id}
 
     @router.get("/contacts/{contact_id}")
-    async def get_contact_detail(contact_id: int):
+    def get_contact_detail(contact_id: int):
         """Get contact details."""
         conn = get_conn()
         try:
@@ -402,7 +398,7 @@ def register_messaging_routes(app, templates, get_conn):
     # =========================================================================
 
     @router.get("/unread")
-    async def get_unread(request: Request):
+    def get_unread(request: Request):
         """Get unread message count for current user."""
         user_id = request.session.get("unit_id") or request.session.get("user", "unknown")
 
@@ -445,7 +441,7 @@ def register_messaging_routes(app, templates, get_conn):
             payload = dict(form)
 
             # Log webhook
-            log_webhook(conn, "twilio", json.dumps(payload), payload.get("MessageStatus") or "inbound")
+            await run_db(log_webhook, conn, "twilio", json.dumps(payload), payload.get("MessageStatus") or "inbound")
 
             # Process with provider
             provider = TwilioProvider()
@@ -454,7 +450,7 @@ def register_messaging_routes(app, templates, get_conn):
             if result.get("type") == "inbound":
                 # Create inbound message
                 # Try to find existing contact
-                contact = find_contact_by_address(conn, result["from_address"], "sms")
+                contact = await run_db(find_contact_by_address, conn, result["from_address"], "sms")
 
                 sender_id = str(contact["contact_id"]) if contact else None
                 sender_name = contact["name"] if contact else result["from_address"]
@@ -462,8 +458,8 @@ def register_messaging_routes(app, templates, get_conn):
                 # Find or create conversation
                 # For inbound, we need to figure out the recipient (our CAD)
                 # This is simplified - in production you might route to specific users
-                message_id = create_message(
-                    conn,
+                message_id = await run_db(
+                    create_message, conn,
                     direction=MessageDirection.INBOUND,
                     channel="sms",
                     sender_type="contact" if contact else "external",
@@ -494,11 +490,12 @@ def register_messaging_routes(app, templates, get_conn):
                 # Update existing message status
                 external_id = result.get("external_id")
                 if external_id:
-                    c = conn.cursor()
-                    msg = c.execute(
-                        "SELECT message_id FROM Messages WHERE external_id = ?",
-                        (external_id,)
-                    ).fetchone()
+                    msg = await run_db(
+                        lambda: conn.execute(
+                            "SELECT message_id FROM Messages WHERE external_id = ?",
+                            (external_id,)
+                        ).fetchone()
+                    )
                     if msg:
                         status_map = {
                             "delivered": MessageStatus.DELIVERED,
@@ -507,8 +504,8 @@ def register_messaging_routes(app, templates, get_conn):
                             "undelivered": MessageStatus.FAILED,
                         }
                         new_status = status_map.get(result["status"], MessageStatus.SENT)
-                        update_message_status(
-                            conn, msg["message_id"], new_status,
+                        await run_db(
+                            update_message_status, conn, msg["message_id"], new_status,
                             external_status=result["status"],
                             error_message=result.get("error_message")
                         )
@@ -534,16 +531,16 @@ def register_messaging_routes(app, templates, get_conn):
                 # Event webhook
                 payload = await request.json()
 
-            log_webhook(conn, "sendgrid", json.dumps(payload) if isinstance(payload, dict) else str(payload))
+            await run_db(log_webhook, conn, "sendgrid", json.dumps(payload) if isinstance(payload, dict) else str(payload))
 
             provider = SendGridProvider()
             result = await provider.handle_webhook(payload)
 
             if result.get("type") == "inbound":
-                contact = find_contact_by_address(conn, result["from_address"], "email")
+                contact = await run_db(find_contact_by_address, conn, result["from_address"], "email")
 
-                message_id = create_message(
-                    conn,
+                message_id = await run_db(
+                    create_message, conn,
                     direction=MessageDirection.INBOUND,
                     channel="email",
                     sender_type="contact" if contact else "external",
@@ -579,14 +576,14 @@ def register_messaging_routes(app, templates, get_conn):
         conn = get_conn()
         try:
             payload = await request.json()
-            log_webhook(conn, "webex", json.dumps(payload), payload.get("event"))
+            await run_db(log_webhook, conn, "webex", json.dumps(payload), payload.get("event"))
 
             provider = WebExProvider()
             result = await provider.handle_webhook(payload)
 
             if result.get("type") == "inbound":
-                message_id = create_message(
-                    conn,
+                message_id = await run_db(
+                    create_message, conn,
                     direction=MessageDirection.INBOUND,
                     channel="webex",
                     sender_type="external",
@@ -631,7 +628,8 @@ def register_messaging_routes(app, templates, get_conn):
             return
 
         broadcaster = get_broadcaster()
-        await broadcaster.connect(websocket, user_id)
+        await broadcaster.connect(websocket, user_id, topics=websocket.query_params.get("topics"),
+                                  **resume_params(websocket))
 
         try:
             while True:
@@ -639,7 +637,7 @@ def register_messaging_routes(app, templates, get_conn):
                 data = await websocket.receive_json()
 
                 if data.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    broadcaster.send_to_websocket(websocket, {"type": "pong"})
 
                 elif data.get("type") == "typing":
                     # Broadcast typing indicator
@@ -648,7 +646,7 @@ def register_messaging_routes(app, templates, get_conn):
                         # Get other participants
                         conn = get_conn()
                         try:
-                            conv = get_conversation(conn, conversation_id)
+                            conv = await run_db(get_conversation, conn, conversation_id)
                             if conv:
                                 for p in conv["participants"]:
                                     if p["id"] != user_id:
@@ -669,7 +667,7 @@ def register_messaging_routes(app, templates, get_conn):
                     if conversation_id:
                         conn = get_conn()
                         try:
-                            mark_messages_read(conn, user_id, conversation_id=conversation_id)
+                            await run_db(mark_messages_read, conn, user_id, conversation_id=conversation_id)
                         finally:
                             conn.close()
 
@@ -684,13 +682,21 @@ def register_messaging_routes(app, templates, get_conn):
 
     @router.get("/events")
     async def sse_endpoint(request: Request):
-        """Server-Sent Events endpoint for clients without WebSocket support."""
+        """Server-Sent Events endpoint for clients without WebSocket support
+        (?topics= limits the event stream as on the WebSocket)."""
         user_id = request.session.get("unit_id") or request.session.get("user")
         if not user_id:
             raise HTTPException(status_code=401, detail="Not authenticated")
 
+        # Browsers resend the last "id:" they saw when EventSource reconnects
+        last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_event_id = None
+
         return StreamingResponse(
-            sse_event_generator(user_id),
+            sse_event_generator(user_id, last_event_id, request.query_params.get("topics")),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -703,7 +709,7 @@ def register_messaging_routes(app, templates, get_conn):
     # =========================================================================
 
     @router.get("/panel", response_class=HTMLResponse)
-    async def messaging_panel(request: Request):
+    def messaging_panel(request: Request):
         """Render messaging panel for dispatch UI."""
         user_id = request.session.get("unit_id") or request.session.get("user", "unknown")
 
@@ -725,7 +731,7 @@ def register_messaging_routes(app, templates, get_conn):
             conn.close()
 
     @router.get("/conversation/{conversation_id}/fragment", response_class=HTMLResponse)
-    async def conversation_fragment(request: Request, conversation_id: int):
+    def conversation_fragment(request: Request, conversation_id: int):
         """Render conversation thread fragment."""
         user_id = request.session.get("unit_id") or request.session.get("user", "unknown")
 
@@ -748,7 +754,7 @@ def register_messaging_routes(app, templates, get_conn):
             conn.close()
 
     @router.get("/compose", response_class=HTMLResponse)
-    async def compose_modal(request: Request, to: str = None, channel: str = None):
+    def compose_modal(request: Request, to: str = None, channel: str = None):
         """Render compose message modal."""
         conn = get_conn()
         try:
@@ -6,14 +6,146 @@
 # ============================================================================
 
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, Set, Optional, List
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Set, Optional, List, Tuple
 import asyncio
 import json
 import logging
+import os
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Outbound queue per connection. A broadcast only appends to each queue;
+# one writer task per socket does the actual send, so a stalled client
+# (MDT on bad Wi-Fi) delays nobody but itself.
+OUTBOX_SIZE = int(os.getenv("CAD_WS_OUTBOX_SIZE", "256"))
+# Full queue: "drop_oldest" (then disconnect after SLOW_MAX_DROPS drops in a
+# row without a completed send) or "disconnect" straight away
+SLOW_POLICY = os.getenv("CAD_WS_SLOW_POLICY", "drop_oldest").strip().lower()
+SLOW_MAX_DROPS = int(os.getenv("CAD_WS_SLOW_MAX_DROPS", "1000"))
+# A single send taking longer than this closes the connection
+SEND_TIMEOUT_S = float(os.getenv("CAD_WS_SEND_TIMEOUT", "10"))
+
+
+def encode_frame(event_type: str, data: Dict) -> str:
+    """One WebSocket text frame for an event. Built once per broadcast and
+    shared by every recipient's queue."""
+    return json.dumps({
+        "type": event_type,
+        "timestamp": datetime.now().isoformat(),
+        **data
+    })
+
+
+def _ws_frame_event_id(frame: str) -> Optional[int]:
+    """Event-stream id of an encoded frame (None for other frame types)."""
+    if not frame.startswith('{"type": "event_stream"'):
+        return None
+    event_id = json.loads(frame).get("id")
+    return int(event_id) if event_id is not None else None
+
+
+# Event-stream topics a client can subscribe to ("incident:1182",
+# "unit:E12", "category:unit", "severity:critical"). "none" mutes the
+# event stream entirely (chat-only clients).
+TOPIC_KINDS = ("incident", "unit", "category", "severity")
+
+
+def parse_topics(topics) -> Dict[str, Set[str]]:
+    """Normalise topics given as "kind:value" strings (a list, or one
+    comma-separated string) into {kind: {values}}. Unknown kinds are ignored."""
+    if isinstance(topics, str):
+        topics = topics.split(",")
+    parsed: Dict[str, Set[str]] = {}
+    for topic in topics or ():
+        topic = str(topic).strip()
+        if topic.lower() == "none":
+            parsed["none"] = {"1"}
+            continue
+        kind, _, value = topic.partition(":")
+        kind, value = kind.strip().lower(), value.strip()
+        if kind in TOPIC_KINDS and value:
+            if kind in ("category", "severity"):
+                value = value.lower()
+            elif kind == "unit":
+                value = value.upper()
+            parsed.setdefault(kind, set()).add(value)
+    return parsed
+
+
+def event_topic(incident_id=None, unit_id=None, category=None, severity=None) -> Dict[str, str]:
+    """Topic of one event-stream event, for broadcast(topic=...)."""
+    return {
+        "incident": str(incident_id) if incident_id not in (None, "") else "",
+        "unit": str(unit_id).upper() if unit_id else "",
+        "category": (category or "").lower(),
+        "severity": (severity or "").lower(),
+    }
+
+
+def topic_matches(subs: Dict[str, Set[str]], topic: Dict[str, str]) -> bool:
+    """Incident / unit subscriptions pick the events (either matches);
+    category / severity subscriptions filter them. No subscriptions = all."""
+    if not subs:
+        return True
+    if "none" in subs:
+        return False
+    scope = subs.get("incident"), subs.get("unit")
+    if any(scope) and not ((scope[0] and topic["incident"] in scope[0]) or
+                           (scope[1] and topic["unit"] in scope[1])):
+        return False
+    for kind in ("category", "severity"):
+        wanted = subs.get(kind)
+        if wanted and topic[kind] not in wanted:
+            return False
+    return True
+
+
+def format_topics(subs: Dict[str, Set[str]]) -> List[str]:
+    """parse_topics() output back to sorted "kind:value" strings."""
+    return sorted(f"{kind}:{value}" if kind != "none" else "none"
+                  for kind, values in (subs or {}).items()
+                  for value in values)
+
+
+def resume_params(websocket: WebSocket) -> Dict[str, Any]:
+    """?last_event_id= / ?panel_seq= / ?panel_origin= of a reconnecting
+    client, for connect()."""
+    out: Dict[str, Any] = {}
+    for key in ("last_event_id", "panel_seq"):
+        try:
+            out[key] = int(websocket.query_params[key])
+        except (KeyError, ValueError):
+            out[key] = None
+    out["panel_origin"] = websocket.query_params.get("panel_origin") or None
+    return out
+
+
+class _Outbox:
+    """Bounded outbound queue and writer task for one WebSocket."""
+
+    __slots__ = ("ws", "user_id", "topics", "queue", "hold", "wakeup", "task", "closed",
+                 "sent", "dropped", "drops_in_row", "max_lag_ms")
+
+    def __init__(self, ws: WebSocket, user_id: str, topics: Optional[Dict[str, Set[str]]] = None):
+        self.ws = ws
+        self.user_id = user_id
+        # Event-stream topics of this connection (parse_topics; empty = all)
+        self.topics: Dict[str, Set[str]] = topics or {}
+        # (queued_at, encoded frame)
+        self.queue: Deque[Tuple[float, str]] = deque()
+        # Live frames held back while a reconnect replay is sent (or None)
+        self.hold: Optional[List[str]] = None
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.drops_in_row = 0
+        self.max_lag_ms = 0.0
+
 
 class MessageBroadcaster:
     """
@@ -28,9 +160,12 @@ class MessageBroadcaster:
     - Presence tracking (available, busy, on-scene, dnd, offline)
     - Channel subscriptions
     - Typing indicators
+    - Per-connection bounded send queues (slow clients cannot stall others)
     """
 
-    def __init__(self):
+    def __init__(self, outbox_size: int = OUTBOX_SIZE, slow_policy: str = SLOW_POLICY,
+                 slow_max_drops: int = SLOW_MAX_DROPS, send_timeout: float = SEND_TIMEOUT_S,
+                 bus=None):
         # Map user_id -> set of WebSocket connections
         self._connections: Dict[str, Set[WebSocket]] = {}
         # Map WebSocket -> user_id
@@ -45,18 +180,47 @@ class MessageBroadcaster:
         self._subscriptions: Dict[str, Set[int]] = {}
         # Typing state: channel_id -> { user_id: timestamp }
         self._typing: Dict[int, Dict[str, datetime]] = {}
-
-    async def connect(self, websocket: WebSocket, user_id: str):
-        """Register a new WebSocket connection for a user."""
+        # Outbound queue + writer per WebSocket
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        self.outbox_size = max(1, int(outbox_size))
+        self.slow_policy = slow_policy if slow_policy in ("drop_oldest", "disconnect") else "drop_oldest"
+        self.slow_max_drops = max(1, int(slow_max_drops))
+        self.send_timeout = float(send_timeout)
+        # Relay to other workers (bus.py); default: the process-wide bus
+        self._bus = bus
+        self._stats = {"encoded": 0, "queued": 0, "sent": 0, "dropped": 0, "evicted": 0,
+                       "send_failed": 0, "topic_filtered": 0, "replays": 0,
+                       "relay_failed": 0, "max_lag_ms": 0.0}
+
+    async def connect(self, websocket: WebSocket, user_id: str, topics=None,
+                      last_event_id: Optional[int] = None, panel_seq: Optional[int] = None,
+                      panel_origin: Optional[str] = None):
+        """Register a new WebSocket connection for a user. `topics` (e.g. the
+        ?topics= query parameter) limits this connection's event stream;
+        the user's other connections keep their own.
+        A reconnecting client passes the last event_stream id and panel
+        notice seq (and the origin of that seq) it saw and is sent what it
+        missed (replay())."""
         await websocket.accept()
+        resuming = last_event_id is not None or panel_seq is not None
 
         was_offline = not self.is_user_online(user_id)
 
+        from .panel_push import get_panel_push
+        outbox = _Outbox(websocket, user_id, parse_topics(topics))
+        if resuming:
+            outbox.hold = []
+        outbox.task = asyncio.get_running_loop().create_task(self._writer(outbox))
+
         async with self._lock:
             if user_id not in self._connections:
                 self._connections[user_id] = set()
             self._connections[user_id].add(websocket)
             self._ws_to_user[websocket] = user_id
+            self._outboxes[websocket] = outbox
+            # Notices up to here are replayed, later ones arrive live
+            missed_panels = (get_panel_push().notices_since(panel_seq, panel_origin)
+                             if panel_seq is not None else None)
 
         # Set presence to available if they were offline
         if was_offline:
@@ -71,23 +235,86 @@ class MessageBroadcaster:
 
         logger.info(f"[WS] User {user_id} connected. Total connections: {self._count_connections()}")
 
-        # Send connection confirmation with current presence map
-        await self._send_to_websocket(websocket, {
-            "type": "connected",
+        # Send connection confirmation with current presence map and the
+        # held-incident count (later changes arrive as "held_count")
+        push = get_panel_push()
+        self._push(outbox, self._encode("connected", {
             "user_id": user_id,
-            "timestamp": datetime.now().isoformat(),
             "presence": self.get_all_presence(),
-        })
+            "held_count": push.held.value,
+            "panel_seq": push.seq,
+            "panel_origin": push.origin,
+            "topics": format_topics(outbox.topics),
+        }))
+
+        if resuming:
+            await self.replay(outbox, last_event_id, missed_panels)
+
+    async def replay(self, outbox: _Outbox, last_event_id: Optional[int],
+                     missed_panels: Optional[Dict] = None):
+        """Send a reconnecting client what it missed, then release the live
+        frames held meanwhile. Events after `last_event_id` come from the
+        replay ring (or the event_stream table) filtered by the connection's
+        topics; missed panel notices go out merged as one "panel_dirty"
+        with replay=true. Ends with "replay_done"; complete=false there (or
+        on the notice) means the client should refetch everything."""
+        if outbox.hold is None:
+            outbox.hold = []
+        events: List[Dict] = []
+        complete = True
+        try:
+            if last_event_id is not None:
+                from app.db import run_db
+                from app.eventstream.replay import events_since
+                events, complete = await run_db(events_since, int(last_event_id))
+        except Exception as e:
+            logger.warning(f"[WS] Replay for {outbox.user_id} failed: {e}")
+            events, complete = [], False
+        finally:
+            held, outbox.hold = outbox.hold, None
+
+        subs = outbox.topics
+        sent = 0
+        for ev in events:
+            topic = event_topic(ev.get("incident_id"), ev.get("unit_id"),
+                                ev.get("category"), ev.get("severity"))
+            if topic_matches(subs, topic):
+                self._push(outbox, self._encode("event_stream", ev))
+                sent += 1
+        if missed_panels is not None:
+            self._push(outbox, self._encode("panel_dirty", {**missed_panels, "replay": True}))
+        replayed_to = events[-1]["id"] if events else last_event_id
+        self._push(outbox, self._encode("replay_done", {
+            "last_event_id": replayed_to,
+            "count": sent,
+            "complete": complete,
+        }))
+        self._stats["replays"] += 1
+        for frame in held:
+            # Events committed during events_since arrive both ways: the
+            # replay already sent those up to replayed_to
+            if replayed_to is not None:
+                event_id = _ws_frame_event_id(frame)
+                if event_id is not None and event_id <= int(replayed_to):
+                    continue
+            self._push(outbox, frame)
 
     async def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection."""
         async with self._lock:
             user_id = self._ws_to_user.pop(websocket, None)
+            outbox = self._outboxes.pop(websocket, None)
             if user_id and user_id in self._connections:
                 self._connections[user_id].discard(websocket)
                 if not self._connections[user_id]:
                     del self._connections[user_id]
 
+        if outbox is not None:
+            outbox.closed = True
+            outbox.queue.clear()
+            if outbox.task is not None and outbox.task is not asyncio.current_task():
+                outbox.task.cancel()
+
         # If user has no more connections, set offline
         if user_id and not self.is_user_online(user_id):
             self._user_status[user_id] = "offline"
@@ -101,7 +328,8 @@ class MessageBroadcaster:
                 "last_seen": datetime.now().isoformat()
             })
 
-        logger.info(f"[WS] User {user_id} disconnected. Total connections: {self._count_connections()}")
+        if user_id:
+            logger.info(f"[WS] User {user_id} disconnected. Total connections: {self._count_connections()}")
 
     def _count_connections(self) -> int:
         """Count total active connections."""
@@ -162,33 +390,167 @@ class MessageBroadcaster:
         """Get user_ids subscribed to a channel."""
         return [uid for uid, subs in self._subscriptions.items() if channel_id in subs]
 
+    # ---- Event-Stream Topics ----
+
+    def subscribe_topics(self, websocket: WebSocket, topics, replace: bool = False):
+        """Limit the event stream sent to one connection to `topics` (see
+        parse_topics). Connections without topics get every event."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        parsed = parse_topics(topics)
+        if replace or "none" in parsed:
+            outbox.topics = parsed
+            return
+        current = outbox.topics
+        current.pop("none", None)
+        for kind, values in parsed.items():
+            current.setdefault(kind, set()).update(values)
+
+    def unsubscribe_topics(self, websocket: WebSocket, topics=None):
+        """Drop the given topics, or all of them (back to every event)."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        if topics is None:
+            outbox.topics = {}
+            return
+        current = outbox.topics
+        for kind, values in parse_topics(topics).items():
+            if kind in current:
+                current[kind] -= values
+                if not current[kind]:
+                    del current[kind]
+
+    def get_topics(self, websocket: WebSocket) -> List[str]:
+        outbox = self._outboxes.get(websocket)
+        return format_topics(outbox.topics) if outbox is not None else []
+
     # ---- Typing ----
 
     async def handle_typing(self, user_id: str, channel_id: int):
         """Handle typing indicator from a user."""
+        data = {"channel_id": channel_id, "user_id": user_id}
+        await self._send_typing(data)
+        # Channel subscriptions are per worker: the others resolve the
+        # channel against their own subscribers (deliver_remote)
+        self._relay("typing", data, exclude_users=[user_id])
+
+    async def _send_typing(self, data: Dict):
+        """Send a typing notice to this worker's other subscribers of the
+        channel."""
+        channel_id, user_id = data["channel_id"], data["user_id"]
         if channel_id not in self._typing:
             self._typing[channel_id] = {}
         self._typing[channel_id][user_id] = datetime.now()
 
-        # Broadcast to other subscribers of this channel
-        subscribers = self.get_channel_subscribers(channel_id)
-        for sub_id in subscribers:
-            if sub_id != user_id:
-                await self.send_to_user(sub_id, "typing", {
-                    "channel_id": channel_id,
-                    "user_id": user_id
-                })
+        subscribers = [sub_id for sub_id in self.get_channel_subscribers(channel_id)
+                       if sub_id != user_id]
+        if subscribers:
+            await self.send_to_users(subscribers, "typing", data, relay=False)
 
     # ---- Core Send/Broadcast ----
 
-    async def _send_to_websocket(self, ws: WebSocket, data: Dict) -> bool:
-        """Send data to a single WebSocket."""
-        try:
-            await ws.send_json(data)
+    def _encode(self, event_type: str, data: Dict) -> str:
+        self._stats["encoded"] += 1
+        return encode_frame(event_type, data)
+
+    def _enqueue(self, outbox: _Outbox, frame: str) -> bool:
+        """Queue an encoded frame for one connection without waiting (held
+        back while a replay is in progress)."""
+        if outbox.hold is not None and not outbox.closed:
+            if len(outbox.hold) >= self.outbox_size:
+                outbox.hold.pop(0)
+                outbox.dropped += 1
+                self._stats["dropped"] += 1
+            outbox.hold.append(frame)
             return True
-        except Exception as e:
-            logger.warning(f"[WS] Send failed: {e}")
+        return self._push(outbox, frame)
+
+    def _push(self, outbox: _Outbox, frame: str) -> bool:
+        """Append to the send queue, applying the slow-consumer policy when
+        it is full."""
+        if outbox.closed:
+            return False
+        if len(outbox.queue) >= self.outbox_size:
+            if self.slow_policy == "disconnect":
+                self._evict(outbox, "send queue full")
+                return False
+            outbox.queue.popleft()
+            outbox.dropped += 1
+            outbox.drops_in_row += 1
+            self._stats["dropped"] += 1
+            if outbox.drops_in_row >= self.slow_max_drops:
+                self._evict(outbox, f"{outbox.drops_in_row} messages dropped")
+                return False
+        outbox.queue.append((time.perf_counter(), frame))
+        self._stats["queued"] += 1
+        outbox.wakeup.set()
+        return True
+
+    def send_to_websocket(self, websocket: WebSocket, data: Dict) -> bool:
+        """Queue a raw message for one connection (e.g. a pong)."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
             return False
+        self._stats["encoded"] += 1
+        return self._enqueue(outbox, json.dumps(data))
+
+    async def _writer(self, outbox: _Outbox):
+        """Send queued messages to one socket, in order."""
+        ws = outbox.ws
+        while not outbox.closed:
+            if not outbox.queue:
+                outbox.wakeup.clear()
+                await outbox.wakeup.wait()
+                continue
+            queued_at, frame = outbox.queue.popleft()
+            try:
+                await asyncio.wait_for(ws.send_text(frame), self.send_timeout)
+            except asyncio.TimeoutError:
+                self._evict(outbox, f"send stalled > {self.send_timeout:g}s")
+                return
+            except Exception as e:
+                logger.warning(f"[WS] Send failed: {e}")
+                self._stats["send_failed"] += 1
+                await self.disconnect(ws)
+                return
+            lag_ms = (time.perf_counter() - queued_at) * 1000.0
+            outbox.sent += 1
+            outbox.drops_in_row = 0
+            outbox.max_lag_ms = max(outbox.max_lag_ms, lag_ms)
+            self._stats["sent"] += 1
+            self._stats["max_lag_ms"] = max(self._stats["max_lag_ms"], lag_ms)
+
+    def _evict(self, outbox: _Outbox, reason: str):
+        """Close a connection that cannot keep up (non-blocking)."""
+        if outbox.closed:
+            return
+        outbox.closed = True
+        outbox.queue.clear()
+        self._stats["evicted"] += 1
+        logger.warning(f"[WS] Disconnecting slow client {outbox.user_id}: {reason}")
+        asyncio.get_running_loop().create_task(self._close_slow(outbox))
+
+    async def _close_slow(self, outbox: _Outbox):
+        if outbox.task is not None and outbox.task is not asyncio.current_task():
+            outbox.task.cancel()
+        try:
+            # 1013 = try again later; the client reconnects and refetches
+            await asyncio.wait_for(outbox.ws.close(code=1013), 1.0)
+        except Exception:
+            pass
+        await self.disconnect(outbox.ws)
+
+    async def _queue_frame(self, user_ids: Iterable[str], frame: str) -> Dict[str, int]:
+        """Queue one encoded frame for every connection of `user_ids`."""
+        async with self._lock:
+            targets = [(uid, [self._outboxes[ws] for ws in self._connections.get(uid, ())
+                              if ws in self._outboxes])
+                       for uid in user_ids]
+
+        return {uid: sum(1 for outbox in outboxes if self._enqueue(outbox, frame))
+                for uid, outboxes in targets}
 
     async def send_to_user(
         self,
@@ -196,80 +558,138 @@ class MessageBroadcaster:
         event_type: str,
         data: Dict
     ) -> int:
-        """Send event to all connections for a specific user."""
-        message = {
-            "type": event_type,
-            "timestamp": datetime.now().isoformat(),
-            **data
-        }
-
-        sent_count = 0
-        failed_connections = []
-
-        async with self._lock:
-            connections = self._connections.get(user_id, set()).copy()
-
-        for ws in connections:
-            if await self._send_to_websocket(ws, message):
-                sent_count += 1
-            else:
-                failed_connections.append(ws)
-
-        # Clean up failed connections
-        for ws in failed_connections:
-            await self.disconnect(ws)
-
-        return sent_count
+        """Queue event for all connections of a specific user; returns the
+        number of connections it was queued for."""
+        results = await self.send_to_users([user_id], event_type, data)
+        return results[user_id]
 
     async def send_to_users(
         self,
         user_ids: List[str],
         event_type: str,
-        data: Dict
+        data: Dict,
+        relay: bool = True
     ) -> Dict[str, int]:
-        """Send event to multiple users."""
-        results = {}
-        for user_id in user_ids:
-            results[user_id] = await self.send_to_user(user_id, event_type, data)
+        """Send event to multiple users (encoded once). SSE fallback
+        clients among them get it too, and so do their connections on
+        other workers (`relay`)."""
+        user_ids = list(dict.fromkeys(user_ids))
+        await get_sse_manager().send_to_users(user_ids, event_type, data)
+        results = await self._queue_frame(user_ids, self._encode(event_type, data))
+        if relay:
+            self._relay(event_type, data, user_ids=user_ids)
         return results
 
     async def broadcast(
         self,
         event_type: str,
         data: Dict,
-        exclude_users: List[str] = None
+        exclude_users: List[str] = None,
+        topic: Optional[Dict[str, str]] = None,
+        relay: bool = True
     ) -> int:
-        """Broadcast event to all connected users."""
-        exclude_users = exclude_users or []
-        total_sent = 0
+        """Broadcast event to all connected users (encoded once). With a
+        `topic` (event_topic), only connections whose topic subscriptions
+        match receive it; the filtering happens before encoding. `relay`
+        also hands it to the other workers."""
+        exclude_users = set(exclude_users or ())
 
         async with self._lock:
-            all_users = list(self._connections.keys())
-
-        for user_id in all_users:
-            if user_id not in exclude_users:
-                total_sent += await self.send_to_user(user_id, event_type, data)
+            outboxes = [outbox for outbox in self._outboxes.values()
+                        if outbox.user_id not in exclude_users]
+        if topic is not None:
+            matched = [outbox for outbox in outboxes if topic_matches(outbox.topics, topic)]
+            self._stats["topic_filtered"] += len(outboxes) - len(matched)
+            outboxes = matched
+        await get_sse_manager().broadcast_event(event_type, data, exclude_users=list(exclude_users),
+                                                topic=topic)
+        delivered = 0
+        if outboxes:
+            frame = self._encode(event_type, data)
+            delivered = sum(1 for outbox in outboxes if self._enqueue(outbox, frame))
+        if relay:
+            self._relay(event_type, data, exclude_users=list(exclude_users) or None, topic=topic)
+        return delivered
+
+    @property
+    def bus(self):
+        if self._bus is None:
+            from .bus import get_event_bus
+            self._bus = get_event_bus()
+        return self._bus
+
+    def _relay(self, event_type: str, data: Dict, **kwargs):
+        """Hand an event to the other workers. Called after local delivery,
+        which never depends on the bus: a failure is only counted."""
+        try:
+            self.bus.publish(event_type, data, **kwargs)
+        except Exception as e:
+            self._stats["relay_failed"] += 1
+            logger.warning(f"[WS] Relay of {event_type} failed: {e}")
+
+    async def deliver_remote(self, event_type: str, data: Dict, user_ids: Optional[List[str]] = None,
+                             exclude_users: Optional[List[str]] = None,
+                             topic: Optional[Dict[str, str]] = None):
+        """An event relayed by another worker: deliver it to this worker's
+        clients without relaying it again, and keep per-process state in
+        step with it."""
+        if event_type == "panel_dirty":
+            # Re-issued under this worker's own notice seq, not relayed again
+            from .panel_push import get_panel_push
+            push = get_panel_push()
+            panels = data.get("panels") or []
+            if "held" in panels:
+                push.held.invalidate()
+            push.mark_dirty(panels, relay=False)
+            for incident_id in data.get("incident_ids") or ():
+                push.mark_dirty((), incident_id=incident_id, relay=False)
+            return
+        if event_type == "presence":
+            uid = data.get("user_id")
+            if data.get("status") == "offline" and self.is_user_online(uid):
+                # Left another worker, still connected here
+                return
+            self._user_status[uid] = data.get("status", "available")
+            self._last_activity[uid] = datetime.now()
+        elif event_type == "event_stream":
+            from app.eventstream.replay import remember_event
+            remember_event(data)
+        elif event_type == "typing":
+            await self._send_typing(data)
+            return
 
-        return total_sent
+        if user_ids is None:
+            await self.broadcast(event_type, data, exclude_users=exclude_users, topic=topic, relay=False)
+        else:
+            await self.send_to_users(user_ids, event_type, data, relay=False)
 
     async def ping_all(self):
         """Send ping to all connections to keep them alive."""
         async with self._lock:
-            all_websockets = [
-                ws for conns in self._connections.values()
-                for ws in conns
-            ]
-
-        for ws in all_websockets:
-            try:
-                await ws.send_json({"type": "ping", "timestamp": datetime.now().isoformat()})
-            except Exception:
-                await self.disconnect(ws)
+            outboxes = list(self._outboxes.values())
+
+        frame = self._encode("ping", {})
+        for outbox in outboxes:
+            self._enqueue(outbox, frame)
+
+    def stats(self) -> Dict[str, Any]:
+        """Send-queue counters plus the current depth per connection."""
+        out: Dict[str, Any] = dict(self._stats)
+        out["max_lag_ms"] = round(out["max_lag_ms"], 2)
+        out["connections"] = len(self._outboxes)
+        out["outbox_size"] = self.outbox_size
+        out["slow_policy"] = self.slow_policy
+        out["topic_subscribers"] = sum(1 for o in self._outboxes.values() if o.topics)
+        depths = sorted(((len(o.queue), o.user_id) for o in self._outboxes.values()), reverse=True)
+        out["deepest"] = [{"user_id": uid, "depth": d} for d, uid in depths[:5] if d]
+        return out
 
     # ---- WebSocket Message Handler ----
 
-    async def handle_client_message(self, user_id: str, data: Dict):
-        """Route incoming WebSocket messages from client."""
+    async def handle_client_message(self, user_id: str, data: Dict,
+                                    websocket: Optional[WebSocket] = None):
+        """Route incoming WebSocket messages from client. Topic changes
+        apply to the `websocket` they arrived on."""
         msg_type = data.get("type")
 
         if msg_type == "ping":
@@ -320,6 +740,14 @@ class MessageBroadcaster:
             if channel_id:
                 self.unsubscribe_channel(user_id, int(channel_id))
 
+        elif msg_type == "subscribe_topics":
+            if websocket is not None:
+                self.subscribe_topics(websocket, data.get("topics"), replace=bool(data.get("replace")))
+
+        elif msg_type == "unsubscribe_topics":
+            if websocket is not None:
+                self.unsubscribe_topics(websocket, data.get("topics"))
+
         # Update activity timestamp
         self._last_activity[user_id] = datetime.now()
 
@@ -340,49 +768,244 @@ def get_broadcaster() -> MessageBroadcaster:
 # SSE (Server-Sent Events) Fallback
 # ============================================================================
 
+def encode_sse_frame(event_type: str, data: Dict) -> str:
+    """One SSE event block, shared by every subscriber's queue. Event-stream
+    events carry their id, which the browser sends back as Last-Event-ID
+    when it reconnects."""
+    frame = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+    if event_type == "event_stream" and data.get("id") is not None:
+        frame = f"id: {data['id']}\n" + frame
+    return frame
+
+
+def _sse_frame_id(frame: str) -> Optional[int]:
+    if not frame.startswith("id: "):
+        return None
+    return int(frame[4:frame.index("\n")])
+
+
+# Per-subscriber limits. A browser that stops reading (lid closed, tab
+# alive) must not grow server memory over a shift: its queue is capped by
+# count and bytes (oldest dropped, then a "resync" tells it to refetch),
+# superseded events are coalesced, and a subscriber that has not taken a
+# frame for SSE_IDLE_EVICT seconds while frames are waiting is evicted.
+SSE_QUEUE_SIZE = int(os.getenv("CAD_SSE_QUEUE_SIZE", "200"))
+SSE_QUEUE_BYTES = int(os.getenv("CAD_SSE_QUEUE_BYTES", str(256 * 1024)))
+SSE_IDLE_EVICT = float(os.getenv("CAD_SSE_IDLE_EVICT", "300"))
+SSE_KEEPALIVE = 30.0
+
+
+def _coalesce_key(event_type: str, data: Dict) -> Optional[tuple]:
+    """Events where only the latest pending one matters (None: keep all)."""
+    if event_type == "presence":
+        return (event_type, data.get("user_id"))
+    if event_type == "typing":
+        return (event_type, data.get("channel_id"), data.get("user_id"))
+    if event_type in ("held_count", "panel_dirty"):
+        return (event_type,)
+    return None
+
+
+def _merge_panel_dirty(old: Dict, new: Dict) -> Dict:
+    """Two pending notices as one. first_seq keeps the client's seq-gap
+    check from mistaking the merge for lost notices."""
+    return {
+        **new,
+        "first_seq": old.get("first_seq", old.get("seq")),
+        "panels": sorted(set(old.get("panels", ())) | set(new.get("panels", ()))),
+        "incident_ids": sorted(set(old.get("incident_ids", ())) | set(new.get("incident_ids", ()))),
+    }
+
+
+class _SSESubscriber:
+    """Bounded, coalescing frame queue for one SSE connection."""
+
+    def __init__(self, user_id: str, max_frames: int, max_bytes: int,
+                 topics: Optional[Dict[str, Set[str]]] = None):
+        self.user_id = user_id
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        # Event-stream topics of this connection (parse_topics; empty = all)
+        self.topics = topics or {}
+        # [coalesce key, frame, data (coalescable events only)]
+        self.frames: Deque[list] = deque()
+        self.nbytes = 0
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.last_read = time.monotonic()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.lost = 0
+
+    def put(self, frame: str, key: Optional[tuple] = None, data: Optional[Dict] = None) -> int:
+        """Queue a frame; returns how many queued frames were dropped."""
+        if self.closed:
+            return 0
+        if key is not None:
+            for entry in self.frames:
+                if entry[0] == key:
+                    self.frames.remove(entry)
+                    self.nbytes -= len(entry[1])
+                    self.coalesced += 1
+                    if key[0] == "panel_dirty":
+                        data = _merge_panel_dirty(entry[2], data)
+                        frame = encode_sse_frame("panel_dirty", data)
+                    break
+        self.frames.append([key, frame, data if key is not None else None])
+        self.nbytes += len(frame)
+        dropped = 0
+        while len(self.frames) > 1 and (len(self.frames) > self.max_frames or self.nbytes > self.max_bytes):
+            self.nbytes -= len(self.frames.popleft()[1])
+            dropped += 1
+        self.dropped += dropped
+        self.lost += dropped
+        self.ready.set()
+        return dropped
+
+    def get_nowait(self) -> Optional[str]:
+        """Next frame (or None). After drops, a "resync" frame comes first."""
+        self.last_read = time.monotonic()
+        if self.lost:
+            frame = encode_sse_frame("resync", {"dropped": self.lost})
+            self.lost = 0
+            return frame
+        if not self.frames:
+            self.ready.clear()
+            return None
+        frame = self.frames.popleft()[1]
+        self.nbytes -= len(frame)
+        self.sent += 1
+        return frame
+
+    async def get(self, timeout: float = SSE_KEEPALIVE) -> Optional[str]:
+        """Wait up to `timeout` for a frame; None on timeout or close."""
+        frame = self.get_nowait()
+        if frame is not None or self.closed:
+            return frame
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.get_nowait()
+
+    def idle_for(self, now: float) -> float:
+        """Seconds since the reader last took a frame, while frames wait."""
+        return now - self.last_read if self.frames else 0.0
+
+    def close(self):
+        self.closed = True
+        self.frames.clear()
+        self.nbytes = 0
+        self.ready.set()
+
+
 class SSEManager:
     """
     Server-Sent Events manager for browsers that don't support WebSocket.
+    One bounded, coalescing queue of pre-encoded frames (encode_sse_frame)
+    per connection; stalled readers are evicted.
     """
 
-    def __init__(self):
-        self._queues: Dict[str, asyncio.Queue] = {}
+    def __init__(self, max_frames: int = SSE_QUEUE_SIZE, max_bytes: int = SSE_QUEUE_BYTES,
+                 idle_evict: float = SSE_IDLE_EVICT):
+        self._subs: Dict[str, Set[_SSESubscriber]] = {}
         self._lock = asyncio.Lock()
-
-    async def subscribe(self, user_id: str) -> asyncio.Queue:
-        """Create event queue for a user."""
+        self.max_frames = max(1, int(max_frames))
+        self.max_bytes = max(1, int(max_bytes))
+        self.idle_evict = float(idle_evict)
+        self._last_sweep = time.monotonic()
+        self._stats = {"subscribed": 0, "dropped": 0, "coalesced": 0, "evicted": 0,
+                       "topic_filtered": 0, "max_bytes_seen": 0}
+
+    async def subscribe(self, user_id: str, topics=None) -> _SSESubscriber:
+        """Create an event queue for one SSE connection of a user. `topics`
+        (the ?topics= query parameter) limits its event stream like a
+        WebSocket's."""
+        sub = _SSESubscriber(user_id, self.max_frames, self.max_bytes, parse_topics(topics))
         async with self._lock:
-            if user_id not in self._queues:
-                self._queues[user_id] = asyncio.Queue()
-            return self._queues[user_id]
+            self._subs.setdefault(user_id, set()).add(sub)
+            self._stats["subscribed"] += 1
+        return sub
 
-    async def unsubscribe(self, user_id: str):
-        """Remove event queue for a user."""
+    async def unsubscribe(self, sub: _SSESubscriber):
+        """Remove one connection's queue."""
+        sub.close()
         async with self._lock:
-            self._queues.pop(user_id, None)
+            subs = self._subs.get(sub.user_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.user_id]
+
+    def _put(self, subs: List[_SSESubscriber], event_type: str, data: Dict):
+        frame = encode_sse_frame(event_type, data)
+        key = _coalesce_key(event_type, data)
+        for sub in subs:
+            before = sub.coalesced
+            self._stats["dropped"] += sub.put(frame, key, data)
+            self._stats["coalesced"] += sub.coalesced - before
+            self._stats["max_bytes_seen"] = max(self._stats["max_bytes_seen"], sub.nbytes)
+        now = time.monotonic()
+        if now - self._last_sweep >= min(10.0, self.idle_evict):
+            self._last_sweep = now
+            self._sweep(now)
+
+    def _sweep(self, now: float):
+        """Evict subscribers that stopped reading."""
+        for uid, subs in list(self._subs.items()):
+            for sub in list(subs):
+                if sub.idle_for(now) > self.idle_evict:
+                    logger.warning(f"[SSE] Evicting idle subscriber {uid} "
+                                   f"({len(sub.frames)} frames, {sub.nbytes} bytes pending)")
+                    sub.close()
+                    subs.discard(sub)
+                    self._stats["evicted"] += 1
+            if not subs:
+                del self._subs[uid]
 
     async def send_event(self, user_id: str, event_type: str, data: Dict):
         """Queue event for a user."""
-        async with self._lock:
-            queue = self._queues.get(user_id)
+        await self.send_to_users([user_id], event_type, data)
 
-        if queue:
-            await queue.put({
-                "event": event_type,
-                "data": data,
-                "timestamp": datetime.now().isoformat()
-            })
+    async def send_to_users(self, user_ids: List[str], event_type: str, data: Dict):
+        """Queue event for several users (encoded once)."""
+        async with self._lock:
+            subs = [sub for uid in user_ids for sub in self._subs.get(uid, ())]
+        if subs:
+            self._put(subs, event_type, data)
 
-    async def broadcast_event(self, event_type: str, data: Dict, exclude_users: List[str] = None):
-        """Broadcast event to all subscribed users."""
-        exclude_users = exclude_users or []
+    async def broadcast_event(self, event_type: str, data: Dict, exclude_users: List[str] = None,
+                              topic: Optional[Dict[str, str]] = None):
+        """Broadcast event to all subscribed users (encoded once). With a
+        `topic`, only connections whose topics match get it."""
+        exclude_users = set(exclude_users or ())
 
         async with self._lock:
-            user_ids = list(self._queues.keys())
-
-        for user_id in user_ids:
-            if user_id not in exclude_users:
-                await self.send_event(user_id, event_type, data)
+            subs = [sub for uid, s in self._subs.items() if uid not in exclude_users for sub in s]
+        if topic is not None:
+            matched = [sub for sub in subs if topic_matches(sub.topics, topic)]
+            self._stats["topic_filtered"] += len(subs) - len(matched)
+            subs = matched
+        if subs:
+            self._put(subs, event_type, data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals plus memory held per subscriber (largest first)."""
+        now = time.monotonic()
+        subs = [sub for s in self._subs.values() for sub in s]
+        out: Dict[str, Any] = dict(self._stats)
+        out["subscribers"] = len(subs)
+        out["queued_bytes"] = sum(sub.nbytes for sub in subs)
+        out["limits"] = {"frames": self.max_frames, "bytes": self.max_bytes,
+                         "idle_evict_s": self.idle_evict}
+        out["largest"] = [
+            {"user_id": sub.user_id, "frames": len(sub.frames), "bytes": sub.nbytes,
+             "dropped": sub.dropped, "coalesced": sub.coalesced,
+             "idle_s": round(sub.idle_for(now), 1)}
+            for sub in sorted(subs, key=lambda x: x.nbytes, reverse=True)[:5]
+        ]
+        return out
 
 
 # Singleton SSE manager
@@ -397,9 +1020,12 @@ def get_sse_manager() -> SSEManager:
     return _sse_manager
 
 
-async def sse_event_generator(user_id: str):
+async def sse_event_generator(user_id: str, last_event_id: Optional[int] = None, topics=None):
     """
-    Async generator for SSE events.
+    Async generator for SSE events. With `last_event_id` (the browser's
+    Last-Event-ID header on reconnect) the missed event_stream events are
+    sent first, followed by a "replay_done" event. `topics` limits the
+    event stream (live and replayed) as for WebSocket clients.
 
     Usage in FastAPI:
         @app.get("/messages/events")
@@ -410,17 +1036,44 @@ async def sse_event_generator(user_id: str):
             )
     """
     manager = get_sse_manager()
-    queue = await manager.subscribe(user_id)
+    sub = await manager.subscribe(user_id, topics)
+    replayed_to = None
 
     try:
-        while True:
+        if last_event_id is not None:
+            from app.db import run_db
+            from app.eventstream.replay import events_since
             try:
-                # Wait for event with timeout (for keepalive)
-                event = await asyncio.wait_for(queue.get(), timeout=30)
-                yield f"event: {event['event']}\n"
-                yield f"data: {json.dumps(event['data'])}\n\n"
-            except asyncio.TimeoutError:
+                events, complete = await run_db(events_since, int(last_event_id))
+            except Exception as e:
+                logger.warning(f"[SSE] Replay for {user_id} failed: {e}")
+                events, complete = [], False
+            sent = 0
+            for ev in events:
+                topic = event_topic(ev.get("incident_id"), ev.get("unit_id"),
+                                    ev.get("category"), ev.get("severity"))
+                if topic_matches(sub.topics, topic):
+                    yield encode_sse_frame("event_stream", ev)
+                    sent += 1
+            replayed_to = events[-1]["id"] if events else int(last_event_id)
+            yield encode_sse_frame("replay_done", {
+                "last_event_id": replayed_to, "count": sent, "complete": complete,
+            })
+
+        while not sub.closed:
+            # Wait for event with timeout (for keepalive)
+            frame = await sub.get(timeout=SSE_KEEPALIVE)
+            if frame is None:
+                if sub.closed:
+                    break
                 # Send keepalive
                 yield f": keepalive\n\n"
+                continue
+            if replayed_to is not None:
+                # Queued live while the replay was read: already sent
+                event_id = _sse_frame_id(frame)
+                if event_id is not None and event_id <= replayed_to:
+                    continue
+            yield frame
     finally:
-        await manager.unsubscribe(user_id)
+        await manager.unsubscribe(sub)
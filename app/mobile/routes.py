@@ -8,7 +8,8 @@ import datetime
 from fastapi import FastAPI, Request, UploadFile, File, Form
 from fastapi.responses import HTMLResponse, JSONResponse
 
-from .models import init_mobile_schema, save_photo, get_photos
+from app.db import run_db
+from .models import save_photo, get_photos
 
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "static", "uploads", "photos")
 
@@ -16,11 +17,10 @@ UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file
 def register_mobile_routes(app: FastAPI):
     """Register extended mobile endpoints."""
 
-    init_mobile_schema()
     os.makedirs(UPLOAD_DIR, exist_ok=True)
 
     @app.get("/mobile/mdt/{unit_id}/timeline", response_class=HTMLResponse)
-    async def mobile_timeline(unit_id: str, request: Request):
+    def mobile_timeline(unit_id: str, request: Request):
         """Event timeline for active incident on this unit's MDT."""
         incident_id = _get_active_incident(unit_id)
         events = []
@@ -43,7 +43,7 @@ def register_mobile_routes(app: FastAPI):
     ):
         """Upload a photo from mobile device."""
         if not incident_id:
-            incident_id = _get_active_incident(unit_id)
+            incident_id = await run_db(_get_active_incident, unit_id)
         if not incident_id:
             return JSONResponse({"ok": False, "error": "No active incident"}, status_code=400)
 
@@ -52,41 +52,22 @@ def register_mobile_routes(app: FastAPI):
         unique_name = f"{incident_id}_{unit_id}_{uuid.uuid4().hex[:8]}{ext}"
         filepath = os.path.join(UPLOAD_DIR, unique_name)
 
-        # Save file
         contents = await file.read()
-        with open(filepath, "wb") as f:
-            f.write(contents)
-
-        # Save to DB
-        photo_id = save_photo(
-            incident_id=incident_id,
-            filename=unique_name,
-            filepath=f"/static/uploads/photos/{unique_name}",
-            mime_type=file.content_type or "image/jpeg",
-            file_size=len(contents),
-            caption=caption,
-            uploaded_by=unit_id,
+        photo_id = await run_db(
+            _store_photo, unit_id, incident_id, unique_name, filepath,
+            file.content_type or "image/jpeg", contents, caption,
         )
-
-        # Emit to event stream
-        try:
-            from app.eventstream.emitter import emit_event
-            emit_event("PHOTO_UPLOADED", incident_id=incident_id, unit_id=unit_id,
-                       summary=f"Photo uploaded by {unit_id}" + (f": {caption}" if caption else ""))
-        except Exception:
-            pass
-
         return {"ok": True, "photo_id": photo_id, "filepath": f"/static/uploads/photos/{unique_name}"}
 
     @app.get("/mobile/mdt/{unit_id}/photos", response_class=HTMLResponse)
-    async def mobile_photos(unit_id: str, request: Request):
+    def mobile_photos(unit_id: str, request: Request):
         """Photo gallery for active incident."""
         incident_id = _get_active_incident(unit_id)
         photos = get_photos(incident_id) if incident_id else []
         return _render_mobile_photos(unit_id, incident_id, photos)
 
     @app.get("/mobile/mdt/{unit_id}/messages", response_class=HTMLResponse)
-    async def mobile_messages(unit_id: str, request: Request):
+    def mobile_messages(unit_id: str, request: Request):
         """Mobile chat interface for unit."""
         incident_id = _get_active_incident(unit_id)
         messages = []
@@ -95,9 +76,8 @@ def register_mobile_routes(app: FastAPI):
                 from app.messaging.chat_engine import get_chat_engine
                 engine = get_chat_engine()
                 # Try to get incident channel messages
-                import sqlite3
-                conn = sqlite3.connect("cad.db", timeout=30, check_same_thread=False)
-                conn.row_factory = sqlite3.Row
+                from app.db import get_conn
+                conn = get_conn()
                 c = conn.cursor()
                 rows = c.execute("""
                     SELECT * FROM chat_messages
@@ -114,18 +94,45 @@ def register_mobile_routes(app: FastAPI):
         return _render_mobile_messages(unit_id, incident_id, messages)
 
     @app.get("/api/mobile/photos/{incident_id}")
-    async def api_mobile_photos(incident_id: int):
+    def api_mobile_photos(incident_id: int):
         """JSON photo list for an incident."""
         photos = get_photos(incident_id)
         return {"ok": True, "photos": photos}
 
 
+def _store_photo(unit_id: str, incident_id: int, unique_name: str, filepath: str,
+                 mime_type: str, contents: bytes, caption: str) -> int:
+    """Write an uploaded photo to disk and the database (blocking)."""
+    # Save file
+    with open(filepath, "wb") as f:
+        f.write(contents)
+
+    # Save to DB
+    photo_id = save_photo(
+        incident_id=incident_id,
+        filename=unique_name,
+        filepath=f"/static/uploads/photos/{unique_name}",
+        mime_type=mime_type,
+        file_size=len(contents),
+        caption=caption,
+        uploaded_by=unit_id,
+    )
+
+    # Emit to event stream
+    try:
+        from app.eventstream.emitter import emit_event
+        emit_event("PHOTO_UPLOADED", incident_id=incident_id, unit_id=unit_id,
+                   summary=f"Photo uploaded by {unit_id}" + (f": {caption}" if caption else ""))
+    except Exception:
+        pass
+    return photo_id
+
+
 def _get_active_incident(unit_id: str):
     """Get the active incident for a unit."""
     try:
-        import sqlite3
-        conn = sqlite3.connect("cad.db", timeout=30, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        from app.db import get_conn
+        conn = get_conn()
         c = conn.cursor()
         row = c.execute("""
             SELECT incident_id FROM UnitAssignments
@@ -4,7 +4,6 @@ FORD-CAD Playbooks — Action Executors
 Executes playbook actions: notifications, suggestions, auto-dispatch hints.
 """
 import json
-import asyncio
 import logging
 from typing import Dict, List, Optional
 
@@ -72,8 +71,7 @@ def _send_notification(message: str, incident_id: Optional[int], unit_id: Option
                        playbook_name: str, targets: List[str] = None):
     """Send notification via WebSocket broadcast."""
     try:
-        from app.messaging.websocket import get_broadcaster
-        broadcaster = get_broadcaster()
+        from app.messaging.bridge import publish
         payload = {
             "message": message,
             "playbook": playbook_name,
@@ -81,11 +79,7 @@ def _send_notification(message: str, incident_id: Optional[int], unit_id: Option
             "unit_id": unit_id,
             "targets": targets or [],
         }
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.broadcast("playbook_notification", payload))
-        except RuntimeError:
-            pass
+        publish("playbook_notification", payload)
     except Exception as e:
         logger.debug(f"[Playbooks] notification broadcast skipped: {e}")
 
@@ -93,19 +87,14 @@ def _send_notification(message: str, incident_id: Optional[int], unit_id: Option
 def _send_suggestion(message: str, incident_id: Optional[int], playbook_name: str):
     """Send a suggestion toast via WebSocket."""
     try:
-        from app.messaging.websocket import get_broadcaster
-        broadcaster = get_broadcaster()
+        from app.messaging.bridge import publish
         payload = {
             "type": "suggestion",
             "message": message,
             "playbook": playbook_name,
             "incident_id": incident_id,
         }
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.broadcast("playbook_suggestion", payload))
-        except RuntimeError:
-            pass
+        publish("playbook_suggestion", payload)
     except Exception:
         pass
 
@@ -115,8 +104,8 @@ def _add_narrative(incident_id: Optional[int], text: str, user: str):
     if not incident_id:
         return
     try:
-        import sqlite3
-        conn = sqlite3.connect("cad.db", timeout=30, check_same_thread=False)
+        from app.db import get_conn
+        conn = get_conn(row_factory=None)
         c = conn.cursor()
         import datetime
         ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 def evaluate_playbooks(event_type: str, context: Dict) -> None:
     """
     Evaluate all enabled playbooks against an event.
-    Called from emit_event() after writing to event_stream.
+    Called from emit_event() once the event_stream row is committed.
 
     context keys: event_type, incident_id, unit_id, category, severity,
                   summary, user, shift
@@ -128,9 +128,7 @@ def dismiss_playbook_suggestion(execution_id: int, user: str) -> bool:
 def _send_playbook_suggestion(playbook: Dict, context: Dict):
     """Broadcast a playbook suggestion to dispatchers."""
     try:
-        import asyncio
-        from app.messaging.websocket import get_broadcaster
-        broadcaster = get_broadcaster()
+        from app.messaging.bridge import publish
 
         actions = json.loads(playbook["actions_json"]) if isinstance(playbook["actions_json"], str) else playbook["actions_json"]
         message = actions[0].get("message", playbook["name"]) if actions else playbook["name"]
@@ -144,10 +142,6 @@ def _send_playbook_suggestion(playbook: Dict, context: Dict):
             "unit_id": context.get("unit_id"),
         }
 
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.broadcast("playbook_suggestion", payload))
-        except RuntimeError:
-            pass
+        publish("playbook_suggestion", payload)
     except Exception:
         pass
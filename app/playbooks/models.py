@@ -1,18 +1,15 @@
 """
 FORD-CAD Playbooks — Database Models & CRUD
 """
-import sqlite3
 import json
 import datetime
 from typing import Optional, List, Dict
 
-DB_PATH = "cad.db"
+from app.db import audit_insert, flush_audit, get_conn
 
 
 def _get_conn():
-    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_conn()
 
 
 def _ts() -> str:
@@ -200,17 +197,13 @@ def delete_playbook(pb_id: int) -> bool:
 
 
 def log_execution(playbook_id: int, incident_id: Optional[int], unit_id: Optional[str],
-                  result: str, actions_taken: str, executed_by: str = "system", details: str = "") -> int:
-    conn = _get_conn()
-    c = conn.cursor()
-    c.execute("""
+                  result: str, actions_taken: str, executed_by: str = "system", details: str = "") -> None:
+    """Queue an execution record on the audit writer (group-committed)."""
+    audit_insert("""
         INSERT INTO playbook_executions (playbook_id, timestamp, incident_id, unit_id, result, actions_taken, executed_by, details)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (playbook_id, _ts(), incident_id, unit_id, result, actions_taken, executed_by, details))
-    exec_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    return exec_id
+    """, (playbook_id, _ts(), incident_id, unit_id, result, actions_taken, executed_by, details),
+        name="playbook_executions")
 
 
 def get_executions(playbook_id: Optional[int] = None, incident_id: Optional[int] = None, limit: int = 50) -> List[Dict]:
@@ -237,6 +230,9 @@ def get_executions(playbook_id: Optional[int] = None, incident_id: Optional[int]
 
 def count_fires_for_incident(playbook_id: int, incident_id: int) -> int:
     """Count how many times a playbook has fired for a specific incident."""
+    # Executions are queued on the audit writer; commit them before counting
+    # so max_fires_per_incident holds for back-to-back events.
+    flush_audit()
     conn = _get_conn()
     row = conn.execute("""
         SELECT COUNT(*) as cnt FROM playbook_executions
@@ -5,8 +5,10 @@ import json
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 
+from app.db import run_db
+
 from .models import (
-    init_playbook_schema, get_playbooks, get_playbook,
+    get_playbooks, get_playbook,
     create_playbook, update_playbook, delete_playbook,
     get_executions,
 )
@@ -16,10 +18,8 @@ from .engine import execute_playbook_suggestion, dismiss_playbook_suggestion
 def register_playbook_routes(app: FastAPI):
     """Register all playbook endpoints."""
 
-    init_playbook_schema()
-
     @app.get("/api/playbooks")
-    async def api_get_playbooks(request: Request):
+    def api_get_playbooks(request: Request):
         playbooks = get_playbooks()
         return {"ok": True, "playbooks": playbooks}
 
@@ -27,22 +27,22 @@ def register_playbook_routes(app: FastAPI):
     async def api_create_playbook(request: Request):
         data = await request.json()
         data["created_by"] = request.session.get("user", "admin")
-        pb_id = create_playbook(data)
+        pb_id = await run_db(create_playbook, data)
         return {"ok": True, "playbook_id": pb_id}
 
     @app.put("/api/playbooks/{pb_id}")
     async def api_update_playbook(pb_id: int, request: Request):
         data = await request.json()
-        update_playbook(pb_id, data)
+        await run_db(update_playbook, pb_id, data)
         return {"ok": True}
 
     @app.delete("/api/playbooks/{pb_id}")
-    async def api_delete_playbook(pb_id: int, request: Request):
+    def api_delete_playbook(pb_id: int, request: Request):
         delete_playbook(pb_id)
         return {"ok": True}
 
     @app.get("/api/playbooks/executions")
-    async def api_get_executions(request: Request):
+    def api_get_executions(request: Request):
         pb_id = request.query_params.get("playbook_id")
         inc_id = request.query_params.get("incident_id")
         execs = get_executions(
@@ -52,19 +52,19 @@ def register_playbook_routes(app: FastAPI):
         return {"ok": True, "executions": execs}
 
     @app.post("/api/playbooks/executions/{exec_id}/accept")
-    async def api_accept_suggestion(exec_id: int, request: Request):
+    def api_accept_suggestion(exec_id: int, request: Request):
         user = request.session.get("user", "Dispatcher")
         ok = execute_playbook_suggestion(exec_id, user)
         return {"ok": ok}
 
     @app.post("/api/playbooks/executions/{exec_id}/dismiss")
-    async def api_dismiss_suggestion(exec_id: int, request: Request):
+    def api_dismiss_suggestion(exec_id: int, request: Request):
         user = request.session.get("user", "Dispatcher")
         ok = dismiss_playbook_suggestion(exec_id, user)
         return {"ok": ok}
 
     @app.get("/modals/playbooks", response_class=HTMLResponse)
-    async def modal_playbooks(request: Request):
+    def modal_playbooks(request: Request):
         playbooks = get_playbooks()
         execs = get_executions(limit=20)
         return _render_playbook_modal(playbooks, execs)
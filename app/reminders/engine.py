@@ -216,8 +216,7 @@ def _recently_reminded_location(rule_id: int, location: str, minutes: int = 60)
 def _notify(message: str, severity: str, incident_id: Optional[int], unit_id: Optional[str], rule: dict):
     """Send notification via WebSocket broadcast and event stream."""
     try:
-        from app.messaging.websocket import get_broadcaster
-        import asyncio
+        from app.messaging.bridge import publish
 
         payload = {
             "message": message,
@@ -228,12 +227,7 @@ def _notify(message: str, severity: str, incident_id: Optional[int], unit_id: Op
             "rule_type": rule.get("rule_type", ""),
         }
 
-        broadcaster = get_broadcaster()
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(broadcaster.broadcast("reminder", payload))
-        except RuntimeError:
-            pass
+        publish("reminder", payload)
     except Exception:
         pass
 
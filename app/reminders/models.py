@@ -1,18 +1,15 @@
 """
 FORD-CAD Reminders — Database Models & Query Helpers
 """
-import sqlite3
 import json
 import datetime
 from typing import Optional, List, Dict
 
-DB_PATH = "cad.db"
+from app.db import get_conn
 
 
 def _get_conn():
-    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_conn()
 
 
 def _ts() -> str:
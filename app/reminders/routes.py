@@ -5,8 +5,10 @@ import json
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 
+from app.db import run_db
+
 from .models import (
-    init_reminder_schema, get_rules, get_rule, create_rule,
+    get_rules, get_rule, create_rule,
     update_rule, delete_rule, get_active_reminders, acknowledge_reminder,
 )
 
@@ -14,10 +16,8 @@ from .models import (
 def register_reminder_routes(app: FastAPI):
     """Register all reminder endpoints."""
 
-    init_reminder_schema()
-
     @app.get("/api/reminders/rules")
-    async def api_get_rules(request: Request):
+    def api_get_rules(request: Request):
         rules = get_rules()
         return {"ok": True, "rules": rules}
 
@@ -25,7 +25,8 @@ def register_reminder_routes(app: FastAPI):
     async def api_create_rule(request: Request):
         data = await request.json()
         user = request.session.get("user", "admin")
-        rule_id = create_rule(
+        rule_id = await run_db(
+            create_rule,
             name=data.get("name", "Untitled"),
             rule_type=data.get("rule_type", "custom"),
             config=data.get("config", {}),
@@ -37,27 +38,27 @@ def register_reminder_routes(app: FastAPI):
     @app.put("/api/reminders/rules/{rule_id}")
     async def api_update_rule(rule_id: int, request: Request):
         data = await request.json()
-        update_rule(rule_id, **data)
+        await run_db(update_rule, rule_id, **data)
         return {"ok": True}
 
     @app.delete("/api/reminders/rules/{rule_id}")
-    async def api_delete_rule(rule_id: int, request: Request):
+    def api_delete_rule(rule_id: int, request: Request):
         delete_rule(rule_id)
         return {"ok": True}
 
     @app.get("/api/reminders/active")
-    async def api_active_reminders(request: Request):
+    def api_active_reminders(request: Request):
         reminders = get_active_reminders()
         return {"ok": True, "reminders": reminders}
 
     @app.post("/api/reminders/{reminder_id}/acknowledge")
-    async def api_acknowledge_reminder(reminder_id: int, request: Request):
+    def api_acknowledge_reminder(reminder_id: int, request: Request):
         user = request.session.get("user", "Dispatcher")
         acknowledge_reminder(reminder_id, user)
         return {"ok": True}
 
     @app.get("/modals/reminders", response_class=HTMLResponse)
-    async def modal_reminders(request: Request):
+    def modal_reminders(request: Request):
         rules = get_rules()
         active = get_active_reminders()
         return _render_reminder_modal(rules, active)
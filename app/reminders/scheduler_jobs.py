@@ -2,10 +2,14 @@
 FORD-CAD Reminders — Scheduler Jobs
 
 Uses its own APScheduler BackgroundScheduler instance (not the reporting scheduler).
+Every worker runs the scheduler; the jobs only fire in the worker holding the
+"reminders" lease (app/db/lease.py).
 """
 import logging
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from app.db import leader_only
+
 from .engine import check_on_scene_timers, check_repeated_alarms, generate_shift_handoff_summary
 
 logger = logging.getLogger(__name__)
@@ -32,7 +36,7 @@ def init_reminder_scheduler():
 
     # On-Scene Timer: check every 60 seconds
     scheduler.add_job(
-        check_on_scene_timers,
+        leader_only("reminders")(check_on_scene_timers),
         "interval",
         seconds=60,
         id="reminder_on_scene_timer",
@@ -41,7 +45,7 @@ def init_reminder_scheduler():
 
     # Repeated Alarm Detector: check every 5 minutes
     scheduler.add_job(
-        check_repeated_alarms,
+        leader_only("reminders")(check_repeated_alarms),
         "interval",
         minutes=5,
         id="reminder_repeated_alarm",
@@ -64,6 +68,7 @@ def init_reminder_scheduler():
     logger.info("[Reminders] Scheduler started with on-scene, repeated-alarm, and shift-handoff jobs")
 
 
+@leader_only("reminders")
 def _post_shift_handoff():
     """Generate and broadcast shift handoff summary."""
     try:
@@ -71,21 +76,14 @@ def _post_shift_handoff():
         if not summary:
             return
 
-        # Broadcast via WebSocket
+        # Broadcast via WebSocket (runs on the scheduler thread)
         try:
-            from app.messaging.websocket import get_broadcaster
-            import asyncio
-            broadcaster = get_broadcaster()
-            payload = {
+            from app.messaging.bridge import publish
+            publish("reminder", {
                 "message": summary,
                 "severity": "info",
                 "type": "shift_handoff",
-            }
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(broadcaster.broadcast("reminder", payload))
-            except RuntimeError:
-                pass
+            })
         except Exception:
             pass
 
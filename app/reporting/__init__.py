@@ -13,7 +13,7 @@
 from .config import ReportingConfig, get_config, set_config
 from .scheduler import ReportScheduler, get_scheduler
 from .engine import ReportEngine, get_engine
-from .routes import register_reporting_routes
+from .routes import register_reporting_routes, start_reporting
 
 __version__ = "3.0.0"
 __all__ = [
@@ -25,4 +25,5 @@ __all__ = [
     "ReportEngine",
     "get_engine",
     "register_reporting_routes",
+    "start_reporting",
 ]
@@ -343,7 +343,3 @@ def migrate_from_json_config():
 
     except Exception as e:
         print(f"[REPORTING] Migration error: {e}")
-
-
-# Initialize defaults on import
-ReportingConfig.init_defaults()
@@ -21,12 +21,15 @@
 import json
 import logging
 import sqlite3
+import time
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
+from app.db import reporting_conn, reporting_snapshot
+
 from .models import (
     RunRepository,
     ReportRun,
@@ -61,7 +64,6 @@ except ImportError:
 logger = logging.getLogger("reporting.engine")
 
 EASTERN = ZoneInfo("America/New_York")
-DB_PATH = Path("cad.db")
 
 # ============================================================================
 # Timestamp helpers
@@ -189,10 +191,29 @@ def _resolve_shift_range(
 # ============================================================================
 
 def _get_conn() -> sqlite3.Connection:
-    """Return a new connection with row-factory enabled."""
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Read-only connection to the reporting snapshot (row-factory enabled).
+
+    Extractors never touch the live database: a month-long summary must
+    not compete with dispatch commits.
+    """
+    return reporting_conn()
+
+
+def _snapshot_not_before(filters: Dict[str, Any]) -> float:
+    """Earliest acceptable snapshot time (epoch seconds) for a report.
+
+    The snapshot must have been taken after the end of the report range. A
+    range the engine resolves itself (the current shift), one ending in the
+    future or one that cannot be parsed reaches the present: it gets a
+    snapshot taken now, so rows written just before the run are included.
+    """
+    now = time.time()
+    if not (filters.get("date_start") and filters.get("date_end")):
+        return now
+    end = _parse_ts(str(filters["date_end"]))
+    if end is None:
+        return now
+    return min(now, end.timestamp())
 
 
 def _rows_to_dicts(rows) -> List[Dict[str, Any]]:
@@ -3623,9 +3644,10 @@ class ReportEngine:
         )
 
         try:
-            # 2. Extract data.
+            # 2. Extract data (one consistent snapshot for every query).
             extractor = get_extractor(template_key)
-            data = extractor(filters)
+            with reporting_snapshot(not_before=_snapshot_not_before(filters)):
+                data = extractor(filters)
 
             # Ensure metadata carries template_key and title for the renderer
             if "metadata" not in data:
@@ -4099,7 +4121,8 @@ class ReportEngine:
             # shift_end and custom use shift-based defaults (handled by extractor).
 
         extractor = get_extractor(template_key)
-        data = extractor(filters)
+        with reporting_snapshot(not_before=_snapshot_not_before(filters)):
+            data = extractor(filters)
 
         # Re-shape into the format the legacy HTML formatter expects.
         return self._reshape_legacy(data, report_type, shift, date)
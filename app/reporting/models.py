@@ -5,7 +5,6 @@
 # report_deliveries, report_schedules, plus legacy tables preserved.
 # ============================================================================
 
-import sqlite3
 import json
 import uuid
 import hmac
@@ -17,8 +16,9 @@ from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field, asdict
 from zoneinfo import ZoneInfo
 
+from app.db import get_conn
+
 EASTERN = ZoneInfo('America/New_York')
-DB_PATH = Path("cad.db")
 ARTIFACT_DIR = Path("artifacts/reports")
 
 # Secret for signing download tokens
@@ -198,7 +198,7 @@ CREATE INDEX IF NOT EXISTS idx_report_contacts_enabled ON report_contacts(enable
 
 def init_database():
     """Initialize the reporting database tables."""
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = get_conn(row_factory=None)
     conn.executescript(SCHEMA_SQL)
     conn.commit()
     conn.close()
@@ -206,9 +206,7 @@ def init_database():
 
 def get_db():
     """Get database connection with row factory."""
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_conn()
 
 
 def ensure_artifact_dir(run_id: int) -> Path:
@@ -1103,8 +1101,3 @@ def seed_builtin_templates():
     ]
     for t in builtins:
         TemplateRepository.upsert(t)
-
-
-# Initialize on import
-init_database()
-seed_builtin_templates()
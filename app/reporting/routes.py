@@ -20,6 +20,8 @@ from datetime import datetime
 from fastapi import APIRouter, Request, HTTPException, BackgroundTasks, Query
 from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
 
+from app.db import reporting_snapshot, run_db
+
 from .models import (
     TemplateRepository, RunRepository, DeliveryRepository,
     NewScheduleRepository, AuditRepository, ReportRun,
@@ -266,7 +268,7 @@ def _json_loads_safe(raw: str, fallback: Any = None) -> Any:
 # ============================================================================
 
 @modal_router.get("/modals/reporting", response_class=HTMLResponse)
-async def reporting_modal(request: Request):
+def reporting_modal(request: Request):
     """Return the 4-tab reporting modal HTML.
 
     Attempts to load the template from the templates directory via Jinja2.
@@ -371,7 +373,7 @@ def _inline_reporting_modal_html() -> str:
 # ============================================================================
 
 @router.get("/templates")
-async def list_templates():
+def list_templates():
     """List all report templates (built-in + custom).
 
     Returns a combined list with built-in templates flagged as ``builtin: true``
@@ -418,6 +420,10 @@ async def create_template(request: Request):
     ```
     """
     data = await request.json()
+    return await run_db(_create_template, request, data)
+
+
+def _create_template(request: Request, data: dict):
     user = _get_user(request)
 
     name = data.get("name", "").strip()
@@ -483,7 +489,7 @@ async def run_report(request: Request, background_tasks: BackgroundTasks):
 
     # Validate template exists
     builtin_keys = {bt["template_key"] for bt in BUILTIN_TEMPLATES}
-    template = TemplateRepository.get_by_key(template_key)
+    template = await run_db(TemplateRepository.get_by_key, template_key)
     if not template and template_key not in builtin_keys:
         raise HTTPException(status_code=404, detail=f"Unknown template_key: {template_key}")
 
@@ -498,7 +504,8 @@ async def run_report(request: Request, background_tasks: BackgroundTasks):
     run_id = None
     try:
         engine = get_engine()
-        result = engine.run_report(
+        result = await run_db(
+            engine.run_report,
             template_key=template_key,
             filters=filters,
             formats=formats,
@@ -558,6 +565,26 @@ async def run_report(request: Request, background_tasks: BackgroundTasks):
 # Preview  (/api/reporting/preview)
 # ============================================================================
 
+def _render_preview(template_key: str, filters: Dict[str, Any]) -> str:
+    """Extract + render a preview (blocking; runs on the DB executor)."""
+    from .engine import _snapshot_not_before, get_extractor
+    extractor = get_extractor(template_key)
+    # Same freshness bound as a report run: a range reaching the present
+    # must not come from a snapshot older than the latest calls
+    with reporting_snapshot(not_before=_snapshot_not_before(filters)):
+        data = extractor(filters)
+
+    # Use the renderer for proper template-aware HTML
+    try:
+        from .renderer import ReportRenderer
+        renderer = ReportRenderer()
+        return renderer.render_html(template_key, data.get("metadata", {}).get("title", template_key), data, filters)
+    except Exception:
+        # Fallback to engine's built-in HTML
+        engine = get_engine()
+        return engine._render_html(data)
+
+
 @router.get("/preview", response_class=HTMLResponse)
 async def preview_report(
     template_key: str = Query("blotter", description="Template key"),
@@ -577,7 +604,6 @@ async def preview_report(
     without persisting a run record.
     """
     try:
-        from .engine import get_extractor
         filters: Dict[str, Any] = {}
         if date_from:
             filters["date_start"] = date_from
@@ -598,18 +624,7 @@ async def preview_report(
         if status:
             filters["status"] = status
 
-        extractor = get_extractor(template_key)
-        data = extractor(filters)
-
-        # Use the renderer for proper template-aware HTML
-        try:
-            from .renderer import ReportRenderer
-            renderer = ReportRenderer()
-            html = renderer.render_html(template_key, data.get("metadata", {}).get("title", template_key), data, filters)
-        except Exception:
-            # Fallback to engine's built-in HTML
-            engine = get_engine()
-            html = engine._render_html(data)
+        html = await run_db(_render_preview, template_key, filters)
         return HTMLResponse(content=html)
     except Exception as exc:
         logger.error("Preview failed: %s", exc, exc_info=True)
@@ -653,7 +668,7 @@ async def deliver_report(request: Request, background_tasks: BackgroundTasks):
         raise HTTPException(status_code=400, detail="At least one channel is required")
 
     engine = get_engine()
-    result = engine.deliver_report(run_id, channels, triggered_by=user)
+    result = await run_db(engine.deliver_report, run_id, channels, triggered_by=user)
 
     if not result.get("ok") and "not found" in result.get("error", ""):
         raise HTTPException(status_code=404, detail=result["error"])
@@ -663,7 +678,7 @@ async def deliver_report(request: Request, background_tasks: BackgroundTasks):
 
 
 @router.get("/delivery/status")
-async def delivery_channel_status():
+def delivery_channel_status():
     """Return configuration status for each delivery channel."""
     from .delivery import (
         EmailDelivery, SMSDelivery, WebhookDelivery,
@@ -683,7 +698,7 @@ async def delivery_channel_status():
 # ============================================================================
 
 @router.get("/units")
-async def reporting_units_list():
+def reporting_units_list():
     """Return unit_id and name for all apparatus units.
 
     Used by the reporting modal to populate apparatus filter checkboxes
@@ -747,7 +762,7 @@ async def report_history(
     status: Optional[str] = Query(None, description="Filter by status"),
 ):
     """List report runs with optional filters."""
-    runs = RunRepository.get_recent(limit=limit, template_key=template_key)
+    runs = await run_db(RunRepository.get_recent, limit=limit, template_key=template_key)
 
     # Apply status filter in-memory if provided
     if status:
@@ -762,11 +777,11 @@ async def report_history(
 @router.get("/run/{run_id}")
 async def get_run_detail(run_id: int):
     """Get details of a specific report run including delivery records."""
-    run = RunRepository.get_by_id(run_id)
+    run = await run_db(RunRepository.get_by_id, run_id)
     if not run:
         raise HTTPException(status_code=404, detail=f"Report run {run_id} not found")
 
-    deliveries = DeliveryRepository.get_for_run(run_id)
+    deliveries = await run_db(DeliveryRepository.get_for_run, run_id)
 
     # Generate download links if artifacts exist
     links: Dict[str, str] = {}
@@ -788,7 +803,7 @@ async def get_run_detail(run_id: int):
 # ============================================================================
 
 @router.get("/schedules")
-async def list_schedules():
+def list_schedules():
     """List all report schedules (new-style)."""
     schedules = NewScheduleRepository.get_all()
     return {"schedules": [s.to_dict() for s in schedules]}
@@ -814,6 +829,10 @@ async def create_schedule(request: Request):
     """
     _require_admin(request)
     data = await request.json()
+    return await run_db(_create_schedule, request, data)
+
+
+def _create_schedule(request: Request, data: dict):
     user = _get_user(request)
 
     name = data.get("name", "").strip()
@@ -857,16 +876,23 @@ async def toggle_schedule(schedule_id: int, request: Request):
     If no body is provided, the schedule's enabled state is flipped.
     """
     _require_admin(request)
+    try:
+        data = await request.json()
+    except Exception:
+        # No body or invalid JSON -- just toggle
+        data = None
+    return await run_db(_toggle_schedule, schedule_id, request, data)
+
+
+def _toggle_schedule(schedule_id: int, request: Request, data: Optional[dict]):
     user = _get_user(request)
     schedule = NewScheduleRepository.get_by_id(schedule_id)
     if not schedule:
         raise HTTPException(status_code=404, detail=f"Schedule {schedule_id} not found")
 
     try:
-        data = await request.json()
         enabled = bool(data.get("enabled", not schedule.enabled))
     except Exception:
-        # No body or invalid JSON -- just toggle
         enabled = not schedule.enabled
 
     NewScheduleRepository.toggle(schedule_id, enabled)
@@ -886,7 +912,7 @@ async def toggle_schedule(schedule_id: int, request: Request):
 
 
 @router.post("/schedule/{schedule_id}/run_now")
-async def run_schedule_now(schedule_id: int, request: Request, background_tasks: BackgroundTasks):
+def run_schedule_now(schedule_id: int, request: Request, background_tasks: BackgroundTasks):
     """Manually trigger a scheduled report immediately (admin only).
 
     Uses the v3 scheduler run_now() which calls engine.run_report() + deliver_report().
@@ -917,7 +943,7 @@ async def run_schedule_now(schedule_id: int, request: Request, background_tasks:
 
 
 @router.delete("/schedule/{schedule_id}")
-async def delete_schedule(schedule_id: int, request: Request):
+def delete_schedule(schedule_id: int, request: Request):
     """Delete a report schedule (admin only)."""
     _require_admin(request)
     user = _get_user(request)
@@ -960,6 +986,10 @@ async def update_schedule(schedule_id: int, request: Request):
     """
     _require_admin(request)
     data = await request.json()
+    return await run_db(_update_schedule, schedule_id, request, data)
+
+
+def _update_schedule(schedule_id: int, request: Request, data: dict):
     user = _get_user(request)
 
     schedule = NewScheduleRepository.get_by_id(schedule_id)
@@ -1005,7 +1035,7 @@ async def update_schedule(schedule_id: int, request: Request):
 # ============================================================================
 
 @router.get("/scheduler/status")
-async def scheduler_status(request: Request):
+def scheduler_status(request: Request):
     """Get comprehensive scheduler status (admin only)."""
     _require_admin(request)
     scheduler = get_scheduler()
@@ -1013,7 +1043,7 @@ async def scheduler_status(request: Request):
 
 
 @router.post("/scheduler/start")
-async def scheduler_start(request: Request):
+def scheduler_start(request: Request):
     """Start the scheduler (admin only)."""
     _require_admin(request)
     user = _get_user(request)
@@ -1026,7 +1056,7 @@ async def scheduler_start(request: Request):
 
 
 @router.post("/scheduler/stop")
-async def scheduler_stop(request: Request):
+def scheduler_stop(request: Request):
     """Stop the scheduler (admin only)."""
     _require_admin(request)
     user = _get_user(request)
@@ -1038,7 +1068,7 @@ async def scheduler_stop(request: Request):
 
 
 @router.post("/scheduler/restart")
-async def scheduler_restart(request: Request):
+def scheduler_restart(request: Request):
     """Restart the scheduler (admin only)."""
     _require_admin(request)
     user = _get_user(request)
@@ -1054,7 +1084,7 @@ async def scheduler_restart(request: Request):
 # ============================================================================
 
 @router.get("/download/{token}")
-async def download_artifact(token: str):
+def download_artifact(token: str):
     """Download a report artifact using a time-limited signed token.
 
     Tokens are generated by ``make_download_token`` and contain the run ID,
@@ -1105,7 +1135,7 @@ async def download_artifact(token: str):
 # ============================================================================
 
 @router.get("/contacts")
-async def list_contacts(keyword: Optional[str] = Query(None, description="Filter by keyword")):
+def list_contacts(keyword: Optional[str] = Query(None, description="Filter by keyword")):
     """List all contacts, optionally filtered by keyword."""
     if keyword:
         contacts = ContactRepository.get_by_keyword(keyword)
@@ -1122,6 +1152,10 @@ async def create_contact(request: Request):
     phone_carrier, department, keywords, enabled fields.
     """
     data = await request.json()
+    return await run_db(_create_contact, request, data)
+
+
+def _create_contact(request: Request, data: dict):
     user = _get_user(request)
 
     full_name = (data.get("full_name") or "").strip()
@@ -1156,6 +1190,10 @@ async def create_contact(request: Request):
 async def update_contact(contact_id: int, request: Request):
     """Update an existing contact."""
     data = await request.json()
+    return await run_db(_update_contact, contact_id, request, data)
+
+
+def _update_contact(contact_id: int, request: Request, data: dict):
     user = _get_user(request)
 
     contact = ContactRepository.get_by_id(contact_id)
@@ -1191,7 +1229,7 @@ async def update_contact(contact_id: int, request: Request):
 
 
 @router.delete("/contacts/{contact_id}")
-async def delete_contact(contact_id: int, request: Request):
+def delete_contact(contact_id: int, request: Request):
     """Delete a contact."""
     user = _get_user(request)
 
@@ -1213,14 +1251,14 @@ async def delete_contact(contact_id: int, request: Request):
 
 
 @router.get("/contacts/keywords")
-async def list_contact_keywords():
+def list_contact_keywords():
     """Get all unique keywords across contacts."""
     keywords = ContactRepository.get_all_keywords()
     return {"keywords": keywords}
 
 
 @router.post("/contacts/{contact_id}/test")
-async def test_contact(contact_id: int):
+def test_contact(contact_id: int):
     """Send a test message to a specific contact."""
     contact = ContactRepository.get_by_id(contact_id)
     if not contact:
@@ -1251,7 +1289,7 @@ async def test_contact(contact_id: int):
 # These preserve backward compatibility with the existing v2 API surface.
 
 @legacy_router.get("/config")
-async def legacy_get_config():
+def legacy_get_config():
     """Get all report configuration (legacy v2)."""
     config = get_all_config()
 
@@ -1275,6 +1313,10 @@ async def legacy_get_config():
 async def legacy_update_config(request: Request):
     """Update report configuration (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_update_config, request, data)
+
+
+def _legacy_update_config(request: Request, data: dict):
     user = _get_user(request)
 
     updated = []
@@ -1288,7 +1330,7 @@ async def legacy_update_config(request: Request):
 
 
 @legacy_router.get("/config/email")
-async def legacy_get_email_config():
+def legacy_get_email_config():
     """Get email configuration (legacy v2)."""
     return {
         "provider": get_config("email_provider", "sendgrid"),
@@ -1303,6 +1345,10 @@ async def legacy_get_email_config():
 async def legacy_update_email_config(request: Request):
     """Update email configuration (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_update_email_config, request, data)
+
+
+def _legacy_update_email_config(request: Request, data: dict):
     user = _get_user(request)
 
     email_fields = {
@@ -1330,6 +1376,10 @@ async def legacy_update_email_config(request: Request):
 async def legacy_test_email(request: Request):
     """Test email configuration by sending a test email (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_test_email, request, data)
+
+
+def _legacy_test_email(request: Request, data: dict):
     email = data.get("email")
     if not email:
         raise HTTPException(status_code=400, detail="Email address required")
@@ -1365,7 +1415,7 @@ async def legacy_test_email(request: Request):
 # --- Legacy schedule endpoints ---
 
 @legacy_router.get("/schedules")
-async def legacy_list_schedules():
+def legacy_list_schedules():
     """List all report schedules (legacy v2)."""
     schedules = ScheduleRepository.get_all()
     return {"schedules": [s.to_dict() for s in schedules]}
@@ -1375,6 +1425,10 @@ async def legacy_list_schedules():
 async def legacy_create_schedule(request: Request):
     """Create a new report schedule (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_create_schedule, request, data)
+
+
+def _legacy_create_schedule(request: Request, data: dict):
     user = _get_user(request)
 
     schedule = Schedule(
@@ -1406,7 +1460,7 @@ async def legacy_create_schedule(request: Request):
 
 
 @legacy_router.get("/schedules/{schedule_id}")
-async def legacy_get_schedule(schedule_id: int):
+def legacy_get_schedule(schedule_id: int):
     """Get a specific schedule (legacy v2)."""
     schedule = ScheduleRepository.get_by_id(schedule_id)
     if not schedule:
@@ -1418,6 +1472,10 @@ async def legacy_get_schedule(schedule_id: int):
 async def legacy_update_schedule(schedule_id: int, request: Request):
     """Update a schedule (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_update_schedule, schedule_id, request, data)
+
+
+def _legacy_update_schedule(schedule_id: int, request: Request, data: dict):
     user = _get_user(request)
 
     schedule = ScheduleRepository.get_by_id(schedule_id)
@@ -1448,7 +1506,7 @@ async def legacy_update_schedule(schedule_id: int, request: Request):
 
 
 @legacy_router.delete("/schedules/{schedule_id}")
-async def legacy_delete_schedule(schedule_id: int, request: Request):
+def legacy_delete_schedule(schedule_id: int, request: Request):
     """Delete a schedule (legacy v2)."""
     user = _get_user(request)
 
@@ -1472,7 +1530,7 @@ async def legacy_delete_schedule(schedule_id: int, request: Request):
 
 
 @legacy_router.post("/schedules/{schedule_id}/enable")
-async def legacy_enable_schedule(schedule_id: int, request: Request):
+def legacy_enable_schedule(schedule_id: int, request: Request):
     """Enable a schedule (legacy v2)."""
     user = _get_user(request)
     ScheduleRepository.set_enabled(schedule_id, True)
@@ -1491,7 +1549,7 @@ async def legacy_enable_schedule(schedule_id: int, request: Request):
 
 
 @legacy_router.post("/schedules/{schedule_id}/disable")
-async def legacy_disable_schedule(schedule_id: int, request: Request):
+def legacy_disable_schedule(schedule_id: int, request: Request):
     """Disable a schedule (legacy v2)."""
     user = _get_user(request)
     ScheduleRepository.set_enabled(schedule_id, False)
@@ -1510,7 +1568,7 @@ async def legacy_disable_schedule(schedule_id: int, request: Request):
 
 
 @legacy_router.post("/schedules/{schedule_id}/run")
-async def legacy_run_schedule(schedule_id: int, request: Request, background_tasks: BackgroundTasks):
+def legacy_run_schedule(schedule_id: int, request: Request, background_tasks: BackgroundTasks):
     """Manually run a schedule (legacy v2)."""
     user = _get_user(request)
 
@@ -1532,7 +1590,7 @@ async def legacy_run_schedule(schedule_id: int, request: Request, background_tas
 # --- Legacy recipient endpoints ---
 
 @legacy_router.get("/recipients")
-async def legacy_list_recipients(schedule_id: Optional[int] = None):
+def legacy_list_recipients(schedule_id: Optional[int] = None):
     """List all recipients (legacy v2)."""
     recipients = RecipientRepository.get_all(schedule_id)
     return {"recipients": [r.to_dict() for r in recipients]}
@@ -1542,6 +1600,10 @@ async def legacy_list_recipients(schedule_id: Optional[int] = None):
 async def legacy_create_recipient(request: Request):
     """Create a new recipient (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_create_recipient, request, data)
+
+
+def _legacy_create_recipient(request: Request, data: dict):
     user = _get_user(request)
 
     recipient = Recipient(
@@ -1571,6 +1633,10 @@ async def legacy_create_recipient(request: Request):
 async def legacy_update_recipient(recipient_id: int, request: Request):
     """Update a recipient (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_update_recipient, recipient_id, request, data)
+
+
+def _legacy_update_recipient(recipient_id: int, request: Request, data: dict):
     user = _get_user(request)
 
     recipient = RecipientRepository.get_by_id(recipient_id)
@@ -1598,7 +1664,7 @@ async def legacy_update_recipient(recipient_id: int, request: Request):
 
 
 @legacy_router.delete("/recipients/{recipient_id}")
-async def legacy_delete_recipient(recipient_id: int, request: Request):
+def legacy_delete_recipient(recipient_id: int, request: Request):
     """Delete a recipient (legacy v2)."""
     user = _get_user(request)
 
@@ -1620,7 +1686,7 @@ async def legacy_delete_recipient(recipient_id: int, request: Request):
 
 
 @legacy_router.post("/recipients/{recipient_id}/test")
-async def legacy_test_recipient(recipient_id: int):
+def legacy_test_recipient(recipient_id: int):
     """Send test to a specific recipient (legacy v2)."""
     recipient = RecipientRepository.get_by_id(recipient_id)
     if not recipient:
@@ -1640,7 +1706,7 @@ async def legacy_test_recipient(recipient_id: int):
 
 
 @legacy_router.get("/recipients/battalion")
-async def legacy_get_battalion_chiefs():
+def legacy_get_battalion_chiefs():
     """Get battalion chief list by shift (legacy v2)."""
     bcs = RecipientRepository.get_battalion_chiefs()
 
@@ -1667,6 +1733,10 @@ async def legacy_update_battalion_chief(shift: str, request: Request):
         raise HTTPException(status_code=400, detail="Invalid shift")
 
     data = await request.json()
+    return await run_db(_legacy_update_battalion_chief, shift, request, data)
+
+
+def _legacy_update_battalion_chief(shift: str, request: Request, data: dict):
     user = _get_user(request)
 
     email = data.get("email", "")
@@ -1688,7 +1758,7 @@ async def legacy_update_battalion_chief(shift: str, request: Request):
 # --- Legacy report generation endpoints ---
 
 @legacy_router.get("/preview", response_class=HTMLResponse)
-async def legacy_preview_report(shift: Optional[str] = None):
+def legacy_preview_report(shift: Optional[str] = None):
     """Preview current report as HTML (legacy v2)."""
     engine = get_engine()
     report = engine.generate_report(report_type="shift_end", shift=shift)
@@ -1697,7 +1767,7 @@ async def legacy_preview_report(shift: Optional[str] = None):
 
 
 @legacy_router.get("/preview/pdf")
-async def legacy_preview_pdf(shift: Optional[str] = None):
+def legacy_preview_pdf(shift: Optional[str] = None):
     """Preview report as PDF (legacy v2)."""
     return {"ok": False, "error": "PDF export not yet implemented"}
 
@@ -1706,6 +1776,10 @@ async def legacy_preview_pdf(shift: Optional[str] = None):
 async def legacy_send_report(request: Request, background_tasks: BackgroundTasks):
     """Send report immediately (legacy v2)."""
     data = await request.json()
+    return await run_db(_legacy_send_report, request, background_tasks, data)
+
+
+def _legacy_send_report(request: Request, background_tasks: BackgroundTasks, data: dict):
     user = _get_user(request)
     shift = data.get("shift")
 
@@ -1730,14 +1804,14 @@ async def legacy_send_report(request: Request, background_tasks: BackgroundTasks
 # --- Legacy history endpoints ---
 
 @legacy_router.get("/history")
-async def legacy_get_history(limit: int = 50):
+def legacy_get_history(limit: int = 50):
     """Get report history (legacy v2)."""
     history = HistoryRepository.get_recent(limit)
     return {"history": [h.to_dict() for h in history]}
 
 
 @legacy_router.get("/history/{history_id}")
-async def legacy_get_history_detail(history_id: int):
+def legacy_get_history_detail(history_id: int):
     """Get detailed history for a specific report (legacy v2)."""
     entry = HistoryRepository.get_by_id(history_id)
     if not entry:
@@ -1754,14 +1828,14 @@ async def legacy_get_history_detail(history_id: int):
 # --- Legacy scheduler control endpoints ---
 
 @legacy_router.get("/scheduler/status")
-async def legacy_scheduler_status():
+def legacy_scheduler_status():
     """Get scheduler status (legacy v2)."""
     scheduler = get_scheduler()
     return scheduler.get_status()
 
 
 @legacy_router.post("/scheduler/start")
-async def legacy_scheduler_start(request: Request):
+def legacy_scheduler_start(request: Request):
     """Start the scheduler (legacy v2)."""
     user = _get_user(request)
     set_config("scheduler_enabled", True, user=user)
@@ -1773,7 +1847,7 @@ async def legacy_scheduler_start(request: Request):
 
 
 @legacy_router.post("/scheduler/stop")
-async def legacy_scheduler_stop(request: Request):
+def legacy_scheduler_stop(request: Request):
     """Stop the scheduler (legacy v2)."""
     user = _get_user(request)
     scheduler = get_scheduler()
@@ -1784,7 +1858,7 @@ async def legacy_scheduler_stop(request: Request):
 
 
 @legacy_router.post("/scheduler/restart")
-async def legacy_scheduler_restart(request: Request):
+def legacy_scheduler_restart(request: Request):
     """Restart the scheduler (legacy v2)."""
     user = _get_user(request)
     scheduler = get_scheduler()
@@ -1795,7 +1869,7 @@ async def legacy_scheduler_restart(request: Request):
 
 
 @legacy_router.post("/scheduler/enable")
-async def legacy_scheduler_enable(request: Request):
+def legacy_scheduler_enable(request: Request):
     """Enable automatic reporting (legacy v2)."""
     user = _get_user(request)
     set_config("scheduler_enabled", True, user=user)
@@ -1807,7 +1881,7 @@ async def legacy_scheduler_enable(request: Request):
 
 
 @legacy_router.post("/scheduler/disable")
-async def legacy_scheduler_disable(request: Request):
+def legacy_scheduler_disable(request: Request):
     """Disable automatic reporting (legacy v2)."""
     user = _get_user(request)
     set_config("scheduler_enabled", False, user=user)
@@ -1821,7 +1895,7 @@ async def legacy_scheduler_disable(request: Request):
 # --- Legacy audit log ---
 
 @legacy_router.get("/audit")
-async def legacy_get_audit_log(limit: int = 100, category: Optional[str] = None):
+def legacy_get_audit_log(limit: int = 100, category: Optional[str] = None):
     """Get audit log entries (legacy v2)."""
     entries = AuditRepository.get_recent(limit, category)
     return {"entries": entries}
@@ -1838,22 +1912,29 @@ def register_reporting_routes(app):
     1. Includes the new ``/api/reporting`` router
     2. Includes the legacy ``/api/v2/reports`` router for backward compatibility
     3. Includes the modal router for ``/modals/reporting``
-    4. Initialises the database, scheduler, and report engine
-    """
-    from .models import init_database
-
-    # Initialize database tables
-    init_database()
 
+    Tables are created by the versioned schema migrations; anything that
+    reads them runs later from :func:`start_reporting`.
+    """
     # Include all three routers
     app.include_router(router)
     app.include_router(legacy_router)
     app.include_router(modal_router)
 
-    # Initialize scheduler (v3: scheduler calls engine directly, no callback needed)
-    init_scheduler()
-
     logger.info(
         "Reporting module registered: /api/reporting (new), "
         "/api/v2/reports (legacy), /modals/reporting (modal)"
     )
+
+
+def start_reporting():
+    """Startup hook (after schema migrations): fill config defaults,
+    refresh built-in templates and initialise the scheduler."""
+    from .config import ReportingConfig
+    from .models import seed_builtin_templates
+
+    ReportingConfig.init_defaults()
+    seed_builtin_templates()
+
+    # Initialize scheduler (v3: scheduler calls engine directly, no callback needed)
+    init_scheduler()
@@ -4,6 +4,8 @@
 # Robust, timezone-aware scheduling using APScheduler.
 # Supports: shift_change, daily, weekly, monthly, once schedule types.
 # Works with the v3 template engine (run_report + deliver_report).
+# Every worker keeps the jobs; only the holder of the "reporting" lease
+# (app/db/lease.py) executes them.
 # ============================================================================
 
 import json
@@ -26,6 +28,8 @@ except ImportError:
     APSCHEDULER_AVAILABLE = False
     print("[REPORTING] APScheduler not installed. Install with: pip install apscheduler")
 
+from app.db import is_leader
+
 from .config import get_config, set_config, get_timezone, get_local_now, format_time_for_display
 from .models import (
     NewScheduleRepository,
@@ -438,6 +442,10 @@ class ReportScheduler:
         7. Update last_run_at / next_run_at
         8. Audit log
         """
+        if not is_leader("reporting"):
+            logger.debug(f"Schedule {schedule_id} runs in the leader worker, skipping")
+            return
+
         logger.info(f"Executing scheduled job: schedule_id={schedule_id}, shift_hint={shift_hint}")
 
         # 1. Reload from DB
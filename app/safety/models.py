@@ -1,19 +1,16 @@
 """
 FORD-CAD Safety Inspection — Database Models & Query Helpers
 """
-import sqlite3
 import json
 import uuid
 import datetime
 from typing import Optional, List, Dict
 
-DB_PATH = "cad.db"
+from app.db import get_conn
 
 
 def _get_conn():
-    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_conn()
 
 
 def _ts() -> str:
@@ -1113,8 +1110,12 @@ def get_dashboard_stats() -> Dict:
         "SELECT COUNT(*) FROM deficiencies WHERE severity = 'critical' AND status IN ('open','in_progress')"
     ).fetchone()[0]
 
+    # Local-date cutoff as a bound parameter (date('now') is UTC) so
+    # idx_ir_date serves the range
+    cutoff_30d = (datetime.date.today() - datetime.timedelta(days=30)).isoformat()
     inspections_30d = conn.execute(
-        "SELECT COUNT(*) FROM inspection_records WHERE inspection_date >= date('now', '-30 days')"
+        "SELECT COUNT(*) FROM inspection_records WHERE inspection_date >= ?",
+        (cutoff_30d,)
     ).fetchone()[0]
 
     # By type
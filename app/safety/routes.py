@@ -7,8 +7,8 @@ import uuid
 from fastapi import FastAPI, Request, UploadFile, File
 from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 
+from app.db import run_db
 from .models import (
-    init_safety_schema,
     get_asset_types, get_asset_type, create_asset_type,
     get_locations, get_location, create_location, update_location, delete_location,
     get_assets, get_asset, get_asset_by_qr, create_asset, update_asset, delete_asset,
@@ -27,7 +27,6 @@ UPLOAD_DIR = os.path.join("static", "uploads", "safety")
 def register_safety_routes(app: FastAPI):
     """Register all safety inspection endpoints."""
 
-    init_safety_schema()
     os.makedirs(UPLOAD_DIR, exist_ok=True)
 
     # ============================================================
@@ -35,14 +34,14 @@ def register_safety_routes(app: FastAPI):
     # ============================================================
 
     @app.get("/api/safety/types")
-    async def api_get_types(request: Request):
+    def api_get_types(request: Request):
         types = get_asset_types()
         return {"ok": True, "types": types}
 
     @app.post("/api/safety/types")
     async def api_create_type(request: Request):
         data = await request.json()
-        tid = create_asset_type(data)
+        tid = await run_db(create_asset_type, data)
         return {"ok": True, "type_id": tid}
 
     # ============================================================
@@ -50,7 +49,7 @@ def register_safety_routes(app: FastAPI):
     # ============================================================
 
     @app.get("/api/safety/locations")
-    async def api_get_locations(request: Request):
+    def api_get_locations(request: Request):
         building = request.query_params.get("building")
         floor = request.query_params.get("floor")
         locs = get_locations(building=building, floor=floor)
@@ -59,17 +58,17 @@ def register_safety_routes(app: FastAPI):
     @app.post("/api/safety/locations")
     async def api_create_location(request: Request):
         data = await request.json()
-        lid = create_location(data)
+        lid = await run_db(create_location, data)
         return {"ok": True, "location_id": lid}
 
     @app.put("/api/safety/locations/{loc_id}")
     async def api_update_location(loc_id: int, request: Request):
         data = await request.json()
-        update_location(loc_id, data)
+        await run_db(update_location, loc_id, data)
         return {"ok": True}
 
     @app.delete("/api/safety/locations/{loc_id}")
-    async def api_delete_location(loc_id: int, request: Request):
+    def api_delete_location(loc_id: int, request: Request):
         delete_location(loc_id)
         return {"ok": True}
 
@@ -78,7 +77,7 @@ def register_safety_routes(app: FastAPI):
     # ============================================================
 
     @app.get("/api/safety/assets")
-    async def api_get_assets(request: Request):
+    def api_get_assets(request: Request):
         params = request.query_params
         assets = get_assets(
             asset_type_id=int(params["type"]) if params.get("type") else None,
@@ -90,7 +89,7 @@ def register_safety_routes(app: FastAPI):
         return {"ok": True, "assets": assets}
 
     @app.get("/api/safety/assets/scan/{qr_code}")
-    async def api_scan_qr(qr_code: str, request: Request):
+    def api_scan_qr(qr_code: str, request: Request):
         asset = get_asset_by_qr(qr_code)
         if not asset:
             return JSONResponse({"ok": False, "error": "Asset not found"}, status_code=404)
@@ -99,7 +98,7 @@ def register_safety_routes(app: FastAPI):
         return {"ok": True, "asset": asset, "templates": templates}
 
     @app.get("/api/safety/assets/{asset_id}")
-    async def api_get_asset(asset_id: int, request: Request):
+    def api_get_asset(asset_id: int, request: Request):
         asset = get_asset(asset_id)
         if not asset:
             return JSONResponse({"ok": False, "error": "Not found"}, status_code=404)
@@ -112,17 +111,17 @@ def register_safety_routes(app: FastAPI):
     @app.post("/api/safety/assets")
     async def api_create_asset(request: Request):
         data = await request.json()
-        aid = create_asset(data)
+        aid = await run_db(create_asset, data)
         return {"ok": True, "asset_id": aid}
 
     @app.put("/api/safety/assets/{asset_id}")
     async def api_update_asset(asset_id: int, request: Request):
         data = await request.json()
-        update_asset(asset_id, data)
+        await run_db(update_asset, asset_id, data)
         return {"ok": True}
 
     @app.delete("/api/safety/assets/{asset_id}")
-    async def api_delete_asset(asset_id: int, request: Request):
+    def api_delete_asset(asset_id: int, request: Request):
         delete_asset(asset_id)
 
         try:
@@ -135,7 +134,7 @@ def register_safety_routes(app: FastAPI):
         return {"ok": True}
 
     @app.get("/api/safety/assets/{asset_id}/qr")
-    async def api_get_qr(asset_id: int, request: Request):
+    def api_get_qr(asset_id: int, request: Request):
         asset = get_asset(asset_id)
         if not asset:
             return JSONResponse({"ok": False, "error": "Not found"}, status_code=404)
@@ -149,10 +148,8 @@ def register_safety_routes(app: FastAPI):
         fname = f"asset-{asset_id}-{uuid.uuid4().hex[:8]}{ext}"
         fpath = os.path.join(UPLOAD_DIR, fname)
         content = await file.read()
-        with open(fpath, "wb") as f:
-            f.write(content)
         url = f"/static/uploads/safety/{fname}"
-        update_asset(asset_id, {"photo_url": url})
+        await run_db(_store_asset_photo, asset_id, fpath, content, url)
         return {"ok": True, "photo_url": url}
 
     # ============================================================
@@ -160,7 +157,7 @@ def register_safety_routes(app: FastAPI):
     # ============================================================
 
     @app.get("/api/safety/templates")
-    async def api_get_templates(request: Request):
+    def api_get_templates(request: Request):
         type_id = request.query_params.get("asset_type_id")
         templates = get_templates(asset_type_id=int(type_id) if type_id else None)
         return {"ok": True, "templates": templates}
@@ -170,7 +167,7 @@ def register_safety_routes(app: FastAPI):
     # ============================================================
 
     @app.get("/api/safety/inspections")
-    async def api_get_inspections(request: Request):
+    def api_get_inspections(request: Request):
         params = request.query_params
         inspections = get_inspections(
             asset_id=int(params["asset_id"]) if params.get("asset_id") else None,
@@ -184,11 +181,11 @@ def register_safety_routes(app: FastAPI):
     @app.get("/api/safety/inspections/pending")
     async def api_pending_inspections(request: Request):
         days = int(request.query_params.get("days", "7"))
-        pending = get_pending_inspections(days_ahead=days)
+        pending = await run_db(get_pending_inspections, days_ahead=days)
         return {"ok": True, "pending": pending}
 
     @app.get("/api/safety/inspections/{insp_id}")
-    async def api_get_inspection(insp_id: int, request: Request):
+    def api_get_inspection(insp_id: int, request: Request):
         insp = get_inspection(insp_id)
         if not insp:
             return JSONResponse({"ok": False, "error": "Not found"}, status_code=404)
@@ -197,24 +194,7 @@ def register_safety_routes(app: FastAPI):
     @app.post("/api/safety/inspections")
     async def api_submit_inspection(request: Request):
         data = await request.json()
-        insp_id = create_inspection(data)
-
-        # Emit events
-        try:
-            from app.eventstream.emitter import emit_event
-            asset = get_asset(data["asset_id"])
-            tag = asset["asset_tag"] if asset else f"#{data['asset_id']}"
-            result = data.get("result", "pass")
-            emit_event(
-                "SAFETY_INSPECTION_COMPLETED",
-                summary=f"Inspection completed: {tag} — {result}",
-                user=data.get("inspector_name"),
-                category="safety",
-                severity="info" if result == "pass" else "warning",
-            )
-        except Exception:
-            pass
-
+        insp_id = await run_db(_submit_inspection, data)
         return {"ok": True, "inspection_id": insp_id}
 
     # ============================================================
@@ -222,7 +202,7 @@ def register_safety_routes(app: FastAPI):
     # ============================================================
 
     @app.get("/api/safety/deficiencies")
-    async def api_get_deficiencies(request: Request):
+    def api_get_deficiencies(request: Request):
         params = request.query_params
         defs = get_deficiencies(
             status=params.get("status"),
@@ -233,28 +213,13 @@ def register_safety_routes(app: FastAPI):
 
     @app.get("/api/safety/deficiencies/dashboard")
     async def api_deficiency_dashboard(request: Request):
-        dash = get_deficiency_dashboard()
+        dash = await run_db(get_deficiency_dashboard)
         return {"ok": True, "dashboard": dash}
 
     @app.put("/api/safety/deficiencies/{def_id}")
     async def api_update_deficiency(def_id: int, request: Request):
         data = await request.json()
-        update_deficiency(def_id, data)
-
-        # Emit event on resolution
-        if data.get("status") == "resolved":
-            try:
-                from app.eventstream.emitter import emit_event
-                d = get_deficiency(def_id)
-                emit_event(
-                    "SAFETY_DEFICIENCY_RESOLVED",
-                    summary=f"Deficiency resolved: {d['asset_tag'] if d else def_id}",
-                    user=data.get("resolved_by"),
-                    category="safety", severity="info",
-                )
-            except Exception:
-                pass
-
+        await run_db(_update_deficiency, def_id, data)
         return {"ok": True}
 
     # ============================================================
@@ -263,13 +228,13 @@ def register_safety_routes(app: FastAPI):
 
     @app.get("/api/safety/dashboard")
     async def api_dashboard(request: Request):
-        stats = get_dashboard_stats()
+        stats = await run_db(get_dashboard_stats)
         return {"ok": True, "dashboard": stats}
 
     @app.get("/api/safety/reports/compliance")
     async def api_compliance_report(request: Request):
         group_by = request.query_params.get("group_by", "type")
-        report = get_compliance_report(group_by=group_by)
+        report = await run_db(get_compliance_report, group_by=group_by)
         return {"ok": True, "report": report}
 
     # ============================================================
@@ -277,24 +242,24 @@ def register_safety_routes(app: FastAPI):
     # ============================================================
 
     @app.get("/api/safety/schedules")
-    async def api_get_schedules(request: Request):
+    def api_get_schedules(request: Request):
         scheds = get_schedules()
         return {"ok": True, "schedules": scheds}
 
     @app.post("/api/safety/schedules")
     async def api_create_schedule(request: Request):
         data = await request.json()
-        sid = create_schedule(data)
+        sid = await run_db(create_schedule, data)
         return {"ok": True, "schedule_id": sid}
 
     @app.put("/api/safety/schedules/{sched_id}")
     async def api_update_schedule(sched_id: int, request: Request):
         data = await request.json()
-        update_schedule(sched_id, data)
+        await run_db(update_schedule, sched_id, data)
         return {"ok": True}
 
     @app.delete("/api/safety/schedules/{sched_id}")
-    async def api_delete_schedule(sched_id: int, request: Request):
+    def api_delete_schedule(sched_id: int, request: Request):
         delete_schedule(sched_id)
         return {"ok": True}
 
@@ -306,11 +271,7 @@ def register_safety_routes(app: FastAPI):
     async def api_qr_batch(request: Request):
         data = await request.json()
         asset_ids = data.get("asset_ids", [])
-        assets_list = []
-        for aid in asset_ids:
-            a = get_asset(aid)
-            if a:
-                assets_list.append(a)
+        assets_list = await run_db(_assets_by_id, asset_ids)
         if not assets_list:
             return JSONResponse({"ok": False, "error": "No assets found"}, status_code=400)
         zip_bytes = generate_batch_zip(assets_list)
@@ -318,7 +279,7 @@ def register_safety_routes(app: FastAPI):
                         headers={"Content-Disposition": 'attachment; filename="safety-qr-codes.zip"'})
 
     @app.get("/api/safety/qr/print-sheet")
-    async def api_qr_print_sheet(request: Request):
+    def api_qr_print_sheet(request: Request):
         type_id = request.query_params.get("type")
         loc_id = request.query_params.get("location")
         assets_list = get_assets(
@@ -334,7 +295,65 @@ def register_safety_routes(app: FastAPI):
 
     @app.get("/modals/safety", response_class=HTMLResponse)
     async def modal_safety(request: Request):
-        return _render_safety_modal()
+        return await run_db(_render_safety_modal)
+
+
+# ============================================================
+# BLOCKING HELPERS (run via run_db)
+# ============================================================
+
+def _store_asset_photo(asset_id: int, fpath: str, content: bytes, url: str):
+    with open(fpath, "wb") as f:
+        f.write(content)
+    update_asset(asset_id, {"photo_url": url})
+
+
+def _submit_inspection(data: dict) -> int:
+    insp_id = create_inspection(data)
+
+    # Emit events
+    try:
+        from app.eventstream.emitter import emit_event
+        asset = get_asset(data["asset_id"])
+        tag = asset["asset_tag"] if asset else f"#{data['asset_id']}"
+        result = data.get("result", "pass")
+        emit_event(
+            "SAFETY_INSPECTION_COMPLETED",
+            summary=f"Inspection completed: {tag} — {result}",
+            user=data.get("inspector_name"),
+            category="safety",
+            severity="info" if result == "pass" else "warning",
+        )
+    except Exception:
+        pass
+    return insp_id
+
+
+def _update_deficiency(def_id: int, data: dict):
+    update_deficiency(def_id, data)
+
+    # Emit event on resolution
+    if data.get("status") == "resolved":
+        try:
+            from app.eventstream.emitter import emit_event
+            d = get_deficiency(def_id)
+            emit_event(
+                "SAFETY_DEFICIENCY_RESOLVED",
+                summary=f"Deficiency resolved: {d['asset_tag'] if d else def_id}",
+                user=data.get("resolved_by"),
+                category="safety", severity="info",
+            )
+        except Exception:
+            pass
+
+
+def _assets_by_id(asset_ids) -> list:
+    assets_list = []
+    for aid in asset_ids:
+        a = get_asset(aid)
+        if a:
+            assets_list.append(a)
+    return assets_list
 
 
 def _render_safety_modal() -> str:
@@ -1,14 +1,11 @@
-import sqlite3
 import json
 import datetime
-from pathlib import Path
 
-DB_PATH = Path(__file__).resolve().parent.parent.parent / "cad.db"
+from app.db import get_conn
+
 
 def get_db():
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_conn()
 
 def init_schema():
     """Create user_themes table if not exists."""
@@ -3,18 +3,26 @@ FORD-CAD Theme System — API Routes
 """
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+
+from app.db import run_db
 from . import models
 import json
 import logging
 
 log = logging.getLogger("themes")
 
+
+def _save_and_activate(user_id, slot, name, tokens):
+    models.save_theme(user_id, slot, name, tokens)
+    # Auto-activate the slot being saved
+    models.set_active_slot(user_id, slot)
+
+
 def register_theme_routes(app: FastAPI):
-    models.init_schema()
     log.info("[Themes] Routes registered")
 
     @app.get("/api/themes")
-    async def api_get_themes(request: Request):
+    def api_get_themes(request: Request):
         """Get all themes + active slot for current user."""
         user_id = request.session.get("unit", "DISPATCH")
         themes = models.get_all_themes(user_id)
@@ -28,7 +36,7 @@ def register_theme_routes(app: FastAPI):
         })
 
     @app.get("/api/themes/active")
-    async def api_get_active_theme(request: Request):
+    def api_get_active_theme(request: Request):
         """Get the active theme tokens for the current user."""
         user_id = request.session.get("unit", "DISPATCH")
         active_slot = models.get_active_slot(user_id)
@@ -52,7 +60,7 @@ def register_theme_routes(app: FastAPI):
         slot = body.get("slot", 0)
         if not isinstance(slot, int) or slot < 0 or slot > 5:
             return JSONResponse({"ok": False, "error": "Slot must be 0-5"}, status_code=400)
-        models.set_active_slot(user_id, slot)
+        await run_db(models.set_active_slot, user_id, slot)
         return JSONResponse({"ok": True, "active_slot": slot})
 
     @app.post("/api/themes/save")
@@ -67,9 +75,7 @@ def register_theme_routes(app: FastAPI):
             return JSONResponse({"ok": False, "error": "Slot must be 1-5"}, status_code=400)
         if not isinstance(tokens, dict):
             return JSONResponse({"ok": False, "error": "Tokens must be object"}, status_code=400)
-        models.save_theme(user_id, slot, name, tokens)
-        # Auto-activate the slot being saved
-        models.set_active_slot(user_id, slot)
+        await run_db(_save_and_activate, user_id, slot, name, tokens)
         return JSONResponse({"ok": True, "slot": slot, "name": name})
 
     @app.post("/api/themes/reset")
@@ -80,7 +86,7 @@ def register_theme_routes(app: FastAPI):
         slot = body.get("slot", 1)
         if not isinstance(slot, int) or slot < 1 or slot > 5:
             return JSONResponse({"ok": False, "error": "Slot must be 1-5"}, status_code=400)
-        models.delete_theme(user_id, slot)
+        await run_db(models.delete_theme, user_id, slot)
         return JSONResponse({"ok": True})
 
     @app.post("/api/themes/duplicate")
@@ -92,7 +98,7 @@ def register_theme_routes(app: FastAPI):
         to_slot = body.get("to_slot")
         if not from_slot or not to_slot:
             return JSONResponse({"ok": False, "error": "Need from_slot and to_slot"}, status_code=400)
-        ok = models.duplicate_theme(user_id, from_slot, to_slot)
+        ok = await run_db(models.duplicate_theme, user_id, from_slot, to_slot)
         if not ok:
             return JSONResponse({"ok": False, "error": "Source theme not found"}, status_code=404)
         return JSONResponse({"ok": True})
@@ -103,7 +109,7 @@ def register_theme_routes(app: FastAPI):
         user_id = request.session.get("unit", "DISPATCH")
         body = await request.json()
         slot = body.get("slot", 1)
-        theme = models.get_theme(user_id, slot)
+        theme = await run_db(models.get_theme, user_id, slot)
         if not theme:
             return JSONResponse({"ok": False, "error": "Theme not found"}, status_code=404)
         return JSONResponse({
@@ -127,7 +133,7 @@ def register_theme_routes(app: FastAPI):
         tokens = theme_data.get("tokens", {})
         if not isinstance(tokens, dict) or not tokens:
             return JSONResponse({"ok": False, "error": "Invalid theme data"}, status_code=400)
-        models.save_theme(user_id, slot, name, tokens)
+        await run_db(models.save_theme, user_id, slot, name, tokens)
         return JSONResponse({"ok": True, "slot": slot, "name": name})
 
     @app.get("/api/themes/presets")
@@ -137,7 +143,7 @@ def register_theme_routes(app: FastAPI):
         return JSONResponse({"ok": True, "presets": presets})
 
     @app.get("/modals/themes")
-    async def modal_themes(request: Request):
+    def modal_themes(request: Request):
         """Serve the theme editor modal HTML."""
         templates = app.state.templates
         user_id = request.session.get("unit", "DISPATCH")
@@ -27,6 +27,18 @@ import os
 import base64
 import hashlib
 import hmac
+import importlib
+import asyncio
+
+from app import board as board_state
+from app import db as db_pool
+from app.db import migrations as db_migrations
+from app.messaging import bridge as event_bridge
+from app.messaging import bus as event_bus
+from app.messaging.websocket import get_broadcaster, get_sse_manager
+from app.eventstream.emitter import stop_playbook_worker
+from app.eventstream.replay import replay_stats
+from app.messaging import panel_push
 
 
 # ================================================================
@@ -34,11 +46,13 @@ import hmac
 # ================================================================
 
 BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "cad.db"
+DB_PATH = BASE_DIR / os.getenv("CAD_DB_PATH", "cad.db")
 TEMPLATES_DIR = BASE_DIR / "templates"
 STATIC_DIR = BASE_DIR / "static"
 UNITLOG_PATH = BASE_DIR / "UnitLog.txt"
 
+db_pool.configure(DB_PATH)
+
 # ================================================================
 # FASTAPI APP
 # ================================================================
@@ -180,6 +194,24 @@ except ImportError as e:
 except Exception as e:
     print(f"[MAIN] Safety module error: {e}")
 
+# ------------------------------------------------
+# Middleware: tag DB work with its endpoint (write-lock telemetry)
+# ------------------------------------------------
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@app.middleware("http")
+async def lock_endpoint_tag(request: Request, call_next):
+    """Attribute write-lock waits/holds to 'METHOD /path/{id}'."""
+    if request.url.path.startswith("/static"):
+        return await call_next(request)
+    token = db_pool.set_lock_endpoint(f"{request.method} {_ID_SEGMENT.sub('/{id}', request.url.path)}")
+    try:
+        return await call_next(request)
+    finally:
+        db_pool.reset_lock_endpoint(token)
+
+
 # ------------------------------------------------
 # Middleware: guarantee every mutation is written to MasterLog
 # ------------------------------------------------
@@ -197,13 +229,32 @@ async def masterlog_guard(request: Request, call_next):
     if request.url.path.startswith("/static") or request.method in ("GET", "HEAD", "OPTIONS"):
         return await call_next(request)
 
+    audit_mark = db_pool.get_audit_writer().enqueued
     response = await call_next(request)
 
     # If handler already wrote to MasterLog, do nothing
-    if MASTERLOG_WRITTEN.get():
-        return response
+    if not MASTERLOG_WRITTEN.get():
+        _masterlog_fallback(request, response)
+
+    # Consoles with this incident's IAW open reload it (board panels are
+    # pushed from the commits themselves)
+    if getattr(response, "status_code", 200) < 400:
+        m = re.search(r"/incident/(\d+)", request.url.path)
+        if m:
+            panel_push.mark_panels_dirty(incident_id=m.group(1))
+
+    # Audit rows are group-committed by the writer thread; hold the response
+    # until this request's rows are durable so the client's follow-up panel
+    # refresh sees them (awaits, does not block the loop).
+    writer = db_pool.get_audit_writer()
+    if writer.enqueued != audit_mark:
+        await asyncio.wrap_future(writer.barrier())
 
-    # Generic audit fallback
+    return response
+
+
+def _masterlog_fallback(request: Request, response):
+    """Generic audit fallback for mutations whose handler wrote no MasterLog row."""
     try:
         user = (request.session.get("user") if hasattr(request, "session") else None) or "Dispatcher"
     except Exception:
@@ -252,7 +303,6 @@ async def masterlog_guard(request: Request, call_next):
         # never break the request path due to audit logging
         pass
 
-    return response
 
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
@@ -269,7 +319,11 @@ async def no_cache_html(request: Request, call_next):
     # Add no-cache headers to HTML responses (not static assets)
     if not request.url.path.startswith("/static"):
         content_type = response.headers.get("content-type", "")
-        if "text/html" in content_type or request.url.path in ("/", "/login", "/logout"):
+        if "etag" in response.headers:
+            # Versioned panel fragment: keep it so the next poll revalidates
+            # with If-None-Match (see _versioned_panel)
+            response.headers["Cache-Control"] = "private, no-cache"
+        elif "text/html" in content_type or request.url.path in ("/", "/login", "/logout"):
             response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
             response.headers["Pragma"] = "no-cache"
             response.headers["Expires"] = "0"
@@ -381,7 +435,6 @@ async def login_submit(request: Request):
         )
 
     # Resolve display name from Units table if possible (sqlite3.Row has no .get)
-    ensure_phase3_schema()
     display_name = ""
     conn = get_conn()
     try:
@@ -598,37 +651,43 @@ def incident_type_requires_number(type_key: str) -> bool:
 def get_conn():
     """
     Canon DB connector.
-    NOTE: sqlite3.connect() does NOT accept row_factory as a kwarg.
-          You must set conn.row_factory AFTER connecting.
-    """
-    conn = sqlite3.connect(
-        DB_PATH,                 # keep your existing DB_PATH variable
-        timeout=30,
-        check_same_thread=False
-        # IMPORTANT: do NOT pass row_factory=... here (Python will throw TypeError)
-    )
+    Connections come from the shared pool in app.db (WAL, tuned pragmas);
+    conn.close() hands the connection back to the pool.
+    Row factory is sqlite3.Row; callers may override it per checkout.
+    """
+    return db_pool.get_conn(DB_PATH)
 
-    # Row factory must be set on the connection object
-    conn.row_factory = sqlite3.Row
 
-    return conn
+def schema_cols(table: str) -> frozenset:
+    """Cached column names of `table` (schema registry; no PRAGMA per call)."""
+    return db_pool.get_schema(DB_PATH).columns(table)
+
+
+def schema_has_table(table: str) -> bool:
+    """Cached table-existence flag (schema registry; no sqlite_master scan)."""
+    return db_pool.get_schema(DB_PATH).has_table(table)
 
 
 def _sqlite_exec_retry(cursor, sql: str, params=(), retries: int = 8, sleep_base: float = 0.05):
     """
     Retries SQLITE_BUSY / 'database is locked' transient write conflicts.
-    Keep transactions short; this is a last-mile guard.
+    Keep transactions short; this is a last-mile guard. Every retry is
+    counted in the write-lock telemetry (/api/health/locks).
     """
     import time
     import sqlite3
 
+    site = None
     for attempt in range(retries):
         try:
             return cursor.execute(sql, params)
         except sqlite3.OperationalError as e:
             msg = str(e).lower()
             if "database is locked" in msg or "database is busy" in msg:
-                time.sleep(sleep_base * (attempt + 1))
+                delay = sleep_base * (attempt + 1)
+                site = site or db_pool.call_site()
+                db_pool.note_busy_retry(delay, site)
+                time.sleep(delay)
                 continue
             raise
     # Final attempt (raise real error if still locked)
@@ -651,13 +710,9 @@ except Exception as e:
 # CHAT MODULE v2 — Channel-based messaging
 # ================================================================
 try:
-    from app.messaging.models import init_chat_schema
     from app.messaging.chat_engine import get_chat_engine
     from app.messaging.chat_routes import register_chat_routes
-    # Init chat schema
-    _chat_conn = get_conn()
-    init_chat_schema(_chat_conn)
-    _chat_conn.close()
+    # Chat schema is created by the versioned migrations (startup)
     # Init singleton engine
     get_chat_engine(get_conn)
     # Register chat API routes
@@ -672,7 +727,6 @@ except Exception as e:
 
 def assert_known_unit(unit_id: str):
     """Raise 400 if unit_id is not present in Units table."""
-    ensure_phase3_schema()
     uid = str(unit_id or "").strip()
     if not uid:
         raise HTTPException(status_code=400, detail="Missing unit_id")
@@ -801,6 +855,7 @@ def ensure_dailylog_schema():
         """)
         conn.commit()
         conn.close()
+        db_pool.invalidate_schema(DB_PATH)
         return
 
     cols = [r[1] for r in c.execute("PRAGMA table_info('DailyLog')").fetchall()]
@@ -874,6 +929,7 @@ def ensure_dailylog_schema():
 
         conn.commit()
         conn.close()
+        db_pool.invalidate_schema(DB_PATH)
         return
 
     # Otherwise, add any missing canonical columns (SQLite allows ADD COLUMN)
@@ -886,6 +942,7 @@ def ensure_dailylog_schema():
 
     conn.commit()
     conn.close()
+    db_pool.invalidate_schema(DB_PATH)
 
 # ================================================================
 # CORE HELPER FUNCTIONS
@@ -948,25 +1005,22 @@ def dailylog_event(
     if not text:
         return False
 
-    ensure_phase3_schema()
 
     ts = (timestamp or _ts()).strip()
 
-    conn = get_conn()
-    c = conn.cursor()
-
-    dl_number = _next_dl_number(c)
-
-    c.execute(
-        """
-        INSERT INTO DailyLog (timestamp, user, incident_id, unit_id, action, event_type, details, dl_number)
-        VALUES (?, ?, ?, ?, 'DAILYLOG', ?, ?, ?)
-        """,
-        (ts, user, incident_id, unit_id, subtype, text, dl_number),
-    )
+    def _insert(c):
+        # dl_number is assigned inside the writer's transaction, so numbers
+        # stay gap-free and in commit order
+        dl_number = _next_dl_number(c)
+        c.execute(
+            """
+            INSERT INTO DailyLog (timestamp, user, incident_id, unit_id, action, event_type, details, dl_number)
+            VALUES (?, ?, ?, ?, 'DAILYLOG', ?, ?, ?)
+            """,
+            (ts, user, incident_id, unit_id, subtype, text, dl_number),
+        )
 
-    conn.commit()
-    conn.close()
+    db_pool.audit_submit(_insert, name="DailyLog")
 
     # Optional: also mirror to MasterLog for audit visibility
     try:
@@ -994,7 +1048,6 @@ def add_narrative(
     unit_id: str | None = None
 ):
     """Canonical narrative writer."""
-    ensure_phase3_schema()
     
     conn = get_conn()
     c = conn.cursor()
@@ -1027,7 +1080,6 @@ def add_narrative(
 
 def incident_has_data(incident_id: int) -> bool:
     """Returns True if incident has assigned units or narrative entries."""
-    ensure_phase3_schema()
     
     conn = get_conn()
     c = conn.cursor()
@@ -1263,7 +1315,6 @@ def sync_unit_roster_from_unitlog(unitlog_path: str = UNITLOG_PATH) -> None:
           shift_letter (current roster assignment)
           home_shift_letter (initial default; only set if null)
     """
-    ensure_phase3_schema()
 
     if not os.path.exists(unitlog_path):
         print(f"[ROSTER] UnitLog not found: {unitlog_path}")
@@ -1384,21 +1435,24 @@ def roster_personnel_ids_for_shift(shift_letter: str) -> set[str]:
     sh = (shift_letter or "").strip().upper()
     if not sh:
         return set()
+    return {uid for uid, letter in board_state.board_section("roster") if letter == sh}
 
-    ensure_phase3_schema()
+
+def _load_roster_personnel() -> list[tuple[str, str]]:
+    """Board section "roster": (personnel unit_id, shift_letter) from UnitRoster."""
     conn = get_conn()
-    c = conn.cursor()
     try:
-        rows = c.execute(
+        rows = conn.execute(
             """
-            SELECT unit_id
+            SELECT unit_id, shift_letter
             FROM UnitRoster
-            WHERE shift_letter = ?
-              AND unit_id GLOB '[0-9][0-9]'
-            """,
-            (sh,),
+            WHERE unit_id GLOB '[0-9][0-9]'
+            """
         ).fetchall()
-        return {str(r["unit_id"]).strip() for r in (rows or []) if (r["unit_id"] or "").strip()}
+        return [
+            (str(r["unit_id"]).strip(), r["shift_letter"])
+            for r in (rows or []) if (r["unit_id"] or "").strip()
+        ]
     finally:
         conn.close()
 
@@ -1406,10 +1460,15 @@ def roster_personnel_ids_for_shift(shift_letter: str) -> set[str]:
 def expire_stale_shift_overrides() -> int:
     """
     Auto-expire shift overrides when the shift they were moved to is no longer active.
-    Called on panel load to clean up overrides from previous shifts.
+    Run by the board reconciler (board repair "stale_shift_overrides").
 
     Returns the count of expired overrides.
     """
+    return len(_expire_stale_shift_overrides())
+
+
+def _expire_stale_shift_overrides() -> list[str]:
+    """Expire overrides from previous shifts; returns what was expired."""
     try:
         from shift_logic import get_shift_for_date
         import datetime
@@ -1418,12 +1477,11 @@ def expire_stale_shift_overrides() -> int:
         active_shifts = {day_shift, night_shift}
     except Exception:
         # Fallback: don't expire anything if shift_logic unavailable
-        return 0
+        return []
 
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
-    expired_count = 0
+    expired: list[str] = []
     try:
         # Find overrides where to_shift_letter is NOT an active shift today
         rows = c.execute(
@@ -1442,19 +1500,19 @@ def expire_stale_shift_overrides() -> int:
                     "UPDATE ShiftOverrides SET end_ts = ? WHERE id = ?",
                     (_ts(), r["id"])
                 )
-                expired_count += 1
+                expired.append(f"override {r['id']} {r['unit_id']} ({to_shift})")
                 try:
                     log_master("SHIFT_OVERRIDE_AUTO_EXPIRE",
                               f"Auto-expired coverage for {r['unit_id']} (was on {to_shift} shift, now {day_shift}/{night_shift})")
                 except Exception:
                     pass
 
-        if expired_count > 0:
+        if expired:
             conn.commit()
     finally:
         conn.close()
 
-    return expired_count
+    return expired
 
 
 def apply_active_shift_overrides(shift_letter: str, base_ids: set[str]) -> set[str]:
@@ -1467,37 +1525,39 @@ def apply_active_shift_overrides(shift_letter: str, base_ids: set[str]) -> set[s
     if not sh:
         return set(base_ids or set())
 
-    ensure_phase3_schema()
+    add_in: set[str] = set()
+    take_out: set[str] = set()
+
+    for r in board_state.board_section("overrides"):
+        uid = (r["unit_id"] or "").strip()
+        frm = (r["from_shift_letter"] or "").strip().upper()
+        to = (r["to_shift_letter"] or "").strip().upper()
+        if not uid or not frm or not to:
+            continue
+
+        if to == sh:
+            add_in.add(uid)
+        if frm == sh:
+            take_out.add(uid)
+
+    out = set(base_ids or set())
+    out |= add_in
+    out -= take_out
+    return out
+
+
+def _load_active_shift_overrides() -> list[dict]:
+    """Board section "overrides": ShiftOverrides rows still in effect."""
     conn = get_conn()
-    c = conn.cursor()
     try:
-        rows = c.execute(
+        rows = conn.execute(
             """
-            SELECT unit_id, from_shift_letter, to_shift_letter
+            SELECT id, unit_id, from_shift_letter, to_shift_letter
             FROM ShiftOverrides
             WHERE end_ts IS NULL
             """
         ).fetchall()
-
-        add_in: set[str] = set()
-        take_out: set[str] = set()
-
-        for r in (rows or []):
-            uid = (r["unit_id"] or "").strip()
-            frm = (r["from_shift_letter"] or "").strip().upper()
-            to = (r["to_shift_letter"] or "").strip().upper()
-            if not uid or not frm or not to:
-                continue
-
-            if to == sh:
-                add_in.add(uid)
-            if frm == sh:
-                take_out.add(uid)
-
-        out = set(base_ids or set())
-        out |= add_in
-        out -= take_out
-        return out
+        return [dict(r) for r in (rows or [])]
     finally:
         conn.close()
 
@@ -1516,20 +1576,7 @@ def get_session_roster_view_mode(request: Request) -> str:
 
 
 def roster_personnel_ids_all_shifts() -> set[str]:
-    ensure_phase3_schema()
-    conn = get_conn()
-    c = conn.cursor()
-    try:
-        rows = c.execute(
-            """
-            SELECT unit_id
-            FROM UnitRoster
-            WHERE unit_id GLOB '[0-9][0-9]'
-            """
-        ).fetchall()
-        return {str(r["unit_id"]).strip() for r in (rows or []) if (r["unit_id"] or "").strip()}
-    finally:
-        conn.close()
+    return {uid for uid, _letter in board_state.board_section("roster")}
 
 
 # Battalion chiefs are SHIFT-SCOPED (letter-based). 1578 and Car1 are always visible.
@@ -1583,7 +1630,6 @@ def reject_and_log(
 
 def set_unit_disposition(incident_id: int, unit_id: str, disposition: str):
     """Sets disposition code for a unit assignment."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     
@@ -1599,7 +1645,6 @@ def set_unit_disposition(incident_id: int, unit_id: str, disposition: str):
 
 def incident_has_active_units(incident_id: int) -> bool:
     """Returns True if incident has units that have not been cleared."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     
@@ -1633,13 +1678,11 @@ def masterlog(event_type, user="System", incident_id=None, details=None, unit_id
     Canonical MasterLog writer.
     Always satisfies legacy NOT NULL action column.
     """
-    ensure_phase3_schema()
 
     conn = get_conn()
     c = conn.cursor()
 
-    # PRAGMA table_info returns tuples: (cid, name, type, notnull, dflt, pk)
-    cols = [row[1] for row in c.execute("PRAGMA table_info(MasterLog)").fetchall()]
+    cols = schema_cols("MasterLog")
 
     ts = _ts()
     action_value = event_type or "SYSTEM"
@@ -1706,13 +1749,19 @@ _SCHEMA_INIT_DONE = False
 
 
 def ensure_phase3_schema():
+    """
+    Bring the database up to the latest schema version (once per process).
+    Runs from startup_event; request handlers never touch DDL.
+    """
     global _SCHEMA_INIT_DONE
-    # Return early if already initialized to prevent concurrent schema operations
-    # which can cause database locks on multi-threaded access
     if _SCHEMA_INIT_DONE:
         return
+    db_migrations.run_migrations(DB_PATH)
+    _SCHEMA_INIT_DONE = True
 
-    conn = get_conn()
+
+def _migrate_phase3_core(conn):
+    """Migration 1 — Phase-3 core tables, retrofit columns and indexes."""
     c = conn.cursor()
 
     # ------------------------------------------------------------
@@ -2323,7 +2372,6 @@ def ensure_phase3_schema():
     _create_index("CREATE INDEX IF NOT EXISTS idx_incidents_number ON Incidents(incident_number)")
     _create_index("CREATE INDEX IF NOT EXISTS idx_incidents_type ON Incidents(incident_type)")
     _create_index("CREATE INDEX IF NOT EXISTS idx_unit_assignments_composite ON UnitAssignments(unit_id, incident_id)")
-    _create_index("CREATE INDEX IF NOT EXISTS idx_contacts_name ON Contacts(name)")
     _create_index("CREATE INDEX IF NOT EXISTS idx_incident_history_user ON IncidentHistory(user)")
 
     # --------------------------------------------------
@@ -2346,6 +2394,7 @@ def ensure_phase3_schema():
         )
     """)
     _create_index("CREATE INDEX IF NOT EXISTS idx_contacts_unit ON Contacts(unit_id)")
+    _create_index("CREATE INDEX IF NOT EXISTS idx_contacts_name ON Contacts(name)")
 
     # ALTER Contacts: add extended fields (idempotent)
     for col, typedef in [
@@ -2491,9 +2540,53 @@ def ensure_phase3_schema():
     """)
     _create_index("CREATE INDEX IF NOT EXISTS idx_employee_certs_unit ON EmployeeCertifications(unit_id)")
 
-    conn.commit()
-    conn.close()
-    _SCHEMA_INIT_DONE = True
+
+def _migrate_user_settings(conn):
+    """Migration 2 — per-dispatcher UI settings (was created inside the handlers)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS UserSettings (
+            dispatcher_unit TEXT PRIMARY KEY,
+            settings_json TEXT,
+            updated TEXT
+        )
+    """)
+
+
+def _module_schema_step(module: str, func: str, with_conn: bool = False):
+    """Migration step that runs an app module's own schema initializer."""
+    def _apply(conn):
+        try:
+            mod = importlib.import_module(module)
+        except ImportError as e:
+            raise db_migrations.MigrationSkipped(f"{module} not available: {e}") from e
+        fn = getattr(mod, func)
+        fn(conn) if with_conn else fn()
+    return _apply
+
+
+# ======================================================
+# SCHEMA MIGRATIONS (PRAGMA user_version)
+# ======================================================
+# Append new steps with the next version number. Never renumber or edit a
+# shipped step; databases past it will not run it again.
+
+db_migrations.register_migration(1, "phase3_core", _migrate_phase3_core)
+db_migrations.register_migration(2, "user_settings", _migrate_user_settings)
+db_migrations.register_migration(3, "messaging", _module_schema_step("app.messaging.models", "init_messaging_schema", with_conn=True))
+db_migrations.register_migration(4, "chat", _module_schema_step("app.messaging.models", "init_chat_schema", with_conn=True))
+db_migrations.register_migration(5, "eventstream", _module_schema_step("app.eventstream.models", "init_eventstream_schema"))
+db_migrations.register_migration(6, "playbooks", _module_schema_step("app.playbooks.models", "init_playbook_schema"))
+db_migrations.register_migration(7, "reminders", _module_schema_step("app.reminders.models", "init_reminder_schema"))
+db_migrations.register_migration(8, "safety", _module_schema_step("app.safety.models", "init_safety_schema"))
+db_migrations.register_migration(9, "mobile", _module_schema_step("app.mobile.models", "init_mobile_schema"))
+db_migrations.register_migration(10, "themes", _module_schema_step("app.themes.models", "init_schema"))
+db_migrations.register_migration(11, "calendar", _module_schema_step("app.calendar.models", "ensure_calendar_schema", with_conn=True))
+db_migrations.register_migration(12, "reporting", _module_schema_step("app.reporting.models", "init_database"))
+db_migrations.register_migration(13, "hot_path_indexes", db_pool.install_hot_path_indexes)
+db_migrations.register_migration(14, "epoch_columns", db_pool.install_epoch_columns)
+db_migrations.register_migration(15, "leader_leases", db_pool.install_lease_table)
+db_migrations.register_migration(16, "board_versions", board_state.install_board_versions)
+db_migrations.register_migration(17, "board_versions_dailylog", board_state.install_dailylog_version)
 
 
 
@@ -2504,8 +2597,6 @@ def ensure_phase3_schema():
 
 @app.post("/incident/new")
 async def create_incident(request: Request):
-    ensure_phase3_schema()
-
     # Role check: CALLTAKER minimum to create incidents
     if not require_role(request, "CALLTAKER"):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Insufficient role: CALLTAKER required"})
@@ -2598,8 +2689,6 @@ async def create_incident(request: Request):
 
 @app.post("/incident/cancel/{incident_id}")
 async def cancel_incident(request: Request, incident_id: int):
-    ensure_phase3_schema()
-
     conn = get_conn()
     c = conn.cursor()
 
@@ -2644,7 +2733,6 @@ async def cancel_incident(request: Request, incident_id: int):
 # ================================================================
 @app.post("/incident/save/{incident_id}")
 async def save_incident(request: Request, incident_id: int):
-    ensure_phase3_schema()
     data = await request.json()
     ts = _ts()
     user = (data.get("user") or "CLI").strip()  # safe default
@@ -2832,7 +2920,6 @@ async def save_incident(request: Request, incident_id: int):
 # ------------------------------------------------
 @app.get("/incident_action_window/{incident_id}", response_class=HTMLResponse)
 def ford_incident_action_window(request: Request, incident_id: int):
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -2991,8 +3078,6 @@ def ford_incident_action_window(request: Request, incident_id: int):
 # ------------------------------------------------
 @app.get("/incident/{incident_id}/timeline", response_class=HTMLResponse)
 def ford_incident_timeline_view(request: Request, incident_id: int):
-    ensure_phase3_schema()
-
     timeline = get_incident_timeline(incident_id)
 
     return templates.TemplateResponse(
@@ -3007,7 +3092,6 @@ def ford_incident_timeline_view(request: Request, incident_id: int):
 
 @app.get("/iaw/{incident_id}/timeline", response_class=HTMLResponse)
 def ford_iaw_timeline_partial(request: Request, incident_id: int):
-    ensure_phase3_schema()
     timeline = get_incident_timeline(incident_id)
 
     return templates.TemplateResponse(
@@ -3053,7 +3137,6 @@ def fetch_units_metadata_only() -> list[dict]:
     Returns ONLY metadata fields for writing UnitLog.txt.
     Does NOT include status or timestamps.
     """
-    ensure_phase3_schema()
 
     conn = get_conn()
     c = conn.cursor()
@@ -3076,7 +3159,6 @@ def fetch_units_metadata_only() -> list[dict]:
 
 def unit_is_assigned(unit_id: str) -> bool:
     """Returns True if the unit cannot be edited (currently active on an incident)."""
-    ensure_phase3_schema()
 
     conn = get_conn()
     c = conn.cursor()
@@ -3107,7 +3189,6 @@ async def units_editor_update(request: Request):
     if unit_is_assigned(unit_id):
         return {"ok": False, "error": "Unit is active on an incident — cannot modify"}
 
-    ensure_phase3_schema()
 
     conn = get_conn()
     c = conn.cursor()
@@ -3151,7 +3232,6 @@ async def units_editor_add(request: Request):
     if not unit_id:
         return {"ok": False, "error": "Missing unit_id"}
 
-    ensure_phase3_schema()
 
     conn = get_conn()
     c = conn.cursor()
@@ -3204,7 +3284,6 @@ async def units_editor_delete(request: Request):
     if unit_is_assigned(unit_id):
         return {"ok": False, "error": "Cannot delete — unit is active on an incident"}
 
-    ensure_phase3_schema()
 
     conn = get_conn()
     c = conn.cursor()
@@ -3230,7 +3309,7 @@ async def units_editor_delete(request: Request):
 @app.get("/api/units/refresh", response_class=HTMLResponse)
 async def api_units_refresh(request: Request):
     """Returns a fully-rendered Units Panel HTML block (shift-scoped)."""
-    ctx = _build_units_panel_context(request)
+    ctx = await db_pool.run_db(_build_units_panel_context, request)
     return templates.TemplateResponse(
         "units.html",
         {
@@ -3268,25 +3347,12 @@ async def api_dispatch_picker_refresh(request: Request, incident_id: int):
 
     shift_letter = get_session_shift_letter(request)
 
-    # Start with the canonical ordered set
-    units = fetch_units() or []
+    # Start with the canonical ordered set (board state rows are shared: copy)
+    board_units, assignments = board_state.board_sections("units", "assignments")
+    units = [dict(u) for u in board_units]
 
     # Availability: block duplicates (units already assigned to any active incident)
-    conn = get_conn()
-    c = conn.cursor()
-    try:
-        assigned_to_incident = {
-            (r["unit_id"] or "").strip()
-            for r in c.execute(
-                """
-                SELECT unit_id
-                FROM UnitAssignments
-                WHERE cleared IS NULL
-                """
-            ).fetchall()
-        }
-    finally:
-        conn.close()
+    assigned_to_incident = {(a["unit_id"] or "").strip() for a in assignments}
 
     # Roster personnel (shift letter) + overrides
     view_mode = get_session_roster_view_mode(request)
@@ -3331,6 +3397,8 @@ async def api_dispatch_picker_refresh(request: Request, incident_id: int):
     # Get incident type for response plan recommendations
     incident_type = None
     recommended_units = []
+    conn = get_conn()
+    c = conn.cursor()
     try:
         inc_row = c.execute("SELECT type FROM Incidents WHERE incident_id = ?", (incident_id,)).fetchone()
         if inc_row and inc_row["type"]:
@@ -3612,7 +3680,6 @@ def _pw_verify(password: str, stored: str) -> bool:
 
 
 def _get_user_account(unit_id: str) -> dict | None:
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         row = conn.execute(
@@ -3639,7 +3706,6 @@ def _upsert_user_account(unit_id: str, display_name: str, is_admin: bool, requir
     """
     Upsert user account. If password provided, set/replace password_hash.
     """
-    ensure_phase3_schema()
     ts = _ts()
     conn = get_conn()
     try:
@@ -3700,7 +3766,6 @@ def _dispatcher_options() -> list[dict]:
     Login selector options.
     Phase-3 intent: resolve dispatcher identity from roster/units.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     try:
@@ -3883,16 +3948,6 @@ async def api_get_settings(request: Request):
     conn = get_conn()
     c = conn.cursor()
 
-    # Ensure UserSettings table exists
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS UserSettings (
-            dispatcher_unit TEXT PRIMARY KEY,
-            settings_json TEXT,
-            updated TEXT
-        )
-    """)
-    conn.commit()
-
     row = c.execute("SELECT settings_json FROM UserSettings WHERE dispatcher_unit=?", (dispatcher_unit,)).fetchone()
     conn.close()
 
@@ -3939,15 +3994,6 @@ async def api_save_settings(request: Request):
     conn = get_conn()
     c = conn.cursor()
 
-    # Ensure UserSettings table exists
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS UserSettings (
-            dispatcher_unit TEXT PRIMARY KEY,
-            settings_json TEXT,
-            updated TEXT
-        )
-    """)
-
     c.execute("""
         INSERT OR REPLACE INTO UserSettings (dispatcher_unit, settings_json, updated)
         VALUES (?, ?, ?)
@@ -4005,7 +4051,6 @@ async def api_shift_override_start(request: Request, payload: dict):
     if to_shift_letter not in ("A", "B", "C", "D"):
         return reject_and_log("BAD_REQUEST", "to_shift_letter must be A/B/C/D (or login to set session shift).")
 
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     try:
@@ -4058,7 +4103,6 @@ async def api_shift_override_end(request: Request, payload: dict):
     if not unit_id:
         return reject_and_log("BAD_REQUEST", "unit_id is required.")
 
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     try:
@@ -4237,7 +4281,15 @@ def split_units_for_picker(units: list[dict]) -> dict:
 
 
 def get_units_for_panel() -> list[dict]:
+    """Ordered units with metadata (see _load_units_for_panel), copied from
+    the board state."""
+    return [dict(u) for u in board_state.board_section("units")]
+
+
+def _load_units_for_panel() -> list[dict]:
     """
+    Board section "units".
+
     FORD-CAD Units Panel order (CANON):
       1) Command units pinned (canonical fixed order): 1578, Car1, Batt1–Batt4
       2) Personnel (two-digit IDs) - sorted by display_order, then by unit_id
@@ -4438,14 +4490,7 @@ def get_apparatus_crew(parent_unit_id: str):
     c = conn.cursor()
 
     try:
-        exists = c.execute("""
-            SELECT 1
-            FROM sqlite_master
-            WHERE type='table' AND name='PersonnelAssignments'
-            LIMIT 1
-        """).fetchone()
-
-        if not exists:
+        if not schema_has_table("PersonnelAssignments"):
             return []
 
         rows = c.execute("""
@@ -4465,20 +4510,11 @@ def get_apparatus_crew(parent_unit_id: str):
 # ================================================================
 
 def _personnel_assignments_table_exists_tx(c) -> bool:
-    row = c.execute(
-        """
-        SELECT 1
-        FROM sqlite_master
-        WHERE type='table' AND name='PersonnelAssignments'
-        LIMIT 1
-        """
-    ).fetchone()
-    return bool(row)
+    return schema_has_table("PersonnelAssignments")
 
 
 def get_personnel_parent_apparatus(personnel_id: str) -> str | None:
     """Returns the apparatus_id this personnel_id is assigned to (or None)."""
-    ensure_phase3_schema()
     pid = (personnel_id or "").strip()
     if not pid:
         return None
@@ -4504,7 +4540,6 @@ def get_personnel_parent_apparatus(personnel_id: str) -> str | None:
 
 def get_apparatus_crew_details(apparatus_id: str) -> list[dict]:
     """Returns crew rows with optional role/shift + joined Units metadata."""
-    ensure_phase3_schema()
     aid = (apparatus_id or "").strip()
     if not aid:
         return []
@@ -4539,7 +4574,6 @@ def get_apparatus_crew_details(apparatus_id: str) -> list[dict]:
 
 def get_all_apparatus_crew_map() -> dict[str, list[dict]]:
     """Map: apparatus_id -> [ {personnel_id, role, shift, icon, status, custom_status} ]"""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     try:
@@ -4582,7 +4616,6 @@ def set_personnel_assignment(
     user: str = "System",
 ) -> dict:
     """Assign personnel to apparatus (move semantics: personnel can only be on one apparatus)."""
-    ensure_phase3_schema()
     aid = (apparatus_id or "").strip()
     pid = (personnel_id or "").strip()
     role = (role or "").strip()
@@ -4664,7 +4697,6 @@ def clear_personnel_assignment(
     user: str = "System",
 ) -> dict:
     """Unassign personnel from an apparatus. If apparatus_id omitted, unassign from any."""
-    ensure_phase3_schema()
     pid = (personnel_id or "").strip()
     aid = (apparatus_id or "").strip() if apparatus_id else None
     if not pid:
@@ -4713,9 +4745,7 @@ def clear_personnel_assignment(
 @app.get("/api/apparatus/list")
 async def api_apparatus_list():
     """Ordered list of apparatus for pickers/UAW."""
-    ensure_phase3_schema()
-    units = fetch_units() or []
-    groups = split_units_for_picker(units)
+    groups = split_units_for_picker(board_state.board_section("units"))
     apparatus = groups.get("apparatus") or []
     return {
         "ok": True,
@@ -4729,21 +4759,18 @@ async def api_apparatus_list():
 
 @app.get("/api/crew/for_personnel/{personnel_id}")
 async def api_crew_for_personnel(personnel_id: str):
-    ensure_phase3_schema()
     aid = get_personnel_parent_apparatus(personnel_id)
     return {"ok": True, "personnel_id": personnel_id, "apparatus_id": aid}
 
 
 @app.get("/api/crew/for_apparatus/{apparatus_id}")
 async def api_crew_for_apparatus(apparatus_id: str):
-    ensure_phase3_schema()
     crew = get_apparatus_crew_details(apparatus_id)
     return {"ok": True, "apparatus_id": apparatus_id, "crew": crew}
 
 
 @app.post("/api/crew/assign")
 async def api_crew_assign(request: Request):
-    ensure_phase3_schema()
     data = await request.json()
 
     apparatus_id = (data.get("apparatus_id") or "").strip()
@@ -4766,7 +4793,6 @@ async def api_crew_assign(request: Request):
 
 @app.post("/api/crew/unassign")
 async def api_crew_unassign(request: Request):
-    ensure_phase3_schema()
     data = await request.json()
 
     personnel_id = (data.get("personnel_id") or "").strip()
@@ -4783,7 +4809,6 @@ async def api_crew_unassign(request: Request):
 @app.post("/api/unit/transfer_assignment")
 async def api_unit_transfer_assignment(request: Request):
     """Move an ACTIVE unit assignment from one incident to another (drag-drop transfer)."""
-    ensure_phase3_schema()
     data = await request.json()
     unit_id = (data.get("unit_id") or "").strip()
     from_incident_id = int(data.get("from_incident_id") or 0)
@@ -5083,7 +5108,7 @@ async def dispatch_units(incident_id: int, request: Request):
         return {"ok": False, "error": "No units provided"}
 
     # Use the canonical dispatch function which handles transactions properly
-    result = dispatch_units_to_incident(incident_id, units, user)
+    result = await db_pool.run_db(dispatch_units_to_incident, incident_id, units, user)
 
     # Map response to expected format for backward compatibility
     if result.get("ok"):
@@ -5340,8 +5365,27 @@ async def unit_status_update(
     data = await request.json()
     new_status = (data.get("status") or "").upper().strip()
     user = request.session.get("user", "Dispatcher")
-    ensure_phase3_schema()
 
+    # Rejected before the unit of work takes the write lock
+    if new_status not in VALID_UNIT_STATUSES:
+        return {"ok": False, "error": f"Invalid status {new_status}"}
+
+    # One unit of work: status, assignment timestamps, crew mirroring and
+    # history commit together; chat cards and broadcasts run after commit.
+    return await db_pool.run_db(
+        _in_unit_of_work, _unit_status_update_tx, incident_id, unit_id, new_status, user
+    )
+
+
+def _in_unit_of_work(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) in one unit of work. Blocking: async handlers
+    call it via run_db so the unit (and its write lock) lives on a DB worker
+    thread, never on the event loop."""
+    with db_pool.unit_of_work():
+        return fn(*args, **kwargs)
+
+
+def _unit_status_update_tx(incident_id: int, unit_id: str, new_status: str, user: str):
     # Only apparatus should attempt crew mirroring
     conn = get_conn()
     c = conn.cursor()
@@ -5352,10 +5396,6 @@ async def unit_status_update(
     conn.close()
     _is_apparatus = bool(row and int(row["is_apparatus"] or 0) == 1)
 
-
-    if new_status not in VALID_UNIT_STATUSES:
-        return {"ok": False, "error": f"Invalid status {new_status}"}
-
     def _has_disposition() -> bool:
         conn = get_conn()
         c = conn.cursor()
@@ -5407,11 +5447,12 @@ async def unit_status_update(
             conn.close()
 
 
-    # --- Chat event helper ---
+    # --- Chat event helper (posted once the status change commits) ---
     def _chat_event(evt):
         try:
             from app.messaging.chat_engine import get_chat_engine, post_cad_event_to_chat
-            post_cad_event_to_chat(get_chat_engine(), incident_id, evt, unit_id=unit_id, user=user)
+            db_pool.after_commit(post_cad_event_to_chat, get_chat_engine(), incident_id, evt,
+                                 unit_id=unit_id, user=user)
         except Exception:
             pass
 
@@ -5456,7 +5497,7 @@ async def unit_status_update(
         ts_now = _ts()
 
         # Check if this is the first unit to arrive on this incident
-        inc_cols = {r["name"] for r in c.execute("PRAGMA table_info(Incidents)").fetchall()}
+        inc_cols = schema_cols("Incidents")
         if "first_unit_arrived" in inc_cols:
             existing = c.execute(
                 "SELECT first_unit_arrived FROM Incidents WHERE incident_id = ?",
@@ -5483,8 +5524,7 @@ async def unit_status_update(
                              details=f"First arrival by {unit_id}")
 
         # Auto-command: first ARRIVED unit becomes command (if supported)
-        ua_cols = [r["name"] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()]
-        has_cmd_col = "commanding_unit" in ua_cols
+        has_cmd_col = "commanding_unit" in schema_cols("UnitAssignments")
 
         if has_cmd_col:
             has_cmd = c.execute("""
@@ -5544,8 +5584,7 @@ async def unit_status_update(
         conn = get_conn()
         c = conn.cursor()
 
-        ua_cols = [r[1] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()]
-        has_cmd = "commanding_unit" in ua_cols
+        has_cmd = "commanding_unit" in schema_cols("UnitAssignments")
 
         is_cmd = False
         if has_cmd:
@@ -5628,8 +5667,7 @@ async def unit_disposition_submit(
     c = conn.cursor()
 
     # Optional remark column support (non-breaking)
-    cols = [r["name"] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()]
-    has_remark_col = "disposition_remark" in cols
+    has_remark_col = "disposition_remark" in schema_cols("UnitAssignments")
 
     if has_remark_col:
         c.execute("""
@@ -5763,7 +5801,6 @@ async def submit_incident_disposition(incident_id: int, request: Request):
           - Else, if there are no active units remaining: mark incident CLOSED
       • Never auto-closes while units remain assigned
     """
-    ensure_phase3_schema()
 
     # Parse JSON payload (UI uses postJSON)
     try:
@@ -5881,8 +5918,8 @@ async def submit_incident_disposition(incident_id: int, request: Request):
 
     try:
         # ---- Detect schema columns (older DBs drift) ------------------------
-        inc_cols = {r["name"] for r in c.execute("PRAGMA table_info(Incidents)").fetchall()}
-        ua_cols  = {r["name"] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()}
+        inc_cols = schema_cols("Incidents")
+        ua_cols  = schema_cols("UnitAssignments")
 
         # Pick the correct "cleared" column name for UnitAssignments
         if "cleared_at" in ua_cols:
@@ -6069,7 +6106,6 @@ def incident_has_data_api(incident_id: int):
 
 @app.get("/history", response_class=HTMLResponse)
 async def history_list(request: Request):
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -6161,7 +6197,6 @@ async def history_export_csv(request: Request):
     """Export filtered history as CSV download."""
     import csv
     import io
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -6224,7 +6259,6 @@ async def history_export_csv(request: Request):
 
 @app.get("/history/{incident_id}", response_class=HTMLResponse)
 async def history_detail(request: Request, incident_id: int):
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -6274,7 +6308,6 @@ async def history_detail(request: Request, incident_id: int):
 @app.post("/api/incident/{incident_id}/schedule")
 async def api_incident_schedule(request: Request, incident_id: int):
     """Schedule an incident for delayed activation."""
-    ensure_phase3_schema()
     data = await request.json()
     scheduled_for = (data.get("scheduled_for") or "").strip()
     user = request.session.get("user", "Dispatcher")
@@ -6303,7 +6336,6 @@ async def api_incident_schedule(request: Request, incident_id: int):
 @app.get("/api/incidents/scheduled")
 async def api_incidents_scheduled(request: Request):
     """Get all scheduled (delayed) incidents."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     rows = c.execute("""
@@ -6349,7 +6381,6 @@ async def api_incident_reopen(request: Request):
       • Reopen returns the incident to OPEN (no units assigned)
       • Audit trails: IncidentHistory + MasterLog + DailyLog
     """
-    ensure_phase3_schema()
 
     try:
         data = await request.json()
@@ -6500,7 +6531,6 @@ async def panel_dailylog(request: Request):
     Loads the Daily Log table rows (HTML partial) — DAILYLOG entries ONLY.
     Optional query param: ?date=YYYY-MM-DD
     """
-    ensure_phase3_schema()
 
     date = (request.query_params.get("date") or "").strip()
 
@@ -6508,7 +6538,8 @@ async def panel_dailylog(request: Request):
     c = conn.cursor()
 
     if date:
-        rows = c.execute("""
+        day_sql, day_params = _date_range_filter("DailyLog", "timestamp", date, date)
+        rows = c.execute(f"""
             SELECT
                 id AS log_id,
                 timestamp,
@@ -6521,10 +6552,10 @@ async def panel_dailylog(request: Request):
                 dl_number
             FROM DailyLog
             WHERE action = 'DAILYLOG'
-              AND substr(timestamp, 1, 10) = ?
+              AND {day_sql}
             ORDER BY id DESC
             LIMIT 500
-        """, (date,)).fetchall()
+        """, day_params).fetchall()
     else:
         rows = c.execute("""
             SELECT
@@ -6573,6 +6604,15 @@ def unit_is_dispatchable(unit: dict) -> bool:
 
 
 def dispatch_units_to_incident(incident_id: int, units: list[str], user: str, force: bool = False):
+    """
+    Dispatch units (and apparatus crew) as one unit of work: assignments,
+    unit status, incident history, daily log and event rows commit together.
+    """
+    with db_pool.unit_of_work():
+        return _dispatch_units_to_incident_tx(incident_id, units, user, force)
+
+
+def _dispatch_units_to_incident_tx(incident_id: int, units: list[str], user: str, force: bool = False):
     ts = _ts()
 
     conn = get_conn()
@@ -6771,7 +6811,8 @@ async def dispatch_unit_endpoint(request: Request):
 
     user = request.session.get("user", "Dispatcher")
 
-    result = dispatch_units_to_incident(
+    result = await db_pool.run_db(
+        dispatch_units_to_incident,
         incident_id=int(incident_id),
         units=units,
         user=user,
@@ -7062,7 +7103,6 @@ async def clear_unit_api(request: Request, incident_id: int, unit_id: str):
 # ---------------------------------------------------------------
 @app.get("/calltaker/edit/{incident_id}", response_class=HTMLResponse)
 async def calltaker_edit(request: Request, incident_id: int):
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -7087,7 +7127,6 @@ async def calltaker_edit(request: Request, incident_id: int):
 @app.get("/incident/{incident_id}/edit_data")
 async def incident_edit_data(request: Request, incident_id: int):
     """Return incident data as JSON for populating the calltaker form."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -7164,8 +7203,6 @@ async def incident_edit_data(request: Request, incident_id: int):
 # ---------------------------------------------------------------
 @app.get("/incident/{incident_id}/issue", response_class=HTMLResponse)
 async def issue_modal(request: Request, incident_id: int):
-    ensure_phase3_schema()
-
     conn = get_conn()
     c = conn.cursor()
 
@@ -7366,20 +7403,6 @@ async def event_disposition_modal(request: Request, incident_id: int):
 # BLOCK 17 — ISSUE FOUND ENGINE (Phase-3 Canon)
 # ================================================================
 
-def ensure_issue_flag_column():
-    conn = get_conn()
-    c = conn.cursor()
-    try:
-        c.execute("ALTER TABLE Incidents ADD COLUMN issue_flag INTEGER DEFAULT 0")
-        conn.commit()
-    except Exception:
-        pass
-    conn.close()
-
-
-ensure_issue_flag_column()
-
-
 def incident_is_dailylog(incident_id: int) -> bool:
     conn = get_conn()
     c = conn.cursor()
@@ -7777,6 +7800,19 @@ def normalize_date(datestr: str) -> str:
         return datetime.datetime.now().strftime("%Y-%m-%d")
 
 
+def _date_range_filter(table: str, column: str, start_date=None, end_date=None,
+                       alias: str | None = None) -> tuple[str, list]:
+    """
+    Sargable whole-day range on table.column (both dates inclusive), using
+    the indexed epoch shadow column when present. An unparseable date
+    matches nothing, as DATE('garbage') / substr() comparisons did.
+    """
+    try:
+        return db_pool.date_range_sql(table, column, start_date, end_date, alias=alias)
+    except ValueError:
+        return "0", []
+
+
 def _dailylog_label_expr(alias: str = "dl") -> str:
     """
     SQL label used for filtering + display.
@@ -7814,7 +7850,6 @@ def fetch_daily_log_feed(
       • Shows ALL rows in DailyLog (manual DAILYLOG + system/incident events).
       • Optional filters only (no default date gating).
     """
-    ensure_phase3_schema()
 
     # Normalize
     date_iso = normalize_date(date_iso) if date_iso else None
@@ -7839,8 +7874,9 @@ def fetch_daily_log_feed(
     params: list = []
 
     if date_iso:
-        where.append("substr(dl.timestamp, 1, 10) = ?")
-        params.append(date_iso)
+        day_sql, day_params = _date_range_filter("DailyLog", "timestamp", date_iso, date_iso, alias="dl")
+        where.append(day_sql)
+        params.extend(day_params)
 
     if subtype:
         # subtype filter applies to the ONE visible label
@@ -7915,8 +7951,6 @@ async def panel_dailylog_rows(
     q: str | None = None,
     limit: int | None = 750,
 ):
-    ensure_phase3_schema()
-
     # ---------------------------
     # Normalize filters
     # ---------------------------
@@ -7941,6 +7975,15 @@ async def panel_dailylog_rows(
         limit = 750
     limit = max(50, min(limit, 2000))
 
+    return await _versioned_panel(
+        request,
+        "dailylog_rows",
+        (subtype, unit_id, iid, q, limit),
+        lambda: _render_dailylog_rows(request, subtype, unit_id, iid, q, limit),
+    )
+
+
+def _render_dailylog_rows(request: Request, subtype: str, unit_id: str, iid: int | None, q: str, limit: int):
     # ---------------------------
     # SQL (ONLY DAILYLOG rows)
     # label = subtype (event_type) fallback OTHER
@@ -8067,7 +8110,6 @@ def _dailylog_add_entry(
     Writes ONE row into DailyLog as action='DAILYLOG'.
     Returns: (ok, error_message)
     """
-    ensure_phase3_schema()
 
     details = (details or "").strip()
     if not details:
@@ -8250,11 +8292,9 @@ def incident_history(
 ):
     """
     Canonical incident history logger (Phase-3)
+    Queued on the audit writer; committed with the next group commit.
     """
-    conn = get_conn()
-    c = conn.cursor()
-
-    c.execute("""
+    db_pool.audit_insert("""
         INSERT INTO IncidentHistory (
             incident_id,
             timestamp,
@@ -8271,10 +8311,7 @@ def incident_history(
         user,
         unit_id,
         details
-    ))
-
-    conn.commit()
-    conn.close()
+    ), name="IncidentHistory")
 
 
 def masterlog(
@@ -8293,17 +8330,12 @@ def masterlog(
       - Works with masterlog(event_type="EVENT")
       - Works with legacy masterlog(action="EVENT") without event_type
     """
-    ensure_phase3_schema()
     MASTERLOG_WRITTEN.set(True)
 
     event = ((event_type or action) or "SYSTEM").strip() or "SYSTEM"
     ts = _ts()
 
-    conn = get_conn()
-    c = conn.cursor()
-
-    cols = [row[1] for row in c.execute("PRAGMA table_info(MasterLog)").fetchall()]
-    has = set(cols)
+    has = schema_cols("MasterLog")
 
     insert_cols = ["timestamp", "user"]
     insert_vals = [ts, user]
@@ -8340,11 +8372,8 @@ def masterlog(
     q_cols = ", ".join(insert_cols)
     q_q = ", ".join(["?"] * len(insert_cols))
 
-    _sqlite_exec_retry(c, f"INSERT INTO MasterLog ({q_cols}) VALUES ({q_q})", insert_vals)
-
-
-    conn.commit()
-    conn.close()
+    # Queued on the audit writer (group commit; no per-row fsync)
+    db_pool.audit_insert(f"INSERT INTO MasterLog ({q_cols}) VALUES ({q_q})", insert_vals, name="MasterLog")
 
 
 
@@ -8457,15 +8486,13 @@ def process_remark(user: str, text: str, unit_id: str = None, incident_id: int =
                 return {"ok": True, "routed": "INCIDENT", "incident_id": int(inc), "unit_id": unit_id}
 
             # 3) Unit not on an incident -> write to DailyLog as REMARK (viewer expects this)
-            ensure_phase3_schema()
             ts = _ts()
 
             conn = get_conn()
             c = conn.cursor()
 
             # issue_found column exists in Phase-3, but guard just in case
-            dl_cols = [r[1] for r in c.execute("PRAGMA table_info('DailyLog')").fetchall()]
-            has_issue = "issue_found" in set(dl_cols)
+            has_issue = "issue_found" in schema_cols("DailyLog")
 
             if has_issue:
                 _sqlite_exec_retry(c, """
@@ -8490,13 +8517,11 @@ def process_remark(user: str, text: str, unit_id: str = None, incident_id: int =
             return {"ok": True, "routed": "EVENTLOG", "unit_id": unit_id}
 
         # 4) No incident, no unit -> still write to DailyLog as REMARK
-        ensure_phase3_schema()
         ts = _ts()
         conn = get_conn()
         c = conn.cursor()
 
-        dl_cols = [r[1] for r in c.execute("PRAGMA table_info('DailyLog')").fetchall()]
-        has_issue = "issue_found" in set(dl_cols)
+        has_issue = "issue_found" in schema_cols("DailyLog")
 
         if has_issue:
             _sqlite_exec_retry(c, """
@@ -8619,8 +8644,7 @@ def get_incident_timeline(incident_id: int) -> list[dict]:
         })
 
     # Photos (if table exists)
-    tables = {r[0] for r in c.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()}
-    if "incident_photos" in tables:
+    if schema_has_table("incident_photos"):
         for r in c.execute("""
             SELECT uploaded_at AS timestamp, filename, caption, uploaded_by
             FROM incident_photos
@@ -8650,7 +8674,6 @@ try:
     _active_incident_id_for_unit
 except NameError:
     def _active_incident_id_for_unit(unit_id: str) -> int | None:
-        ensure_phase3_schema()
         conn = get_conn()
         c = conn.cursor()
         row = c.execute("""
@@ -8668,11 +8691,7 @@ except NameError:
 
 
 def _ua_has_column(c, table: str, col: str) -> bool:
-    try:
-        cols = [r[1] for r in c.execute(f"PRAGMA table_info({table})").fetchall()]
-        return col in cols
-    except Exception:
-        return False
+    return col in schema_cols(table)
 
 
 def _unit_is_command_on_incident_tx(c, incident_id: int, unit_id: str) -> bool:
@@ -8730,7 +8749,6 @@ def _requires_disposition_for_clear_tx(c, incident_id: int, unit_id: str) -> boo
 # ================================================================
 
 def _cli_picker_lists():
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -8789,7 +8807,6 @@ async def api_incidents_dispatchable():
 @app.get("/api/incident/{incident_id}/unit_count")
 async def api_incident_unit_count(incident_id: int):
     """Return count of units still assigned (not cleared) to this incident."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -8808,7 +8825,6 @@ async def api_clear_all_and_close(incident_id: int, request: Request):
     Clear all units with the given disposition, then close the incident.
     This is a convenience endpoint for the right-click "Close Incident" flow.
     """
-    ensure_phase3_schema()
 
     # Role check: DISPATCHER minimum to close incidents
     # NOTE: Can be elevated to SUPERVISOR when agency policy requires supervisor sign-off
@@ -8831,6 +8847,21 @@ async def api_clear_all_and_close(incident_id: int, request: Request):
 
     user = request.session.get("user", "Dispatcher")
 
+    units_cleared = await db_pool.run_db(
+        _in_unit_of_work, _clear_all_and_close_tx, incident_id, disposition, comment, user
+    )
+
+    return {
+        "ok": True,
+        "incident_id": incident_id,
+        "disposition": disposition,
+        "units_cleared": units_cleared,
+        "status": "CLOSED"
+    }
+
+
+def _clear_all_and_close_tx(incident_id: int, disposition: str, comment: str, user: str) -> int:
+    """Clear every unit and close the incident (one unit of work). Returns units cleared."""
     conn = get_conn()
     c = conn.cursor()
 
@@ -8868,8 +8899,7 @@ async def api_clear_all_and_close(incident_id: int, request: Request):
 
         # Now close the incident
         # Check if final_disposition_note column exists
-        inc_cols = [r[1] for r in c.execute("PRAGMA table_info(Incidents)").fetchall()]
-        if "final_disposition_note" in inc_cols:
+        if "final_disposition_note" in schema_cols("Incidents"):
             c.execute("""
                 UPDATE Incidents
                 SET status = 'CLOSED', final_disposition = ?, final_disposition_note = ?, closed_at = ?
@@ -8904,13 +8934,7 @@ async def api_clear_all_and_close(incident_id: int, request: Request):
     except Exception:
         pass
 
-    return {
-        "ok": True,
-        "incident_id": incident_id,
-        "disposition": disposition,
-        "units_cleared": len(units),
-        "status": "CLOSED"
-    }
+    return len(units)
 
 
 @app.post("/api/admin/cleanup_stale_units")
@@ -8919,7 +8943,6 @@ async def api_cleanup_stale_units(request: Request):
     Clear any stale unit assignments (units where the unit doesn't exist in Units table
     or units assigned to non-existent incidents).
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -8992,7 +9015,6 @@ async def api_cleanup_stale_units(request: Request):
 @app.get("/api/incident/{incident_id}/assignments")
 async def api_incident_assignments(incident_id: int, request: Request):
     """View all unit assignments for an incident (for debugging)."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -9019,7 +9041,6 @@ async def api_incident_assignments(incident_id: int, request: Request):
 @app.post("/api/incident/{incident_id}/force_clear_units")
 async def api_force_clear_units(incident_id: int, request: Request):
     """Force-clear all unit assignments for an incident (admin only)."""
-    ensure_phase3_schema()
 
     user = request.session.get("user", "Dispatcher")
     if not _is_admin(user):
@@ -9110,7 +9131,6 @@ def _resolve_incident_ref_tx(c, ref: str):
 
 @app.get("/api/incident/resolve/{ref}")
 async def api_incident_resolve(ref: str):
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     incident_id = _resolve_incident_ref_tx(c, ref)
@@ -9122,7 +9142,6 @@ async def api_incident_resolve(ref: str):
 
 @app.post("/api/cli/dispatch")
 async def api_cli_dispatch(request: Request):
-    ensure_phase3_schema()
     data = await request.json()
 
     units = data.get("units") or []
@@ -9135,6 +9154,10 @@ async def api_cli_dispatch(request: Request):
     incident_id = data.get("incident_id")
     incident_ref = (data.get("incident_ref") or data.get("incident_number") or "").strip()
 
+    return await db_pool.run_db(_in_unit_of_work, _cli_dispatch_tx, incident_id, incident_ref, units, mode)
+
+
+def _cli_dispatch_tx(incident_id, incident_ref: str, units: list, mode: str):
     conn = get_conn()
     c = conn.cursor()
 
@@ -9188,7 +9211,6 @@ async def api_cli_dispatch(request: Request):
 @app.post("/api/cli/swap")
 async def api_cli_swap(request: Request):
     """Swap incident assignments between two units."""
-    ensure_phase3_schema()
     data = await request.json()
     unit1 = (data.get("unit1") or "").strip()
     unit2 = (data.get("unit2") or "").strip()
@@ -9196,6 +9218,11 @@ async def api_cli_swap(request: Request):
         return {"ok": False, "error": "Two unit IDs required"}
 
     user = request.session.get("user", "Dispatcher")
+    # Clears and both re-dispatches commit together, off the event loop.
+    return await db_pool.run_db(_in_unit_of_work, _cli_swap_tx, unit1, unit2, user)
+
+
+def _cli_swap_tx(unit1: str, unit2: str, user: str):
     conn = get_conn()
     c = conn.cursor()
 
@@ -9242,7 +9269,6 @@ async def api_cli_swap(request: Request):
 @app.post("/api/cli/move")
 async def api_cli_move(request: Request):
     """Move a unit from its current incident to a different incident."""
-    ensure_phase3_schema()
     data = await request.json()
     unit_id = (data.get("unit_id") or "").strip()
     to_incident = int(data.get("to_incident") or 0)
@@ -9250,6 +9276,10 @@ async def api_cli_move(request: Request):
         return {"ok": False, "error": "unit_id and to_incident required"}
 
     user = request.session.get("user", "Dispatcher")
+    return await db_pool.run_db(_in_unit_of_work, _cli_move_tx, unit_id, to_incident, user)
+
+
+def _cli_move_tx(unit_id: str, to_incident: int, user: str):
     conn = get_conn()
     c = conn.cursor()
 
@@ -9293,7 +9323,6 @@ async def api_cli_note(request: Request):
 
 @app.get("/api/uaw/context/{unit_id}")
 async def uaw_context(unit_id: str):
-    ensure_phase3_schema()
     active_incident_id = _active_incident_id_for_unit(unit_id)
 
     conn = get_conn()
@@ -9335,7 +9364,6 @@ async def uaw_context(unit_id: str):
 
 @app.get("/api/uaw/dispatch_targets")
 async def uaw_dispatch_targets():
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -9358,7 +9386,6 @@ async def uaw_dispatch_targets():
 
 @app.post("/api/uaw/misc/{unit_id}")
 async def uaw_misc_status(request: Request, unit_id: str):
-    ensure_phase3_schema()
     data = await request.json()
     text = (data.get("text") or "").strip()
 
@@ -9380,7 +9407,6 @@ async def uaw_misc_status(request: Request, unit_id: str):
 
 @app.get("/api/uaw/scene_units/{incident_id}")
 async def uaw_scene_units(incident_id: int):
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -9398,7 +9424,6 @@ async def uaw_scene_units(incident_id: int):
 
 @app.post("/api/uaw/transfer_command")
 async def uaw_transfer_command(request: Request):
-    ensure_phase3_schema()
     data = await request.json()
     incident_id = int(data.get("incident_id") or 0)
     unit_id = (data.get("unit_id") or "").strip()
@@ -9448,7 +9473,6 @@ async def uaw_clear_unit(request: Request):
 
     If disposition is provided in request, it will be saved before clearing.
     """
-    ensure_phase3_schema()
     data = await request.json()
     incident_id = int(data.get("incident_id") or 0)
     unit_id = (data.get("unit_id") or "").strip()
@@ -9537,7 +9561,6 @@ async def uaw_clear_all(request: Request):
     Enforces your disposition rule by requiring the CURRENT command unit (if any) to have disposition.
     Accepts optional disposition parameter to apply to command unit (and all units if desired).
     """
-    ensure_phase3_schema()
     data = await request.json()
     incident_id = int(data.get("incident_id") or 0)
     disposition = (data.get("disposition") or "").strip().upper()
@@ -9548,6 +9571,11 @@ async def uaw_clear_all(request: Request):
 
     user = request.session.get("user", "Dispatcher")
 
+    return await db_pool.run_db(_in_unit_of_work, _uaw_clear_all_tx, incident_id, disposition, user)
+
+
+def _uaw_clear_all_tx(incident_id: int, disposition: str, user: str):
+    """Apply dispositions and clear every unit on the incident (one unit of work)."""
     conn = get_conn()
     c = conn.cursor()
 
@@ -9625,20 +9653,47 @@ async def uaw_clear_all(request: Request):
 # PANEL DATA LOADERS (FILTERED — DRAFT SAFE)
 # ================================================================
 
+def _with_age(incidents: list[dict], *fields: str) -> list[dict]:
+    """Copies of board incident rows with a fresh age (from the first set
+    field). Board sections cache the raw timestamps only: an age computed
+    in the loader would stand still until the next Incidents write."""
+    out = []
+    for i in incidents:
+        d = dict(i)
+        d["age"] = _format_age(next((d.get(f) for f in fields if d.get(f)), None))
+        out.append(d)
+    return out
+
+
 def panel_active():
+    """Active incidents with their assigned units, from the board state."""
+    return _with_age(board_state.board_section("active"), "updated", "created")
+
+
+def panel_open():
+    """Open incidents, from the board state."""
+    return _with_age(board_state.board_section("open"), "created", "updated")
+
+
+def panel_held():
+    """Held incidents, from the board state."""
+    return _with_age(board_state.board_section("held"), "created", "updated")
+
+
+def _load_panel_active():
     """
+    Board section "active".
     Fetch active incidents + their currently assigned units (tree rows).
 
     Canon (your rule):
       • ACTIVE panel shows ONLY incidents that have >= 1 uncleared unit assignment.
       • If an incident is status ACTIVE but has 0 uncleared units, it should not appear here.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
     # Detect cleared column name for UnitAssignments
-    ua_cols = {r["name"] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()}
+    ua_cols = schema_cols("UnitAssignments")
     if "cleared_at" in ua_cols:
         cleared_expr = "(ua.cleared_at IS NULL OR ua.cleared_at = '')"
         cleared_expr_plain = "(cleared_at IS NULL OR cleared_at = '')"
@@ -9667,10 +9722,9 @@ def panel_active():
 
     incidents = [dict(r) for r in (inc_rows or [])]
 
-    # Normalize issue flag and add age for templates
+    # Normalize issue flag (age is added at render time, panel_active())
     for i in incidents:
         i["issue_flag"] = int(i.get("issue_flag") or i.get("issue_found") or 0)
-        i["age"] = _format_age(i.get("updated") or i.get("created"))
         i["unit_count"] = 0  # Will be updated below
 
     if not incidents:
@@ -9685,8 +9739,7 @@ def panel_active():
     ph = ",".join(["?"] * len(ids))
 
     # commanding_unit may not exist in older DBs
-    ua_cols2 = [r["name"] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()]
-    has_cmd_col = "commanding_unit" in ua_cols2
+    has_cmd_col = "commanding_unit" in ua_cols
 
     cmd_select = "COALESCE(ua.commanding_unit,0) AS commanding_unit" if has_cmd_col else "0 AS commanding_unit"
     cmd_order  = "COALESCE(ua.commanding_unit,0) DESC," if has_cmd_col else ""
@@ -9756,8 +9809,9 @@ def panel_active():
 
 
 
-def panel_open():
+def _load_panel_open():
     """
+    Board section "open".
     Fetch open incidents.
 
     Canon (your rule):
@@ -9765,11 +9819,10 @@ def panel_open():
       • PLUS incidents that are status ACTIVE but currently have 0 uncleared assignments
         (i.e., units cleared and disposition not yet completed, so they should not float).
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
-    ua_cols = {r["name"] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()}
+    ua_cols = schema_cols("UnitAssignments")
     if "cleared_at" in ua_cols:
         cleared_expr = "(ua.cleared_at IS NULL OR ua.cleared_at = '')"
     elif "cleared" in ua_cols:
@@ -9800,19 +9853,18 @@ def panel_open():
     for r in (rows or []):
         d = dict(r)
         d["issue_flag"] = int(d.get("issue_flag") or d.get("issue_found") or 0)
-        d["age"] = _format_age(d.get("created") or d.get("updated"))
         incidents.append(d)
 
     conn.close()
     return incidents
 
 
-def panel_held():
+def _load_panel_held():
     """
+    Board section "held".
     Fetch held incidents.
     Draft-held incidents are excluded.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -9830,7 +9882,6 @@ def panel_held():
     for r in (rows or []):
         d = dict(r)
         d["issue_flag"] = int(d.get("issue_flag") or d.get("issue_found") or 0)
-        d["age"] = _format_age(d.get("created") or d.get("updated"))
         incidents.append(d)
 
     return incidents
@@ -9842,28 +9893,22 @@ def panel_held():
 # ------------------------------------------------------
 
 def get_held_count() -> int:
-    ensure_phase3_schema()
-    conn = get_conn()
-    c = conn.cursor()
-
-    row = c.execute("""
-        SELECT COUNT(*) AS n
-        FROM Incidents
-        WHERE status = 'HELD'
-          AND is_draft = 0
-    """).fetchone()
-
-    conn.close()
-    return row["n"] if row else 0
+    """Held (non-draft) incidents. Kept in memory by the panel push and
+    recounted only after a commit touches Incidents."""
+    return panel_push.held_count()
 
 
 # ------------------------------------------------------
-# HELD COUNT — API ROUTE (UI POLLING)
+# HELD COUNT — API ROUTE
+# Consoles get the count in the chat socket's "connected" payload and
+# "held_count" pushes; this serves page load and the no-socket fallback.
 # ------------------------------------------------------
 
 @app.get("/held_count", response_class=JSONResponse)
+@app.get("/api/held_count", response_class=JSONResponse)
 def api_held_count():
-    return {"count": get_held_count()}
+    """Return count of HELD incidents (for toolbar badge)."""
+    return {"ok": True, "count": get_held_count()}
 
 
 
@@ -9927,41 +9972,132 @@ def _crew_id_map_for_shift(shift_key: str | None) -> dict[str, list[str]]:
     Returns {apparatus_id: [personnel_id,...]} for the given shift key (A/B).
     Backward compatible: rows with shift NULL/'' are treated as global.
     """
-    ensure_phase3_schema()
     sk = (shift_key or "").strip().upper()
 
+    crew_map: dict[str, list[str]] = {}
+    for app_id, per_id, shift in board_state.board_section("crews"):
+        if sk in ("A", "B") and shift not in ("", sk):
+            continue
+        crew_map.setdefault(app_id, []).append(per_id)
+    return crew_map
+
+
+def _load_crews() -> list[tuple[str, str, str]]:
+    """Board section "crews": (apparatus_id, personnel_id, shift) from
+    PersonnelAssignments; shift "" is global."""
     conn = get_conn()
-    c = conn.cursor()
     try:
-        if sk in ("A", "B"):
-            rows = c.execute(
-                """
-                SELECT apparatus_id, personnel_id
-                FROM PersonnelAssignments
-                WHERE COALESCE(NULLIF(TRIM(shift), ''), ?) IN (?, ?)
-                """,
-                (sk, sk, sk),
-            ).fetchall()
-        else:
-            rows = c.execute(
-                """
-                SELECT apparatus_id, personnel_id
-                FROM PersonnelAssignments
-                """
-            ).fetchall()
-
-        crew_map: dict[str, list[str]] = {}
+        rows = conn.execute(
+            """
+            SELECT apparatus_id, personnel_id, shift
+            FROM PersonnelAssignments
+            """
+        ).fetchall()
+        out = []
         for r in (rows or []):
             app_id = (r["apparatus_id"] or "").strip()
             per_id = (r["personnel_id"] or "").strip()
             if not app_id or not per_id:
                 continue
-            crew_map.setdefault(app_id, []).append(per_id)
-        return crew_map
+            out.append((app_id, per_id, (r["shift"] or "").strip(" ")))
+        return out
+    finally:
+        conn.close()
+
+
+def _load_open_assignments() -> list[dict]:
+    """Board section "assignments": uncleared assignments with the status of
+    their incident (None when the incident row is gone)."""
+    conn = get_conn()
+    try:
+        rows = conn.execute(
+            """
+            SELECT ua.unit_id, ua.incident_id, i.status AS incident_status
+            FROM UnitAssignments ua
+            LEFT JOIN Incidents i ON i.incident_id = ua.incident_id
+            WHERE ua.cleared IS NULL
+            """
+        ).fetchall()
+        return [dict(r) for r in (rows or [])]
+    finally:
+        conn.close()
+
+
+# Board state sections (app/board): rebuilt only when their tables change
+board_state.register_board_section("units", _load_units_for_panel, ("Units",))
+board_state.register_board_section("assignments", _load_open_assignments, ("UnitAssignments", "Incidents"))
+board_state.register_board_section("overrides", _load_active_shift_overrides, ("ShiftOverrides",))
+board_state.register_board_section("roster", _load_roster_personnel, ("UnitRoster",))
+board_state.register_board_section("crews", _load_crews, ("PersonnelAssignments",))
+board_state.register_board_section("active", _load_panel_active, ("Incidents", "UnitAssignments", "Units"))
+board_state.register_board_section("open", _load_panel_open, ("Incidents", "UnitAssignments"))
+board_state.register_board_section("held", _load_panel_held, ("Incidents",))
+
+
+# ------------------------------------------------------
+# BOARD REPAIRS — run by the board reconciler (app/board/reconciler.py),
+# periodically and after Incidents commits; never on a panel read
+# ------------------------------------------------------
+
+def _reconcile_ghost_assignments() -> list[str]:
+    """Clear assignments still open on CLOSED incidents."""
+    conn = get_conn()
+    try:
+        rows = conn.execute("""
+            SELECT ua.id, ua.unit_id, ua.incident_id
+            FROM UnitAssignments ua
+            JOIN Incidents i ON i.incident_id = ua.incident_id
+            WHERE ua.cleared IS NULL
+              AND i.status = 'CLOSED'
+        """).fetchall()
+        if not rows:
+            return []
+        conn.executemany(
+            "UPDATE UnitAssignments SET cleared = ? WHERE id = ? AND cleared IS NULL",
+            [(_ts(), r["id"]) for r in rows],
+        )
+        conn.commit()
+        return [f"{r['unit_id']} on closed incident {r['incident_id']}" for r in rows]
     finally:
         conn.close()
 
 
+def _reconcile_idle_unit_status() -> list[str]:
+    """Reset units left in a busy status with nothing assigned."""
+    conn = get_conn()
+    try:
+        rows = conn.execute("""
+            SELECT unit_id, status
+            FROM Units
+            WHERE status NOT IN ('AVAILABLE', 'UNAVAILABLE', 'OOS')
+              AND unit_id NOT IN (SELECT unit_id FROM UnitAssignments WHERE cleared IS NULL)
+        """).fetchall()
+        if not rows:
+            return []
+        ts = _ts()
+        fixed = []
+        for r in rows:
+            # Re-checked in the UPDATE: a dispatch may have landed since the read
+            cur = conn.execute("""
+                UPDATE Units SET status = 'AVAILABLE', last_updated = ?
+                WHERE unit_id = ?
+                  AND status NOT IN ('AVAILABLE', 'UNAVAILABLE', 'OOS')
+                  AND unit_id NOT IN (SELECT unit_id FROM UnitAssignments WHERE cleared IS NULL)
+            """, (ts, r["unit_id"]))
+            if cur.rowcount:
+                fixed.append(f"{r['unit_id']} {r['status']} -> AVAILABLE")
+        conn.commit()
+        return fixed
+    finally:
+        conn.close()
+
+
+# Ghost assignments first: clearing them can leave units idle
+board_state.register_board_repair("ghost_assignments", _reconcile_ghost_assignments)
+board_state.register_board_repair("idle_unit_status", _reconcile_idle_unit_status)
+board_state.register_board_repair("stale_shift_overrides", _expire_stale_shift_overrides)
+
+
 def _build_units_panel_context(request: Request) -> dict:
     """
     Units panel context builder.
@@ -9990,62 +10126,21 @@ def _build_units_panel_context(request: Request) -> dict:
     shift_letter = get_session_shift_letter(request) or ""
     shift_effective = get_session_shift_effective(request) or ""
 
-    # Auto-expire shift overrides from previous shifts
-    try:
-        expire_stale_shift_overrides()
-    except Exception:
-        pass  # Don't fail panel load if cleanup fails
-
-    # Ghost assignment cleanup: clear assignments on closed incidents, reset unit status
-    try:
-        _gc = get_conn()
-        _gc_ts = _ts()
-        _gc.execute("""
-            UPDATE UnitAssignments SET cleared = ?
-            WHERE cleared IS NULL
-              AND incident_id IN (SELECT incident_id FROM Incidents WHERE status = 'CLOSED')
-        """, (_gc_ts,))
-        _gc.execute("""
-            UPDATE Units SET status = 'AVAILABLE', last_updated = ?
-            WHERE status NOT IN ('AVAILABLE', 'UNAVAILABLE', 'OOS')
-              AND unit_id NOT IN (SELECT unit_id FROM UnitAssignments WHERE cleared IS NULL)
-        """, (_gc_ts,))
-        _gc.commit()
-        _gc.close()
-    except Exception:
-        pass
+    # Read-only: ghost assignments and stale overrides are repaired by the
+    # board reconciler (see _reconcile_ghost_assignments)
+    # Board state: ordered units (categorized and sorted), coverage overrides
+    # and uncleared assignments, checked against one board_versions read
+    rows, overrides, assignments = board_state.board_sections("units", "overrides", "assignments")
 
-    ensure_phase3_schema()
-    conn = get_conn()
-    try:
-        # Use get_units_for_panel() for proper categorization and sorting
-        rows = get_units_for_panel()
+    # Units with active shift coverage for current shift
+    units_with_coverage = {r["unit_id"] for r in overrides if r["to_shift_letter"] == shift_effective}
 
-        # Get units with active shift coverage for current shift
-        coverage_rows = conn.execute(
-            """
-            SELECT unit_id
-            FROM ShiftOverrides
-            WHERE end_ts IS NULL
-              AND to_shift_letter = ?
-            """,
-            (shift_effective,)
-        ).fetchall()
-        units_with_coverage = {r["unit_id"] for r in coverage_rows}
-
-        # Get units currently dispatched to active incidents (hide from units panel)
-        dispatched_rows = conn.execute(
-            """
-            SELECT DISTINCT ua.unit_id
-            FROM UnitAssignments ua
-            JOIN Incidents i ON i.incident_id = ua.incident_id
-            WHERE ua.cleared IS NULL
-              AND i.status NOT IN ('CLOSED', 'CANCELLED', 'DISPOSED')
-            """
-        ).fetchall()
-        dispatched_unit_ids = {r["unit_id"] for r in dispatched_rows}
-    finally:
-        conn.close()
+    # Units currently dispatched to active incidents (hide from units panel)
+    dispatched_unit_ids = {
+        a["unit_id"] for a in assignments
+        if a["incident_status"] is not None
+        and a["incident_status"] not in ("CLOSED", "CANCELLED", "DISPOSED")
+    }
 
     # Command visibility (Batt chiefs shift-scoped, 1578/Car1 always)
     visible_command = visible_command_unit_ids(shift_letter, shift_effective)
@@ -10107,6 +10202,58 @@ def _build_units_panel_context(request: Request) -> dict:
 
 
 
+# ----------------------------------------------------------------
+# Versioned panels (ETag / 304)
+# Each polled panel is keyed on the board tables it renders; a poll whose
+# If-None-Match still matches costs one board_versions read (app/board/
+# fragments.py). Held call ages are rendered server-side only, so the held
+# panel also turns over every minute.
+# ----------------------------------------------------------------
+board_state.register_panel("units", ("Units", "UnitAssignments", "Incidents", "ShiftOverrides",
+                                      "UnitRoster", "PersonnelAssignments"))
+board_state.register_panel("active", ("Incidents", "UnitAssignments", "Units"))
+board_state.register_panel("open", ("Incidents", "UnitAssignments"))
+board_state.register_panel("held", ("Incidents",), age_bucket_s=60)
+board_state.register_panel("dailylog_rows", ("DailyLog", "Incidents"))
+
+
+async def _versioned_panel(request: Request, panel: str, view, render) -> Response:
+    """
+    Serve a polled panel by version: 304 when the client's ETag still
+    matches, else the cached fragment for this view and version, else
+    render() (blocking, run via run_db). `view` must hold everything from
+    the request the rendered HTML depends on.
+    """
+    etag = await db_pool.run_db(board_state.panel_etag, panel, view)
+    if etag is None:
+        return await db_pool.run_db(render)
+
+    headers = {"ETag": etag}
+    if board_state.etag_matches(request.headers.get("if-none-match"), etag):
+        board_state.panel_not_modified(panel)
+        return Response(status_code=304, headers=headers)
+
+    body = board_state.cached_panel(panel, etag)
+    if body is None:
+        response = await db_pool.run_db(render)
+        if response.status_code != 200:
+            return response
+        body = bytes(response.body)
+        board_state.store_panel(panel, etag, body)
+    return HTMLResponse(body, headers=headers)
+
+
+def _units_panel_view(request: Request) -> tuple:
+    """Session values the units panel depends on (its ETag view key)."""
+    if not session_is_initialized(request):
+        return ("LOGIN", get_session_roster_view_mode(request) or "CURRENT")
+    return (
+        get_session_shift_letter(request) or "",
+        get_session_shift_effective(request) or "",
+        get_session_roster_view_mode(request) or "CURRENT",
+    )
+
+
 @app.get("/panel/units", response_class=HTMLResponse)
 async def panel_units_display(request: Request):
     """
@@ -10114,80 +10261,74 @@ async def panel_units_display(request: Request):
     Pre-login: show "Login Required" prompt.
     Post-login: show the roster world for the selected shift.
     """
-    ctx = _build_units_panel_context(request)
-    return templates.TemplateResponse(
-        "units.html",
-        {
-            "request": request,
-            "units": ctx["units"],
-            "crew_map": ctx["crew_map"],
-            "login_required": ctx["login_required"],
-            "shift_letter": ctx["shift_letter"],
-            "shift_effective": ctx["shift_effective"],
-            "roster_view_mode": ctx["roster_view_mode"],
-        },
-    )
+    def render():
+        ctx = _build_units_panel_context(request)
+        return templates.TemplateResponse(
+            "units.html",
+            {
+                "request": request,
+                "units": ctx["units"],
+                "crew_map": ctx["crew_map"],
+                "login_required": ctx["login_required"],
+                "shift_letter": ctx["shift_letter"],
+                "shift_effective": ctx["shift_effective"],
+                "roster_view_mode": ctx["roster_view_mode"],
+            },
+        )
+
+    return await _versioned_panel(request, "units", _units_panel_view(request), render)
 
 
 
 
 @app.get("/panel/active", response_class=HTMLResponse)
 async def panel_active_display(request: Request):
-    ensure_phase3_schema()
-    return templates.TemplateResponse(
-        "active_incidents.html",
-        {
-            "request": request,
-            "incidents": panel_active() or [],
-        },
-    )
+    def render():
+        return templates.TemplateResponse(
+            "active_incidents.html",
+            {
+                "request": request,
+                "incidents": panel_active() or [],
+            },
+        )
+
+    return await _versioned_panel(request, "active", (), render)
 
 
 @app.get("/panel/open", response_class=HTMLResponse)
 async def panel_open_display(request: Request):
-    ensure_phase3_schema()
-    return templates.TemplateResponse(
-        "open_incidents.html",
-        {
-            "request": request,
-            "incidents": panel_open() or [],
-        },
-    )
+    def render():
+        return templates.TemplateResponse(
+            "open_incidents.html",
+            {
+                "request": request,
+                "incidents": panel_open() or [],
+            },
+        )
+
+    return await _versioned_panel(request, "open", (), render)
 
 
 @app.get("/panel/held", response_class=HTMLResponse)
 async def panel_held_display(request: Request):
-    ensure_phase3_schema()
-    return templates.TemplateResponse(
-        "held_incidents.html",
-        {
-            "request": request,
-            "incidents": panel_held() or [],
-        },
-    )
+    def render():
+        return templates.TemplateResponse(
+            "held_incidents.html",
+            {
+                "request": request,
+                "incidents": panel_held() or [],
+            },
+        )
+
+    return await _versioned_panel(request, "held", (), render)
 
 
 @app.get("/modals/held", response_class=HTMLResponse)
 async def modals_held(request: Request):
     """Held calls viewer (modal)."""
-    ensure_phase3_schema()
     return templates.TemplateResponse("held_incidents.html", {"request": request, "incidents": panel_held() or []})
 
 
-# ------------------------------------------------------
-# INCIDENT HOLD / UNHOLD (PHASE-3 CANONICAL)
-# ------------------------------------------------------
-
-@app.get("/api/held_count", response_class=JSONResponse)
-def api_held_count(request: Request):
-    """Return count of HELD incidents (for toolbar badge)."""
-    ensure_phase3_schema()
-    conn = get_conn()
-    c = conn.cursor()
-    row = c.execute("SELECT COUNT(1) AS n FROM Incidents WHERE status='HELD'").fetchone()
-    conn.close()
-    n = int(row['n'] if row and 'n' in row.keys() else (row[0] if row else 0))
-    return {"ok": True, "count": n}
 # ---------------------------------------------------------------------------
 # MODAL — Daily Log Viewer (Phase-3 contract)
 # Toolbar opens: /modals/dailylog
@@ -10209,7 +10350,6 @@ async def dailylog_modal(request: Request):
 @app.get("/modals/shift_coverage", response_class=HTMLResponse)
 async def shift_coverage_modal(request: Request):
     """Modal for adding temporary shift coverage (shift overrides)."""
-    ensure_phase3_schema()
 
     # Get active overrides for current shift
     shift_letter = get_session_shift_letter(request) or ""
@@ -10326,9 +10466,7 @@ async def dashboard_modal(request: Request):
 @app.get("/incident/{incident_id}/nfirs", response_class=HTMLResponse)
 async def nfirs_modal(request: Request, incident_id: int):
     """NFIRS/NERIS data entry modal for an incident."""
-    ensure_phase3_schema()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
     c = conn.cursor()
 
     c.execute("SELECT * FROM Incidents WHERE incident_id = ?", (incident_id,))
@@ -10384,8 +10522,7 @@ def get_nfirs_completeness(incident_id: int) -> dict:
     Calculate NFIRS completeness for an incident.
     Returns dict with: complete (bool), score (0-100), missing (list of field names), status (green/yellow/red)
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
     c = conn.cursor()
 
     c.execute("SELECT * FROM Incidents WHERE incident_id = ?", (incident_id,))
@@ -10476,7 +10613,6 @@ def get_nfirs_completeness(incident_id: int) -> dict:
 @app.post("/api/incident/{incident_id}/nfirs")
 async def save_nfirs_data(request: Request, incident_id: int):
     """Save NFIRS/NERIS compliance data for an incident."""
-    ensure_phase3_schema()
     body = await request.json()
 
     # Validate required fields based on incident type
@@ -10519,7 +10655,7 @@ async def save_nfirs_data(request: Request, incident_id: int):
     values.insert(-1, datetime.datetime.now(datetime.timezone.utc).isoformat())
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_conn()
         c = conn.cursor()
         c.execute(sql, values)
         conn.commit()
@@ -10540,9 +10676,7 @@ async def save_nfirs_data(request: Request, incident_id: int):
 @app.get("/api/incident/{incident_id}/nfirs/export")
 async def export_nfirs_data(request: Request, incident_id: int):
     """Export NFIRS data for a single incident as JSON."""
-    ensure_phase3_schema()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
     c = conn.cursor()
 
     c.execute("SELECT * FROM Incidents WHERE incident_id = ?", (incident_id,))
@@ -10631,12 +10765,30 @@ async def export_nfirs_csv(
       - end_date: Filter incidents to date (YYYY-MM-DD)
       - status: Filter by status (default: CLOSED)
     """
+    # Snapshot refresh, query and CSV build all block: run on a DB worker
+    csv_content = await db_pool.run_db(_nfirs_csv, start_date, end_date, status)
+
+    # Generate filename with date range
+    today = datetime.datetime.now().strftime("%Y%m%d")
+    filename = f"NFIRS_Export_{today}.csv"
+
+    from fastapi.responses import Response
+    return Response(
+        content=csv_content,
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
+
+def _nfirs_csv(start_date: str, end_date: str, status: str) -> str:
+    """NFIRS CSV text for export_nfirs_csv (blocking; call via run_db)."""
     import csv
     import io
 
-    ensure_phase3_schema()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    # Bulk export: read the reporting snapshot, not the live board DB
+    conn = db_pool.reporting_conn()
     c = conn.cursor()
 
     # Build query
@@ -10647,13 +10799,10 @@ async def export_nfirs_csv(
         where_clauses.append("status = ?")
         params.append(status.upper())
 
-    if start_date:
-        where_clauses.append("DATE(created) >= DATE(?)")
-        params.append(start_date)
-
-    if end_date:
-        where_clauses.append("DATE(created) <= DATE(?)")
-        params.append(end_date)
+    if start_date or end_date:
+        range_sql, range_params = _date_range_filter("Incidents", "created", start_date, end_date)
+        where_clauses.append(range_sql)
+        params.extend(range_params)
 
     where_sql = " AND ".join(where_clauses)
     c.execute(f"""
@@ -10716,8 +10865,7 @@ async def export_nfirs_csv(
     fdid = "FORD"
     state = "KY"
     try:
-        settings_conn = sqlite3.connect(DB_PATH)
-        settings_conn.row_factory = sqlite3.Row
+        settings_conn = get_conn()
         sc = settings_conn.cursor()
         sc.execute("SELECT key, value FROM SystemSettings WHERE key IN ('fdid', 'state')")
         settings = {r["key"]: r["value"] for r in sc.fetchall()}
@@ -10757,37 +10905,21 @@ async def export_nfirs_csv(
                 csv_row.append(val if val is not None else "")
         writer.writerow(csv_row)
 
-    # Create response
     csv_content = output.getvalue()
     output.close()
-
-    # Generate filename with date range
-    today = datetime.datetime.now().strftime("%Y%m%d")
-    filename = f"NFIRS_Export_{today}.csv"
-
-    from fastapi.responses import Response
-    return Response(
-        content=csv_content,
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
-    )
+    return csv_content
 
 
 @app.get("/api/nfirs/completeness/{incident_id}")
 async def api_nfirs_completeness(incident_id: int):
     """Get NFIRS completeness status for an incident."""
-    ensure_phase3_schema()
     return get_nfirs_completeness(incident_id)
 
 
 @app.get("/api/nfirs/stats")
 async def api_nfirs_stats():
     """Get NFIRS compliance statistics for admin dashboard."""
-    ensure_phase3_schema()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = get_conn()
     c = conn.cursor()
 
     # Total incidents with NFIRS data
@@ -10874,7 +11006,6 @@ async def panel_eventlog_rows(
     Return HTML rows for the Event Log Viewer.
     Shows DAILYLOG and REMARK entries from DailyLog table.
     """
-    ensure_phase3_schema()
 
     # Normalize filters
     category = (category or "").strip().upper()
@@ -10887,12 +11018,10 @@ async def panel_eventlog_rows(
     params: list = []
 
     # Date range filter
-    if from_date:
-        where.append("DATE(dl.timestamp) >= DATE(?)")
-        params.append(from_date)
-    if to_date:
-        where.append("DATE(dl.timestamp) <= DATE(?)")
-        params.append(to_date)
+    if from_date or to_date:
+        range_sql, range_params = _date_range_filter("DailyLog", "timestamp", from_date, to_date, alias="dl")
+        where.append(range_sql)
+        params.extend(range_params)
 
     # Category filter
     if category:
@@ -10962,7 +11091,6 @@ async def api_eventlog_add(request: Request):
     Add a new event log entry (DAILYLOG or REMARK).
     Supports issue_found flag.
     """
-    ensure_phase3_schema()
 
     try:
         data = await request.json()
@@ -11013,7 +11141,6 @@ async def api_eventlog_add(request: Request):
 @app.post("/api/eventlog/{log_id}/toggle_issue")
 async def api_eventlog_toggle_issue(log_id: int, request: Request):
     """Toggle the issue_found flag on an event log entry."""
-    ensure_phase3_schema()
 
     try:
         data = await request.json()
@@ -11049,7 +11176,6 @@ def _eventlog_fetch_rows(
     limit: int = 2000,
 ):
     """Return filtered DailyLog rows for export."""
-    ensure_phase3_schema()
 
     try:
         limit = int(limit)
@@ -11239,7 +11365,6 @@ def api_eventlog_export_pdf(
 @app.post("/incident/{incident_id}/hold")
 async def api_hold_incident(incident_id: int, request: Request):
     """Hold an incident (requires free-text reason). Persists held_reason for audit."""
-    ensure_phase3_schema()
 
     data = {}
     try:
@@ -11301,7 +11426,6 @@ async def api_hold_incident_v2(incident_id: int, request: Request):
 @app.post("/incident/{incident_id}/unhold")
 async def api_unhold_incident(incident_id: int, request: Request):
     """Unhold an incident. Restores to OPEN. held_reason remains for audit."""
-    ensure_phase3_schema()
 
     user = request.session.get("user", "Dispatcher")
     ts = _ts()
@@ -11478,8 +11602,6 @@ def require_role(request, min_role: str) -> bool:
 
 @app.get("/admin/run_numbers", response_class=JSONResponse)
 def admin_run_numbers(user: str = "DISPATCH"):
-    ensure_phase3_schema()
-
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
 
@@ -11506,8 +11628,6 @@ def admin_set_next(
     next_seq: int = Body(...),
     user: str = "DISPATCH"
 ):
-    ensure_phase3_schema()
-
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
 
@@ -11553,8 +11673,6 @@ def admin_set_next(
 
 @app.get("/admin/drafts", response_class=JSONResponse)
 def admin_list_drafts(user: str = "DISPATCH"):
-    ensure_phase3_schema()
-
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
 
@@ -11581,8 +11699,6 @@ def admin_delete_draft(
     incident_id: int,
     user: str = "DISPATCH"
 ):
-    ensure_phase3_schema()
-
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
 
@@ -11627,8 +11743,6 @@ def admin_delete_draft(
 
 @app.get("/admin/drafts_page", response_class=HTMLResponse)
 def admin_drafts_page(request: Request, user: str = "DISPATCH"):
-    ensure_phase3_schema()
-
     if not _is_admin(user):
         return HTMLResponse("Admin only", status_code=403)
 
@@ -11682,7 +11796,6 @@ def _archive_to_csv(filename: str, headers: list, rows: list) -> str:
 @app.get("/admin/stats", response_class=JSONResponse)
 def admin_stats(user: str = "DISPATCH"):
     """Get comprehensive system statistics."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -11758,7 +11871,6 @@ def admin_stats(user: str = "DISPATCH"):
 @app.get("/api/response_plans")
 def get_response_plans():
     """Get all response plans."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     rows = c.execute("""
@@ -11774,7 +11886,6 @@ def get_response_plans():
 @app.get("/api/response_plans/{plan_id}")
 def get_response_plan(plan_id: int):
     """Get a single response plan by ID."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     row = c.execute("SELECT * FROM ResponsePlans WHERE id = ?", (plan_id,)).fetchone()
@@ -11787,7 +11898,6 @@ def get_response_plan(plan_id: int):
 @app.post("/api/response_plans")
 async def create_response_plan(request: Request):
     """Create a new response plan."""
-    ensure_phase3_schema()
     body = await request.json()
 
     name = body.get("name", "").strip()
@@ -11826,7 +11936,6 @@ async def create_response_plan(request: Request):
 @app.put("/api/response_plans/{plan_id}")
 async def update_response_plan(request: Request, plan_id: int):
     """Update an existing response plan."""
-    ensure_phase3_schema()
     body = await request.json()
 
     updates = []
@@ -11864,7 +11973,6 @@ async def update_response_plan(request: Request, plan_id: int):
 @app.delete("/api/response_plans/{plan_id}")
 async def delete_response_plan(request: Request, plan_id: int):
     """Delete a response plan."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     c.execute("DELETE FROM ResponsePlans WHERE id = ?", (plan_id,))
@@ -11883,7 +11991,6 @@ def recommend_units(incident_type: str, alarm_level: int = 1, time_of_day: str =
     Get recommended units for a given incident type.
     Returns units from matching response plans, filtered by availability.
     """
-    ensure_phase3_schema()
     incident_type = incident_type.upper().strip()
 
     # Determine time of day if not specified
@@ -11971,20 +12078,13 @@ async def analytics_page(request: Request):
     )
 
 
-@app.get("/api/analytics")
-async def get_analytics(
+def _analytics_data(
     period: str = "week",
     from_date: str = None,
     to_date: str = None,
     type: str = None,
     shift: str = None
 ):
-    """
-    Get analytics data for the dashboard.
-    Period: today, week, month, year, custom
-    Filters: type (incident type), shift (A/B/C by hour)
-    """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -12005,6 +12105,17 @@ async def get_analytics(
 
     end_date = to_date + "T23:59:59" if to_date else now.isoformat()
 
+    # Index range on the created_epoch shadow; the upper bound is exclusive,
+    # so to_date covers its whole day. (Comparing the stored
+    # 'YYYY-MM-DD HH:MM:SS' text against 'T'-separated bounds dropped the
+    # first day of every range.)
+    try:
+        range_end = db_pool.day_bounds(None, to_date)[1] if to_date else None
+        created_sql, created_params = db_pool.time_range_sql("Incidents", "created", start_date, range_end)
+        i_created_sql, _ = db_pool.time_range_sql("Incidents", "created", start_date, range_end, alias="i")
+    except ValueError:
+        created_sql, i_created_sql, created_params = "0", "0", []
+
     # Build optional WHERE clauses for type and shift filters
     type_filter = ""
     type_params = []
@@ -12021,8 +12132,8 @@ async def get_analytics(
     elif shift == "C":
         shift_filter = " AND (CAST(substr(created, 12, 2) AS INTEGER) >= 23 OR CAST(substr(created, 12, 2) AS INTEGER) < 7)"
 
-    base_where = "incident_number IS NOT NULL AND created >= ? AND created <= ?" + type_filter + shift_filter
-    base_params = [start_date, end_date] + type_params
+    base_where = f"incident_number IS NOT NULL AND {created_sql}" + type_filter + shift_filter
+    base_params = created_params + type_params
 
     # Total incidents
     total_row = c.execute(f"""
@@ -12084,21 +12195,23 @@ async def get_analytics(
 
     timeline_data = [r["count"] for r in timeline_rows]
 
-    # Response times calculation
+    # Response times calculation. CROSS JOIN pins Incidents as the outer
+    # loop so the created_epoch range drives the join (SQLite would
+    # otherwise scan every assignment ever made).
     rt_type_filter = " AND i.type = ?" if type else ""
     rt_type_params = [type] if type else []
     response_times = []
     rt_rows = c.execute(f"""
         SELECT ua.dispatched, ua.enroute, ua.arrived,
                i.type
-        FROM UnitAssignments ua
-        JOIN Incidents i ON ua.incident_id = i.incident_id
+        FROM Incidents i
+        CROSS JOIN UnitAssignments ua ON ua.incident_id = i.incident_id
         WHERE i.incident_number IS NOT NULL
-          AND i.created >= ? AND i.created <= ?
+          AND {i_created_sql}
           AND ua.dispatched IS NOT NULL
           AND ua.arrived IS NOT NULL
           {rt_type_filter}{shift_filter.replace('created', 'i.created') if shift_filter else ''}
-    """, [start_date, end_date] + rt_type_params).fetchall()
+    """, created_params + rt_type_params).fetchall()
 
     for r in rt_rows:
         try:
@@ -12180,24 +12293,24 @@ async def get_analytics(
     response_by_type_list.sort(key=lambda x: x["count"], reverse=True)
 
     # Unit utilization (runs per unit)
-    unit_rows = c.execute("""
+    unit_rows = c.execute(f"""
         SELECT ua.unit_id, COUNT(*) as runs
-        FROM UnitAssignments ua
-        JOIN Incidents i ON ua.incident_id = i.incident_id
+        FROM Incidents i
+        CROSS JOIN UnitAssignments ua ON ua.incident_id = i.incident_id
         WHERE i.incident_number IS NOT NULL
-          AND i.created >= ? AND i.created <= ?
+          AND {i_created_sql}
         GROUP BY ua.unit_id
         ORDER BY runs DESC
         LIMIT 15
-    """, (start_date, end_date)).fetchall()
+    """, created_params).fetchall()
 
     unit_labels = [r["unit_id"] for r in unit_rows]
     unit_data = [r["runs"] for r in unit_rows]
 
     # Incidents by shift (based on hour: A=07-15, B=15-23, C=23-07)
     # Use base_params but without shift filter for shift breakdown
-    shift_base_where = "incident_number IS NOT NULL AND created >= ? AND created <= ?" + type_filter
-    shift_base_params = [start_date, end_date] + type_params
+    shift_base_where = f"incident_number IS NOT NULL AND {created_sql}" + type_filter
+    shift_base_params = created_params + type_params
     shift_counts = {"A": 0, "B": 0, "C": 0}
     shift_rows = c.execute(f"""
         SELECT substr(created, 12, 2) as hour, COUNT(*) as count
@@ -12255,6 +12368,22 @@ async def get_analytics(
     }
 
 
+@app.get("/api/analytics")
+async def get_analytics(
+    period: str = "week",
+    from_date: str = None,
+    to_date: str = None,
+    type: str = None,
+    shift: str = None
+):
+    """
+    Get analytics data for the dashboard.
+    Period: today, week, month, year, custom
+    Filters: type (incident type), shift (A/B/C by hour)
+    """
+    return await db_pool.run_db(_analytics_data, period, from_date, to_date, type, shift)
+
+
 # ------------------------------------------------------
 # MOBILE MDT INTERFACE
 # ------------------------------------------------------
@@ -12265,7 +12394,6 @@ async def mobile_mdt(request: Request, unit_id: str):
     Mobile Data Terminal interface for apparatus tablets.
     Touch-optimized view for a single unit's dispatch operations.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -12328,7 +12456,6 @@ async def mobile_status_check(unit_id: str):
     Quick status check for mobile MDT auto-refresh.
     Returns whether the page needs to refresh (new dispatch, status change).
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -12355,7 +12482,6 @@ async def mobile_status_check(unit_id: str):
 @app.get("/mobile", response_class=HTMLResponse)
 async def mobile_unit_select(request: Request):
     """Mobile unit selection page."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -12417,7 +12543,6 @@ async def mobile_unit_select(request: Request):
 @app.get("/admin/export/incidents", response_class=JSONResponse)
 def admin_export_incidents(user: str = "DISPATCH"):
     """Export all incidents to CSV and return the file path."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -12457,7 +12582,6 @@ def admin_export_incidents(user: str = "DISPATCH"):
 @app.get("/admin/export/logs", response_class=JSONResponse)
 def admin_export_logs(user: str = "DISPATCH", log_type: str = "masterlog"):
     """Export MasterLog or DailyLog to CSV."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -12501,7 +12625,6 @@ def admin_export_logs(user: str = "DISPATCH", log_type: str = "masterlog"):
 @app.get("/api/admin/logs", response_class=JSONResponse)
 def api_admin_logs(user: str = "DISPATCH", limit: int = 50):
     """Fetch recent admin-related MasterLog entries."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -12522,6 +12645,42 @@ def api_admin_logs(user: str = "DISPATCH", limit: int = 50):
     return {"ok": True, "entries": [dict(r) for r in rows]}
 
 
+# ------------------------------------------------------
+# ADMIN — DATABASE MAINTENANCE
+# ------------------------------------------------------
+
+@app.get("/api/admin/db/maintenance", response_class=JSONResponse)
+def api_admin_db_maintenance(user: str = "DISPATCH"):
+    """Maintenance job status: last run, duration and result per job."""
+
+    if not _is_admin(user):
+        return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
+
+    return {"ok": True, **db_pool.maintenance_stats(), "backups": db_pool.list_backups()}
+
+
+@app.post("/api/admin/db/maintenance/{job}", response_class=JSONResponse)
+def api_admin_db_maintenance_run(job: str, user: str = "DISPATCH"):
+    """Run one maintenance job now (backup, wal_checkpoint, incremental_vacuum,
+    optimize, quick_check, archive, vacuum). `vacuum` blocks writers while
+    it runs — use it once, off-peak, to enable incremental vacuum."""
+
+    if not _is_admin(user):
+        return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
+
+    try:
+        result = db_pool.run_maintenance(job)
+    except KeyError as e:
+        return JSONResponse(status_code=404, content={"ok": False, "error": str(e.args[0])})
+
+    masterlog(
+        action="ADMIN_DB_MAINTENANCE",
+        user=user,
+        details=f"{job}: {'ok' if result.get('ok') else result.get('error', 'failed')}"
+    )
+    return result
+
+
 # ------------------------------------------------------
 # ADMIN — RESET RUN NUMBERS
 # ------------------------------------------------------
@@ -12533,7 +12692,6 @@ def admin_reset_run_numbers(
     force: bool = Body(False, embed=True)
 ):
     """Reset run number counter to 1 for current year."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -12590,7 +12748,6 @@ def admin_reset_units(
     confirm: bool = Body(False, embed=True)
 ):
     """Reset all units to AVAILABLE status."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -12640,7 +12797,6 @@ def admin_reset_logs(
     keep_days: int = Body(0, embed=True)
 ):
     """Archive then clear MasterLog and DailyLog entries."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -12706,6 +12862,8 @@ def admin_reset_logs(
 
     conn.commit()
     conn.close()
+    # Return the freed pages to the filesystem (app/db/maintenance.py)
+    db_pool.request_maintenance("incremental_vacuum")
 
     return {
         "ok": True,
@@ -12726,7 +12884,6 @@ def admin_reset_closed(
     confirm: bool = Body(False, embed=True)
 ):
     """Archive then clear only closed incidents."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -12779,6 +12936,7 @@ def admin_reset_closed(
 
     conn.commit()
     conn.close()
+    db_pool.request_maintenance("incremental_vacuum")
 
     return {"ok": True, "count": len(incidents), "file": filepath}
 
@@ -12793,7 +12951,6 @@ def admin_reset_incidents(
     confirm: str = Body("", embed=True)
 ):
     """Archive then clear ALL incidents. Requires confirm='DELETE ALL'"""
-    ensure_phase3_schema()
 
     if not _is_super_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Super-admin access required to delete all incidents"})
@@ -12835,6 +12992,7 @@ def admin_reset_incidents(
 
     conn.commit()
     conn.close()
+    db_pool.request_maintenance("incremental_vacuum")
 
     return {"ok": True, "count": len(incidents), "file": filepath}
 
@@ -12849,7 +13007,6 @@ def admin_reset_full(
     confirm: str = Body("", embed=True)
 ):
     """Full system reset: archive everything, clear all data, reset run numbers. Requires confirm='RESET'"""
-    ensure_phase3_schema()
 
     if not _is_super_admin(user):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Super-admin access required for full system reset"})
@@ -12934,6 +13091,8 @@ def admin_reset_full(
 
     conn.commit()
     conn.close()
+    db_pool.invalidate_schema(DB_PATH)
+    db_pool.request_maintenance("incremental_vacuum")
 
     return {
         "ok": True,
@@ -12953,7 +13112,6 @@ def admin_reset_full(
 @app.get("/api/admin/units", response_class=JSONResponse)
 def api_admin_units_list(user: str = "DISPATCH"):
     """List all units for admin management."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse({"ok": False, "error": "Admin access required"}, status_code=403)
@@ -12981,7 +13139,6 @@ def api_admin_units_list(user: str = "DISPATCH"):
 @app.post("/api/admin/units/add", response_class=JSONResponse)
 async def api_admin_units_add(request: Request, user: str = "DISPATCH"):
     """Add a new unit."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse({"ok": False, "error": "Admin access required"}, status_code=403)
@@ -13032,7 +13189,6 @@ async def api_admin_units_add(request: Request, user: str = "DISPATCH"):
 @app.post("/api/admin/units/update/{unit_id}", response_class=JSONResponse)
 async def api_admin_units_update(request: Request, unit_id: str, user: str = "DISPATCH"):
     """Update an existing unit."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse({"ok": False, "error": "Admin access required"}, status_code=403)
@@ -13099,7 +13255,6 @@ async def api_admin_units_update(request: Request, unit_id: str, user: str = "DI
 @app.post("/api/admin/units/delete/{unit_id}", response_class=JSONResponse)
 def api_admin_units_delete(unit_id: str, user: str = "DISPATCH"):
     """Delete a unit."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse({"ok": False, "error": "Admin access required"}, status_code=403)
@@ -13124,7 +13279,6 @@ def api_admin_units_delete(unit_id: str, user: str = "DISPATCH"):
 @app.post("/api/admin/units/reorder", response_class=JSONResponse)
 async def api_admin_units_reorder(request: Request, user: str = "DISPATCH"):
     """Reorder units by setting their display_order values."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse({"ok": False, "error": "Admin access required"}, status_code=403)
@@ -13164,7 +13318,6 @@ async def api_admin_units_reorder(request: Request, user: str = "DISPATCH"):
 @app.post("/api/admin/users/{unit_id}/role")
 async def set_user_role(request: Request, unit_id: str):
     """Change a user's role. ADMIN only."""
-    ensure_phase3_schema()
     user = request.session.get("user", "")
     if not require_role(request, "ADMIN"):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
@@ -13201,7 +13354,6 @@ async def set_user_role(request: Request, unit_id: str):
 @app.get("/api/admin/users/roles")
 async def list_user_roles(request: Request):
     """List all user accounts with their roles. ADMIN only."""
-    ensure_phase3_schema()
     if not require_role(request, "ADMIN"):
         return JSONResponse(status_code=403, content={"ok": False, "error": "Admin only"})
     conn = get_conn()
@@ -13232,7 +13384,6 @@ async def list_user_roles(request: Request):
 @app.get("/api/admin/settings", response_class=JSONResponse)
 def api_admin_settings_list(user: str = "DISPATCH"):
     """Get all system settings."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse({"ok": False, "error": "Admin access required"}, status_code=403)
@@ -13251,7 +13402,6 @@ def api_admin_settings_list(user: str = "DISPATCH"):
 @app.post("/api/admin/settings", response_class=JSONResponse)
 async def api_admin_settings_save(request: Request, user: str = "DISPATCH"):
     """Save a system setting. Super-admin required for system settings."""
-    ensure_phase3_schema()
 
     if not _is_admin(user):
         return JSONResponse({"ok": False, "error": "Admin access required"}, status_code=403)
@@ -13329,7 +13479,6 @@ def api_admin_icons_list():
 @app.get("/admin", response_class=HTMLResponse)
 def admin_dashboard_page(request: Request, user: str = "DISPATCH"):
     """Admin dashboard HTML page."""
-    ensure_phase3_schema()
 
     permission_level = _get_user_permission_level(user)
     if permission_level == "user":
@@ -13365,13 +13514,35 @@ def settings_page(request: Request, user: str = "DISPATCH"):
 
 
 # ================================================================
-# STARTUP EVENT (KEEP THIS - DON'T MODIFY)
+# STARTUP / SHUTDOWN
 # ================================================================
+# Order matters. Startup: schema and migrations first, then the DB
+# workers (audit writer, leases, maintenance), the event bridge and bus,
+# panel push, reporting, the Units sync, and last the in-memory board
+# and its reconciler (they read the synced tables). Shutdown stops the
+# producers (panel push, bridge, bus, reconciler, maintenance, leases,
+# playbooks) before the audit writer drains, then the executor and pool.
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database schema on application startup."""
-    ensure_phase3_schema()
+    """Migrate the schema, start the DB workers and messaging, and build the
+    in-memory board."""
+    ensure_phase3_schema()
+    db_pool.start_audit_writer()
+    db_pool.start_leases()
+    db_pool.start_maintenance()
+    event_bridge.start_event_bridge()
+    event_bus.start_event_bus()
+    panel_push.start_panel_push()
+
+    # Reporting reads its tables (config, templates) only after migrations
+    try:
+        from app.reporting import start_reporting
+        start_reporting()
+    except ImportError as e:
+        print(f"[STARTUP] Reports v2 module not available: {e}")
+    except Exception as e:
+        print(f"[STARTUP] Reports v2 startup failed: {e}")
 
     # Populate/refresh Units table from UnitLog.txt at startup (safe: does not overwrite status)
     try:
@@ -13379,20 +13550,43 @@ async def startup_event():
     except Exception as e:
         print(f"[STARTUP] sync_units_table() failed: {e}")
 
-    # Start scheduled incident checker (runs every 30s)
+    # Build the in-memory board (panels and pickers read from it) and start
+    # the reconciler that repairs it
+    board_state.load_board_state()
+    board_state.start_board_reconciler()
+
+    # Start scheduled incident checker (runs every 30s, in the lease holder only)
     import threading
     def _scheduled_check_loop():
         import time as _time
         while True:
             _time.sleep(30)
             try:
-                _check_scheduled_incidents()
+                if db_pool.is_leader("scheduled_incidents"):
+                    _check_scheduled_incidents()
             except Exception:
                 pass
     t = threading.Thread(target=_scheduled_check_loop, daemon=True)
     t.start()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Commit queued audit rows, stop DB workers and close pooled connections
+    so the WAL is checkpointed on exit."""
+    panel_push.stop_panel_push()
+    await event_bridge.stop_event_bridge()
+    event_bus.stop_event_bus()
+    board_state.stop_board_reconciler()
+    db_pool.stop_maintenance()
+    db_pool.stop_leases()
+    # Playbook actions queue audit rows: stop them before the writer
+    stop_playbook_worker()
+    db_pool.stop_audit_writer()
+    db_pool.shutdown_executor()
+    db_pool.close_all()
+
+
 # ================================================================
 # ERROR HANDLERS
 # ================================================================
@@ -13439,10 +13633,7 @@ async def health_check():
         "schema_initialized": _SCHEMA_INIT_DONE
     }
 
-@app.get("/api/health")
-async def api_health():
-    """Detailed health check: DB connectivity, table count, uptime, active incidents, units, memory."""
-    ensure_phase3_schema()
+def _api_health_data():
     conn = get_conn()
     try:
         # DB connectivity
@@ -13499,6 +13690,37 @@ async def api_health():
     finally:
         conn.close()
 
+
+@app.get("/api/health")
+async def api_health():
+    """Detailed health check: DB connectivity, table count, uptime, active incidents, units, memory."""
+    data = await db_pool.run_db(_api_health_data)
+    data["db_executor"] = db_pool.executor_stats()
+    data["audit_writer"] = db_pool.audit_stats()
+    data["reporting_snapshot"] = db_pool.snapshot_stats()
+    data["archive"] = db_pool.archive_stats()
+    data["maintenance"] = db_pool.maintenance_stats()
+    data["leases"] = db_pool.lease_stats()
+    data["write_locks"] = db_pool.lock_stats(top=5, detail=False)
+    data["panel_push"] = panel_push.panel_push_stats()
+    data["board_state"] = board_state.board_state_stats()
+    data["board_reconciler"] = board_state.reconciler_stats()
+    data["panel_cache"] = board_state.panel_cache_stats()
+    data["event_bridge"] = event_bridge.event_bridge_stats()
+    data["websocket"] = get_broadcaster().stats()
+    data["sse"] = get_sse_manager().stats()
+    data["event_bus"] = event_bus.event_bus_stats()
+    data["event_replay"] = replay_stats()
+    return data
+
+
+@app.get("/api/health/locks")
+async def api_health_locks(top: int = 20):
+    """Write-lock contention: wait / hold / retry totals per endpoint and
+    call site, with a rolling per-minute histogram."""
+    return {"ok": True, **db_pool.lock_stats(top=top)}
+
+
 @app.get("/api/ping")
 async def api_ping():
     """Lightweight ping for connection status indicator."""
@@ -13508,15 +13730,13 @@ async def api_ping():
 # GLOBAL QUICK-SEARCH
 # ================================================================
 
-@app.get("/api/search")
-async def api_global_search(q: str = ""):
-    """Search across incidents, units, contacts, and history."""
-    ensure_phase3_schema()
+def _global_search(q: str = ""):
     q = q.strip()
     if len(q) < 2:
         return {"ok": True, "incidents": [], "units": [], "contacts": [], "history": []}
 
-    conn = get_conn()
+    # History results include archived (cold-storage) incidents
+    conn = db_pool.archive_conn()
     try:
         like = f"%{q}%"
 
@@ -13604,6 +13824,12 @@ async def api_global_search(q: str = ""):
     finally:
         conn.close()
 
+
+@app.get("/api/search")
+async def api_global_search(q: str = ""):
+    """Search across incidents, units, contacts, and history."""
+    return await db_pool.run_db(_global_search, q)
+
 @app.get("/modals/search", response_class=HTMLResponse)
 async def search_modal(request: Request):
     """Global quick-search modal."""
@@ -13619,7 +13845,6 @@ async def search_modal(request: Request):
 @app.get("/api/roster")
 async def api_roster_list():
     """List all personnel from UnitRoster + PersonnelAssignments, with display_name/headshot."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         # Get unit roster entries with display names
@@ -13681,7 +13906,6 @@ async def api_roster_list():
 @app.post("/api/roster")
 async def api_roster_add(request: Request):
     """Add personnel to an apparatus."""
-    ensure_phase3_schema()
     data = await request.json()
     apparatus_id = str(data.get("apparatus_id", "")).strip()
     personnel_id = str(data.get("personnel_id", "")).strip()
@@ -13706,7 +13930,6 @@ async def api_roster_add(request: Request):
 @app.put("/api/roster/{apparatus_id}/{personnel_id}")
 async def api_roster_update(apparatus_id: str, personnel_id: str, request: Request):
     """Update a personnel assignment."""
-    ensure_phase3_schema()
     data = await request.json()
     conn = get_conn()
     try:
@@ -13745,7 +13968,6 @@ async def api_roster_update(apparatus_id: str, personnel_id: str, request: Reque
 @app.delete("/api/roster/{apparatus_id}/{personnel_id}")
 async def api_roster_delete(apparatus_id: str, personnel_id: str):
     """Remove a personnel assignment."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         conn.execute(
@@ -13828,8 +14050,6 @@ async def api_unit_status(request: Request, unit_id: str, status: str):
       • Apparatus status mirrors to assigned personnel automatically.
     """
     try:
-        ensure_phase3_schema()
-
         # Role check: DISPATCHER minimum to change unit status
         if not require_role(request, "DISPATCHER"):
             return JSONResponse(status_code=403, content={"ok": False, "error": "Insufficient role: DISPATCHER required"})
@@ -13881,7 +14101,7 @@ async def api_unit_status(request: Request, unit_id: str, status: str):
         incident_id = int(active["incident_id"]) if active else 0
 
         # Column-safe stamping
-        ua_cols = {r["name"] for r in c.execute("PRAGMA table_info(UnitAssignments)").fetchall()}
+        ua_cols = schema_cols("UnitAssignments")
         field_map = {
             "DISPATCHED": "dispatched",
             "ENROUTE": "enroute",
@@ -13903,8 +14123,7 @@ async def api_unit_status(request: Request, unit_id: str, status: str):
             conn3 = get_conn()
             c3 = conn3.cursor()
             ts_now = _ts()
-            inc_cols2 = {r["name"] for r in c3.execute("PRAGMA table_info(Incidents)").fetchall()}
-            if "first_unit_arrived" in inc_cols2:
+            if "first_unit_arrived" in schema_cols("Incidents"):
                 existing = c3.execute(
                     "SELECT first_unit_arrived FROM Incidents WHERE incident_id = ?",
                     (incident_id,)
@@ -14163,7 +14382,6 @@ async def api_unit_ids():
     Return the canonical list of known unit IDs from the Units table.
     Front-end can use this to validate unit commands safely.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     rows = c.execute("SELECT unit_id FROM Units ORDER BY unit_id").fetchall()
@@ -14179,7 +14397,6 @@ async def api_unit_aliases():
     Returns: { "alias1": "UNIT_ID", "alias2": "UNIT_ID", ... }
     Also includes unit_id itself as an alias (case-insensitive).
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
     rows = c.execute("SELECT unit_id, aliases FROM Units").fetchall()
@@ -14211,7 +14428,6 @@ async def api_unit_aliases():
 @app.get("/api/crew/{apparatus_id}")
 async def api_crew_get(apparatus_id: str):
     """Return assigned personnel IDs for a given apparatus/command unit."""
-    ensure_phase3_schema()
     apparatus_id = str(apparatus_id or "").strip()
     if not apparatus_id:
         return {"ok": False, "error": "apparatus_id is required"}
@@ -14241,7 +14457,6 @@ async def api_crew_get(apparatus_id: str):
 @app.get("/api/contacts")
 async def api_contacts_list(department_id: int | None = None, shift: str | None = None):
     """List all contacts, optionally filtered by department and shift."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         sql = """
@@ -14273,7 +14488,6 @@ async def api_contacts_list(department_id: int | None = None, shift: str | None
 @app.get("/api/contacts/{contact_id}")
 async def api_contact_get(contact_id: int):
     """Get a single contact."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         row = conn.execute(
@@ -14289,7 +14503,6 @@ async def api_contact_get(contact_id: int):
 @app.post("/api/contacts")
 async def api_contact_create(request: Request):
     """Create a new contact."""
-    ensure_phase3_schema()
     data = await request.json()
 
     unit_id = str(data.get("unit_id", "")).strip() or None
@@ -14333,7 +14546,6 @@ async def api_contact_create(request: Request):
 @app.put("/api/contacts/{contact_id}")
 async def api_contact_update(contact_id: int, request: Request):
     """Update a contact."""
-    ensure_phase3_schema()
     data = await request.json()
 
     conn = get_conn()
@@ -14389,7 +14601,6 @@ async def api_contact_update(contact_id: int, request: Request):
 @app.delete("/api/contacts/{contact_id}")
 async def api_contact_delete(contact_id: int):
     """Delete a contact."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         conn.execute("DELETE FROM Contacts WHERE contact_id=?", (contact_id,))
@@ -14404,7 +14615,6 @@ async def api_contact_delete(contact_id: int):
 @app.get("/api/contacts/departments")
 async def api_contact_departments_list():
     """List all contact departments."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         rows = conn.execute("SELECT * FROM ContactDepartments WHERE is_active=1 ORDER BY display_order, name").fetchall()
@@ -14416,7 +14626,6 @@ async def api_contact_departments_list():
 @app.post("/api/contacts/departments")
 async def api_contact_department_create(request: Request):
     """Create a contact department (admin)."""
-    ensure_phase3_schema()
     data = await request.json()
     name = str(data.get("name", "")).strip()
     if not name:
@@ -14438,7 +14647,6 @@ async def api_contact_department_create(request: Request):
 @app.put("/api/contacts/departments/{dept_id}")
 async def api_contact_department_update(dept_id: int, request: Request):
     """Update a contact department (admin)."""
-    ensure_phase3_schema()
     data = await request.json()
     conn = get_conn()
     try:
@@ -14461,7 +14669,6 @@ async def api_contact_department_update(dept_id: int, request: Request):
 @app.delete("/api/contacts/departments/{dept_id}")
 async def api_contact_department_delete(dept_id: int):
     """Delete (deactivate) a contact department."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         conn.execute("UPDATE ContactDepartments SET is_active=0 WHERE id=?", (dept_id,))
@@ -14474,7 +14681,6 @@ async def api_contact_department_delete(dept_id: int):
 @app.get("/api/contacts/{contact_id}/card")
 async def api_contact_card(contact_id: int):
     """Full contact card with all fields including department info."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         row = conn.execute("""
@@ -14502,7 +14708,6 @@ async def api_contact_card(contact_id: int):
 @app.post("/api/contacts/{contact_id}/send")
 async def api_contact_send(contact_id: int, request: Request):
     """Send message via email/sms/signal/webex."""
-    ensure_phase3_schema()
     data = await request.json()
     message = str(data.get("message", "")).strip()
     channel = str(data.get("channel", "email")).strip().lower()
@@ -14539,7 +14744,6 @@ async def api_contact_send(contact_id: int, request: Request):
 @app.post("/api/contacts/{contact_id}/message")
 async def api_contact_send_message(contact_id: int, request: Request):
     """Send a message to a contact via their preferred channel."""
-    ensure_phase3_schema()
     data = await request.json()
     message = str(data.get("message", "")).strip()
     channel = str(data.get("channel", "email")).strip().lower()  # email, sms, signal
@@ -14589,7 +14793,6 @@ async def api_contact_send_message(contact_id: int, request: Request):
 @app.get("/modals/employee_profile", response_class=HTMLResponse)
 async def employee_profile_modal(request: Request, unit_id: str = ""):
     """Render the employee profile modal."""
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not unit_id:
@@ -14619,7 +14822,6 @@ async def api_employee_photo_upload(unit_id: str, request: Request):
         return {"ok": False, "error": "No photo uploaded"}
 
     # Resolve the slug for this unit
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         row = conn.execute("SELECT display_name FROM UserAccounts WHERE UPPER(unit_id)=UPPER(?)", (unit_id,)).fetchone()
@@ -14689,7 +14891,6 @@ async def api_me(request: Request):
 @app.get("/api/employees/{unit_id}")
 async def api_employee_get(unit_id: str, request: Request):
     """Get full employee profile (joins UserAccounts + EmployeeProfiles + headshot + assignment + shift)."""
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not user:
@@ -14781,7 +14982,6 @@ async def api_employee_activity(unit_id: str, request: Request):
 @app.post("/api/employees/{unit_id}")
 async def api_employee_upsert(unit_id: str, request: Request):
     """Create or update employee profile (upsert)."""
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14833,7 +15033,6 @@ async def api_employee_upsert(unit_id: str, request: Request):
 
 @app.get("/api/employees/{unit_id}/emergency_contacts")
 async def api_emergency_contacts_list(unit_id: str, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14849,7 +15048,6 @@ async def api_emergency_contacts_list(unit_id: str, request: Request):
 
 @app.post("/api/employees/{unit_id}/emergency_contacts")
 async def api_emergency_contact_add(unit_id: str, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14872,7 +15070,6 @@ async def api_emergency_contact_add(unit_id: str, request: Request):
 
 @app.put("/api/employees/{unit_id}/emergency_contacts/{contact_id}")
 async def api_emergency_contact_update(unit_id: str, contact_id: int, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14895,7 +15092,6 @@ async def api_emergency_contact_update(unit_id: str, contact_id: int, request: R
 
 @app.delete("/api/employees/{unit_id}/emergency_contacts/{contact_id}")
 async def api_emergency_contact_delete(unit_id: str, contact_id: int, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14914,7 +15110,6 @@ async def api_emergency_contact_delete(unit_id: str, contact_id: int, request: R
 
 @app.get("/api/employees/{unit_id}/certifications")
 async def api_certifications_list(unit_id: str, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14930,7 +15125,6 @@ async def api_certifications_list(unit_id: str, request: Request):
 
 @app.post("/api/employees/{unit_id}/certifications")
 async def api_certification_add(unit_id: str, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14955,7 +15149,6 @@ async def api_certification_add(unit_id: str, request: Request):
 
 @app.put("/api/employees/{unit_id}/certifications/{cert_id}")
 async def api_certification_update(unit_id: str, cert_id: int, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -14980,7 +15173,6 @@ async def api_certification_update(unit_id: str, cert_id: int, request: Request)
 
 @app.delete("/api/employees/{unit_id}/certifications/{cert_id}")
 async def api_certification_delete(unit_id: str, cert_id: int, request: Request):
-    ensure_phase3_schema()
     user = (request.session.get("user") or "").upper()
     is_admin = bool(request.session.get("is_admin"))
     if not is_admin and unit_id.upper() != user:
@@ -15011,7 +15203,6 @@ async def admin_preplans_page(request: Request):
 @app.get("/api/preplans")
 async def get_preplans(search: str = None, active_only: bool = True):
     """Get all pre-plans with optional search."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -15045,7 +15236,6 @@ async def get_preplans(search: str = None, active_only: bool = True):
 @app.get("/api/preplans/{preplan_id}")
 async def get_preplan(preplan_id: int):
     """Get a specific pre-plan by ID."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -15064,7 +15254,6 @@ async def match_preplan(address: str):
     Find pre-plans that match a given address.
     Used during incident creation to show pre-plan info.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -15105,7 +15294,6 @@ async def match_preplan(address: str):
 @app.post("/api/preplans")
 async def create_or_update_preplan(request: Request):
     """Create or update a pre-plan."""
-    ensure_phase3_schema()
     data = await request.json()
 
     preplan_id = data.get("id")
@@ -15224,7 +15412,6 @@ async def create_or_update_preplan(request: Request):
 @app.delete("/api/preplans/{preplan_id}")
 async def delete_preplan(preplan_id: int):
     """Delete (deactivate) a pre-plan."""
-    ensure_phase3_schema()
     conn = get_conn()
 
     try:
@@ -15371,7 +15558,6 @@ async def get_determinant_info(protocol: str, code: str):
 @app.post("/api/incident/{incident_id}/determinant")
 async def set_incident_determinant(incident_id: int, request: Request):
     """Set the determinant code for an incident."""
-    ensure_phase3_schema()
     data = await request.json()
 
     code = str(data.get("code", "")).strip().upper()
@@ -15413,7 +15599,6 @@ async def api_incident_edit(incident_id: int, request: Request):
     Accepts JSON with any of: location, address, caller_name, caller_phone, type, priority, notes.
     Logs all changes to IncidentHistory for audit trail.
     """
-    ensure_phase3_schema()
     data = await request.json()
 
     editable_fields = [
@@ -15504,7 +15689,6 @@ async def api_incident_edit(incident_id: int, request: Request):
 @app.get("/incident/{incident_id}/determinant_picker", response_class=HTMLResponse)
 async def determinant_picker(request: Request, incident_id: int):
     """Display the determinant code picker modal."""
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -15543,7 +15727,6 @@ async def admin_station_alerts_page(request: Request):
 @app.get("/api/station_alerts")
 async def get_station_alerts():
     """Get all station alert configurations."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         rows = conn.execute("SELECT * FROM StationAlerts ORDER BY name").fetchall()
@@ -15555,7 +15738,6 @@ async def get_station_alerts():
 @app.get("/api/station_alerts/{alert_id}")
 async def get_station_alert(alert_id: int):
     """Get a specific station alert configuration."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         row = conn.execute("SELECT * FROM StationAlerts WHERE id = ?", (alert_id,)).fetchone()
@@ -15569,7 +15751,6 @@ async def get_station_alert(alert_id: int):
 @app.post("/api/station_alerts")
 async def create_or_update_station_alert(request: Request):
     """Create or update a station alert webhook."""
-    ensure_phase3_schema()
     data = await request.json()
 
     alert_id = data.get("id")
@@ -15643,7 +15824,6 @@ async def create_or_update_station_alert(request: Request):
 @app.delete("/api/station_alerts/{alert_id}")
 async def delete_station_alert(alert_id: int):
     """Delete a station alert webhook."""
-    ensure_phase3_schema()
     conn = get_conn()
     try:
         conn.execute("DELETE FROM StationAlerts WHERE id = ?", (alert_id,))
@@ -15657,7 +15837,6 @@ async def delete_station_alert(alert_id: int):
 @app.post("/api/station_alerts/{alert_id}/test")
 async def test_station_alert(alert_id: int):
     """Test a station alert webhook with sample data."""
-    ensure_phase3_schema()
     conn = get_conn()
 
     try:
@@ -15779,7 +15958,6 @@ async def trigger_webhook(alert: dict, payload: dict) -> dict:
 
 async def fire_station_alerts(trigger_type: str, incident: dict, units: list = None):
     """Fire all matching station alerts for a dispatch event."""
-    ensure_phase3_schema()
     conn = get_conn()
 
     try:
@@ -15841,13 +16019,7 @@ async def fire_station_alerts(trigger_type: str, incident: dict, units: list = N
 # CALLER & PREMISE HISTORY
 # ------------------------------------------------------
 
-@app.get("/api/premise_history/{location}")
-async def get_premise_history(location: str, limit: int = 10, exclude_id: int = None):
-    """
-    Get previous incidents at or near the same location.
-    Used to show dispatchers premise history.
-    """
-    ensure_phase3_schema()
+def _premise_history(location: str, limit: int = 10, exclude_id: int = None):
     conn = get_conn()
     c = conn.cursor()
 
@@ -15909,13 +16081,21 @@ async def get_premise_history(location: str, limit: int = 10, exclude_id: int =
         conn.close()
 
 
+@app.get("/api/premise_history/{location}")
+async def get_premise_history(location: str, limit: int = 10, exclude_id: int = None):
+    """
+    Get previous incidents at or near the same location.
+    Used to show dispatchers premise history.
+    """
+    return await db_pool.run_db(_premise_history, location, limit, exclude_id)
+
+
 @app.get("/api/caller_history/{phone}")
 async def get_caller_history(phone: str, limit: int = 10, exclude_id: int = None):
     """
     Get previous incidents from the same caller phone number.
     Helps identify frequent callers.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -15995,7 +16175,6 @@ async def get_incident_history_context(incident_id: int):
     Get both premise and caller history for an incident.
     Returns combined history for display in IAW.
     """
-    ensure_phase3_schema()
     conn = get_conn()
     c = conn.cursor()
 
@@ -16082,15 +16261,16 @@ async def get_incident_history_context(incident_id: int):
 # DASHBOARD STATS ENDPOINT
 # ================================================================
 
-@app.get("/api/dashboard/stats")
-async def dashboard_stats():
-    """Return daily stats for the dashboard stats bar."""
+def _dashboard_stats_data():
     conn = get_conn()
     try:
         c = conn.cursor()
 
+        # Local calendar day (DATE('now') is UTC)
+        today = datetime.date.today()
+        today_sql, today_params = _date_range_filter("Incidents", "created", today, today)
         today_count = c.execute(
-            "SELECT COUNT(*) AS cnt FROM Incidents WHERE DATE(created) = DATE('now')"
+            f"SELECT COUNT(*) AS cnt FROM Incidents WHERE {today_sql}", today_params
         ).fetchone()["cnt"]
 
         active_count = c.execute(
@@ -16099,7 +16279,8 @@ async def dashboard_stats():
 
         avg_row = c.execute(
             "SELECT AVG(julianday(first_arrival_time) - julianday(created)) * 1440 AS avg_min "
-            "FROM Incidents WHERE first_arrival_time IS NOT NULL AND DATE(created) = DATE('now')"
+            f"FROM Incidents WHERE first_arrival_time IS NOT NULL AND {today_sql}",
+            today_params,
         ).fetchone()
         avg_response_min = round(avg_row["avg_min"], 1) if avg_row["avg_min"] is not None else 0
 
@@ -16122,3 +16303,9 @@ async def dashboard_stats():
     finally:
         conn.close()
 
+
+@app.get("/api/dashboard/stats")
+async def dashboard_stats():
+    """Return daily stats for the dashboard stats bar."""
+    return await db_pool.run_db(_dashboard_stats_data)
+
@@ -27,6 +27,8 @@ from email import encoders
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+from app import db as db_pool
+
 # Timezone handling - prefer zoneinfo (Python 3.9+), fallback to pytz
 try:
     from zoneinfo import ZoneInfo
@@ -438,10 +440,8 @@ load_email_config()
 
 
 def get_db_connection():
-    """Get database connection."""
-    conn = sqlite3.connect(CONFIG["db_path"])
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get database connection (pooled)."""
+    return db_pool.get_conn(CONFIG["db_path"])
 
 
 def get_current_shift(dt: datetime.datetime = None) -> str:
@@ -1834,6 +1834,11 @@ def run_scheduler():
                 logger.info("Auto-report disabled, stopping scheduler")
                 break
 
+            # Only one worker creates and sends reports (app/db/lease.py)
+            if not db_pool.is_leader("reports"):
+                _scheduler_stop_event.wait(timeout=5)
+                continue
+
             # Check if we need to create a new pending report
             if should_send_report_now() and current_key != last_pending_key:
                 # Check if there's already a pending report
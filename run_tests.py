@@ -39,6 +39,8 @@ def main():
         "tests/test_api_core.py",
         "tests/test_api_modules.py",
         "tests/test_e2e_workflows.py",
+        "tests/test_db_layer.py",
+        "tests/test_query_plans.py",
     ]
     if not quick:
         test_files.append("tests/test_ui_playwright.py")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+FORD-CAD Broadcast Encode Benchmark
+====================================
+Encode cost of one broadcast at 10 / 50 / 200 connections: the old path
+(every socket JSON-encodes its own copy via send_json) against the shared
+frame built once by MessageBroadcaster / SSEManager.
+
+Only the encoding is timed; sends go to a socket that discards the frame.
+
+Usage:
+    python scripts/bench_broadcast.py                  # 200-event burst
+    python scripts/bench_broadcast.py --events 1000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.messaging.websocket import encode_frame, encode_sse_frame  # noqa: E402
+
+CONNECTIONS = (10, 50, 200)
+
+# Representative "event_stream" payload (unit cleared from a call)
+PAYLOAD = {
+    "id": 48213,
+    "ts": "2026-02-04T14:03:11",
+    "category": "unit",
+    "event_type": "UNIT_CLEARED",
+    "severity": "info",
+    "incident_id": 1182,
+    "unit_id": "E12",
+    "user": "DISPATCH3",
+    "summary": "E12 cleared from 2026-00431 (STRUCTURE FIRE) at 1200 PLANT RD",
+    "details": {"status_from": "ON_SCENE", "status_to": "AVAILABLE",
+                "disposition": "FA", "notes": "All units returning"},
+}
+
+
+def per_socket(events: int, conns: int) -> float:
+    """Seconds to encode `events` broadcasts, once per connection."""
+    t0 = time.perf_counter()
+    for _ in range(events):
+        for _ in range(conns):
+            json.dumps({"type": "event_stream", "timestamp": PAYLOAD["ts"], **PAYLOAD})
+    return time.perf_counter() - t0
+
+
+def encode_once(events: int, conns: int, encode) -> float:
+    """Seconds to encode `events` broadcasts once and share the frame."""
+    t0 = time.perf_counter()
+    for _ in range(events):
+        frame = encode("event_stream", PAYLOAD)
+        for _ in range(conns):
+            _ = frame
+    return time.perf_counter() - t0
+
+
+class _NullSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        pass
+
+
+async def broadcaster_check(conns: int) -> int:
+    """Frames encoded by a real MessageBroadcaster for one broadcast."""
+    from app.messaging.websocket import MessageBroadcaster
+    bc = MessageBroadcaster()
+    socks = [_NullSocket() for _ in range(conns)]
+    for i, ws in enumerate(socks):
+        await bc.connect(ws, f"U{i}")
+    before = bc.stats()["encoded"]
+    await bc.broadcast("event_stream", PAYLOAD)
+    encoded = bc.stats()["encoded"] - before
+    for ws in socks:
+        await bc.disconnect(ws)
+    return encoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--events", type=int, default=200, help="broadcasts per run (default 200)")
+    args = parser.parse_args()
+
+    print(f"Encode cost per broadcast ({args.events}-event burst, {len(json.dumps(PAYLOAD))} B payload)")
+    print(f"{'conns':>6}  {'per-socket us':>14}  {'once (WS) us':>13}  {'once (SSE) us':>14}  {'speedup':>8}  {'encodes':>8}")
+    for conns in CONNECTIONS:
+        old = per_socket(args.events, conns) / args.events * 1e6
+        ws = encode_once(args.events, conns, encode_frame) / args.events * 1e6
+        sse = encode_once(args.events, conns, encode_sse_frame) / args.events * 1e6
+        encodes = asyncio.run(broadcaster_check(conns))
+        print(f"{conns:>6}  {old:>14.1f}  {ws:>13.1f}  {sse:>14.1f}  {old / ws:>7.0f}x  {encodes:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,14 @@ const MessagingUI = {
     _browserNotifyEnabled: true,
     _mentionSoundEnabled: true,
     _soundEnabled: true,
+    // Event-stream topics ("incident:1182", "unit:E12", "category:unit",
+    // "severity:critical", or "none"); empty = every event
+    topics: window.CAD_WS_TOPICS || [],
+    // Last event_stream id / panel notice seq seen; sent on reconnect so
+    // the server replays the gap instead of us refetching the board
+    lastEventId: null,
+    lastPanelSeq: null,
+    lastPanelOrigin: null,
 
     // =========================================================================
     // INITIALIZATION
@@ -59,7 +67,12 @@ const MessagingUI = {
     connectWebSocket() {
         if (!this.userId) return;
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const wsUrl = `${protocol}//${window.location.host}/ws/chat?user_id=${encodeURIComponent(this.userId)}`;
+        let wsUrl = `${protocol}//${window.location.host}/ws/chat?user_id=${encodeURIComponent(this.userId)}`;
+        if (this.topics.length) wsUrl += `&topics=${encodeURIComponent(this.topics.join(','))}`;
+        const resuming = this.lastPanelSeq != null;
+        if (this.lastEventId != null) wsUrl += `&last_event_id=${this.lastEventId}`;
+        if (resuming) wsUrl += `&panel_seq=${this.lastPanelSeq}`;
+        if (resuming && this.lastPanelOrigin) wsUrl += `&panel_origin=${encodeURIComponent(this.lastPanelOrigin)}`;
 
         try {
             this.ws = new WebSocket(wsUrl);
@@ -70,6 +83,7 @@ const MessagingUI = {
                 this.reconnectAttempts = 0;
                 this.startHeartbeat();
                 this.flushOfflineQueue();
+                this._emitPushStatus(true, wasReconnect, resuming);
                 if (wasReconnect) {
                     this._showReconnectBanner('connected');
                 } else {
@@ -88,6 +102,7 @@ const MessagingUI = {
 
             this.ws.onclose = () => {
                 this.stopHeartbeat();
+                this._emitPushStatus(false, false);
                 this.attemptReconnect();
             };
 
@@ -127,6 +142,26 @@ const MessagingUI = {
         if (this.heartbeatInterval) clearInterval(this.heartbeatInterval);
     },
 
+    // Board panels (panels.js) listen for these to switch between push
+    // invalidation and interval polling. resuming: missed notices are
+    // about to be replayed, so no full refresh is needed.
+    _emitPushStatus(connected, reconnected, resuming) {
+        document.dispatchEvent(new CustomEvent('cad:push_status', {
+            detail: { connected: connected, reconnected: reconnected, resuming: !!resuming }
+        }));
+    },
+
+    // Toolbar held badge (layout.js)
+    _emitHeldCount(count) {
+        document.dispatchEvent(new CustomEvent('cad:held_count', { detail: { count: count } }));
+    },
+
+    // Replace the event-stream topics (kept for reconnects)
+    setTopics(topics) {
+        this.topics = topics || [];
+        this.wsSend({ type: 'subscribe_topics', topics: this.topics, replace: true });
+    },
+
     wsSend(data) {
         if (this.ws && this.ws.readyState === WebSocket.OPEN) {
             this.ws.send(JSON.stringify(data));
@@ -275,6 +310,30 @@ const MessagingUI = {
                     this.presenceMap = data.presence;
                     this.updateAllPresenceDots();
                 }
+                if (data.held_count != null) this._emitHeldCount(data.held_count);
+                if (this.lastPanelSeq == null) {
+                    this.lastPanelSeq = data.panel_seq || 0;
+                    this.lastPanelOrigin = data.panel_origin || null;
+                }
+                break;
+
+            case 'event_stream':
+                if (data.id != null) {
+                    // Replay and live delivery can overlap after a reconnect
+                    if (this.lastEventId != null && data.id <= this.lastEventId) break;
+                    this.lastEventId = data.id;
+                }
+                if (window._cadWSMessageHandler) {
+                    window._cadWSMessageHandler({ type: 'event_stream', data: data });
+                }
+                break;
+
+            case 'replay_done':
+                if (data.last_event_id != null) this.lastEventId = data.last_event_id;
+                // Gap too old to replay: reload the timeline instead
+                if (!data.complete && window.ES_TIMELINE && window.ES_TIMELINE.reload) {
+                    window.ES_TIMELINE.reload();
+                }
                 break;
 
             case 'channel_message':
@@ -305,6 +364,16 @@ const MessagingUI = {
                 this.loadChannels();
                 break;
 
+            case 'panel_dirty':
+                if (data.seq != null) this.lastPanelSeq = data.seq;
+                if (data.origin) this.lastPanelOrigin = data.origin;
+                document.dispatchEvent(new CustomEvent('cad:panel_dirty', { detail: data }));
+                break;
+
+            case 'held_count':
+                this._emitHeldCount(data.count);
+                break;
+
             case 'ping':
                 break;
 
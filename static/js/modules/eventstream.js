@@ -117,6 +117,15 @@
             b.classList.remove('es-active');
         });
         btn.classList.add('es-active');
+        ES.reload();
+    };
+
+    /**
+     * Refetch the timeline rows (current filter), e.g. after a reconnect
+     * whose gap could not be replayed.
+     */
+    ES.reload = function() {
+        const cat = ES._activeFilter;
         const url = cat
             ? '/partials/event-stream/rows?limit=100&category=' + encodeURIComponent(cat)
             : '/partials/event-stream/rows?limit=100';
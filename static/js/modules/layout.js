@@ -210,15 +210,39 @@ function _applyHeldCount(count) {
   if (drawerPill) drawerPill.classList.toggle("cad-held-alert", alertOn);
 }
 
+// The count is pushed over the chat socket ("connected" payload, then
+// "held_count" on change); /api/held_count is polled only while it is down.
+const HELD_POLL_MS = 6000;
+
 function _startHeldWatcher() {
+  let pollTimer = null;
+
   const tick = async () => {
     const count = await _fetchHeldCount();
     if (count === null) return;
     _applyHeldCount(count);
   };
 
+  const setPolling = (on) => {
+    if (on && !pollTimer) {
+      pollTimer = setInterval(tick, HELD_POLL_MS);
+    } else if (!on && pollTimer) {
+      clearInterval(pollTimer);
+      pollTimer = null;
+    }
+  };
+
+  document.addEventListener(CAD_UTIL.EVENTS.HELD_COUNT, (e) => {
+    const count = Number(e.detail?.count);
+    if (Number.isFinite(count)) _applyHeldCount(count);
+  });
+  document.addEventListener(CAD_UTIL.EVENTS.PUSH_STATUS, (e) => {
+    setPolling(!e.detail?.connected);
+  });
+
   tick();
-  setInterval(tick, 6000);
+  // The socket may already be up if messaging.js connected first
+  setPolling(window.MessagingUI?.ws?.readyState !== WebSocket.OPEN);
 }
 
 // ---------------------------------------------------------------------------
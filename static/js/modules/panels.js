@@ -6,6 +6,9 @@
 //   • Single delegated click binding for incident + unit rows
 //   • Panel refresh engine (Units + Open + Active)
 //   • Event-driven refresh: listens for CAD_UTIL.REFRESH_EVENT
+//   • Server push: "panel_dirty" notices (app/messaging/panel_push.py)
+//     refetch only the named panels; interval polling slows to a
+//     fallback while the push socket is connected
 // ============================================================================
 
 import IAW from "./iaw.js";
@@ -14,6 +17,9 @@ import { CAD_UTIL } from "./utils.js";
 
 const GLOBAL_GUARD_KEY = "__FORDCAD_PANELS_BOUND__";
 
+// Poll interval floor while push notices are arriving (seconds)
+const PUSH_FALLBACK_SEC = 120;
+
 let _initialized = false;
 let _lastOpenId = null;
 let _lastOpenTs = 0;
@@ -61,6 +67,14 @@ const PANELS = {
       });
     }
 
+    // Server push — another console (or this one) changed the board
+    document.addEventListener(EVT.PANEL_DIRTY || "cad:panel_dirty", function (e) {
+      PANELS.onPanelDirty(e.detail || {});
+    });
+    document.addEventListener(EVT.PUSH_STATUS || "cad:push_status", function (e) {
+      PANELS.onPushStatus(e.detail || {});
+    });
+
     // -------------------------------------------------------------
     // Delegated clicks (single-bind)
     // -------------------------------------------------------------
@@ -160,9 +174,67 @@ const PANELS = {
     }
   },
 
+  // -------------------------------------------------------------------------
+  // SERVER PUSH
+  // -------------------------------------------------------------------------
+  _pushConnected: false,
+  _lastPushSeq: 0,
+  _lastPushOrigin: null,
+
+  onPanelDirty(detail) {
+    var seq = Number(detail.seq || 0);
+    // A gap means notices were missed: refetch everything once. A replay
+    // after reconnect merges the missed notices; incomplete = refetch too.
+    // (first_seq: notices coalesced into one by a bounded SSE queue).
+    // Seqs are per worker: no gap check across a change of origin.
+    var first = Number(detail.first_seq || seq);
+    var sameOrigin = !detail.origin || !this._lastPushOrigin || detail.origin === this._lastPushOrigin;
+    var missed = detail.replay
+      ? detail.complete === false
+      : sameOrigin && this._lastPushSeq && first > this._lastPushSeq + 1;
+    this._lastPushSeq = seq;
+    if (detail.origin) this._lastPushOrigin = detail.origin;
+    if (missed) {
+      this.refreshAll();
+    }
+
+    var panels = detail.panels || [];
+    var board = panels.filter(function (p) { return p === "units" || p === "active" || p === "open"; });
+    if (board.length && !missed) this.refreshTargeted(board);
+
+    if (panels.indexOf("dailylog") !== -1) {
+      var logBody = document.getElementById("log-table-body");
+      if (logBody && window.htmx) window.htmx.trigger(logBody, "refresh");
+    }
+
+    // Reload an open IAW for a changed incident, unless the user is typing in it
+    var iaw = document.getElementById("iaw-modal");
+    var ids = (detail.incident_ids || []).map(String);
+    if (iaw && ids.indexOf(String(iaw.dataset.incidentId)) !== -1) {
+      var focused = document.activeElement;
+      var typing = focused && iaw.contains(focused) &&
+        /^(INPUT|TEXTAREA|SELECT)$/.test(focused.tagName);
+      if (!typing) {
+        try { IAW.reopen(); } catch (err) { console.warn("[PANELS] IAW reload failed:", err); }
+      }
+    }
+  },
+
+  onPushStatus(detail) {
+    var connected = !!detail.connected;
+    if (connected && detail.reconnected && !detail.resuming) {
+      // Notices sent while we were away are gone
+      this.refreshAll();
+    }
+    if (connected === this._pushConnected) return;
+    this._pushConnected = connected;
+    if (this._autoRefreshTimer) this.startAutoRefresh();
+  },
+
   // -------------------------------------------------------------------------
   // AUTO-REFRESH POLLING
-  // Integrates with SETTINGS module for user preferences
+  // Integrates with SETTINGS module for user preferences. While push is
+  // connected this is only a safety net (PUSH_FALLBACK_SEC minimum).
   // -------------------------------------------------------------------------
   _autoRefreshTimer: null,
 
@@ -176,7 +248,9 @@ const PANELS = {
       return;
     }
 
-    const intervalSec = settings.autoRefreshInterval || 30;
+    let intervalSec = settings.autoRefreshInterval || 30;
+    if (window.MessagingUI?.ws?.readyState === WebSocket.OPEN) this._pushConnected = true;
+    if (this._pushConnected) intervalSec = Math.max(intervalSec, PUSH_FALLBACK_SEC);
     const intervalMs = intervalSec * 1000;
 
 
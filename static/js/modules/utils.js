@@ -105,6 +105,9 @@ const EVENTS = {
   INCIDENTS_CHANGED: "cad:incidents_changed",
   HELD_CHANGED:      "cad:held_changed",
   SETTINGS_CHANGED:  "cad:settings_changed",
+  PANEL_DIRTY:       "cad:panel_dirty",    // server push (messaging.js)
+  PUSH_STATUS:       "cad:push_status",
+  HELD_COUNT:        "cad:held_count",
   REFRESH_ALL:       REFRESH_EVENT,
 };
 
@@ -29,6 +29,19 @@ ARTIFACTS_DIR = os.path.join(ROOT_DIR, "test_artifacts",
                               datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
 
 os.environ["CAD_TEST_MODE"] = "1"
+os.environ["CAD_DB_PATH"] = TEST_DB_PATH
+# Reports must see rows the test just wrote
+os.environ["CAD_REPORT_SNAPSHOT_MAX_AGE_S"] = "0"
+
+
+def _remove_test_db():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            if os.path.exists(TEST_DB_PATH + suffix):
+                os.remove(TEST_DB_PATH + suffix)
+        except (PermissionError, OSError):
+            pass
+    shutil.rmtree(os.path.splitext(TEST_DB_PATH)[0] + ".snapshots", ignore_errors=True)
 
 
 # ============================================================================
@@ -38,9 +51,8 @@ os.environ["CAD_TEST_MODE"] = "1"
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_env():
     """Session-wide test environment setup."""
-    # Remove stale test DB
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
+    # Remove stale test DB (and any WAL/SHM sidecars)
+    _remove_test_db()
 
     # Create artifact directories
     for subdir in ["screenshots", "console_logs", "server_logs",
@@ -49,17 +61,16 @@ def setup_test_env():
 
     # Monkey-patch main.DB_PATH before importing app
     import main
+    from app import db as db_pool
     main.DB_PATH = TEST_DB_PATH
+    db_pool.configure(TEST_DB_PATH)
     main._SCHEMA_INIT_DONE = False
 
     yield
 
     # Cleanup (ignore Windows file lock errors)
-    try:
-        if os.path.exists(TEST_DB_PATH):
-            os.remove(TEST_DB_PATH)
-    except (PermissionError, OSError):
-        pass
+    db_pool.close_all()
+    _remove_test_db()
 
 
 @pytest.fixture(scope="session")
@@ -289,6 +300,10 @@ def seeded_db(app, client):
         pass
 
     conn.close()
+
+    # Seeded outside the pool, so the in-memory held count never saw it
+    from app.messaging import get_panel_push
+    get_panel_push().held.invalidate()
     return TEST_DB_PATH
 
 
@@ -333,7 +348,12 @@ def superadmin_session(client, seeded_db):
 # ============================================================================
 
 def get_test_db():
-    """Direct connection to test database for assertions."""
+    """Direct connection to test database for assertions.
+
+    Flushes the audit writer first so queued MasterLog / history rows are visible.
+    """
+    from app.db import flush_audit
+    flush_audit()
     conn = sqlite3.connect(TEST_DB_PATH, timeout=30)
     conn.row_factory = sqlite3.Row
     return conn
@@ -1,7 +1,9 @@
 """
 FORD-CAD — Module API Tests
 =============================
-Tests: Reporting, Messaging/Chat, Themes, Event Stream, Playbooks, Reminders, Mobile
+Tests: Reporting, Messaging/Chat, WebSocket Fan-out, Event Bus, Event Bridge,
+       Panel Push, Board State, Board Reconciler, Panel Fragments, Themes, Event Stream, Playbooks,
+       Reminders, Mobile
 """
 
 import pytest
@@ -93,6 +95,993 @@ class TestMessaging:
         assert resp.status_code == 200
 
 
+# ============================================================================
+# WEBSOCKET FAN-OUT
+# ============================================================================
+
+class _FakeSocket:
+    """Stands in for a WebSocket; `stall` blocks every send until released."""
+
+    def __init__(self, stall=False):
+        import asyncio
+        self.received = []
+        self.closed_code = None
+        self.release = asyncio.Event()
+        if not stall:
+            self.release.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        import json
+        await self.release.wait()
+        self.received.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed_code = code
+
+
+class TestWebSocketFanout:
+    """Broadcasts queue per connection; a stalled client does not delay others."""
+
+    def test_stalled_client_does_not_delay_others(self):
+        import asyncio
+        from app.messaging.websocket import MessageBroadcaster
+
+        async def main():
+            bc = MessageBroadcaster(outbox_size=4, slow_max_drops=100)
+            fast, slow = _FakeSocket(), _FakeSocket(stall=True)
+            await bc.connect(fast, "FAST")
+            await bc.connect(slow, "SLOW")
+            for i in range(10):
+                await asyncio.wait_for(bc.broadcast("tick", {"i": i}), 0.5)
+            await asyncio.sleep(0.05)
+            ticks = [m["i"] for m in fast.received if m["type"] == "tick"]
+            assert ticks == list(range(10))
+            assert slow.received == []
+            # Oldest dropped: the stalled client gets the newest on recovery
+            slow.release.set()
+            await asyncio.sleep(0.05)
+            assert [m["i"] for m in slow.received if m["type"] == "tick"][-3:] == [7, 8, 9]
+            assert bc.stats()["dropped"] > 0
+            await bc.disconnect(fast)
+            await bc.disconnect(slow)
+
+        asyncio.run(main())
+
+    def test_broadcast_encodes_once(self):
+        import asyncio
+        from app.messaging.websocket import MessageBroadcaster, SSEManager
+
+        async def main():
+            bc = MessageBroadcaster()
+            socks = [_FakeSocket() for _ in range(3)]
+            for i, ws in enumerate(socks):
+                await bc.connect(ws, f"U{i}")
+            await asyncio.sleep(0.02)
+            before = bc.stats()["encoded"]
+            assert await bc.broadcast("event_stream", {"id": 7}) == 3
+            assert bc.stats()["encoded"] == before + 1
+            await asyncio.sleep(0.02)
+            for ws in socks:
+                assert ws.received[-1]["type"] == "event_stream"
+                assert ws.received[-1]["id"] == 7
+                await bc.disconnect(ws)
+
+            sse = SSEManager()
+            q1, q2 = await sse.subscribe("A"), await sse.subscribe("B")
+            await sse.broadcast_event("panel_dirty", {"seq": 1})
+            f1, f2 = q1.get_nowait(), q2.get_nowait()
+            assert f1 is f2
+            assert f1 == 'event: panel_dirty\ndata: {"seq": 1}\n\n'
+
+        asyncio.run(main())
+
+    def test_topic_subscriptions_filter_before_encoding(self):
+        import asyncio
+        from app.messaging.websocket import MessageBroadcaster, event_topic
+
+        async def main():
+            bc = MessageBroadcaster()
+            console, mdt, chat = _FakeSocket(), _FakeSocket(), _FakeSocket()
+            await bc.connect(console, "DISPATCH")
+            await bc.connect(mdt, "E12", topics="incident:1182,unit:e12")
+            await bc.connect(chat, "CHATONLY", topics="none")
+            await asyncio.sleep(0.02)
+            assert bc.get_topics(mdt) == ["incident:1182", "unit:E12"]
+
+            events = [
+                ({"id": 1}, event_topic(1182, "L3", "unit", "info")),
+                ({"id": 2}, event_topic(None, "E12", "unit", "info")),
+                ({"id": 3}, event_topic(77, "M5", "incident", "critical")),
+            ]
+            for data, topic in events:
+                await bc.broadcast("event_stream", data, topic=topic)
+            # Severity narrows the incident / unit scope
+            bc.subscribe_topics(mdt, ["severity:critical"])
+            await bc.broadcast("event_stream", {"id": 4}, topic=event_topic(1182, None, "unit", "info"))
+            await asyncio.sleep(0.02)
+
+            def ids(ws):
+                return [m["id"] for m in ws.received if m["type"] == "event_stream"]
+
+            assert ids(console) == [1, 2, 3, 4]
+            assert ids(mdt) == [1, 2]
+            assert ids(chat) == []
+
+            # Cleared topics: back to every event
+            bc.unsubscribe_topics(mdt)
+            before = bc.stats()["encoded"]
+            await bc.broadcast("event_stream", {"id": 5}, topic=event_topic(None, None, "chat", "info"))
+            assert bc.stats()["encoded"] == before + 1
+            await asyncio.sleep(0.02)
+            assert ids(mdt)[-1] == 5
+            for ws in (console, mdt, chat):
+                await bc.disconnect(ws)
+
+        asyncio.run(main())
+
+    def test_topics_are_per_connection(self):
+        """An MDT and a console signed in as the same unit keep their own
+        topics; a later connect without topics gets every event."""
+        import asyncio
+        from app.messaging.websocket import MessageBroadcaster, event_topic
+
+        async def main():
+            bc = MessageBroadcaster()
+            console, mdt = _FakeSocket(), _FakeSocket()
+            await bc.connect(console, "E12")
+            await bc.connect(mdt, "E12", topics="unit:E12")
+            await bc.handle_client_message("E12", {"type": "subscribe_topics", "topics": ["none"]}, mdt)
+            await bc.disconnect(mdt)
+            late = _FakeSocket()
+            await bc.connect(late, "E12")
+            await asyncio.sleep(0.02)
+            assert bc.get_topics(console) == [] and bc.get_topics(late) == []
+
+            mdt = _FakeSocket()
+            await bc.connect(mdt, "E12", topics="unit:E12")
+            assert await bc.broadcast("event_stream", {"id": 1}, topic=event_topic(1182, "L3", "unit", "info")) == 2
+            assert await bc.broadcast("event_stream", {"id": 2}, topic=event_topic(None, "E12", "unit", "info")) == 3
+            await asyncio.sleep(0.02)
+
+            def ids(ws):
+                return [m["id"] for m in ws.received if m["type"] == "event_stream"]
+
+            assert ids(console) == [1, 2] and ids(late) == [1, 2]
+            assert ids(mdt) == [2]
+            for ws in (console, late, mdt):
+                await bc.disconnect(ws)
+
+        asyncio.run(main())
+
+    def test_sse_topics_filter_events(self, monkeypatch):
+        import asyncio
+        from app.messaging import websocket as ws_mod
+        from app.messaging.websocket import MessageBroadcaster, SSEManager, event_topic
+        sse = SSEManager()
+        monkeypatch.setattr(ws_mod, "_sse_manager", sse)
+
+        async def main():
+            everything = await sse.subscribe("DISPATCH")
+            mdt = await sse.subscribe("E12", topics="unit:E12")
+            bc = MessageBroadcaster()
+            await bc.broadcast("event_stream", {"id": 1}, topic=event_topic(None, "L3", "unit", "info"))
+            await bc.broadcast("event_stream", {"id": 2}, topic=event_topic(None, "E12", "unit", "info"))
+            await bc.broadcast("reminder", {"text": "untopical"})
+
+            def drain(sub):
+                frames = []
+                while (frame := sub.get_nowait()) is not None:
+                    frames.append(frame)
+                return frames
+
+            assert len(drain(everything)) == 3
+            frames = drain(mdt)
+            assert len(frames) == 2 and '"id": 2' in frames[0] and "reminder" in frames[1]
+            assert sse.stats()["topic_filtered"] == 1
+
+        asyncio.run(main())
+
+    def test_topics_query_parameter(self, client):
+        with client.websocket_connect("/ws/chat?user_id=TOPICPROBE&topics=unit:E7,category:unit") as ws:
+            hello = ws.receive_json()
+        assert hello["topics"] == ["category:unit", "unit:E7"]
+
+    def test_sse_queue_bounded_and_coalesced(self):
+        import asyncio
+        from app.messaging.websocket import SSEManager
+
+        async def main():
+            sse = SSEManager(max_frames=5, max_bytes=10_000)
+            sub = await sse.subscribe("LAPTOP")
+            for i in range(3):
+                await sse.broadcast_event("presence", {"user_id": "E1", "status": f"s{i}"})
+            await sse.broadcast_event("panel_dirty", {"seq": 4, "panels": ["units"], "incident_ids": []})
+            await sse.broadcast_event("panel_dirty", {"seq": 5, "panels": ["active"], "incident_ids": [9]})
+            assert len(sub.frames) == 2
+            assert sse.stats()["coalesced"] == 3
+            presence, notice = sub.get_nowait(), sub.get_nowait()
+            assert '"status": "s2"' in presence
+            assert '"first_seq": 4' in notice and '"panels": ["active", "units"]' in notice
+
+            for i in range(12):
+                await sse.broadcast_event("event_stream", {"id": i})
+            assert len(sub.frames) == 5
+            assert sse.stats()["dropped"] == 7
+            assert sub.get_nowait().startswith("event: resync\ndata: {\"dropped\": 7}")
+            assert sub.get_nowait().startswith("id: 7\n")
+
+            # Bytes cap
+            await sse.broadcast_event("event_stream", {"id": 99, "pad": "x" * 20_000})
+            assert len(sub.frames) == 1
+
+        asyncio.run(main())
+
+    def test_sse_idle_subscriber_evicted(self):
+        import asyncio
+        from app.messaging.websocket import SSEManager
+
+        async def main():
+            sse = SSEManager(idle_evict=0.05)
+            stalled = await sse.subscribe("LID_CLOSED")
+            reader = await sse.subscribe("READER")
+            await sse.broadcast_event("tick", {"i": 0})
+            reader.get_nowait()
+            await asyncio.sleep(0.1)
+            reader.get_nowait()
+            await sse.broadcast_event("tick", {"i": 1})
+            assert stalled.closed and not reader.closed
+            stats = sse.stats()
+            assert stats["evicted"] == 1 and stats["subscribers"] == 1
+            assert await stalled.get(timeout=0.01) is None
+
+        asyncio.run(main())
+
+    def test_disconnect_policy_evicts_slow_client(self):
+        import asyncio
+        from app.messaging.websocket import MessageBroadcaster
+
+        async def main():
+            bc = MessageBroadcaster(outbox_size=2, slow_policy="disconnect")
+            slow = _FakeSocket(stall=True)
+            await bc.connect(slow, "SLOW")
+            for i in range(5):
+                await bc.broadcast("tick", {"i": i})
+            await asyncio.sleep(0.05)
+            assert slow.closed_code == 1013
+            assert not bc.is_user_online("SLOW")
+            assert bc.stats()["evicted"] == 1
+
+        asyncio.run(main())
+
+    def test_send_timeout_evicts(self):
+        import asyncio
+        from app.messaging.websocket import MessageBroadcaster
+
+        async def main():
+            bc = MessageBroadcaster(send_timeout=0.05)
+            slow = _FakeSocket(stall=True)
+            await bc.connect(slow, "SLOW")
+            await asyncio.sleep(0.2)
+            assert slow.closed_code == 1013
+            assert not bc.is_user_online("SLOW")
+
+        asyncio.run(main())
+
+
+class TestEventBus:
+    """Broadcasts reach consoles connected to other workers."""
+
+    def test_sqlite_bus_relays_between_workers(self, tmp_path):
+        import asyncio
+        from app.messaging import SQLiteBus
+        from app.messaging.websocket import MessageBroadcaster
+
+        async def main():
+            path = str(tmp_path / "bus.db")
+            bus_a, bus_b = SQLiteBus(path, poll_ms=10), SQLiteBus(path, poll_ms=10)
+            worker_a, worker_b = MessageBroadcaster(bus=bus_a), MessageBroadcaster(bus=bus_b)
+            bus_a.start(worker_a.deliver_remote)
+            bus_b.start(worker_b.deliver_remote)
+            on_a, on_b = _FakeSocket(), _FakeSocket()
+            try:
+                await worker_a.connect(on_a, "DISPATCH")
+                await worker_b.connect(on_b, "E12")
+                await worker_a.broadcast("reminder", {"text": "check E12"})
+                await worker_a.send_to_users(["E12"], "channel_message", {"channel_id": 3})
+                await worker_a.send_to_users(["NOBODY"], "channel_message", {"channel_id": 4})
+                await asyncio.sleep(0.3)
+            finally:
+                bus_a.stop()
+                bus_b.stop()
+
+            def kinds(ws):
+                return [m["type"] for m in ws.received]
+
+            assert kinds(on_b).count("reminder") == 1
+            assert [m["channel_id"] for m in on_b.received if m["type"] == "channel_message"] == [3]
+            # Presence from worker B reached A's map; nothing echoed back to A
+            assert worker_a.get_user_status("E12") == "available"
+            assert kinds(on_a).count("reminder") == 1
+            assert bus_b.stats()["received"] >= 3
+            assert bus_a.stats()["received"] >= 1
+
+        asyncio.run(main())
+
+    def test_typing_reaches_channel_subscribers_on_other_workers(self, tmp_path):
+        import asyncio
+        from app.messaging import SQLiteBus
+        from app.messaging.websocket import MessageBroadcaster
+
+        async def main():
+            path = str(tmp_path / "bus.db")
+            bus_a, bus_b = SQLiteBus(path, poll_ms=10), SQLiteBus(path, poll_ms=10)
+            worker_a, worker_b = MessageBroadcaster(bus=bus_a), MessageBroadcaster(bus=bus_b)
+            bus_a.start(worker_a.deliver_remote)
+            bus_b.start(worker_b.deliver_remote)
+            on_a, on_b, other = _FakeSocket(), _FakeSocket(), _FakeSocket()
+            try:
+                await worker_a.connect(on_a, "DISPATCH")
+                await worker_b.connect(on_b, "E12")
+                await worker_b.connect(other, "L3")
+                # Subscriptions are known only to the worker that took them
+                worker_a.subscribe_channel("DISPATCH", 7)
+                worker_b.subscribe_channel("E12", 7)
+                await worker_a.handle_typing("DISPATCH", 7)
+                await asyncio.sleep(0.3)
+            finally:
+                bus_a.stop()
+                bus_b.stop()
+            return on_a.received, on_b.received, other.received
+
+        on_a, on_b, other = asyncio.run(main())
+        assert [m for m in on_b if m["type"] == "typing"][0]["user_id"] == "DISPATCH"
+        assert not any(m["type"] == "typing" for m in on_a + other)
+
+    def test_failed_relay_does_not_block_local_delivery(self):
+        import asyncio
+        from app.messaging.websocket import MessageBroadcaster
+
+        class BrokenBus:
+            def publish(self, *args, **kwargs):
+                raise RuntimeError("bus down")
+
+        async def main():
+            bc = MessageBroadcaster(bus=BrokenBus())
+            ws = _FakeSocket()
+            await bc.connect(ws, "E12")
+            assert await bc.broadcast("reminder", {"text": "check E12"}) == 1
+            assert (await bc.send_to_users(["E12"], "channel_message", {"channel_id": 3}))["E12"] == 1
+            await asyncio.sleep(0.05)
+            await bc.disconnect(ws)
+            return ws.received, bc.stats()["relay_failed"]
+
+        received, failed = asyncio.run(main())
+        kinds = [m["type"] for m in received]
+        assert "reminder" in kinds and "channel_message" in kinds
+        assert failed >= 2
+
+    def test_local_bus_is_default(self, client):
+        stats = client.get("/api/health").json()["event_bus"]
+        assert stats["backend"] == "local"
+
+
+# ============================================================================
+# EVENT BRIDGE
+# ============================================================================
+
+class TestEventBridge:
+    """Broadcasts published from worker threads reach the event loop."""
+
+    def test_publish_from_thread(self):
+        import asyncio
+        import threading
+        from app.messaging import EventBridge
+        bc = _RecordingBroadcaster()
+        bridge = EventBridge(broadcaster=bc)
+
+        async def main():
+            bridge.start()
+            try:
+                def work():
+                    bridge.publish("reminder", {"n": 1})
+                    bridge.publish("channel_message", {"n": 2}, user_ids=["E1", "CAR1"])
+                t = threading.Thread(target=work)
+                t.start()
+                t.join()
+                await asyncio.sleep(0.05)
+            finally:
+                await bridge.stop()
+
+        asyncio.run(main())
+        assert bc.sent == [("reminder", {"n": 1}), ("channel_message", {"n": 2}, ["E1", "CAR1"])]
+        stats = bridge.stats()
+        assert stats["delivered"] == 2
+        assert stats["depth"] == 0
+        assert stats["running"] is False
+
+    def test_full_queue_drops_oldest(self):
+        import asyncio
+        from app.messaging import EventBridge
+        bc = _RecordingBroadcaster()
+        bridge = EventBridge(max_queue=3, broadcaster=bc)
+
+        async def main():
+            bridge.start()
+            try:
+                # The consumer cannot run until we yield, so the queue fills
+                for i in range(5):
+                    bridge.publish("tick", {"i": i})
+                await asyncio.sleep(0.05)
+            finally:
+                await bridge.stop()
+
+        asyncio.run(main())
+        assert [d["i"] for _, d in bc.sent] == [2, 3, 4]
+        assert bridge.stats()["dropped_full"] == 2
+
+    def test_publish_before_start_is_dropped(self):
+        from app.messaging import EventBridge
+        bridge = EventBridge(broadcaster=_RecordingBroadcaster())
+        assert bridge.publish("tick", {}) is False
+        assert bridge.stats()["dropped_no_loop"] == 1
+
+    def test_app_bridge_running(self, client):
+        stats = client.get("/api/health").json()["event_bridge"]
+        assert stats["running"] is True
+
+
+# ============================================================================
+# PANEL PUSH
+# ============================================================================
+
+class _RecordingBroadcaster:
+    def __init__(self):
+        self.sent = []
+        self.relayed = []
+
+    async def broadcast(self, event_type, data, exclude_users=None, topic=None, relay=True):
+        self.sent.append((event_type, data))
+        self.relayed.append(relay)
+        return 1
+
+    async def send_to_users(self, user_ids, event_type, data, relay=True):
+        self.sent.append((event_type, data, list(user_ids)))
+        return len(user_ids)
+
+
+class TestPanelPush:
+    """Commits publish coalesced "panel_dirty" notices instead of clients polling."""
+
+    def _run(self, tmp_path, work):
+        import asyncio
+        import sqlite3
+        from app.messaging import PanelPush
+        path = str(tmp_path / "push.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            "CREATE TABLE Incidents (incident_id INTEGER PRIMARY KEY, status TEXT);"
+            "CREATE TABLE DailyLog (id INTEGER PRIMARY KEY, details TEXT);"
+            "INSERT INTO Incidents VALUES (1, 'OPEN');"
+        )
+        conn.close()
+        bc = _RecordingBroadcaster()
+        push = PanelPush(debounce_ms=20, broadcaster=bc)
+
+        async def main():
+            push.start(db_path=path)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, work, path, push)
+                await asyncio.sleep(0.1)
+            finally:
+                push.stop()
+
+        asyncio.run(main())
+        return bc.sent
+
+    def test_commits_coalesce_into_one_notice(self, tmp_path):
+        from app.db import get_conn
+
+        def work(path, push):
+            conn = get_conn(path)
+            try:
+                conn.execute("UPDATE Incidents SET status = 'ACTIVE' WHERE incident_id = 1")
+                conn.commit()
+                conn.execute("INSERT INTO DailyLog (details) VALUES ('x')")
+                conn.commit()
+            finally:
+                conn.close()
+            push.mark_dirty(incident_id=1)
+
+        sent = self._run(tmp_path, work)
+        assert len(sent) == 1
+        event_type, data = sent[0]
+        assert event_type == "panel_dirty"
+        assert data["panels"] == ["active", "dailylog", "held", "open"]
+        assert data["incident_ids"] == [1]
+
+    def test_no_op_writes_and_rollbacks_stay_quiet(self, tmp_path):
+        from app.db import get_conn
+
+        def work(path, push):
+            conn = get_conn(path)
+            try:
+                conn.execute("UPDATE Incidents SET status = 'X' WHERE incident_id = 99")
+                conn.commit()
+                conn.execute("INSERT INTO DailyLog (details) VALUES ('x')")
+                conn.rollback()
+            finally:
+                conn.close()
+
+        assert self._run(tmp_path, work) == []
+
+    def test_relayed_notice_is_not_relayed_again(self, tmp_path):
+        import asyncio
+        from app.messaging import PanelPush
+        bc = _RecordingBroadcaster()
+        push = PanelPush(debounce_ms=10, broadcaster=bc)
+
+        async def main():
+            push.start(db_path=str(tmp_path / "push.db"))
+            try:
+                push.mark_dirty(["units"], relay=False)
+                await asyncio.sleep(0.05)
+                push.mark_dirty(["active"])
+                await asyncio.sleep(0.05)
+            finally:
+                push.stop()
+
+        asyncio.run(main())
+        assert [data["panels"] for _, data in bc.sent] == [["units"], ["active"]]
+        assert bc.relayed == [False, True]
+        assert all(data["origin"] == push.origin for _, data in bc.sent)
+
+    def test_resume_from_another_worker_is_incomplete(self):
+        from app.messaging import PanelPush
+        push = PanelPush()
+        push._seq = 3
+        push._history.extend([(2, ["units"], []), (3, ["active"], [])])
+        assert push.notices_since(2)["complete"] is True
+        assert push.notices_since(2, push.origin)["complete"] is True
+        other = push.notices_since(2, "otherhost:1:deadbeef")
+        assert other["complete"] is False and other["origin"] == push.origin
+
+    def test_incident_edit_pushes_to_consoles(self, dispatcher_session, seeded_db, monkeypatch):
+        from app.messaging import get_panel_push
+        push = get_panel_push()
+        assert push.running
+        bc = _RecordingBroadcaster()
+        monkeypatch.setattr(push, "_broadcaster", bc)
+        resp = dispatcher_session.post("/api/incident/2/edit", json={
+            "priority": "1",
+            "caller_name": "Updated Caller",
+        })
+        assert resp.status_code == 200
+        panels, incidents = self._pushed(bc, {"active", "open"})
+        assert {"active", "open"} <= panels
+        assert 2 in incidents
+
+    def test_dispatch_in_unit_of_work_pushes_board(self, dispatcher_session, seeded_db, monkeypatch):
+        """Dispatch commits as one unit of work; its tables still reach the
+        commit listener."""
+        from app.messaging import get_panel_push
+        push = get_panel_push()
+        bc = _RecordingBroadcaster()
+        monkeypatch.setattr(push, "_broadcaster", bc)
+        resp = dispatcher_session.post("/dispatch/unit_to_incident", json={
+            "incident_id": 2,
+            "units": ["BATT3"],
+        })
+        assert resp.json()["ok"] is True
+        panels, _ = self._pushed(bc, {"units", "active"})
+        assert {"units", "active"} <= panels
+
+    @staticmethod
+    def _pushed(bc, want):
+        """Panels / incidents named by panel_dirty notices sent so far (waits
+        up to 2 s for the `want` panels)."""
+        import time
+        deadline = time.time() + 2
+        while True:
+            notices = [data for event_type, data in bc.sent if event_type == "panel_dirty"]
+            panels = {p for data in notices for p in data["panels"]}
+            if want <= panels or time.time() >= deadline:
+                return panels, {i for data in notices for i in data["incident_ids"]}
+            time.sleep(0.02)
+
+
+class TestHeldCount:
+    """Held count is served from memory and recounted only after Incidents commits."""
+
+    def test_hold_and_unhold_update_count(self, dispatcher_session, seeded_db):
+        from app.messaging import get_panel_push
+        from tests.conftest import get_test_db
+        held = get_panel_push().held
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, is_draft, created, updated) "
+            "VALUES ('HELD-0001', 'TEST', 'HELD TEST', 'OPEN', 0, '', '')"
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        try:
+            before = dispatcher_session.get("/api/held_count").json()["count"]
+            r = dispatcher_session.post(f"/incident/{inc_id}/hold", json={"reason": "HELD COUNT TEST"})
+            assert r.json()["ok"] is True
+            assert dispatcher_session.get("/api/held_count").json()["count"] == before + 1
+
+            recounts = held.stats()["recounts"]
+            assert dispatcher_session.get("/held_count").json()["count"] == before + 1
+            assert held.stats()["recounts"] == recounts
+
+            dispatcher_session.post(f"/incident/{inc_id}/unhold", json={})
+            assert dispatcher_session.get("/api/held_count").json()["count"] == before
+        finally:
+            conn = get_test_db()
+            conn.execute("UPDATE Incidents SET status = 'CLOSED' WHERE incident_id = ?", (inc_id,))
+            conn.commit()
+            conn.close()
+
+    def test_close_in_unit_of_work_updates_count(self, dispatcher_session, seeded_db):
+        from app.messaging import held_count
+        from tests.conftest import get_test_db
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, is_draft, created, updated) "
+            "VALUES ('HELD-0002', 'TEST', 'HELD CLOSE TEST', 'OPEN', 0, '', '')"
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        before = held_count()
+        r = dispatcher_session.post(f"/incident/{inc_id}/hold", json={"reason": "HELD CLOSE TEST"})
+        assert r.json()["ok"] is True
+        assert held_count() == before + 1
+
+        r = dispatcher_session.post(f"/api/incident/{inc_id}/clear_all_and_close",
+                                    json={"disposition": "C"})
+        assert r.json()["ok"] is True
+        assert held_count() == before
+
+    def test_connected_payload_carries_count(self, client, seeded_db):
+        with client.websocket_connect("/ws/chat?user_id=HELDPROBE") as ws:
+            hello = ws.receive_json()
+        assert hello["type"] == "connected"
+        assert hello["held_count"] == client.get("/api/held_count").json()["count"]
+
+
+# ============================================================================
+# BOARD STATE
+# ============================================================================
+
+class TestBoardState:
+    """Board sections are served from memory until a write to their tables."""
+
+    @pytest.fixture
+    def board(self, tmp_path):
+        import sqlite3
+        from app.board import BoardState, install_board_versions
+        path = str(tmp_path / "board.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            "CREATE TABLE Units (unit_id TEXT PRIMARY KEY, status TEXT);"
+            "CREATE TABLE UnitRoster (unit_id TEXT, shift_letter TEXT);"
+            "INSERT INTO Units VALUES ('E1', 'AVAILABLE');"
+        )
+        assert install_board_versions(conn) == ["Units", "UnitRoster"]
+        conn.commit()
+        conn.close()
+        return path, BoardState(db_path=path)
+
+    def _loader(self, path, sql, calls):
+        from app.db import get_conn
+
+        def load():
+            calls.append(sql)
+            conn = get_conn(path)
+            try:
+                return [tuple(r) for r in conn.execute(sql).fetchall()]
+            finally:
+                conn.close()
+        return load
+
+    def test_reload_only_after_own_table_changes(self, board):
+        import sqlite3
+        path, state = board
+        unit_calls, roster_calls = [], []
+        state.register("units", self._loader(path, "SELECT * FROM Units", unit_calls), ("Units",))
+        state.register("roster", self._loader(path, "SELECT * FROM UnitRoster", roster_calls), ("UnitRoster",))
+        assert state.read("units", "roster") == ([("E1", "AVAILABLE")], [])
+        assert state.get("units") == [("E1", "AVAILABLE")]
+        assert len(unit_calls) == 1
+
+        # A writer outside the pool (another worker) is seen through the triggers
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE Units SET status = 'DISPATCHED' WHERE unit_id = 'E1'")
+        conn.commit()
+        conn.close()
+        assert state.get("units") == [("E1", "DISPATCHED")]
+        assert state.get("roster") == []
+        assert len(unit_calls) == 2 and len(roster_calls) == 1
+        stats = state.stats()
+        assert stats["tracking"] is True
+        assert stats["sections"]["units"]["hits"] == 1
+        assert stats["sections"]["roster"]["hits"] == 1
+
+    def test_rolled_back_unit_is_never_cached(self, board):
+        """Reads inside a unit of work see its uncommitted rows but do not
+        cache them: after a rollback, a later commit that reaches the same
+        version must not serve the rolled-back value."""
+        import sqlite3
+        from app.db import get_conn, unit_of_work
+        path, state = board
+        calls = []
+        state.register("units", self._loader(path, "SELECT * FROM Units", calls), ("Units",))
+        assert state.get("units") == [("E1", "AVAILABLE")]
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work(path):
+                conn = get_conn(path)
+                conn.execute("UPDATE Units SET status = 'PHANTOM' WHERE unit_id = 'E1'")
+                assert state.get("units") == [("E1", "PHANTOM")]
+                raise RuntimeError("roll back")
+
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE Units SET status = 'ENROUTE' WHERE unit_id = 'E1'")
+        conn.commit()
+        conn.close()
+        assert state.get("units") == [("E1", "ENROUTE")]
+        assert state.stats()["uncached_reads"] == 1
+
+    def test_dailylog_versions_are_their_own_migration_step(self, tmp_path):
+        import sqlite3
+        from app.board import install_board_versions, install_dailylog_version
+        conn = sqlite3.connect(str(tmp_path / "steps.db"))
+        try:
+            conn.executescript(
+                "CREATE TABLE Units (unit_id TEXT PRIMARY KEY);"
+                "CREATE TABLE DailyLog (id INTEGER PRIMARY KEY, details TEXT);"
+            )
+            assert install_board_versions(conn) == ["Units"]
+            assert install_dailylog_version(conn) == ["DailyLog"]
+            conn.execute("INSERT INTO DailyLog (details) VALUES ('x')")
+            versions = dict(conn.execute("SELECT name, version FROM board_versions").fetchall())
+        finally:
+            conn.close()
+        assert versions == {"Units": 0, "DailyLog": 1}
+
+    def test_untracked_database_reads_through(self, tmp_path):
+        import sqlite3
+        from app.board import BoardState
+        path = str(tmp_path / "plain.db")
+        sqlite3.connect(path).close()
+        state = BoardState(db_path=path)
+        calls = []
+        state.register("units", lambda: calls.append(1) or len(calls), ("Units",))
+        assert state.get("units") == 1 and state.get("units") == 2
+        assert state.stats()["uncached_reads"] == 2
+
+    def test_unknown_table_rejected(self, board):
+        _, state = board
+        with pytest.raises(ValueError):
+            state.register("log", lambda: [], ("Messages",))
+
+    def test_units_panel_follows_status_change(self, dispatcher_session, seeded_db):
+        import main
+        from app.board import board_section, board_state_stats
+        from tests.conftest import get_test_db
+        dispatcher_session.get("/panel/units")
+        r = dispatcher_session.get("/panel/units")
+        assert r.status_code == 200 and "UTV2" in r.text
+        hits = board_state_stats()["sections"]["units"]["hits"]
+        board_section("units")
+        assert board_state_stats()["sections"]["units"]["hits"] == hits + 1
+
+        conn = get_test_db()
+        conn.execute("UPDATE Units SET status = 'OOS' WHERE unit_id = 'UTV2'")
+        conn.commit()
+        conn.close()
+        try:
+            units = {u["unit_id"]: u for u in main.get_units_for_panel()}
+            assert units["UTV2"]["status"] == "OOS"
+        finally:
+            conn = get_test_db()
+            conn.execute("UPDATE Units SET status = 'AVAILABLE' WHERE unit_id = 'UTV2'")
+            conn.commit()
+            conn.close()
+
+    def test_incident_ages_computed_at_render(self, seeded_db, monkeypatch):
+        """Sections cache raw timestamps; a quiet board still ages."""
+        import main
+        from tests.conftest import get_test_db
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, is_draft, created, updated) "
+            "VALUES ('AGE-0001', 'TEST', 'AGE TEST', 'HELD', 0, '2026-01-01 00:00:00', '')"
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        try:
+            cached = main.board_state.board_section("held")
+            assert cached and all("age" not in i for i in cached)
+            monkeypatch.setattr(main, "_format_age", lambda ts: f"AGE {ts}")
+            held = {i["incident_id"]: i["age"] for i in main.panel_held()}
+            assert held[inc_id] == "AGE 2026-01-01 00:00:00"
+            assert all("age" not in i for i in main.board_state.board_section("held"))
+        finally:
+            conn = get_test_db()
+            conn.execute("DELETE FROM Incidents WHERE incident_id = ?", (inc_id,))
+            conn.commit()
+            conn.close()
+
+    def test_health_reports_board_state(self, client, seeded_db):
+        data = client.get("/api/health").json()["board_state"]
+        assert data["tracking"] is True
+        assert {"units", "assignments", "active", "open", "held"} <= set(data["sections"])
+
+
+class TestBoardReconciler:
+    """Ghost assignments are repaired in the background; panel reads never write."""
+
+    def test_units_panel_takes_no_write_lock(self, dispatcher_session, seeded_db):
+        from app.db import lock_stats, reset_lock_stats
+        dispatcher_session.get("/panel/units")
+        reset_lock_stats()
+        r = dispatcher_session.get("/panel/units")
+        assert r.status_code == 200
+        assert lock_stats()["holds"] == 0
+
+    def test_repairs_ghost_assignment_and_unit(self, seeded_db):
+        from app.board import reconciler_stats, run_board_reconcile
+        from tests.conftest import db_query, get_test_db
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, created, updated) "
+            "VALUES ('GHOST-0001', 'TEST', 'GHOST TEST', 'CLOSED', '', '')"
+        ).lastrowid
+        conn.execute("INSERT INTO UnitAssignments (incident_id, unit_id, assigned) VALUES (?, 'UTV2', 'x')", (inc_id,))
+        conn.execute("UPDATE Units SET status = 'ENROUTE' WHERE unit_id = 'UTV2'")
+        conn.commit()
+        conn.close()
+        try:
+            fixes = run_board_reconcile()
+            assert fixes["ghost_assignments"] == [f"UTV2 on closed incident {inc_id}"]
+            assert "UTV2 ENROUTE -> AVAILABLE" in fixes["idle_unit_status"]
+            assert db_query("SELECT cleared FROM UnitAssignments WHERE incident_id = ?", (inc_id,))[0]["cleared"]
+            assert db_query("SELECT status FROM Units WHERE unit_id = 'UTV2'")[0]["status"] == "AVAILABLE"
+            assert run_board_reconcile() == {}
+            stats = reconciler_stats()
+            assert stats["repairs"]["ghost_assignments"]["fixed"] >= 1
+            assert any(r["repair"] == "ghost_assignments" for r in stats["recent"])
+        finally:
+            conn = get_test_db()
+            conn.execute("DELETE FROM UnitAssignments WHERE incident_id = ?", (inc_id,))
+            conn.execute("DELETE FROM Incidents WHERE incident_id = ?", (inc_id,))
+            conn.execute("UPDATE Units SET status = 'AVAILABLE' WHERE unit_id = 'UTV2'")
+            conn.commit()
+            conn.close()
+
+    def _wake_probe(self, tmp_path, close):
+        """Start a reconciler on a scratch database, run close(path) after
+        its startup pass and return how many passes ran."""
+        import sqlite3
+        import time
+        from app.board import BoardReconciler
+        path = str(tmp_path / "rec.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE Incidents (incident_id INTEGER PRIMARY KEY, status TEXT)")
+        conn.close()
+        runs = []
+        rec = BoardReconciler(db_path=path, interval_s=3600, min_spacing_s=0)
+        rec.register("probe", lambda: runs.append(1) or [])
+        rec.start()
+        try:
+            deadline = time.time() + 2
+            while len(runs) < 1 and time.time() < deadline:
+                time.sleep(0.01)
+            assert len(runs) == 1  # startup pass
+            close(path)
+            deadline = time.time() + 2
+            while len(runs) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            return len(runs)
+        finally:
+            rec.stop()
+
+    def test_incidents_commit_wakes_thread(self, tmp_path):
+        from app.db import get_conn
+
+        def close(path):
+            conn = get_conn(path)
+            try:
+                conn.execute("INSERT INTO Incidents (status) VALUES ('CLOSED')")
+                conn.commit()
+            finally:
+                conn.close()
+
+        assert self._wake_probe(tmp_path, close) == 2
+
+    def test_close_in_unit_of_work_wakes_thread(self, tmp_path):
+        from app.db import get_conn, unit_of_work
+
+        def close(path):
+            with unit_of_work(path):
+                get_conn(path).execute("INSERT INTO Incidents (status) VALUES ('CLOSED')")
+
+        assert self._wake_probe(tmp_path, close) == 2
+
+
+class TestPanelFragments:
+    """Polled panels answer 304 until a write to their tables or a view change."""
+
+    def test_active_panel_not_modified_until_write(self, dispatcher_session, seeded_db):
+        from app.board import panel_cache_stats
+        from tests.conftest import get_test_db
+        first = dispatcher_session.get("/panel/active")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert "no-store" not in first.headers["cache-control"]
+
+        before = panel_cache_stats()["panels"]["active"]["not_modified"]
+        again = dispatcher_session.get("/panel/active", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.content == b""
+        assert panel_cache_stats()["panels"]["active"]["not_modified"] == before + 1
+
+        # A write from outside the app (another worker) moves the version
+        conn = get_test_db()
+        conn.execute("UPDATE Units SET status = status WHERE unit_id = 'UTV2'")
+        conn.commit()
+        conn.close()
+        changed = dispatcher_session.get("/panel/active", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_units_etag_follows_roster_view_mode(self, dispatcher_session, seeded_db):
+        tags = {}
+        try:
+            for mode in ("ALL", "CURRENT"):
+                r = dispatcher_session.post("/api/session/roster_view_mode", json={"mode": mode})
+                assert r.status_code == 200
+                tags[mode] = dispatcher_session.get("/panel/units").headers["etag"]
+        finally:
+            dispatcher_session.post("/api/session/roster_view_mode", json={"mode": "CURRENT"})
+        assert tags["ALL"] != tags["CURRENT"]
+        r = dispatcher_session.get("/panel/units", headers={"If-None-Match": tags["CURRENT"]})
+        assert r.status_code == 304
+
+    def test_dailylog_rows_keyed_on_filters(self, dispatcher_session, seeded_db):
+        a = dispatcher_session.get("/panel/dailylog_rows?limit=100")
+        b = dispatcher_session.get("/panel/dailylog_rows?limit=200")
+        assert a.status_code == b.status_code == 200
+        assert a.headers["etag"] != b.headers["etag"]
+
+    def test_fragment_lru_and_etag_matching(self):
+        from app.board import PanelFragments, etag_matches
+        frags = PanelFragments(capacity=2)
+        frags.register("open", ("Incidents",))
+        frags.register("held", ("Incidents",), age_bucket_s=60)
+        tag = frags.etag("open", (), versions={"Incidents": 3})
+        assert tag == frags.etag("open", (), versions={"Incidents": 3})
+        assert tag != frags.etag("open", (), versions={"Incidents": 4})
+        assert tag != frags.etag("held", (), versions={"Incidents": 3})
+        assert etag_matches(f'"x", {tag}', tag)
+        assert etag_matches(tag[2:], tag) and etag_matches("*", tag)
+        assert not etag_matches(None, tag) and not etag_matches('"x"', tag)
+
+        for i in range(3):
+            frags.put("open", f"t{i}", b"<div></div>")
+        assert frags.get("open", "t0") is None
+        assert frags.get("open", "t2") == b"<div></div>"
+        stats = frags.stats()
+        assert stats["cached"] == 2 and stats["panels"]["open"]["rendered"] == 3
+
+    def test_unknown_table_rejected(self):
+        from app.board import PanelFragments
+        with pytest.raises(ValueError):
+            PanelFragments().register("log", ("Messages",))
+
+
 # ============================================================================
 # THEMES
 # ============================================================================
@@ -148,6 +1137,154 @@ class TestEventStream:
         assert resp.status_code == 200
 
 
+def _es_payload(event_id, incident_id=None, unit_id=None, category="unit"):
+    return {"id": event_id, "timestamp": "2026-02-04 14:00:00", "event_type": "UNIT_STATUS",
+            "category": category, "severity": "info", "incident_id": incident_id,
+            "unit_id": unit_id, "user": "T", "summary": f"event {event_id}", "shift": "A"}
+
+
+class TestEventReplay:
+    """Reconnecting clients get the events they missed."""
+
+    def _table(self, tmp_path, ids):
+        import sqlite3
+        path = str(tmp_path / "replay.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE event_stream (id INTEGER PRIMARY KEY, timestamp TEXT, event_type TEXT, "
+            "category TEXT, severity TEXT, incident_id INTEGER, unit_id TEXT, user TEXT, "
+            "summary TEXT, details_json TEXT, shift TEXT)"
+        )
+        for i in ids:
+            p = _es_payload(i)
+            conn.execute(
+                "INSERT INTO event_stream (id, timestamp, event_type, category, severity, "
+                "incident_id, unit_id, user, summary, shift) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                tuple(p.values()),
+            )
+        conn.commit()
+        conn.close()
+        return path
+
+    def test_ring_then_table_fallback(self, tmp_path):
+        from app.eventstream.replay import EventReplay
+        replay = EventReplay(capacity=5, db_path=self._table(tmp_path, range(1, 21)))
+        for i in range(11, 21):
+            replay.remember(_es_payload(i))
+
+        events, complete = replay.since(17)
+        assert [e["id"] for e in events] == [18, 19, 20] and complete
+        assert replay.stats()["from_ring"] == 1
+
+        # 11..15 were evicted from the ring: read from the table
+        events, complete = replay.since(12)
+        assert [e["id"] for e in events] == list(range(13, 21)) and complete
+        assert events[0]["summary"] == "event 13"
+        assert replay.stats()["from_table"] == 1
+
+    def test_incomplete_gaps(self, tmp_path):
+        from app.eventstream.replay import EventReplay
+        replay = EventReplay(capacity=5, db_path=self._table(tmp_path, range(1, 21)))
+        events, complete = replay.since(0, limit=10)
+        assert len(events) == 10 and not complete
+        # An id this database never issued
+        assert replay.since(500) == ([], False)
+        replay.remember(_es_payload(21))
+        assert replay.since(500) == ([], False)
+
+    def test_websocket_resume(self, monkeypatch):
+        import asyncio
+        from app.eventstream import replay as replay_mod
+        from app.messaging.panel_push import PanelPush
+        from app.messaging import panel_push as push_mod
+        from app.messaging.websocket import MessageBroadcaster, event_topic
+
+        ring = replay_mod.EventReplay(capacity=50)
+        for i in range(1, 6):
+            ring.remember(_es_payload(i, unit_id="E12" if i % 2 else "L3"))
+        monkeypatch.setattr(replay_mod, "_replay", ring)
+        push = PanelPush()
+        push._seq = 9
+        push._history.extend([(8, ["units"], []), (9, ["active"], [41])])
+        monkeypatch.setattr(push_mod, "_panel_push", push)
+
+        async def main():
+            bc = MessageBroadcaster()
+            ws = _FakeSocket()
+            await bc.connect(ws, "E12", topics="unit:E12", last_event_id=2, panel_seq=7)
+            await bc.broadcast("event_stream", _es_payload(6, unit_id="E12"),
+                               topic=event_topic(None, "E12", "unit", "info"))
+            await asyncio.sleep(0.05)
+            await bc.disconnect(ws)
+            return ws.received
+
+        received = asyncio.run(main())
+        kinds = [m["type"] for m in received]
+        assert kinds == ["connected", "event_stream", "event_stream",
+                         "panel_dirty", "replay_done", "event_stream"]
+        assert [m["id"] for m in received if m["type"] == "event_stream"] == [3, 5, 6]
+        notice = received[3]
+        assert notice["replay"] and notice["complete"] and notice["seq"] == 9
+        assert notice["panels"] == ["active", "units"] and notice["incident_ids"] == [41]
+        assert received[4]["last_event_id"] == 5 and received[4]["complete"] is True
+
+    def test_websocket_resume_skips_duplicates(self, monkeypatch):
+        import asyncio
+        from app.eventstream import replay as replay_mod
+        from app.messaging.websocket import MessageBroadcaster, encode_frame
+
+        ring = replay_mod.EventReplay(capacity=50)
+        for i in range(1, 4):
+            ring.remember(_es_payload(i))
+        monkeypatch.setattr(replay_mod, "_replay", ring)
+
+        async def main():
+            bc = MessageBroadcaster()
+            ws = _FakeSocket()
+            await bc.connect(ws, "WSPROBE")
+            outbox = bc._outboxes[ws]
+            # Live frames that arrived while events_since ran: a copy of a
+            # replayed event, then a new one
+            outbox.hold = [encode_frame("event_stream", _es_payload(3)),
+                           encode_frame("event_stream", _es_payload(4))]
+            await bc.replay(outbox, 1)
+            await asyncio.sleep(0.05)
+            await bc.disconnect(ws)
+            return ws.received
+
+        received = asyncio.run(main())
+        assert [m["type"] for m in received] == ["connected", "event_stream", "event_stream",
+                                                 "replay_done", "event_stream"]
+        assert [m["id"] for m in received if m["type"] == "event_stream"] == [2, 3, 4]
+
+    def test_sse_resume_skips_duplicates(self, monkeypatch):
+        import asyncio
+        from app.eventstream import replay as replay_mod
+        from app.messaging.websocket import get_sse_manager, sse_event_generator
+
+        ring = replay_mod.EventReplay(capacity=50)
+        for i in range(1, 4):
+            ring.remember(_es_payload(i))
+        monkeypatch.setattr(replay_mod, "_replay", ring)
+
+        async def main():
+            gen = sse_event_generator("SSEPROBE", last_event_id=1)
+            frames = [await gen.__anext__() for _ in range(3)]
+            # Live copy of a replayed event, then a new one
+            sse = get_sse_manager()
+            await sse.broadcast_event("event_stream", _es_payload(3))
+            await sse.broadcast_event("event_stream", _es_payload(4))
+            frames.append(await gen.__anext__())
+            await gen.aclose()
+            return frames
+
+        frames = asyncio.run(main())
+        assert frames[0].startswith("id: 2\nevent: event_stream\n")
+        assert frames[1].startswith("id: 3\n")
+        assert frames[2].startswith("event: replay_done\n")
+        assert frames[3].startswith("id: 4\n")
+
+
 # ============================================================================
 # PLAYBOOKS
 # ============================================================================
@@ -0,0 +1,1145 @@
+"""
+FORD-CAD — Database Layer Tests
+================================
+Tests: Connection pool, schema registry, migrations, DB executor,
+       audit writer, unit of work, reporting snapshot, cold-storage archive,
+       maintenance jobs, write-lock telemetry, leader leases (app/db)
+"""
+
+import pytest
+from tests.conftest import TEST_DB_PATH
+
+
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+
+class TestConnectionPool:
+    """Pooled connections: pragmas, reuse, rollback on release."""
+
+    def test_wal_and_pragmas(self, seeded_db):
+        from app.db import get_conn
+        conn = get_conn()
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+        finally:
+            conn.close()
+
+    def test_close_returns_connection_to_pool(self, seeded_db):
+        from app.db import get_conn
+        conn = get_conn()
+        conn.close()
+        again = get_conn()
+        try:
+            assert again is conn
+        finally:
+            again.close()
+
+    def test_double_close_is_noop(self, seeded_db):
+        from app.db import get_conn
+        conn = get_conn()
+        conn.close()
+        conn.close()
+        a, b = get_conn(), get_conn()
+        try:
+            assert a is not b
+        finally:
+            a.close()
+            b.close()
+
+    def test_uncommitted_work_rolled_back_on_release(self, seeded_db):
+        from app.db import get_conn
+        conn = get_conn()
+        conn.execute("INSERT INTO Contacts (name, created, updated) VALUES ('POOL ROLLBACK', '', '')")
+        conn.close()
+
+        conn = get_conn()
+        try:
+            row = conn.execute("SELECT COUNT(*) FROM Contacts WHERE name = 'POOL ROLLBACK'").fetchone()
+            assert row[0] == 0
+        finally:
+            conn.close()
+
+    def test_row_factory_reset_per_checkout(self, seeded_db):
+        from app.db import get_conn
+        conn = get_conn(row_factory=None)
+        assert conn.execute("SELECT 1 AS x").fetchone() == (1,)
+        conn.close()
+        conn = get_conn()
+        try:
+            assert conn.execute("SELECT 1 AS x").fetchone()["x"] == 1
+        finally:
+            conn.close()
+
+    def test_main_uses_configured_db(self, seeded_db):
+        import os
+        from app.db import get_db_path
+        assert os.path.abspath(str(get_db_path())) == os.path.abspath(TEST_DB_PATH)
+
+
+# ============================================================================
+# SCHEMA REGISTRY
+# ============================================================================
+
+class TestSchemaRegistry:
+    """Cached column sets / table flags loaded after migrations."""
+
+    def test_core_columns_cached(self, seeded_db):
+        from app.db import get_schema
+        reg = get_schema(TEST_DB_PATH)
+        assert reg.has_table("UnitAssignments")
+        assert reg.has_table("unitassignments")
+        assert "cleared" in reg.columns("UnitAssignments")
+        assert reg.has_column("MasterLog", "EVENT_TYPE")
+        assert not reg.has_table("NoSuchTable")
+        assert reg.columns("NoSuchTable") == frozenset()
+
+    def test_lookups_do_not_reload(self, seeded_db):
+        from app.db import get_schema
+        reg = get_schema(TEST_DB_PATH)
+        reg.columns("Incidents")
+        loads = reg.loads
+        for _ in range(20):
+            reg.columns("MasterLog")
+            reg.has_table("Narrative")
+        assert reg.loads == loads
+
+    def test_refresh_picks_up_new_table(self, seeded_db):
+        from app.db import get_conn, get_schema, refresh_schema
+        conn = get_conn(TEST_DB_PATH)
+        conn.execute("CREATE TABLE IF NOT EXISTS registry_probe (id INTEGER)")
+        conn.commit()
+        conn.close()
+        reg = get_schema(TEST_DB_PATH)
+        refresh_schema(TEST_DB_PATH)
+        assert reg.has_table("registry_probe")
+
+
+# ============================================================================
+# MIGRATIONS
+# ============================================================================
+
+class TestMigrations:
+    """PRAGMA user_version-tracked schema steps run once at startup."""
+
+    def test_startup_reaches_latest_version(self, seeded_db):
+        from app.db import latest_version, migration_status
+        status = migration_status(TEST_DB_PATH)
+        assert status["latest_version"] == latest_version() > 0
+        assert status["current_version"] == status["latest_version"]
+
+    def test_rerun_is_noop(self, seeded_db):
+        from app.db import run_migrations
+        assert run_migrations(TEST_DB_PATH) == []
+
+    def test_module_tables_created(self, seeded_db):
+        from app.db import has_table
+        for table in ("UserSettings", "event_stream", "report_templates"):
+            assert has_table(table, TEST_DB_PATH), table
+
+
+# ============================================================================
+# DB EXECUTOR
+# ============================================================================
+
+class TestDBExecutor:
+    """Blocking queries run on the bounded DB worker pool, not the event loop."""
+
+    def test_fetch_runs_off_loop_thread(self, seeded_db):
+        import asyncio
+        import threading
+        from app.db import run_db, db_fetchone
+
+        async def go():
+            loop_thread = threading.get_ident()
+            worker = await run_db(threading.get_ident)
+            row = await db_fetchone("SELECT COUNT(*) AS n FROM Units")
+            return loop_thread, worker, row["n"]
+
+        loop_thread, worker, n = asyncio.run(go())
+        assert worker != loop_thread
+        assert n > 0
+
+    def test_loop_stays_responsive_during_slow_query(self, seeded_db):
+        import asyncio
+        import time
+        from app.db import run_db
+
+        async def go():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            t = asyncio.create_task(ticker())
+            await run_db(time.sleep, 0.3)
+            t.cancel()
+            return ticks
+
+        assert asyncio.run(go()) >= 10
+
+    def test_queue_depth_metrics(self, seeded_db):
+        import asyncio
+        import time
+        from app.db import DBExecutor
+
+        ex = DBExecutor(workers=1, max_pending=2)
+
+        async def go():
+            await asyncio.gather(*(ex.run(time.sleep, 0.02) for _ in range(5)))
+
+        try:
+            asyncio.run(go())
+            stats = ex.stats()
+        finally:
+            ex.shutdown()
+        assert stats["completed"] == 5
+        assert stats["queue_depth"] == 0
+        assert stats["max_queue_depth"] == 2
+        assert stats["max_waiting"] >= 1
+        assert stats["max_wait_ms"] > 0
+
+    def test_health_reports_executor(self, client):
+        r = client.get("/api/health")
+        assert r.status_code == 200
+        assert "queue_depth" in r.json()["db_executor"]
+
+    def test_app_routers_run_no_sql_on_loop(self):
+        """async handlers in app/* routers hand their SQL to run_db (or are
+        plain def, run by Starlette's threadpool)."""
+        import ast
+        from pathlib import Path
+
+        def inline_sql(fn):
+            todo = list(fn.body)
+            while todo:
+                node = todo.pop()
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                    continue
+                if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                        and node.func.attr in ("execute", "executemany", "commit")):
+                    yield node.lineno
+                todo.extend(ast.iter_child_nodes(node))
+
+        offenders = []
+        root = Path(__file__).resolve().parent.parent / "app"
+        for path in sorted(root.glob("*/*routes.py")):
+            for fn in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+                if isinstance(fn, ast.AsyncFunctionDef):
+                    offenders += [f"{path.relative_to(root)}:{line} {fn.name}" for line in inline_sql(fn)]
+        assert offenders == []
+
+
+# ============================================================================
+# AUDIT WRITER
+# ============================================================================
+
+class TestAuditWriter:
+    """Append-only audit rows are group-committed by one writer thread."""
+
+    def _writer(self, **kw):
+        from app.db import AuditWriter
+        w = AuditWriter(TEST_DB_PATH, batch_ms=kw.pop("batch_ms", 50), **kw)
+        w.start()
+        return w
+
+    def _count(self, where):
+        from tests.conftest import db_count
+        return db_count("MasterLog", where)
+
+    def test_rows_group_committed(self, seeded_db):
+        w = self._writer()
+        try:
+            for i in range(20):
+                w.insert(
+                    "INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', ?, 'AUDIT_GROUP')",
+                    (f"A{i}",),
+                )
+            assert w.flush()
+            stats = w.stats()
+        finally:
+            w.stop()
+        assert self._count("event_type = 'AUDIT_GROUP'") == 20
+        assert stats["written"] == 20
+        assert stats["batches"] < 20
+
+    def test_bad_row_does_not_drop_batch(self, seeded_db):
+        w = self._writer()
+        try:
+            w.insert("INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', 'X', 'AUDIT_OK')")
+            w.insert("INSERT INTO NoSuchTable (x) VALUES (1)")
+            w.insert("INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', 'Y', 'AUDIT_OK')")
+            w.flush()
+            stats = w.stats()
+        finally:
+            w.stop()
+        assert self._count("event_type = 'AUDIT_OK'") == 2
+        assert stats["failed"] == 1
+
+    def test_on_commit_receives_rowid(self, seeded_db):
+        got = []
+        w = self._writer()
+        try:
+            w.insert(
+                "INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', 'Z', 'AUDIT_ID')",
+                on_commit=got.append,
+            )
+            w.flush()
+        finally:
+            w.stop()
+        assert len(got) == 1 and got[0] > 0
+
+    def test_stopped_writer_writes_synchronously(self, seeded_db):
+        from app.db import AuditWriter
+        w = AuditWriter(TEST_DB_PATH)
+        w.insert("INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', 'S', 'AUDIT_SYNC')")
+        assert self._count("event_type = 'AUDIT_SYNC'") == 1
+        assert w.stats()["sync_writes"] == 1
+
+    def test_stop_commits_queue(self, seeded_db):
+        w = self._writer(batch_ms=1000)
+        w.insert("INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', 'Q', 'AUDIT_STOP')")
+        w.stop()
+        assert self._count("event_type = 'AUDIT_STOP'") == 1
+
+    def test_playbooks_see_committed_event(self, seeded_db, monkeypatch):
+        """Playbooks for an emitted event run only once its row is
+        committed, on the playbook worker rather than the audit writer."""
+        import sqlite3
+        import threading
+        import app.db.audit as audit
+        import app.playbooks.engine as engine
+        from app.eventstream.emitter import emit_event, flush_playbooks
+
+        seen = []
+
+        def fake_evaluate(event_type, context):
+            conn = sqlite3.connect(TEST_DB_PATH)
+            try:
+                seen.append((conn.execute(
+                    "SELECT COUNT(*) FROM event_stream WHERE event_type = ?", (event_type,)
+                ).fetchone()[0], threading.current_thread().name))
+            finally:
+                conn.close()
+
+        w = self._writer(batch_ms=200)
+        monkeypatch.setattr(audit, "_writer", w)
+        monkeypatch.setattr(engine, "evaluate_playbooks", fake_evaluate)
+        try:
+            assert emit_event("PLAYBOOK_ORDER_PROBE", summary="probe")
+            assert seen == []
+            assert w.flush()
+            assert flush_playbooks(5)
+        finally:
+            w.stop()
+        assert [count for count, _ in seen] == [1]
+        assert seen[0][1].startswith("cad-playbooks")
+
+    def test_slow_playbook_does_not_stall_group_commit(self, seeded_db, monkeypatch):
+        import threading
+        import app.db.audit as audit
+        import app.playbooks.engine as engine
+        from app.eventstream.emitter import emit_event, flush_playbooks
+
+        started, release = threading.Event(), threading.Event()
+
+        def slow_evaluate(event_type, context):
+            started.set()
+            release.wait(5)
+
+        w = self._writer(batch_ms=10)
+        monkeypatch.setattr(audit, "_writer", w)
+        monkeypatch.setattr(engine, "evaluate_playbooks", slow_evaluate)
+        try:
+            assert emit_event("PLAYBOOK_SLOW_PROBE", summary="probe")
+            assert started.wait(5)
+            w.insert("INSERT INTO MasterLog (timestamp, user, action, event_type) "
+                     "VALUES ('', 'T', 'S', 'PLAYBOOK_NO_STALL')")
+            assert w.flush(timeout=2)
+            assert self._count("event_type = 'PLAYBOOK_NO_STALL'") == 1
+        finally:
+            release.set()
+            flush_playbooks(5)
+            w.stop()
+
+    def test_request_audit_visible_after_response(self, dispatcher_session, seeded_db):
+        from tests.conftest import db_count
+        before = db_count("MasterLog")
+        r = dispatcher_session.post("/api/admin/noop_audit_probe", json={})
+        assert r.status_code in (404, 405)
+        # Fallback MasterLog row is committed before the response returns
+        conn = __import__("sqlite3").connect(TEST_DB_PATH)
+        try:
+            after = conn.execute("SELECT COUNT(*) FROM MasterLog").fetchone()[0]
+        finally:
+            conn.close()
+        assert after == before + 1
+
+
+# ============================================================================
+# UNIT OF WORK
+# ============================================================================
+
+class TestUnitOfWork:
+    """One connection / one commit for state change + audit trail."""
+
+    def test_nested_get_conn_shares_transaction(self, seeded_db):
+        from app.db import get_conn, unit_of_work
+        from tests.conftest import db_count
+        with unit_of_work():
+            a = get_conn()
+            a.execute("INSERT INTO Contacts (name, created, updated) VALUES ('UOW SHARED', '', '')")
+            a.commit()   # deferred
+            a.close()    # no-op
+            b = get_conn()
+            assert b.execute("SELECT COUNT(*) FROM Contacts WHERE name = 'UOW SHARED'").fetchone()[0] == 1
+        assert db_count("Contacts", "name = 'UOW SHARED'") == 1
+
+    def test_exception_rolls_back_state_and_audit(self, seeded_db):
+        from app.db import audit_insert, get_conn, unit_of_work
+        from tests.conftest import db_count
+        hooks = []
+        with pytest.raises(RuntimeError):
+            with unit_of_work() as uow:
+                conn = get_conn()
+                conn.execute("INSERT INTO Contacts (name, created, updated) VALUES ('UOW ROLLBACK', '', '')")
+                audit_insert(
+                    "INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', 'R', 'UOW_ROLLBACK')",
+                    on_commit=hooks.append,
+                )
+                uow.after_commit(hooks.append, "hook")
+                raise RuntimeError("boom")
+        assert db_count("Contacts", "name = 'UOW ROLLBACK'") == 0
+        assert db_count("MasterLog", "event_type = 'UOW_ROLLBACK'") == 0
+        assert hooks == []
+
+    def test_audit_committed_with_unit_and_hooks_after(self, seeded_db):
+        from app.db import audit_insert, unit_of_work
+        from tests.conftest import db_count
+        seen = []
+        with unit_of_work():
+            audit_insert(
+                "INSERT INTO MasterLog (timestamp, user, action, event_type) VALUES ('', 'T', 'C', 'UOW_COMMIT')",
+                on_commit=lambda rowid: seen.append((rowid, db_count("MasterLog", "event_type = 'UOW_COMMIT'"))),
+            )
+            assert seen == []
+        assert len(seen) == 1
+        rowid, visible = seen[0]
+        assert rowid > 0 and visible == 1
+
+    def test_commit_listeners_hear_unit_tables(self, seeded_db):
+        from app.db import add_commit_listener, get_conn, remove_commit_listener, unit_of_work
+        heard = []
+
+        def listener(db_path, tables):
+            heard.append(tables)
+
+        add_commit_listener(listener)
+        try:
+            with unit_of_work():
+                conn = get_conn()
+                conn.execute("INSERT INTO Contacts (name, created, updated) VALUES ('UOW HEARD', '', '')")
+                conn.executemany("UPDATE Units SET last_updated = ? WHERE unit_id = ?", [("", "BATT4")])
+                assert heard == []
+            with pytest.raises(RuntimeError):
+                with unit_of_work():
+                    get_conn().execute("INSERT INTO Contacts (name, created, updated) VALUES ('UOW UNHEARD', '', '')")
+                    raise RuntimeError("boom")
+        finally:
+            remove_commit_listener(listener)
+        assert heard == [frozenset({"Contacts", "Units"})]
+
+    def test_rollback_call_marks_unit_rollback_only(self, seeded_db):
+        from app.db import get_conn, unit_of_work
+        from tests.conftest import db_count
+        with unit_of_work():
+            conn = get_conn()
+            conn.execute("INSERT INTO Contacts (name, created, updated) VALUES ('UOW RB ONLY', '', '')")
+            conn.rollback()
+        assert db_count("Contacts", "name = 'UOW RB ONLY'") == 0
+
+    def test_dispatch_writes_history_in_same_unit(self, dispatcher_session, seeded_db):
+        from app.db import audit_stats
+        from tests.conftest import db_count, get_test_db
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, created, updated) "
+            "VALUES ('UOW-0001', 'TEST', 'UOW TEST', 'OPEN', '', '')"
+        ).lastrowid
+        conn.execute("UPDATE UnitAssignments SET cleared = 'x' WHERE unit_id = 'UTV1' AND cleared IS NULL")
+        conn.execute("UPDATE Units SET status = 'AVAILABLE' WHERE unit_id = 'UTV1'")
+        conn.commit()
+        conn.close()
+
+        before = audit_stats()["in_unit"]
+        resp = dispatcher_session.post("/dispatch/unit_to_incident", json={
+            "incident_id": inc_id,
+            "units": ["UTV1"],
+        })
+        assert resp.json()["ok"] is True, resp.json()
+        assert audit_stats()["in_unit"] > before
+        assert db_count("IncidentHistory", "incident_id = ? AND event_type = 'DISPATCH'", (inc_id,)) == 1
+
+        # Leave UTV1 available for other tests
+        conn = get_test_db()
+        conn.execute("UPDATE UnitAssignments SET cleared = 'x' WHERE unit_id = 'UTV1' AND cleared IS NULL")
+        conn.execute("UPDATE Units SET status = 'AVAILABLE' WHERE unit_id = 'UTV1'")
+        conn.execute("UPDATE Incidents SET status = 'CLOSED' WHERE incident_id = ?", (inc_id,))
+        conn.commit()
+        conn.close()
+
+
+    def test_status_update_unit_runs_on_db_worker(self, dispatcher_session, seeded_db, monkeypatch):
+        """The unit of work is opened on a DB worker thread, and an invalid
+        status is rejected without opening one."""
+        import threading
+        import main
+        from app.db.pool import ACTIVE_UOW
+        seen = []
+
+        def fake_tx(incident_id, unit_id, new_status, user):
+            seen.append((threading.current_thread().name, ACTIVE_UOW.get() is not None))
+            return {"ok": True}
+
+        monkeypatch.setattr(main, "_unit_status_update_tx", fake_tx)
+        r = dispatcher_session.post("/incident/1/unit/UTV1/status", json={"status": "NOT_A_STATUS"})
+        assert r.json()["ok"] is False
+        assert seen == []
+
+        r = dispatcher_session.post("/incident/1/unit/UTV1/status", json={"status": "ENROUTE"})
+        assert r.json() == {"ok": True}
+        assert len(seen) == 1
+        thread_name, in_unit = seen[0]
+        assert thread_name.startswith("cad-db") and in_unit
+
+    def test_cli_swap_runs_as_one_unit_on_db_worker(self, dispatcher_session, seeded_db, monkeypatch):
+        """Both swap dispatches share one unit on a DB worker, so a failing
+        second dispatch rolls back the clears as well."""
+        import threading
+        import main
+        from app.db.pool import ACTIVE_UOW
+        from tests.conftest import db_count
+        seen = []
+
+        def fake_dispatch(incident_id, units, user="Dispatcher", force=False):
+            seen.append((threading.current_thread().name, ACTIVE_UOW.get()))
+            if len(seen) == 2:
+                raise RuntimeError("second dispatch failed")
+            return {"ok": True, "assigned": list(units)}
+
+        monkeypatch.setattr(main, "dispatch_units_to_incident", fake_dispatch)
+        r = dispatcher_session.post("/api/cli/swap", json={"unit1": "E1", "unit2": "M1"})
+        assert r.status_code == 500
+
+        assert len(seen) == 2
+        assert all(name.startswith("cad-db") for name, _ in seen)
+        assert seen[0][1] is not None and seen[0][1] is seen[1][1]
+        assert db_count("UnitAssignments", "incident_id = 1 AND cleared IS NULL") == 2
+
+
+# ============================================================================
+# REPORTING SNAPSHOT
+# ============================================================================
+
+class TestReportingSnapshot:
+    """Reports and exports read a backup-API copy, not the live database."""
+
+    def _snapshot(self, tmp_path, max_age_s=300):
+        from app.db import ReportingSnapshot
+        return ReportingSnapshot(TEST_DB_PATH, directory=tmp_path, max_age_s=max_age_s)
+
+    def test_refresh_copies_database(self, seeded_db, tmp_path):
+        from tests.conftest import db_count
+        snap = self._snapshot(tmp_path)
+        conn = snap.connect(snap.refresh())
+        try:
+            got = conn.execute("SELECT COUNT(*) FROM Units").fetchone()[0]
+        finally:
+            conn.close()
+        assert got == db_count("Units")
+
+    def test_snapshot_isolated_from_later_writes(self, seeded_db, tmp_path):
+        from tests.conftest import get_test_db
+        snap = self._snapshot(tmp_path)
+        path = snap.refresh()
+        conn = get_test_db()
+        conn.execute("INSERT INTO Contacts (name, created, updated) VALUES ('SNAP LATER', '', '')")
+        conn.commit()
+        conn.close()
+        try:
+            reader = snap.connect(path)
+            try:
+                n = reader.execute("SELECT COUNT(*) FROM Contacts WHERE name = 'SNAP LATER'").fetchone()[0]
+            finally:
+                reader.close()
+            assert n == 0
+        finally:
+            conn = get_test_db()
+            conn.execute("DELETE FROM Contacts WHERE name = 'SNAP LATER'")
+            conn.commit()
+            conn.close()
+
+    def test_freshness_bound(self, seeded_db, tmp_path):
+        snap = self._snapshot(tmp_path, max_age_s=300)
+        first = snap.ensure_fresh()
+        assert snap.ensure_fresh() == first
+        assert snap.ensure_fresh(max_age_s=0) != first
+        assert snap.stats()["refreshes"] == 2
+
+    def test_pinned_generation_survives_refresh(self, seeded_db, tmp_path):
+        import os
+        snap = self._snapshot(tmp_path)
+        pinned = snap.pin()
+        snap.refresh()
+        snap.refresh()
+        assert os.path.exists(pinned)
+        snap.unpin(pinned)
+        assert not os.path.exists(pinned)
+
+    def test_reporting_snapshot_block_reads_one_generation(self, seeded_db):
+        from app.db import reporting_conn, reporting_snapshot
+        with reporting_snapshot() as path:
+            a = reporting_conn()
+            b = reporting_conn()
+            try:
+                files = {r[2] for c in (a, b) for r in c.execute("PRAGMA database_list")}
+            finally:
+                a.close()
+                b.close()
+        assert files == {path}
+
+    def test_report_engine_reads_snapshot(self, seeded_db):
+        from app.db import snapshot_stats
+        from app.reporting.engine import _get_conn
+        conn = _get_conn()
+        try:
+            path = conn.execute("PRAGMA database_list").fetchone()[2]
+        finally:
+            conn.close()
+        assert path == snapshot_stats()["path"]
+
+    def test_not_before_forces_newer_snapshot(self, seeded_db, tmp_path):
+        import time
+        snap = self._snapshot(tmp_path, max_age_s=300)
+        first = snap.ensure_fresh()
+        assert snap.ensure_fresh(not_before=time.time() - 60) == first
+        assert snap.ensure_fresh(not_before=time.time()) != first
+
+    def test_report_over_now_sees_fresh_write(self, seeded_db, monkeypatch):
+        """A report whose range reaches the present is not served from a
+        snapshot taken before the latest writes."""
+        from datetime import datetime, timedelta
+        from app.db import get_reporting_snapshot, reporting_conn
+        from app.reporting.engine import get_engine
+        from tests.conftest import get_test_db
+
+        # The suite runs with a zero age bound; use the production one
+        monkeypatch.setattr(get_reporting_snapshot(), "max_age_s", 300.0)
+        reporting_conn().close()    # a snapshot well inside the age bound
+        now = datetime.now()
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, created, updated) "
+            "VALUES ('SNAP-NOW-1', 'TEST', 'SNAPSHOT NOW', 'CLOSED', ?, ?)",
+            (now.strftime("%Y-%m-%d %H:%M:%S"),) * 2,
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        try:
+            data = get_engine().generate_report(
+                "custom", start_date=now - timedelta(hours=1), end_date=now + timedelta(hours=1),
+            )
+            assert "SNAP-NOW-1" in repr(data)
+        finally:
+            conn = get_test_db()
+            conn.execute("DELETE FROM Incidents WHERE incident_id = ?", (inc_id,))
+            conn.commit()
+            conn.close()
+
+    def test_preview_over_now_sees_fresh_write(self, dispatcher_session, seeded_db, monkeypatch):
+        """The preview route takes the same freshness bound as a report run."""
+        from datetime import datetime, timedelta
+        from app.db import get_reporting_snapshot, reporting_conn
+        from tests.conftest import get_test_db
+
+        monkeypatch.setattr(get_reporting_snapshot(), "max_age_s", 300.0)
+        reporting_conn().close()
+        now = datetime.now()
+        conn = get_test_db()
+        row_id = conn.execute(
+            "INSERT INTO DailyLog (action, details, user, timestamp) "
+            "VALUES ('NOTE', 'SNAPSHOT PREVIEW ROW', 'DISP1', ?)",
+            (now.strftime("%Y-%m-%d %H:%M:%S"),),
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        try:
+            r = dispatcher_session.get("/api/reporting/preview", params={
+                "template_key": "blotter",
+                "date_from": (now - timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "date_to": (now + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+            })
+            assert r.status_code == 200
+            assert "SNAPSHOT PREVIEW ROW" in r.text
+        finally:
+            conn = get_test_db()
+            conn.execute("DELETE FROM DailyLog WHERE id = ?", (row_id,))
+            conn.commit()
+            conn.close()
+
+    def test_health_reports_snapshot(self, client, seeded_db):
+        r = client.get("/api/health")
+        assert "generation" in r.json()["reporting_snapshot"]
+
+
+# ============================================================================
+# COLD-STORAGE ARCHIVE
+# ============================================================================
+
+class TestColdStorageArchive:
+    """Old closed incidents move to per-year archive files; history,
+    search and reports still see them."""
+
+    @pytest.fixture
+    def archived(self, seeded_db, tmp_path, monkeypatch):
+        """One closed 2018 call with children, archived into tmp_path."""
+        import datetime
+        import app.db.archive as archive
+        from app.db import archive_closed_incidents
+        from tests.conftest import get_test_db
+        monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path))
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, created, updated, closed_at) "
+            "VALUES ('ARCH-0001', 'ARCHTEST', 'ARCHIVE LANE', 'CLOSED', "
+            "'2018-03-04 10:00:00', '2018-03-04 11:00:00', '2018-03-04 11:00:00')"
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO UnitAssignments (incident_id, unit_id, assigned, cleared) "
+            "VALUES (?, 'E1', '2018-03-04 10:01:00', '2018-03-04 10:50:00')", (inc_id,)
+        )
+        conn.execute(
+            "INSERT INTO Narrative (incident_id, timestamp, text, user) "
+            "VALUES (?, '2018-03-04 10:05:00', 'ARCHIVED NARRATIVE', 'DISP1')", (inc_id,)
+        )
+        conn.commit()
+        conn.close()
+        moved = archive_closed_incidents(after_days=30, now=datetime.datetime(2018, 6, 1))
+        yield inc_id, moved
+        conn = get_test_db()
+        for table in ("Incidents", "UnitAssignments", "Narrative"):
+            conn.execute(f"DELETE FROM {table} WHERE incident_id = ?", (inc_id,))
+        conn.commit()
+        conn.close()
+
+    def test_moves_incident_and_children(self, archived):
+        import sqlite3
+        from app.db import archive_path
+        from tests.conftest import db_count
+        inc_id, moved = archived
+        assert moved["Incidents"] == 1
+        assert moved["UnitAssignments"] == 1 and moved["Narrative"] == 1
+        assert db_count("Incidents", "incident_id = ?", (inc_id,)) == 0
+        assert db_count("Narrative", "incident_id = ?", (inc_id,)) == 0
+        conn = sqlite3.connect(archive_path(2018, TEST_DB_PATH))
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM Incidents WHERE incident_id = ?", (inc_id,)).fetchone()[0] == 1
+        finally:
+            conn.close()
+
+    def test_recent_incidents_stay_live(self, archived):
+        from tests.conftest import db_count
+        assert db_count("Incidents", "status IN ('OPEN', 'ACTIVE')") > 0
+
+    def test_history_unions_archive(self, archived):
+        from app.history.queries import fetch_incident_detail, fetch_unified_events
+        inc_id, _ = archived
+        result = fetch_unified_events({"mode": "incidents", "search": "ARCHIVE LANE"})
+        assert [e["event_id"] for e in result["events"]] == [inc_id]
+        detail = fetch_incident_detail(inc_id)
+        assert detail["narrative_entries"][0]["text"] == "ARCHIVED NARRATIVE"
+        assert [u["unit_id"] for u in detail["units"]] == ["E1"]
+
+    def test_search_finds_archived_call(self, archived):
+        import main
+        inc_id, _ = archived
+        assert [h["id"] for h in main._global_search("ARCHIVE LANE")["history"]] == [inc_id]
+
+    def test_reporting_conn_unions_archive(self, archived):
+        from app.db import reporting_conn
+        inc_id, _ = archived
+        conn = reporting_conn()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM Incidents i JOIN UnitAssignments ua ON ua.incident_id = i.incident_id "
+                "WHERE i.incident_id = ?", (inc_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        assert row[0] == 1
+
+    def test_live_copy_wins_over_archived_duplicate(self, archived):
+        from app.db import archive_conn
+        from tests.conftest import get_test_db
+        inc_id, _ = archived
+        # Crash between copy and delete: the row exists in both stores
+        conn = get_test_db()
+        conn.execute(
+            "INSERT INTO Incidents (incident_id, incident_number, type, location, status, created, updated) "
+            "VALUES (?, 'ARCH-0001', 'ARCHTEST', 'ARCHIVE LANE', 'CLOSED', '2018-03-04 10:00:00', 'LIVE')",
+            (inc_id,),
+        )
+        conn.commit()
+        conn.close()
+        conn = archive_conn()
+        try:
+            rows = conn.execute("SELECT updated FROM Incidents WHERE incident_id = ?", (inc_id,)).fetchall()
+        finally:
+            conn.close()
+        assert [r[0] for r in rows] == ["LIVE"]
+
+    def test_no_archive_means_pooled_conn(self, seeded_db, tmp_path, monkeypatch):
+        import app.db.archive as archive
+        from app.db import PooledConnection, archive_conn
+        monkeypatch.setattr(archive, "ARCHIVE_DIR", str(tmp_path))
+        conn = archive_conn()
+        try:
+            assert isinstance(conn, PooledConnection)
+        finally:
+            conn.close()
+
+
+# ============================================================================
+# MAINTENANCE
+# ============================================================================
+
+class TestMaintenance:
+    """Backup, checkpoint, vacuum, optimize and quick_check jobs run online.
+    Jobs run on a copy so ANALYZE does not change later query plans."""
+
+    @pytest.fixture
+    def db_copy(self, seeded_db, tmp_path):
+        import sqlite3
+        from tests.conftest import get_test_db
+        path = str(tmp_path / "cad_copy.db")
+        src = get_test_db()
+        dest = sqlite3.connect(path)
+        try:
+            src.backup(dest)
+            dest.execute("PRAGMA journal_mode=WAL")
+        finally:
+            dest.close()
+            src.close()
+        return path
+
+    def _scheduler(self, path):
+        from app.db import MaintenanceScheduler
+        return MaintenanceScheduler(db_path=path)
+
+    def test_backup_is_checked_and_pruned(self, db_copy, tmp_path, monkeypatch):
+        import sqlite3
+        import app.db.maintenance as maintenance
+        from app.db import list_backups
+        monkeypatch.setattr(maintenance, "BACKUP_DIR", str(tmp_path / "backups"))
+        monkeypatch.setattr(maintenance, "BACKUP_KEEP", 1)
+        sched = self._scheduler(db_copy)
+        first = sched.run_job("backup")
+        assert first["ok"] is True, first
+        conn = sqlite3.connect(first["path"])
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM Units").fetchone()[0] > 0
+        finally:
+            conn.close()
+        (tmp_path / "backups" / "cad_copy-19990101-000000.db").write_bytes(b"")
+        assert sched.run_job("backup")["pruned"] == 1
+        assert list_backups(db_copy) == [first["path"]]
+
+    def test_incremental_vacuum_frees_pages(self, tmp_path):
+        import sqlite3
+        from app.db import get_conn
+        path = str(tmp_path / "fresh.db")
+        conn = get_conn(path)
+        try:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            conn.execute("CREATE TABLE t (x TEXT)")
+            conn.executemany("INSERT INTO t VALUES (?)", [("x" * 500,) for _ in range(2000)])
+            conn.execute("DELETE FROM t")
+            conn.commit()
+        finally:
+            conn.close()
+        result = self._scheduler(path).run_job("incremental_vacuum")
+        assert result["freed_pages"] > 0
+        raw = sqlite3.connect(path)
+        try:
+            assert raw.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        finally:
+            raw.close()
+
+    def test_vacuum_enables_incremental(self, db_copy):
+        import sqlite3
+        conn = sqlite3.connect(db_copy, isolation_level=None)
+        conn.execute("PRAGMA auto_vacuum=NONE")
+        conn.execute("VACUUM")
+        conn.close()
+        sched = self._scheduler(db_copy)
+        assert "skipped" in sched.run_job("incremental_vacuum")
+        assert sched.run_job("vacuum")["ok"] is True
+        conn = sqlite3.connect(db_copy)
+        try:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        finally:
+            conn.close()
+
+    def test_checkpoint_truncates_wal(self, db_copy):
+        import os
+        import sqlite3
+        # Held open so closing the job's connection does not remove the WAL
+        conn = sqlite3.connect(db_copy)
+        try:
+            conn.execute("INSERT INTO Contacts (name, created, updated) VALUES ('WAL PROBE', '', '')")
+            conn.commit()
+            assert os.path.getsize(db_copy + "-wal") > 0
+            result = self._scheduler(db_copy).run_job("wal_checkpoint")
+            assert result["mode"] == "TRUNCATE" and not result["busy"]
+            assert os.path.getsize(db_copy + "-wal") == 0
+        finally:
+            conn.close()
+
+    def test_optimize_collects_statistics(self, db_copy):
+        import sqlite3
+        sched = self._scheduler(db_copy)
+        assert sched.run_job("optimize")["mode"] == "analyze"
+        assert sched.run_job("optimize")["mode"] == "optimize"
+        conn = sqlite3.connect(db_copy)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        finally:
+            conn.close()
+
+    def test_quick_check(self, db_copy):
+        result = self._scheduler(db_copy).run_job("quick_check")
+        assert result["ok"] is True and result["problems"] == []
+
+    def test_locked_database_defers_job(self, db_copy, monkeypatch):
+        import sqlite3
+        import app.db.maintenance as maintenance
+        monkeypatch.setattr(maintenance, "PAUSE_MS", 1)
+        monkeypatch.setattr(maintenance, "MAINT_BUSY_MS", 10)
+        writer = sqlite3.connect(db_copy, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            sched = self._scheduler(db_copy)
+            result = sched.run_job("optimize")
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+        assert result["deferred"] is True
+        assert sched.stats()["jobs"]["optimize"]["deferred"] == 1
+
+    def test_nightly_jobs_due_once_per_day(self, db_copy):
+        import datetime
+        from app.db.maintenance import NIGHTLY_HOUR
+        sched = self._scheduler(db_copy)
+        night = datetime.datetime.now().replace(hour=NIGHTLY_HOUR, minute=5)
+        assert {"backup", "quick_check"} <= set(sched.due(night))
+        sched.run_job("quick_check")
+        assert "quick_check" not in sched.due(night)
+        assert "quick_check" not in sched.due(night.replace(hour=(NIGHTLY_HOUR + 1) % 24))
+
+    def test_request_queues_job(self, db_copy):
+        sched = self._scheduler(db_copy)
+        sched.request("incremental_vacuum")
+        assert sched.stats()["pending"] == ["incremental_vacuum"]
+        with pytest.raises(KeyError):
+            sched.request("defragment")
+
+    def test_admin_endpoint(self, client, seeded_db):
+        assert client.get("/api/admin/db/maintenance", params={"user": "DISP1"}).status_code == 403
+        assert client.post("/api/admin/db/maintenance/defragment", params={"user": "17"}).status_code == 404
+        r = client.post("/api/admin/db/maintenance/quick_check", params={"user": "17"})
+        assert r.json()["ok"] is True
+        status = client.get("/api/admin/db/maintenance", params={"user": "17"}).json()
+        assert status["jobs"]["quick_check"]["runs"] >= 1
+
+
+# ============================================================================
+# WRITE-LOCK TELEMETRY
+# ============================================================================
+
+class TestLockTelemetry:
+    """Pooled connections split write-lock wait from hold time and attribute
+    both to the endpoint and call site."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_stats(self):
+        from app.db import reset_lock_stats
+        reset_lock_stats()
+        yield
+        reset_lock_stats()
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        import sqlite3
+        path = str(tmp_path / "locks.db")
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.close()
+        return path
+
+    def _write(self, path):
+        from app.db import get_conn
+        conn = get_conn(path)
+        try:
+            conn.execute("INSERT INTO t VALUES (1)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_write_records_wait_and_hold(self, path):
+        from app.db import lock_stats
+        self._write(path)
+        stats = lock_stats()
+        assert stats["waits"] == 1 and stats["holds"] == 1
+        assert sum(stats["histogram"]["wait"]) == 1
+        assert stats["top_holders"][0]["name"].startswith("tests/test_db_layer.py:_write:")
+
+    def test_reads_take_no_lock(self, seeded_db):
+        from app.db import get_conn, lock_stats
+        conn = get_conn()
+        try:
+            conn.execute("SELECT COUNT(*) FROM Units").fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        assert lock_stats()["waits"] == 0
+
+    def test_contended_write_measures_wait(self, path):
+        import sqlite3
+        import threading
+        from app.db import lock_stats
+        holder = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        holder.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.2, holder.execute, ("COMMIT",))
+        release.start()
+        try:
+            self._write(path)
+        finally:
+            release.join()
+            holder.close()
+        stats = lock_stats()
+        assert stats["max_wait_ms"] >= 150
+        assert stats["top_waiters"][0]["max_wait_ms"] >= 150
+
+    def test_endpoint_carried_into_run_db(self, path):
+        import asyncio
+        from app.db import lock_stats, reset_lock_endpoint, run_db, set_lock_endpoint
+
+        async def handler():
+            token = set_lock_endpoint("POST /probe/{id}")
+            try:
+                await run_db(self._write, path)
+            finally:
+                reset_lock_endpoint(token)
+
+        asyncio.run(handler())
+        assert lock_stats()["endpoints"]["POST /probe/{id}"]["holds"] == 1
+
+    def test_busy_retry_counted(self):
+        from app.db import lock_stats, note_busy_retry
+        note_busy_retry(0.05)
+        note_busy_retry(0.10)
+        stats = lock_stats()
+        assert stats["retries"] == 2 and stats["retry_ms"] == 150.0
+
+    def test_health_endpoints(self, client, seeded_db):
+        from app.db import note_busy_retry, reset_lock_endpoint, set_lock_endpoint
+        token = set_lock_endpoint("POST /probe")
+        try:
+            note_busy_retry(0.05)
+        finally:
+            reset_lock_endpoint(token)
+        assert client.get("/api/health").json()["write_locks"]["retries"] == 1
+        r = client.get("/api/health/locks").json()
+        assert r["ok"] is True
+        assert len(r["histogram"]["wait"]) == len(r["histogram"]["buckets_ms"])
+        assert r["endpoints"]["POST /probe"]["retries"] == 1
+
+
+# ============================================================================
+# LEADER LEASES
+# ============================================================================
+
+class TestLeaderLease:
+    """One process per scheduler family holds the lease; another takes over
+    when it lapses or is released."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "lease.db")
+
+    def _manager(self, path, holder, ttl_s=15.0):
+        from app.db import LeaseManager
+        return LeaseManager(db_path=path, ttl_s=ttl_s, heartbeat_s=0.1, holder=holder)
+
+    def test_only_one_holder_wins(self, path):
+        a, b = self._manager(path, "a"), self._manager(path, "b")
+        assert a.is_leader("reminders") is True
+        assert b.is_leader("reminders") is False
+        assert b.is_leader("reporting") is True
+        assert a.is_leader("reporting") is False
+        assert a.stats()["standby_for"] == ["reporting"]
+
+    def test_renewal_keeps_the_lease(self, path):
+        a = self._manager(path, "a")
+        assert a.acquire("reports") is True
+        assert a.acquire("reports") is True
+        a.heartbeat()
+        stats = a.stats()
+        assert stats["acquired"] == 1 and stats["renewals"] == 2
+
+    def test_takeover_after_release(self, path):
+        a, b = self._manager(path, "a"), self._manager(path, "b")
+        assert a.is_leader("maintenance") and not b.is_leader("maintenance")
+        a.release()
+        b.heartbeat()
+        assert b.is_leader("maintenance") is True
+        assert a.acquire("maintenance") is False
+
+    def test_takeover_after_expiry(self, path):
+        import time
+        a = self._manager(path, "a", ttl_s=1.0)
+        b = self._manager(path, "b", ttl_s=1.0)
+        assert a.acquire("scheduled_incidents") is True
+        assert b.acquire("scheduled_incidents") is False
+        time.sleep(1.1)
+        assert b.acquire("scheduled_incidents") is True
+        # The old leader notices at its next heartbeat
+        a.heartbeat()
+        assert a.stats()["lost"] == 1
+        assert a.is_leader("scheduled_incidents") is False
+
+    def test_leader_only_skips_in_standby(self, path, monkeypatch):
+        import app.db.lease as lease
+        other = self._manager(path, "other")
+        assert other.acquire("reminders") is True
+        monkeypatch.setattr(lease, "_manager", self._manager(path, "me"))
+        calls = []
+        job = lease.leader_only("reminders")(lambda: calls.append(1) or "ran")
+        assert job() is None and calls == []
+        assert lease.lease_stats()["skipped"] == 1
+        other.release()
+        monkeypatch.setattr(lease, "_manager", self._manager(path, "me2"))
+        assert job() == "ran" and calls == [1]
+
+    def test_disabled_always_leads(self, path, monkeypatch):
+        import app.db.lease as lease
+        monkeypatch.setattr(lease, "ENABLED", False)
+        a, b = self._manager(path, "a"), self._manager(path, "b")
+        assert a.is_leader("reports") and b.is_leader("reports")
+
@@ -0,0 +1,284 @@
+"""
+FORD-CAD — Query Plan Regression Tests
+=======================================
+Tests: Hot-path index set (app/db/indexes.py) and EXPLAIN QUERY PLAN
+       checks on the board, dispatch and Daily Log queries — any full
+       table scan of a hot table fails the suite.
+"""
+
+import pytest
+from tests.conftest import TEST_DB_PATH
+
+# Tables that grow with call volume; roster/config tables (Units,
+# PersonnelAssignments, playbooks, ...) are small and read whole by design.
+HOT_TABLES = {
+    "UnitAssignments", "Incidents", "DailyLog", "Narrative",
+    "IncidentHistory", "ShiftOverrides",
+}
+
+_PLANNED = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+def _hot_scans(statements):
+    """[(statement, [tables])] for every captured statement that fully
+    scans a hot table."""
+    from app.db import full_table_scans, get_conn
+    conn = get_conn()
+    try:
+        bad, seen = [], set()
+        for sql in statements:
+            head = sql.lstrip()[:6].upper()
+            if not head.startswith(_PLANNED) or sql in seen:
+                continue
+            seen.add(sql)
+            tables = [t for t in full_table_scans(conn, sql) if t in HOT_TABLES]
+            if tables:
+                bad.append((" ".join(sql.split())[:200], tables))
+        return bad
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# INDEX SET
+# ============================================================================
+
+class TestHotPathIndexes:
+    """Migration 13 installs the curated index set and drops what it replaces."""
+
+    def _indexes(self):
+        from tests.conftest import db_query
+        return {r["name"]: r["sql"] for r in db_query("SELECT name, sql FROM sqlite_master WHERE type = 'index'")}
+
+    def test_hot_path_indexes_installed(self, seeded_db):
+        from app.db import HOT_PATH_INDEXES
+        indexes = self._indexes()
+        for spec in HOT_PATH_INDEXES:
+            assert spec.name in indexes, spec.name
+
+    def test_active_row_indexes_are_partial(self, seeded_db):
+        indexes = self._indexes()
+        assert "WHERE cleared IS NULL" in indexes["idx_ua_active_unit"]
+        assert "WHERE cleared IS NULL" in indexes["idx_ua_active_incident"]
+        assert "WHERE end_ts IS NULL" in indexes["idx_shift_overrides_active"]
+
+    def test_redundant_indexes_dropped(self, seeded_db):
+        indexes = self._indexes()
+        assert "idx_unit_assignments_cleared" not in indexes
+        assert "idx_narrative_incident" not in indexes
+
+    def test_install_is_idempotent(self, seeded_db):
+        from app.db import HOT_PATH_INDEXES, get_conn, install_hot_path_indexes
+        conn = get_conn(TEST_DB_PATH)
+        try:
+            assert len(install_hot_path_indexes(conn)) == len(HOT_PATH_INDEXES)
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# ============================================================================
+# PLAN CHECKER
+# ============================================================================
+
+class TestFullTableScans:
+    """full_table_scans() resolves aliases and accepts partial-index scans."""
+
+    def test_detects_plain_scan(self, seeded_db):
+        from app.db import full_table_scans, get_conn
+        conn = get_conn()
+        try:
+            assert full_table_scans(conn, "SELECT * FROM DailyLog dl WHERE dl.details LIKE '%x%'") == ["DailyLog"]
+        finally:
+            conn.close()
+
+    def test_partial_index_scan_allowed(self, seeded_db):
+        from app.db import full_table_scans, get_conn
+        conn = get_conn()
+        try:
+            sql = "SELECT DISTINCT unit_id FROM UnitAssignments WHERE cleared IS NULL"
+            assert full_table_scans(conn, sql) == []
+        finally:
+            conn.close()
+
+
+# ============================================================================
+# HOT QUERIES
+# ============================================================================
+
+class TestHotQueryPlans:
+    """EXPLAIN QUERY PLAN on the statements each hot path actually runs."""
+
+    def test_panel_active(self, seeded_db):
+        import main
+        from app.board import invalidate_board_state
+        from app.db import capture_statements
+        # Measure the loader, not a board state hit
+        invalidate_board_state()
+        with capture_statements() as statements:
+            main.panel_active()
+        assert statements
+        assert _hot_scans(statements) == []
+
+    def test_units_panel_context(self, dispatcher_session, seeded_db):
+        from app.board import invalidate_board_state
+        from app.db import capture_statements
+        invalidate_board_state()
+        with capture_statements() as statements:
+            r = dispatcher_session.get("/panel/units")
+        assert r.status_code == 200
+        assert any("ShiftOverrides" in s for s in statements)
+        assert _hot_scans(statements) == []
+
+    def test_committed_elsewhere_check(self, dispatcher_session, seeded_db):
+        from app.db import capture_statements
+        from tests.conftest import get_test_db
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, created, updated) "
+            "VALUES ('PLAN-0001', 'TEST', 'PLAN TEST', 'OPEN', '', '')"
+        ).lastrowid
+        conn.execute("UPDATE UnitAssignments SET cleared = 'x' WHERE unit_id = 'UTV1' AND cleared IS NULL")
+        conn.execute("UPDATE Units SET status = 'AVAILABLE' WHERE unit_id = 'UTV1'")
+        conn.commit()
+        conn.close()
+
+        try:
+            with capture_statements() as statements:
+                resp = dispatcher_session.post("/dispatch/unit_to_incident", json={
+                    "incident_id": inc_id,
+                    "units": ["UTV1"],
+                })
+            assert resp.json()["ok"] is True, resp.json()
+            assert any("incident_id <>" in s for s in statements)
+            assert _hot_scans(statements) == []
+        finally:
+            conn = get_test_db()
+            conn.execute("UPDATE UnitAssignments SET cleared = 'x' WHERE unit_id = 'UTV1' AND cleared IS NULL")
+            conn.execute("UPDATE Units SET status = 'AVAILABLE' WHERE unit_id = 'UTV1'")
+            conn.execute("UPDATE Incidents SET status = 'CLOSED' WHERE incident_id = ?", (inc_id,))
+            conn.commit()
+            conn.close()
+
+    @pytest.mark.parametrize("filters", [
+        {"date_iso": "2026-01-15"},
+        {"unit_id": "E1"},
+        {"incident_id": 1},
+        {"date_iso": "2026-01-15", "unit_id": "E1"},
+    ])
+    def test_daily_log_feed_filters(self, seeded_db, filters):
+        import main
+        from app.db import capture_statements
+        with capture_statements() as statements:
+            main.fetch_daily_log_feed(**filters)
+        assert any("FROM DailyLog" in s for s in statements)
+        assert _hot_scans(statements) == []
+
+    def test_daily_log_feed_unfiltered_walks_newest_first(self, seeded_db):
+        import main
+        from app.db import capture_statements, explain_query_plan, get_conn
+        with capture_statements() as statements:
+            main.fetch_daily_log_feed()
+        sql = next(s for s in statements if "FROM DailyLog" in s)
+        conn = get_conn()
+        try:
+            plan = explain_query_plan(conn, sql)
+        finally:
+            conn.close()
+        # Bounded by LIMIT in rowid order: no sort of the whole log
+        assert not any("TEMP B-TREE" in d for d in plan), plan
+
+
+# ============================================================================
+# EPOCH TIMESTAMPS
+# ============================================================================
+
+class TestEpochColumns:
+    """Indexed epoch shadows stay in sync and serve date-range queries."""
+
+    def test_shadow_tracks_insert_and_update(self, seeded_db):
+        from app.db import to_epoch
+        from tests.conftest import get_test_db
+        conn = get_test_db()
+        try:
+            row_id = conn.execute(
+                "INSERT INTO DailyLog (timestamp, user, action, event_type, details) "
+                "VALUES ('2025-03-04 00:30:00', 'T', 'DAILYLOG', 'OTHER', 'EPOCH PROBE')"
+            ).lastrowid
+            conn.commit()
+            got = conn.execute("SELECT ts_epoch FROM DailyLog WHERE id = ?", (row_id,)).fetchone()[0]
+            assert got == to_epoch("2025-03-04 00:30:00")
+            conn.execute("UPDATE DailyLog SET timestamp = '2025-03-05 12:00:00' WHERE id = ?", (row_id,))
+            conn.commit()
+            got = conn.execute("SELECT ts_epoch FROM DailyLog WHERE id = ?", (row_id,)).fetchone()[0]
+            assert got == to_epoch("2025-03-05T12:00:00")
+        finally:
+            conn.close()
+
+    def test_shadows_hidden_from_table_info(self, seeded_db):
+        from app.db import has_column
+        from tests.conftest import db_query
+        cols = {r["name"] for r in db_query("PRAGMA table_info(Incidents)")}
+        assert "created_epoch" not in cols
+        assert has_column("Incidents", "created_epoch", TEST_DB_PATH)
+
+    def test_date_range_sql_uses_shadow(self, seeded_db):
+        from app.db import date_range_sql, to_epoch
+        sql, params = date_range_sql("Incidents", "created", "2025-03-04", "2025-03-04", alias="i")
+        assert sql == "i.created_epoch >= ? AND i.created_epoch < ?"
+        assert params == [to_epoch("2025-03-04"), to_epoch("2025-03-05")]
+
+    def test_text_fallback_without_shadow(self, seeded_db):
+        from app.db import time_range_sql
+        sql, params = time_range_sql("MasterLog", "timestamp", "2025-03-04T06:00:00", None)
+        assert sql == "timestamp >= ?"
+        assert params == ["2025-03-04 06:00:00"]
+
+    def test_analytics_counts_first_day(self, client, seeded_db):
+        from tests.conftest import get_test_db
+        conn = get_test_db()
+        inc_id = conn.execute(
+            "INSERT INTO Incidents (incident_number, type, location, status, created, updated) "
+            "VALUES ('EPOCH-0001', 'EPOCHTEST', 'EPOCH TEST', 'CLOSED', "
+            "'2019-03-04 00:30:00', '2019-03-04 00:30:00')"
+        ).lastrowid
+        conn.commit()
+        conn.close()
+        try:
+            r = client.get("/api/analytics", params={
+                "period": "custom", "from_date": "2019-03-04", "to_date": "2019-03-04",
+            })
+            assert r.status_code == 200
+            assert r.json()["total_incidents"] == 1
+        finally:
+            conn = get_test_db()
+            conn.execute("DELETE FROM Incidents WHERE incident_id = ?", (inc_id,))
+            conn.commit()
+            conn.close()
+
+    def test_year_analytics_is_range_scan(self, seeded_db):
+        import main
+        from app.db import capture_statements
+        with capture_statements() as statements:
+            main._analytics_data(period="year")
+        ranged = [s for s in statements if "created_epoch >=" in s]
+        assert len(ranged) >= 5
+        assert _hot_scans(ranged) == []
+
+    def test_nfirs_export_is_range_scan(self, seeded_db, monkeypatch):
+        import asyncio
+        import main
+        from starlette.requests import Request
+        from app.db import capture_statements, explain_query_plan, get_conn
+        # The export reads the reporting snapshot; trace it on the pool instead
+        monkeypatch.setattr(main.db_pool, "reporting_conn", get_conn)
+        with capture_statements() as statements:
+            req = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+            asyncio.run(main.export_nfirs_csv(req, start_date="2025-01-01", end_date="2025-12-31"))
+        sql = next(s for s in statements if "FROM Incidents" in s)
+        conn = get_conn()
+        try:
+            plan = explain_query_plan(conn, sql)
+        finally:
+            conn.close()
+        assert any("created_epoch" in d for d in plan), plan